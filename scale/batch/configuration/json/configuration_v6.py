@@ -1,11 +1,11 @@
 """Manages the v6 batch configuration schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from batch.configuration.configuration import BatchConfiguration
 from batch.configuration.exceptions import InvalidConfiguration
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
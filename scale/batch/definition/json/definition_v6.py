@@ -1,12 +1,12 @@
 """Manages the v6 batch definition schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from batch.definition.definition import BatchDefinition
 from batch.definition.exceptions import InvalidDefinition
 from recipe.diff.json.forced_nodes_v6 import convert_forced_nodes_to_v6, ForcedNodesV6
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
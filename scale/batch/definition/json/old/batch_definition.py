@@ -1,7 +1,6 @@
 """Defines the class for managing a batch definition"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 import util.parse as parse
@@ -9,6 +8,7 @@ from batch.definition.exceptions import InvalidDefinition
 from storage.models import Workspace
 from trigger.configuration.exceptions import InvalidTriggerRule
 from trigger.configuration.trigger_rule import TriggerRuleConfiguration
+from util.schema import validate
 
 
 DEFAULT_VERSION = '1.0'
@@ -69,6 +69,24 @@ class UpdateBatchMetrics(CommandMessage):
 
         return len(self._batch_ids) < MAX_NUM
 
+    def can_merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.can_merge`
+        """
+
+        if not isinstance(message, UpdateBatchMetrics):
+            return False
+        return len(set(self._batch_ids) | set(message._batch_ids)) <= MAX_NUM
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        batch_ids = set(self._batch_ids)
+        for batch_id in message._batch_ids:
+            if batch_id not in batch_ids:
+                batch_ids.add(batch_id)
+                self.add_batch(batch_id)
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
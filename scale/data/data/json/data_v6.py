@@ -1,13 +1,13 @@
 """Manages the v6 data schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from data.data.data import Data
 from data.data.exceptions import InvalidData
 from data.data.json.data_v1 import DataV1
 from data.data.value import FileValue, JsonValue
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
@@ -1,11 +1,11 @@
 """Manages the v6 data filter schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from data.filter.filter import DataFilter
 from data.filter.exceptions import InvalidDataFilter
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
@@ -1,12 +1,12 @@
 """Manages the v6 interface schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from data.interface.exceptions import InvalidInterface
 from data.interface.interface import Interface
 from data.interface.parameter import FileParameter, JsonParameter
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
@@ -61,10 +61,19 @@ def perform_ingest(ingest_id):
                     file_download = FileDownload(source_file, local_path, False)
                     ScaleFile.objects.download_files([file_download])
                 source_file.file_path = ingest.new_file_path if ingest.new_file_path else ingest.file_path
-                logger.info('Copying %s in workspace %s to %s in workspace %s', ingest.file_path, ingest.workspace.name,
-                            source_file.file_path, ingest.new_workspace.name)
-                file_upload = FileUpload(source_file, local_path)
-                ScaleFile.objects.upload_files(ingest.new_workspace, [file_upload])
+                new_path = _get_existing_path(ingest.new_workspace, source_file)
+                if paths and new_path and os.path.samefile(local_path, new_path):
+                    # Both workspaces share the file system and the file is already where the new workspace expects it
+                    logger.info('Registering %s in place in workspace %s', source_file.file_path,
+                                ingest.new_workspace.name)
+                    source_file.workspace = ingest.new_workspace
+                    _save_source_file(source_file)
+                else:
+                    # Host and NFS brokers link rather than copy the file when both paths are on the same file system
+                    logger.info('Copying %s in workspace %s to %s in workspace %s', ingest.file_path,
+                                ingest.workspace.name, source_file.file_path, ingest.new_workspace.name)
+                    file_upload = FileUpload(source_file, local_path)
+                    ScaleFile.objects.upload_files(ingest.new_workspace, [file_upload])
             elif ingest.new_file_path:
                 logger.info('Moving %s to %s in workspace %s', ingest.file_path, ingest.new_file_path,
                             ingest.workspace.name)
@@ -81,7 +90,10 @@ def perform_ingest(ingest_id):
             file_with_old_path.file_path = ingest.file_path
             paths = ingest.workspace.get_file_system_paths([file_with_old_path])
             if paths:
-                _delete_file(paths[0])
+                # Never delete a file that was registered in place, it is the one now in the new workspace
+                new_path = _get_existing_path(ingest.new_workspace, source_file)
+                if not new_path or os.path.realpath(paths[0]) != os.path.realpath(new_path):
+                    _delete_file(paths[0])
 
     except Exception:
         _complete_ingest(ingest, 'ERRORED')
@@ -124,6 +136,24 @@ def _delete_file(file_path):
         os.remove(file_path)
 
 
+def _get_existing_path(workspace, scale_file):
+    """Returns the local file system path of the given file in the given workspace if the workspace's broker supports
+    local paths and the file exists there
+
+    :param workspace: The workspace
+    :type workspace: :class:`storage.models.Workspace`
+    :param scale_file: The file model
+    :type scale_file: :class:`storage.models.ScaleFile`
+    :returns: The local file system path, possibly None
+    :rtype: string
+    """
+
+    paths = workspace.get_file_system_paths([scale_file])
+    if paths and os.path.exists(paths[0]):
+        return paths[0]
+    return None
+
+
 @retry_database_query
 def _get_ingest(ingest_id):
     """Returns the ingest for the given ID
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingest', '0015_scan_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='ingest',
+            index_together=set([('scan', 'file_name')]),
+        ),
+    ]
@@ -9,7 +9,7 @@ from collections import namedtuple
 
 import django.utils.timezone as timezone
 import django.contrib.postgres.fields
-from django.db import models, transaction
+from django.db import connection, models, transaction
 from django.utils.timezone import now
 
 from ingest.scan.configuration.scan_configuration import ScanConfiguration
@@ -21,7 +21,7 @@ from ingest.strike.configuration.json.configuration_2_0 import StrikeConfigurati
 from ingest.strike.configuration.json.configuration_v6 import StrikeConfigurationV6
 from ingest.strike.configuration.exceptions import InvalidStrikeConfiguration
 from job.configuration.data.job_data import JobData
-from job.models import JobType
+from job.models import Job, JobType, JobTypeRevision
 from queue.models import Queue
 from storage.exceptions import InvalidDataTypeTag
 from storage.media_type import get_media_type
@@ -195,6 +195,24 @@ class IngestManager(models.Manager):
         return self.filter_ingests(started=started, ended=ended, statuses=statuses, scan_ids=scan_ids,
                                    strike_ids=strike_ids, file_name=file_name, order=order)
 
+    def get_ingested_file_names(self, scan_id, file_names):
+        """Returns the subset of the given file names that already have ingests created by the given scan. The lookup
+        is satisfied by the (scan, file_name) index.
+
+        :param scan_id: The ID of the scan
+        :type scan_id: int
+        :param file_names: The file names to check
+        :type file_names: set[string]
+        :returns: The file names that already have ingests for the scan
+        :rtype: set[string]
+        """
+
+        if not file_names:
+            return set()
+
+        ingests = Ingest.objects.filter(scan_id=scan_id, file_name__in=file_names)
+        return set(ingests.values_list('file_name', flat=True))
+
     def get_ingests_by_scan(self, scan_id, file_names=None):
         """Returns a list of ingests associated with a scan and optionally files
 
@@ -275,9 +293,10 @@ class IngestManager(models.Manager):
 
     @transaction.atomic
     def start_ingest_tasks(self, ingests, scan_id=None, strike_id=None):
-        """Starts a batch of tasks for the given scan in an atomic transaction.
+        """Starts a batch of tasks for the given scan in an atomic transaction. The trigger events, jobs, and queue
+        models for the whole batch are created with bulk inserts and the ingest models are updated with a single query.
 
-        One of scan_id or strike_id must be set.
+        One of scan_id or strike_id must be set. The ingest models must have already been saved in the database.
 
         :param ingests: The ingest models
         :type ingests: list[:class:`ingest.models.Ingest`]
@@ -287,44 +306,88 @@ class IngestManager(models.Manager):
         :type strike_id: int
         """
 
-        # Create new ingest job and mark ingest as QUEUED
+        if scan_id:
+            trigger_type = 'SCAN_TRANSFER'
+            description_key = 'scan_id'
+            source_id = scan_id
+        elif strike_id:
+            trigger_type = 'STRIKE_TRANSFER'
+            description_key = 'strike_id'
+            source_id = strike_id
+        else:
+            raise Exception('One of scan_id or strike_id must be set')
+
+        if not ingests:
+            return
+
+        if scan_id:
+            # Ingest models may not have their IDs populated by a bulk insert, so query for the missing ones using
+            # scan_id and file_name together as a unique composite key
+            missing_file_names = [ingest.file_name for ingest in ingests if not ingest.id]
+            if missing_file_names:
+                ingest_qry = self.filter(scan_id=scan_id, file_name__in=missing_file_names)
+                ingest_ids = dict(ingest_qry.values_list('file_name', 'id'))
+                for ingest in ingests:
+                    if not ingest.id:
+                        ingest.id = ingest_ids[ingest.file_name]
+
+        # Create new ingest jobs and mark ingests as QUEUED
         ingest_job_type = Ingest.objects.get_ingest_job_type()
+        job_type_rev = JobTypeRevision.objects.get_revision(ingest_job_type.name, ingest_job_type.version,
+                                                            ingest_job_type.revision_num)
 
+        events = []
         for ingest in ingests:
+            event = TriggerEvent()
+            event.type = trigger_type
+            event.description = {'file_name': ingest.file_name, description_key: source_id}
+            event.occurred = ingest.transfer_ended if ingest.transfer_ended else now()
+            events.append(event)
+        TriggerEvent.objects.bulk_create(events)
+
+        jobs_with_data = []
+        for ingest, event in zip(ingests, events):
             logger.debug('Creating ingest task for %s', ingest.file_name)
 
-            when = ingest.transfer_ended if ingest.transfer_ended else now()
-            desc = {'file_name': ingest.file_name}
-
-            if scan_id:
-                # Use result from query to get ingest ID
-                # We need to find the id of each ingest that was created.
-                # Using scan_id and file_name together as a unique composite key
-                ingest_id = Ingest.objects.get(scan_id=ingest.scan_id, file_name=ingest.file_name).id
-
-                desc['scan_id'] = scan_id
-                event = TriggerEvent.objects.create_trigger_event('SCAN_TRANSFER', None, desc, when)
-            elif strike_id:
-                ingest_id = ingest.id
-                desc['strike_id'] = strike_id
-                event = TriggerEvent.objects.create_trigger_event('STRIKE_TRANSFER', None, desc, when)
-            else:
-                raise Exception('One of scan_id or strike_id must be set')
-
             # TODO: What is our way forward with ingest jobs? Move to system task or Seed Job Type?
             data = JobData()
-            data.add_property_input('ingest_id', str(ingest_id))
+            data.add_property_input('ingest_id', str(ingest.id))
             data.add_property_input('workspace', ingest.workspace.name)
             if ingest.new_workspace:
                 data.add_property_input('new_workspace', ingest.new_workspace.name)
 
-            ingest_job = Queue.objects.queue_new_job(ingest_job_type, data, event)
+            job = Job.objects.create_job_old(ingest_job_type, event.id, job_type_rev=job_type_rev)
+            jobs_with_data.append((job, data))
 
-            ingest.job = ingest_job
+        jobs = Job.objects.create_jobs_with_data(jobs_with_data)
+        Queue.objects.queue_jobs(jobs)
+        queued_jobs = Job.objects.in_bulk([job.id for job in jobs])
+
+        for ingest, job in zip(ingests, jobs):
+            ingest.job = queued_jobs[job.id]
             ingest.status = 'QUEUED'
-            ingest.save()
+        self._update_ingests_to_queued(ingests, now())
+
+        logger.info('Successfully created %d ingest task(s)', len(ingests))
 
-            logger.debug('Successfully created ingest task for %s', ingest.file_name)
+    def _update_ingests_to_queued(self, ingests, when):
+        """Updates the given ingest models in the database to the QUEUED status with their ingest jobs using a single
+        query
+
+        :param ingests: The ingest models with their ingest jobs
+        :type ingests: list[:class:`ingest.models.Ingest`]
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        values = ', '.join(['(%s, %s)'] * len(ingests))
+        qry = "UPDATE ingest i SET job_id = v.job_id, status = 'QUEUED', last_modified = %s"
+        qry += ' FROM (VALUES ' + values + ') AS v(ingest_id, job_id) WHERE i.id = v.ingest_id'
+        params = [when]
+        for ingest in ingests:
+            params.extend([ingest.id, ingest.job.id])
+        with connection.cursor() as cursor:
+            cursor.execute(qry, params)
 
     def _group_by_time(self, ingests, use_ingest_time):
         """Groups the given ingests by hourly time slots.
@@ -634,6 +697,7 @@ class Ingest(models.Model):
     class Meta(object):
         """meta information for database"""
         db_table = 'ingest'
+        index_together = ['scan', 'file_name']
 
 ScanValidation = namedtuple('ScanValidation', ['is_valid', 'errors', 'warnings'])
 
@@ -848,6 +912,8 @@ class Scan(models.Model):
 
     :keyword file_count: Number of files identified by last execution of Scan
     :type file_count: :class:`django.db.models.BigIntegerField`
+    :keyword checkpoint: The progress of the Scan process with ingests, used to resume the Scan if its job is restarted
+    :type checkpoint: :class:`django.contrib.postgres.fields.JSONField`
     :keyword created: When the Scan process was created
     :type created: :class:`django.db.models.DateTimeField`
     :keyword last_modified: When the Scan process was last modified
@@ -864,6 +930,7 @@ class Scan(models.Model):
     job = models.ForeignKey('job.Job', blank=True, null=True, on_delete=models.PROTECT, related_name='+')
 
     file_count = models.BigIntegerField(blank=True, null=True)
+    checkpoint = django.contrib.postgres.fields.JSONField(blank=True, null=True)
 
     created = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
@@ -5,13 +5,13 @@ import logging
 import os
 import re
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from ingest.handlers.file_handler import FileHandler
 from ingest.handlers.file_rule import FileRule
 from ingest.scan.configuration.scan_configuration import ScanConfiguration
 from ingest.scan.configuration.exceptions import InvalidScanConfiguration
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -5,15 +5,15 @@ import logging
 import os
 import re
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from ingest.handlers.file_handler import FileHandler
 from ingest.handlers.file_rule import FileRule
-from ingest.scan.configuration.scan_configuration import ScanConfiguration
+from ingest.scan.configuration.scan_configuration import DEFAULT_LISTERS, ScanConfiguration
 from ingest.scan.configuration.exceptions import InvalidScanConfiguration
 from ingest.scan.scanners import factory
 from storage.models import Workspace
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +51,10 @@ SCAN_CONFIGURATION_SCHEMA = {
         'recursive': {
             'type': 'boolean'
         },
+        'listers': {
+            'type': 'integer',
+            'minimum': 1
+        },
     },
     'definitions': {
         'file_item': {
@@ -159,6 +163,7 @@ class ScanConfigurationV6(object):
         config.scanner_type     = self._configuration['scanner']['type']
         config.scanner_config   = self._configuration['scanner']
         config.recursive        = self._configuration['recursive']
+        config.listers          = self._configuration.get('listers', DEFAULT_LISTERS)
         config.file_handler     = self._file_handler
         config.workspace        = self._configuration['workspace']
 
@@ -5,7 +5,6 @@ import logging
 import os
 import re
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from ingest.handlers.file_handler import FileHandler
@@ -13,9 +12,13 @@ from ingest.handlers.file_rule import FileRule
 from ingest.scan.configuration.exceptions import InvalidScanConfiguration
 from ingest.scan.scanners import factory
 from storage.models import Workspace
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
+# The default number of partitions of the scanned workspace that are listed concurrently
+DEFAULT_LISTERS = 4
+
 class ValidationWarning(object):
     """Tracks Scan configuration warnings during validation that may prevent the process from working."""
 
@@ -47,6 +50,8 @@ class ScanConfiguration(object):
         
         self.recursive = True
 
+        self.listers = DEFAULT_LISTERS
+
         self.file_handler = FileHandler()
         
         self.workspace = ''
@@ -85,6 +90,7 @@ class ScanConfiguration(object):
             scanner.setup_workspaces(self.workspace, self.file_handler)
             scanner.load_configuration(self.scanner_config)
             scanner.set_recursive(self.recursive)
+            scanner.set_listers(self.listers)
         else:
             msg = 'Scan scanner type has been changed from %s to %s. Cannot reload configuration.'
             logger.warning(msg, scanner.scanner_type, self.scanner_type)
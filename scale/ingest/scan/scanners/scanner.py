@@ -3,6 +3,8 @@ from __future__ import unicode_literals
 
 import logging
 import os
+import Queue
+import threading
 from abc import ABCMeta, abstractmethod
 
 from django.db import transaction
@@ -13,6 +15,9 @@ from storage.models import Workspace
 
 logger = logging.getLogger(__name__)
 
+# The number of file batches that each lister may list ahead of the batches being processed
+LISTER_QUEUE_SIZE = 2
+
 
 class Scanner(object):
     """Abstract class for a scanner that processes existing files to ingest. Sub-classes must have a no-argument
@@ -36,6 +41,7 @@ class Scanner(object):
         self._count = 0
         self._dry_run = False  # Used to only scan and skip ingest process
         self._file_handler = None  # The file handler configured for this scanner
+        self._listers = 1  # The number of workspace partitions to list concurrently
         self._recursive = True
         self._scanned_workspace = None  # The workspace model that is being scanned
         self._scanner_type = scanner_type
@@ -43,6 +49,15 @@ class Scanner(object):
         self._supported_broker_types = supported_broker_types
         self._workspaces = {}  # The workspaces needed by this scanner, stored by workspace name {string: workspace}
 
+    def set_listers(self, listers):
+        """Support configuration of the number of workspace partitions that are listed concurrently
+
+        :param listers: The number of workspace partitions to list concurrently
+        :type listers: int
+        """
+
+        self._listers = listers
+
     def set_recursive(self, recursive):
         """Support configuration of scanner recursive property
         
@@ -85,6 +100,10 @@ class Scanner(object):
     def run(self, dry_run=False):
         """Runs the scanner until signaled to stop by the stop() method or processing complete.
 
+        The workspace is split into partitions (its root and each of its top-level directories for a recursive scan)
+        that are listed concurrently. When not a dry run, the last file processed in each partition is saved in the
+        Scan checkpoint so that a restarted scan resumes each partition where it left off.
+
         :param dry_run: Flag to enable file scanning only, no file ingestion will occur
         :type dry_run: bool
         """
@@ -92,21 +111,33 @@ class Scanner(object):
         logger.info('Running %s scanner %s...' % (self.scanner_type, 'in dry run mode ' if dry_run else ''))
         self._dry_run = dry_run
 
-        # Initialize workspace scan via storage broker. Configuration determines if recursive workspace walk.
-        files = self._scanned_workspace.list_files(recursive=self._recursive)
-
-        batched_files = []
-        for file in files:
-            batched_files.append(file)
-
-            # Process files every time a batch size is reached
-            if len(batched_files) >= self._batch_size:
-                self._process_scanned(batched_files)
-                batched_files = []
+        # Dry runs do not ingest any files, so they always scan the entire workspace
+        checkpoint = None
+        if not dry_run:
+            checkpoint = Scan.objects.get(pk=self.scan_id).checkpoint
+            if checkpoint:
+                self._count = checkpoint['file_count']
+                logger.info('Resuming scan from checkpoint after %i files', self._count)
+            else:
+                checkpoint = {'file_count': 0, 'partitions': {}}
 
-        # If any remaining files, process
-        if len(batched_files):
-            self._process_scanned(batched_files)
+        # Initialize workspace scan via storage broker. Configuration determines if recursive workspace walk.
+        partitions = ['']
+        if self._recursive:
+            partitions.extend(self._scanned_workspace.list_partitions())
+        start_after = {}
+        if checkpoint:
+            partitions_checkpoint = checkpoint['partitions']
+            partitions = [p for p in partitions if not partitions_checkpoint.get(p, {}).get('is_done')]
+            start_after = {p: partitions_checkpoint[p]['last_file'] for p in partitions if p in partitions_checkpoint}
+
+        for partition, batched_files, is_done in self._list_partitions(partitions, start_after):
+            if checkpoint:
+                partition_checkpoint = checkpoint['partitions'].setdefault(partition, {'last_file': None})
+                if batched_files:
+                    partition_checkpoint['last_file'] = batched_files[-1].file
+                partition_checkpoint['is_done'] = is_done
+            self._process_scanned(batched_files, checkpoint)
 
         logger.info('%s %i files during scan.' % ('Detected' if self._dry_run else 'Processed', self._count))
 
@@ -158,11 +189,92 @@ class Scanner(object):
 
         raise NotImplementedError
 
-    def _process_scanned(self, file_list):
+    def _list_partitions(self, partitions, start_after):
+        """Generator that lists the given workspace partitions concurrently, yielding each batch of files as a tuple of
+        the partition, the list of files, and whether the partition has been completely listed. Batches from the same
+        partition are yielded in order.
+
+        :param partitions: The workspace partitions to list
+        :type partitions: [string]
+        :param start_after: The file after which to start listing, keyed by partition
+        :type start_after: dict
+        """
+
+        if not partitions:
+            return
+
+        work_queue = Queue.Queue()
+        for partition in partitions:
+            work_queue.put(partition)
+        num_listers = max(1, min(self._listers, len(partitions)))
+        batch_queue = Queue.Queue(maxsize=num_listers * LISTER_QUEUE_SIZE)
+        stop_event = threading.Event()
+
+        def put_batch(item):
+            while not stop_event.is_set():
+                try:
+                    batch_queue.put(item, timeout=1)
+                    return True
+                except Queue.Full:
+                    pass
+            return False
+
+        def list_partition_files():
+            while not stop_event.is_set():
+                try:
+                    partition = work_queue.get_nowait()
+                except Queue.Empty:
+                    break
+                try:
+                    batched_files = []
+                    for file_details in self._scanned_workspace.list_files(self._recursive, partition,
+                                                                           start_after.get(partition)):
+                        batched_files.append(file_details)
+                        # Hand off files every time a batch size is reached
+                        if len(batched_files) >= self._batch_size:
+                            if not put_batch((partition, batched_files, False)):
+                                return
+                            batched_files = []
+                    if not put_batch((partition, batched_files, True)):
+                        return
+                except Exception as ex:
+                    logger.exception('Failed to list workspace partition %s', partition)
+                    put_batch(ex)
+                    return
+
+        listers = []
+        for i in range(num_listers):
+            lister = threading.Thread(target=list_partition_files, name='Scan lister %d' % i)
+            lister.daemon = True
+            lister.start()
+            listers.append(lister)
+
+        try:
+            remaining = len(partitions)
+            while remaining:
+                if self._stop_received:
+                    raise ScannerInterruptRequested
+                try:
+                    item = batch_queue.get(timeout=1)
+                except Queue.Empty:
+                    if not any(lister.is_alive() for lister in listers) and batch_queue.empty():
+                        break
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                if item[2]:
+                    remaining -= 1
+                yield item
+        finally:
+            stop_event.set()
+
+    def _process_scanned(self, file_list, checkpoint=None):
         """Method for handling files identified by list_files Generator
-        
+
         :param file_list: List of files found within workspace
         :type file_list: storage.brokers.broker.FileDetails
+        :param checkpoint: The scan checkpoint to save along with the ingests, possibly None
+        :type checkpoint: dict
         """
 
         ingests = []
@@ -180,17 +292,32 @@ class Scanner(object):
         # If no ingests were added, don't bother moving on
         if not len(ingests):
             logger.debug('No ingests for batch, this will always be the case during a dry-run.')
+            if checkpoint is not None:
+                self._save_progress(checkpoint)
             return
 
         # Once all ingest rules have been applied, de-duplicate and then bulk insert
         ingests = self._deduplicate_ingest_list(self.scan_id, ingests)
 
-        # bulk insert remaining as queued and note detected files in Scan mode
+        # Bulk insert remaining as queued, start their tasks and note scan progress together so that a restarted scan
+        # resumes exactly after the last batch that was ingested
         with transaction.atomic():
             Ingest.objects.bulk_create(ingests)
-            Scan.objects.filter(pk=self.scan_id).update(file_count=self._count)
+            Ingest.objects.start_ingest_tasks(ingests, scan_id=self.scan_id)
+            self._save_progress(checkpoint)
 
-        Ingest.objects.start_ingest_tasks(ingests, scan_id=self.scan_id)
+    def _save_progress(self, checkpoint):
+        """Saves the detected file count and the given checkpoint (if not None) to the scan model
+
+        :param checkpoint: The scan checkpoint, possibly None
+        :type checkpoint: dict
+        """
+
+        if checkpoint is None:
+            Scan.objects.filter(pk=self.scan_id).update(file_count=self._count)
+        else:
+            checkpoint['file_count'] = self._count
+            Scan.objects.filter(pk=self.scan_id).update(file_count=self._count, checkpoint=checkpoint)
 
     @staticmethod
     def _deduplicate_ingest_list(scan_id, new_ingests):
@@ -204,23 +331,18 @@ class Scanner(object):
         :rtype: List[:class:`ingest.models.Ingest`]
         """
 
-        deduplicate_file_names = set()
         list_count = len(new_ingests)
-        ingest_file_names = [ingest.file_name for ingest in new_ingests]
+        existing_file_names = Ingest.objects.get_ingested_file_names(scan_id, {i.file_name for i in new_ingests})
 
-        existing_ingests = Ingest.objects.get_ingests_by_scan(scan_id, ingest_file_names)
-        existing_ingest_file_names = [ingest.file_name for ingest in existing_ingests]
-
-        deduplicated_ingests = []
+        batch_file_names = set()
+        final_ingests = []
         for ingest in new_ingests:
-            if ingest.file_name not in deduplicate_file_names:
-                deduplicate_file_names.add(ingest.file_name)
-                deduplicated_ingests.append(ingest)
-            else:
-                logging.info('Removed duplicate file_name %s from ingests at file_path %s',
-                             ingest.file_name, ingest.file_path)
-
-        final_ingests = [x for x in deduplicated_ingests if x.file_name not in existing_ingest_file_names]
+            if ingest.file_name in batch_file_names:
+                logger.info('Removed duplicate file_name %s from ingests at file_path %s',
+                            ingest.file_name, ingest.file_path)
+            elif ingest.file_name not in existing_file_names:
+                batch_file_names.add(ingest.file_name)
+                final_ingests.append(ingest)
 
         logger.info('Removed %i duplicates of pre-existing ingests.', list_count - len(final_ingests))
 
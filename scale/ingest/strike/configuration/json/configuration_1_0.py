@@ -4,11 +4,11 @@ from __future__ import unicode_literals
 import os
 import re
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from ingest.strike.configuration.exceptions import InvalidStrikeConfiguration
 from storage.models import Workspace
+from util.schema import validate
 
 DEFAULT_VERSION = '1.0'
 
@@ -5,7 +5,6 @@ import logging
 import os
 import re
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from ingest.handlers.file_handler import FileHandler
@@ -15,6 +14,7 @@ from ingest.strike.configuration.strike_configuration import StrikeConfiguration
 from ingest.strike.configuration.json.configuration_1_0 import StrikeConfigurationV1
 from ingest.strike.monitors import factory
 from storage.models import Workspace
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,187 @@
+"""Defines a monitor that processes incoming files in a file system directory as file events occur"""
+from __future__ import unicode_literals
+
+import logging
+import os
+import time
+
+from ingest.strike.monitors.dir_monitor import DirWatcherMonitor
+from ingest.strike.monitors.exceptions import InvalidMonitorConfiguration
+from util.inotify import Inotify, IN_CLOSE_WRITE, IN_IGNORED, IN_ISDIR, IN_MOVED_TO, IN_Q_OVERFLOW
+
+logger = logging.getLogger(__name__)
+
+# The default number of seconds between the sweeps that reconcile the directory and database with the file events
+DEFAULT_RECONCILE_INTERVAL = 300
+
+# The maximum number of seconds to wait for file events before checking whether the monitor has been stopped
+EVENT_WAIT = 5
+
+# The number of seconds between sweeps when file events are not supported, matching the dir-watcher monitor
+POLL_INTERVAL = 60
+
+
+class DirEventMonitor(DirWatcherMonitor):
+    """A monitor that watches a file system directory for incoming files using inotify events. A file is processed when
+    it is closed after writing or moved into the directory, so the cost of monitoring does not grow with the number of
+    files in the directory. The ongoing ingests are cached in memory and a periodic sweep of the whole directory
+    reconciles the cache with the database and catches any files whose events were missed.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        super(DirEventMonitor, self).__init__()
+        self._monitor_type = 'dir-event-watcher'
+        self._reconcile_interval = DEFAULT_RECONCILE_INTERVAL
+        self._ingests = {}  # The ongoing ingests stored by file name
+        self._inotify = None
+        self._watched_dir = None
+
+    def load_configuration(self, configuration):
+        """See :meth:`ingest.strike.monitors.monitor.Monitor.load_configuration`
+        """
+
+        super(DirEventMonitor, self).load_configuration(configuration)
+        self._reconcile_interval = configuration.get('reconcile_interval', DEFAULT_RECONCILE_INTERVAL)
+
+    def run(self):
+        """See :meth:`ingest.strike.monitors.monitor.Monitor.run`
+        """
+
+        try:
+            while self._running:
+                try:
+                    self.reload_configuration()
+                    self._init_dirs()
+                    # Start watching before the sweep so that no files arriving during the sweep are missed
+                    self._watch_dir()
+                    self._mount_and_process_dir()
+                    self._process_events()
+                except:
+                    logger.exception('Strike encountered error')
+                    self._close_watch()
+                    if self._running:
+                        time.sleep(EVENT_WAIT)
+        finally:
+            self._close_watch()
+
+    def validate_configuration(self, configuration):
+        """See :meth:`ingest.strike.monitors.monitor.Monitor.validate_configuration`
+        """
+
+        super(DirEventMonitor, self).validate_configuration(configuration)
+        if 'reconcile_interval' in configuration:
+            reconcile_interval = configuration['reconcile_interval']
+            if not isinstance(reconcile_interval, (int, long)) or isinstance(reconcile_interval, bool):
+                raise InvalidMonitorConfiguration('reconcile_interval must be an integer')
+            if reconcile_interval < 1:
+                raise InvalidMonitorConfiguration('reconcile_interval must be at least 1 second')
+
+    def _close_watch(self):
+        """Stops watching the Strike directory
+        """
+
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+            self._watched_dir = None
+
+    def _get_ingests(self):
+        """See :meth:`ingest.strike.monitors.dir_monitor.DirWatcherMonitor._get_ingests`
+
+        The database is the source of truth, so the in-memory ingests are replaced on every sweep.
+        """
+
+        self._ingests = super(DirEventMonitor, self)._get_ingests()
+        return dict(self._ingests)
+
+    def _process_event_file(self, file_name):
+        """Processes the given file in the Strike directory after a file event
+
+        :param file_name: The name of the file
+        :type file_name: string
+        """
+
+        file_path = os.path.join(self._strike_dir, file_name)
+        if not os.path.isfile(file_path):
+            # A stale event for a file that has since been renamed or removed. A renamed file has its own event and a
+            # removed file is left to the next reconciliation sweep.
+            return
+        ingest = self._ingests.get(self._final_filename(file_name))
+
+        logger.info('Processing %s', file_path)
+        try:
+            self._process_file(file_name, ingest)
+        except Exception:
+            logger.exception('Error processing %s', file_path)
+
+    def _process_events(self):
+        """Processes the file events for the Strike directory until the next reconciliation sweep is due, the monitor is
+        stopped, or file events were lost
+        """
+
+        next_sweep = time.time() + (self._reconcile_interval if self._inotify else POLL_INTERVAL)
+        while self._running:
+            timeout = next_sweep - time.time()
+            if timeout <= 0:
+                return
+            if not self._inotify:
+                time.sleep(min(timeout, EVENT_WAIT))
+                continue
+
+            # Several events for the same file are processed once since processing checks the file's current state
+            file_names = []
+            for event in self._inotify.read_events(min(timeout, EVENT_WAIT)):
+                if event.mask & IN_Q_OVERFLOW:
+                    logger.warning('File events for %s were lost, sweeping the directory', self._strike_dir)
+                    return
+                if event.mask & IN_IGNORED:
+                    logger.warning('%s is no longer being watched, sweeping the directory', self._strike_dir)
+                    self._close_watch()
+                    return
+                if event.mask & IN_ISDIR or not event.name:
+                    continue
+                if event.name not in file_names:
+                    file_names.append(event.name)
+
+            for file_name in file_names:
+                self._process_event_file(file_name)
+
+    def _process_file(self, file_name, ingest):
+        """See :meth:`ingest.strike.monitors.dir_monitor.DirWatcherMonitor._process_file`
+
+        The in-memory ingests are updated with the result.
+        """
+
+        ingest = super(DirEventMonitor, self)._process_file(file_name, ingest)
+        if ingest.status in ['TRANSFERRING', 'TRANSFERRED']:
+            self._ingests[ingest.file_name] = ingest
+        else:
+            self._ingests.pop(ingest.file_name, None)
+        return ingest
+
+    def _watch_dir(self):
+        """Starts watching the Strike directory for file events if it is not already being watched. If file events are
+        not supported, the monitor falls back to sweeping the directory periodically.
+        """
+
+        if self._watched_dir == self._strike_dir:
+            return
+        self._close_watch()
+
+        try:
+            inotify = Inotify()
+        except OSError as ex:
+            logger.warning('File events are not supported (%s), sweeping %s every %i seconds', ex, self._strike_dir,
+                           POLL_INTERVAL)
+            return
+        try:
+            inotify.add_watch(self._strike_dir, IN_CLOSE_WRITE | IN_MOVED_TO)
+        except OSError:
+            inotify.close()
+            raise
+        logger.info('Watching %s for file events', self._strike_dir)
+        self._inotify = inotify
+        self._watched_dir = self._strike_dir
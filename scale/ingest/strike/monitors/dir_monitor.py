@@ -1,9 +1,11 @@
 """Defines a monitor that watches a file system directory for incoming files"""
 from __future__ import unicode_literals
 
+import errno
 import logging
 import math
 import os
+import stat
 import time
 from datetime import datetime
 
@@ -100,6 +102,43 @@ class DirWatcherMonitor(Monitor):
             return file_name.rstrip(self._transfer_suffix)
         return file_name
 
+    def _get_files(self):
+        """Returns the names of the files in the Strike directory ordered ascending by modification time. Each entry is
+        only stat-ed once.
+
+        :returns: The file names
+        :rtype: [string]
+        """
+
+        files = []  # [(Last modified, file name)]
+        for entry in os.listdir(self._strike_dir):
+            try:
+                entry_stat = os.stat(os.path.join(self._strike_dir, entry))
+            except OSError as ex:
+                if ex.errno != errno.ENOENT:
+                    raise
+                continue  # Moved or removed since the directory was listed
+            if stat.S_ISREG(entry_stat.st_mode):
+                files.append((entry_stat.st_mtime, entry))
+        files.sort(key=lambda x: x[0])
+        return [file_name for _, file_name in files]
+
+    def _get_ingests(self):
+        """Returns the current ingests that need to be processed, which are the ingests that are still TRANSFERRING or
+        have TRANSFERRED but failed to update to DEFERRED, ERRORED, or QUEUED
+
+        :returns: The ingests stored by file name
+        :rtype: dict
+        """
+
+        ingests = {}
+        statuses = ['TRANSFERRING', 'TRANSFERRED']
+        ingests_qry = Ingest.objects.filter(status__in=statuses, strike_id=self.strike_id)
+        ingests_qry = ingests_qry.order_by('last_modified')
+        for ingest in ingests_qry.iterator():
+            ingests[ingest.file_name] = ingest
+        return ingests
+
     def _init_dirs(self):
         """ Creates the directories necessary for processing files
         """
@@ -163,22 +202,11 @@ class DirWatcherMonitor(Monitor):
         logger.debug('Processing %s', self._strike_dir)
 
         # Get current files ordered ascending by modification time
-        file_list = []
-        for entry in os.listdir(self._strike_dir):
-            if os.path.isfile(os.path.join(self._strike_dir, entry)):
-                file_list.append(entry)
-        file_list.sort(key=lambda x: os.path.getmtime(os.path.join(self._strike_dir, x)))
+        file_list = self._get_files()
         logger.debug('%i file(s) in %s', len(file_list), self._strike_dir)
 
         # Compile a dict of current ingests that need to be processed
-        # Ingests that are still TRANSFERRING or have TRANSFERRED but failed to update to DEFERRED, ERRORED, or QUEUED
-        # still need to be processed
-        ingests = {}
-        statuses = ['TRANSFERRING', 'TRANSFERRED']
-        ingests_qry = Ingest.objects.filter(status__in=statuses, strike_id=self.strike_id)
-        ingests_qry = ingests_qry.order_by('last_modified')
-        for ingest in ingests_qry.iterator():
-            ingests[ingest.file_name] = ingest
+        ingests = self._get_ingests()
 
         # Process files in Strike dir
         for file_name in file_list:
@@ -215,6 +243,8 @@ class DirWatcherMonitor(Monitor):
         :type file_name: string
         :param ingest: The ingest model for the file (possibly None)
         :type ingest: :class:`ingest.models.Ingest`
+        :returns: The ingest model for the file
+        :rtype: :class:`ingest.models.Ingest`
         """
 
         if file_name is None and ingest is None:
@@ -241,7 +271,7 @@ class DirWatcherMonitor(Monitor):
                 ingest.status = 'ERRORED'
                 ingest.save()
                 logger.info('Ingest for %s marked as ERRORED', final_name)
-                return
+                return ingest
 
             # Update bytes transferred
             size = os.path.getsize(file_path)
@@ -279,9 +309,11 @@ class DirWatcherMonitor(Monitor):
                     ingest.status = 'ERRORED'
                     ingest.save()
                     logger.info('Ingest for %s marked as ERRORED', file_name)
-                    return
+                    return ingest
 
             self._process_ingest(ingest, rel_ingest_path, ingest.file_size)
 
         if ingest.status == 'DEFERRED':
             self._move_deferred_file(ingest)
+
+        return ingest
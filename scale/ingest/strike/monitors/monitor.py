@@ -179,8 +179,7 @@ class Monitor(object):
 
         # Rule match case
         if ingest.is_there_rule_match(self._file_handler, self._workspaces):
-            if not ingest.id:
-                ingest.save()
+            ingest.save()
             Ingest.objects.start_ingest_tasks([ingest], strike_id=self.strike_id)
         # No rule match
         else:
@@ -2,10 +2,11 @@ from __future__ import unicode_literals
 
 import django
 from django.test import TestCase
-from mock import patch
+from mock import MagicMock, patch
 
+import ingest.test.utils as ingest_test_utils
 import storage.test.utils as storage_test_utils
-from ingest.models import Ingest
+from ingest.models import Ingest, Scan
 from ingest.scan.scanners.exceptions import ScannerInterruptRequested
 from ingest.scan.scanners.s3_scanner import S3Scanner
 from storage.brokers.broker import FileDetails
@@ -115,6 +116,57 @@ class TestScanner(TestCase):
         # Verify we returned prior to calling _deduplicate_ingest_list
         self.assertFalse(dedup.called)
 
+    def test_list_partitions(self):
+        """Tests calling S3Scanner._list_partitions() to list partitions concurrently in batches"""
+
+        def list_files(recursive, partition, start_after):
+            return [FileDetails('%s%d' % (partition, i), 0) for i in range(5)
+                    if not start_after or partition + str(i) > start_after]
+
+        scanner = S3Scanner()
+        scanner._batch_size = 2
+        scanner.set_listers(2)
+        scanner._scanned_workspace = MagicMock()
+        scanner._scanned_workspace.list_files.side_effect = list_files
+
+        batches = list(scanner._list_partitions(['', 'a/', 'b/'], {'a/': 'a/2'}))
+
+        files = {}
+        for partition, batched_files, is_done in batches:
+            self.assertLessEqual(len(batched_files), 2)
+            self.assertFalse(partition in files and files[partition][1])  # Nothing after the partition is done
+            listed_files, _ = files.get(partition, ([], False))
+            files[partition] = (listed_files + [f.file for f in batched_files], is_done)
+        self.assertDictEqual(files, {'': (['0', '1', '2', '3', '4'], True), 'a/': (['a/3', 'a/4'], True),
+                                     'b/': (['b/0', 'b/1', 'b/2', 'b/3', 'b/4'], True)})
+
+    def test_list_partitions_error(self):
+        """Tests calling S3Scanner._list_partitions() when listing a partition fails"""
+
+        scanner = S3Scanner()
+        scanner._scanned_workspace = MagicMock()
+        scanner._scanned_workspace.list_files.side_effect = IOError('listing failed')
+
+        with self.assertRaises(IOError):
+            list(scanner._list_partitions(['', 'a/'], {}))
+
+    @patch('ingest.models.IngestManager.start_ingest_tasks')
+    @patch('ingest.scan.scanners.s3_scanner.S3Scanner._deduplicate_ingest_list')
+    @patch('ingest.scan.scanners.s3_scanner.S3Scanner._ingest_file')
+    def test_process_scanned_with_checkpoint(self, ingest_file, dedup, start_ingests):
+        """Tests calling S3Scanner._process_scanned() saves the scan checkpoint"""
+
+        scan = ingest_test_utils.create_scan()
+        scanner = S3Scanner()
+        scanner.scan_id = scan.id
+        checkpoint = {'file_count': 0, 'partitions': {'a/': {'last_file': 'a/test2', 'is_done': False}}}
+        scanner._process_scanned([FileDetails('a/test1', 0), FileDetails('a/test2', 0)], checkpoint)
+
+        scan = Scan.objects.get(pk=scan.id)
+        self.assertEqual(scan.file_count, 2)
+        self.assertDictEqual(scan.checkpoint, {'file_count': 2,
+                                               'partitions': {'a/': {'last_file': 'a/test2', 'is_done': False}}})
+
     @patch('ingest.models.IngestManager.start_ingest_tasks')
     @patch('ingest.scan.scanners.s3_scanner.S3Scanner._deduplicate_ingest_list')
     @patch('ingest.scan.scanners.s3_scanner.S3Scanner._ingest_file')
@@ -133,22 +185,22 @@ class TestScanner(TestCase):
         self.assertTrue(dedup.called)
         self.assertTrue(start_ingests.called)
 
-    @patch('ingest.models.Ingest.objects.get_ingests_by_scan')
-    def test_deduplicate_ingest_list_no_existing(self, ingests_by_scan):
+    @patch('ingest.models.Ingest.objects.get_ingested_file_names')
+    def test_deduplicate_ingest_list_no_existing(self, ingested_file_names):
         """Tests calling S3Scanner._deduplicate_ingest_list() without existing"""
 
-        ingests_by_scan.return_value = []
+        ingested_file_names.return_value = set()
 
         ingests = [Ingest(file_name='test1'), Ingest(file_name='test2')]
         final_ingests = S3Scanner._deduplicate_ingest_list(None, ingests)
 
         self.assertItemsEqual(ingests, final_ingests)
 
-    @patch('ingest.models.Ingest.objects.get_ingests_by_scan')
-    def test_deduplicate_ingest_list_with_duplicate_file_names(self, ingests_by_scan):
+    @patch('ingest.models.Ingest.objects.get_ingested_file_names')
+    def test_deduplicate_ingest_list_with_duplicate_file_names(self, ingested_file_names):
         """Tests calling S3Scanner._deduplicate_ingest_list() with duplicates"""
 
-        ingests_by_scan.return_value = []
+        ingested_file_names.return_value = set()
 
         ingests = [Ingest(file_name='test1'), Ingest(file_name='test1')]
         final_ingests = S3Scanner._deduplicate_ingest_list(None, ingests)
@@ -156,11 +208,11 @@ class TestScanner(TestCase):
         self.assertEquals(len(final_ingests), 1)
         self.assertEquals(final_ingests[0].file_name, 'test1')
 
-    @patch('ingest.models.Ingest.objects.get_ingests_by_scan')
-    def test_deduplicate_ingest_list_with_existing_no_other_dups(self, ingests_by_scan):
+    @patch('ingest.models.Ingest.objects.get_ingested_file_names')
+    def test_deduplicate_ingest_list_with_existing_no_other_dups(self, ingested_file_names):
         """Tests calling S3Scanner._deduplicate_ingest_list() with existing and no other dups"""
 
-        ingests_by_scan.return_value = [Ingest(file_name='test1')]
+        ingested_file_names.return_value = {'test1'}
 
         ingests = [Ingest(file_name='test1'), Ingest(file_name='test2')]
         final_ingests = S3Scanner._deduplicate_ingest_list(None, ingests)
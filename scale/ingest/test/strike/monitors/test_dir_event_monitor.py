@@ -0,0 +1,106 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+import django
+from django.test import TestCase
+from mock import MagicMock, call, patch
+
+from ingest.strike.monitors.dir_event_monitor import DirEventMonitor
+from ingest.strike.monitors.exceptions import InvalidMonitorConfiguration
+from util.inotify import IN_CLOSE_WRITE, IN_ISDIR, IN_MOVED_TO, IN_Q_OVERFLOW, InotifyEvent
+
+
+class TestDirEventMonitor(TestCase):
+    def setUp(self):
+        django.setup()
+
+        self.strike_dir = tempfile.mkdtemp()
+        self.monitor = DirEventMonitor()
+        self.monitor._strike_dir = self.strike_dir
+        self.monitor._transfer_suffix = '_tmp'
+
+    def tearDown(self):
+        shutil.rmtree(self.strike_dir)
+
+    def test_validate_configuration_bad_reconcile_interval(self):
+        """Tests calling DirEventMonitor.validate_configuration() with a bad reconcile_interval"""
+
+        config = {
+            'type': 'dir-event-watcher',
+            'transfer_suffix': '_tmp',
+            'reconcile_interval': '300'
+        }
+        self.assertRaises(InvalidMonitorConfiguration, self.monitor.validate_configuration, config)
+        config['reconcile_interval'] = 0
+        self.assertRaises(InvalidMonitorConfiguration, self.monitor.validate_configuration, config)
+
+    def test_validate_configuration_success(self):
+        """Tests calling DirEventMonitor.validate_configuration() successfully"""
+
+        config = {
+            'type': 'dir-event-watcher',
+            'transfer_suffix': '_tmp',
+            'reconcile_interval': 300
+        }
+        self.monitor.validate_configuration(config)
+        del config['transfer_suffix']
+        self.assertRaises(InvalidMonitorConfiguration, self.monitor.validate_configuration, config)
+
+    @patch('ingest.strike.monitors.dir_event_monitor.DirEventMonitor._process_file')
+    def test_process_events(self, mock_process_file):
+        """Tests that each file with events is processed once, with its in-memory ingest, until events are lost"""
+
+        for file_name in ['a.txt_tmp', 'b.txt']:
+            open(os.path.join(self.strike_dir, file_name), 'w').close()
+        ingest = MagicMock()
+        self.monitor._ingests = {'a.txt': ingest}
+        self.monitor._inotify = MagicMock()
+        self.monitor._inotify.read_events.side_effect = [
+            [InotifyEvent(1, IN_CLOSE_WRITE, 0, 'a.txt_tmp'), InotifyEvent(1, IN_CLOSE_WRITE, 0, 'b.txt'),
+             InotifyEvent(1, IN_CLOSE_WRITE, 0, 'a.txt_tmp'), InotifyEvent(1, IN_MOVED_TO | IN_ISDIR, 0, 'dir'),
+             InotifyEvent(1, IN_CLOSE_WRITE, 0, 'missing.txt')],
+            [InotifyEvent(-1, IN_Q_OVERFLOW, 0, '')]
+        ]
+
+        self.monitor._process_events()
+
+        self.assertListEqual(mock_process_file.call_args_list, [call('a.txt_tmp', ingest), call('b.txt', None)])
+
+    @patch('ingest.strike.monitors.dir_event_monitor.DirEventMonitor._process_file')
+    def test_process_events_renamed_file(self, mock_process_file):
+        """Tests that a stale event for a transferring file that has since been renamed is skipped, so that the renamed
+        file is processed with its in-memory ingest
+        """
+
+        open(os.path.join(self.strike_dir, 'a.txt'), 'w').close()
+        ingest = MagicMock()
+        ingest.status = 'TRANSFERRING'
+        self.monitor._ingests = {'a.txt': ingest}
+        self.monitor._inotify = MagicMock()
+        self.monitor._inotify.read_events.side_effect = [
+            [InotifyEvent(1, IN_CLOSE_WRITE, 0, 'a.txt_tmp'), InotifyEvent(1, IN_MOVED_TO, 0, 'a.txt')],
+            [InotifyEvent(-1, IN_Q_OVERFLOW, 0, '')]
+        ]
+
+        self.monitor._process_events()
+
+        self.assertListEqual(mock_process_file.call_args_list, [call('a.txt', ingest)])
+
+    @patch('ingest.strike.monitors.dir_monitor.DirWatcherMonitor._process_file')
+    def test_process_file_updates_ingests(self, mock_process_file):
+        """Tests that processing a file keeps only the ongoing ingests in memory"""
+
+        ingest = MagicMock()
+        ingest.file_name = 'a.txt'
+        ingest.status = 'TRANSFERRING'
+        mock_process_file.return_value = ingest
+
+        self.monitor._process_file('a.txt_tmp', None)
+        self.assertDictEqual(self.monitor._ingests, {'a.txt': ingest})
+
+        ingest.status = 'QUEUED'
+        self.monitor._process_file('a.txt', ingest)
+        self.assertDictEqual(self.monitor._ingests, {})
@@ -1,10 +1,19 @@
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
+
 import django
 from django.test import TransactionTestCase
+from mock import patch
 
 import ingest.test.utils as ingest_test_utils
 import source.test.utils as source_test_utils
+import storage.test.utils as storage_test_utils
+from ingest.ingest_job import perform_ingest
+from ingest.models import Ingest
+from storage.models import ScaleFile, Workspace
 
 
 class TestPerformIngest(TransactionTestCase):
@@ -20,3 +29,86 @@ class TestPerformIngest(TransactionTestCase):
         """Tests processing a new ingest successfully."""
 
         pass
+
+
+@patch('ingest.ingest_job.IngestTriggerHandler')
+class TestPerformIngestNewWorkspace(TransactionTestCase):
+    fixtures = ['ingest_job_types.json']
+
+    def setUp(self):
+        django.setup()
+
+        self.root_path = tempfile.mkdtemp()
+        self.volume_paths = {}  # {Workspace ID: Volume path}
+
+        self.workspace = storage_test_utils.create_workspace()
+        self.new_workspace = storage_test_utils.create_workspace()
+        self.ingest = ingest_test_utils.create_ingest(file_name='ingest.txt', status='QUEUED',
+                                                      workspace=self.workspace, new_workspace=self.new_workspace)
+        self.ingest.file_path = os.path.join('strike', 'ingest.txt')
+        self.ingest.save()
+        self.ingest.source_file.is_deleted = True
+        self.ingest.source_file.save()
+
+        patcher = patch.object(Workspace, '_get_volume_path', autospec=True,
+                               side_effect=lambda workspace: self.volume_paths[workspace.id])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.root_path)
+
+    def _create_volume(self, workspace, name):
+        """Creates a directory under the test root to be the volume of the given workspace"""
+
+        volume_path = os.path.join(self.root_path, name)
+        if not os.path.exists(volume_path):
+            os.makedirs(volume_path)
+        self.volume_paths[workspace.id] = volume_path
+        return volume_path
+
+    def _create_ingest_file(self, volume_path):
+        """Creates the file being ingested in the given volume"""
+
+        file_path = os.path.join(volume_path, self.ingest.file_path)
+        os.makedirs(os.path.dirname(file_path))
+        with open(file_path, 'w') as ingest_file:
+            ingest_file.write('ingest me')
+        return file_path
+
+    def test_registered_in_place(self, mock_handler):
+        """Tests ingesting a file into a new workspace that already resolves to the same file"""
+
+        volume_path = self._create_volume(self.workspace, 'shared')
+        self._create_volume(self.new_workspace, 'shared')
+        file_path = self._create_ingest_file(volume_path)
+
+        perform_ingest(self.ingest.id)
+
+        # The only copy of the file is registered in the new workspace and is not deleted
+        self.assertEqual(Ingest.objects.get(id=self.ingest.id).status, 'INGESTED')
+        source_file = ScaleFile.objects.get(id=self.ingest.source_file_id)
+        self.assertEqual(source_file.workspace_id, self.new_workspace.id)
+        self.assertEqual(source_file.file_path, self.ingest.file_path)
+        with open(file_path) as ingest_file:
+            self.assertEqual(ingest_file.read(), 'ingest me')
+
+    def test_linked_into_new_directory(self, mock_handler):
+        """Tests ingesting a file into a new workspace on the same file system, which links it and deletes the old
+        path
+        """
+
+        old_file_path = self._create_ingest_file(self._create_volume(self.workspace, 'old'))
+        new_volume_path = self._create_volume(self.new_workspace, 'new')
+        self.ingest.new_file_path = os.path.join('ingested', 'ingest.txt')
+        self.ingest.save()
+
+        perform_ingest(self.ingest.id)
+
+        self.assertEqual(Ingest.objects.get(id=self.ingest.id).status, 'INGESTED')
+        source_file = ScaleFile.objects.get(id=self.ingest.source_file_id)
+        self.assertEqual(source_file.workspace_id, self.new_workspace.id)
+        self.assertEqual(source_file.file_path, self.ingest.new_file_path)
+        self.assertFalse(os.path.exists(old_file_path))
+        with open(os.path.join(new_volume_path, self.ingest.new_file_path)) as ingest_file:
+            self.assertEqual(ingest_file.read(), 'ingest me')
@@ -3,11 +3,14 @@ from __future__ import unicode_literals
 import django
 from django.test import TestCase, TransactionTestCase
 
+import ingest.test.utils as ingest_test_utils
 import storage.test.utils as storage_test_utils
 from ingest.strike.configuration.json.configuration_2_0 import StrikeConfigurationV2
 from ingest.strike.configuration.json.configuration_v6 import StrikeConfigurationV6
 from ingest.models import Ingest, Strike
+from queue.models import Queue
 from storage.exceptions import InvalidDataTypeTag
+from trigger.models import TriggerEvent
 
 
 class TestIngestAddDataTypeTag(TestCase):
@@ -63,6 +66,79 @@ class TestIngestGetDataTypeTags(TestCase):
         self.assertSetEqual(tags, set())
 
 
+class TestIngestManagerGetIngestedFileNames(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.scan = ingest_test_utils.create_scan()
+        ingest_test_utils.create_ingest(file_name='test1.txt', scan=self.scan)
+        ingest_test_utils.create_ingest(file_name='test2.txt', scan=self.scan)
+        ingest_test_utils.create_ingest(file_name='test3.txt', scan=ingest_test_utils.create_scan())
+
+    def test_successfully(self):
+        """Tests calling IngestManager.get_ingested_file_names() successfully"""
+
+        file_names = Ingest.objects.get_ingested_file_names(self.scan.id, {'test1.txt', 'test3.txt', 'test4.txt'})
+        self.assertSetEqual(file_names, {'test1.txt'})
+
+    def test_no_file_names(self):
+        """Tests calling IngestManager.get_ingested_file_names() without any file names"""
+
+        self.assertSetEqual(Ingest.objects.get_ingested_file_names(self.scan.id, set()), set())
+
+
+class TestIngestManagerStartIngestTasks(TestCase):
+    fixtures = ['ingest_job_types.json']
+
+    def setUp(self):
+        django.setup()
+
+        self.workspace_1 = storage_test_utils.create_workspace()
+        self.workspace_2 = storage_test_utils.create_workspace()
+
+    def test_scan_batch(self):
+        """Tests starting the ingest tasks for a batch of scanned files"""
+
+        scan = ingest_test_utils.create_scan()
+        ingest_1 = ingest_test_utils.create_ingest(file_name='file_1.txt', scan=scan, workspace=self.workspace_1)
+        ingest_2 = ingest_test_utils.create_ingest(file_name='file_2.txt', scan=scan, workspace=self.workspace_1,
+                                                   new_workspace=self.workspace_2)
+        ingest_3 = Ingest.objects.get(id=ingest_test_utils.create_ingest(file_name='file_3.txt', scan=scan).id)
+        ingest_3.id = None  # IDs are found by file name when not populated
+
+        Ingest.objects.start_ingest_tasks([ingest_1, ingest_2, ingest_3], scan_id=scan.id)
+
+        ingests = Ingest.objects.filter(scan_id=scan.id).select_related('job').order_by('file_name')
+        self.assertEqual(len(ingests), 3)
+        job_ids = set()
+        for ingest in ingests:
+            self.assertEqual(ingest.status, 'QUEUED')
+            self.assertEqual(ingest.job.status, 'QUEUED')
+            self.assertEqual(ingest.job.input_file_size, 0.0)
+            self.assertEqual(ingest.job.event.type, 'SCAN_TRANSFER')
+            self.assertDictEqual(ingest.job.event.description, {'file_name': ingest.file_name, 'scan_id': scan.id})
+            job_ids.add(ingest.job_id)
+        self.assertEqual(len(job_ids), 3)
+        self.assertEqual(Queue.objects.filter(job_id__in=job_ids).count(), 3)
+        self.assertEqual(ingest_3.job.status, 'QUEUED')
+
+    def test_strike(self):
+        """Tests starting the ingest task for a Strike ingest"""
+
+        strike = ingest_test_utils.create_strike()
+        ingest = ingest_test_utils.create_ingest(strike=strike, workspace=self.workspace_1)
+
+        Ingest.objects.start_ingest_tasks([ingest], strike_id=strike.id)
+
+        ingest = Ingest.objects.select_related('job').get(id=ingest.id)
+        self.assertEqual(ingest.status, 'QUEUED')
+        self.assertEqual(ingest.job.status, 'QUEUED')
+        event = TriggerEvent.objects.get(id=ingest.job.event_id)
+        self.assertEqual(event.type, 'STRIKE_TRANSFER')
+        self.assertDictEqual(event.description, {'file_name': ingest.file_name, 'strike_id': strike.id})
+
+
 class TestStrikeManagerCreateStrikeProcess(TransactionTestCase):
     fixtures = ['ingest_job_types.json']
 
@@ -9,12 +9,12 @@ from job.configuration.data.job_connection import JobConnection
 from job.data.job_connection import SeedJobConnection
 from job.deprecation import JobConnectionSunset
 from job.seed.manifest import SeedManifest
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from recipe.configuration.data.recipe_connection import LegacyRecipeConnection
 from recipe.triggers.configuration.trigger_rule import RecipeTriggerRuleConfiguration
 from storage.models import Workspace
 from trigger.configuration.exceptions import InvalidTriggerRule
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -3,7 +3,6 @@ from __future__ import unicode_literals
 
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from ingest.triggers.ingest_trigger_condition import IngestTriggerCondition
@@ -12,6 +11,7 @@ from recipe.configuration.data.recipe_connection import LegacyRecipeConnection
 from recipe.triggers.configuration.trigger_rule import RecipeTriggerRuleConfiguration
 from storage.models import Workspace
 from trigger.configuration.exceptions import InvalidTriggerRule
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
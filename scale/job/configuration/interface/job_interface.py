@@ -6,7 +6,6 @@ import logging
 import os
 import re
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.configuration.data.exceptions import InvalidData, InvalidConnection, InvalidConfiguration
@@ -19,6 +18,7 @@ from job.configuration.results.results_manifest.results_manifest import ResultsM
 from job.execution.container import SCALE_JOB_EXE_INPUT_PATH, SCALE_JOB_EXE_OUTPUT_PATH
 from product.types import ProductFileMetadata
 from scheduler.vault.manager import secrets_mgr
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -4,12 +4,12 @@ from __future__ import unicode_literals
 import logging
 import os
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.configuration.interface import job_interface_1_0 as previous_interface
 from job.configuration.interface.exceptions import InvalidInterfaceDefinition
 from job.execution.container import SCALE_JOB_EXE_INPUT_PATH
+from util.schema import validate
 
 
 logger = logging.getLogger(__name__)
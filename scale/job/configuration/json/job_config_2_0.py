@@ -5,12 +5,12 @@ import logging
 import os
 from job.deprecation import JobInterfaceSunset
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.configuration.exceptions import InvalidJobConfiguration
 from job.configuration.json import job_config_1_0 as previous_interface
 from job.execution.configuration.volume import Volume, HOST_TYPE, VOLUME_TYPE
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
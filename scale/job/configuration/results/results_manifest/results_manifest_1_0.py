@@ -7,9 +7,9 @@ from __future__ import unicode_literals
 import copy
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from job.configuration.results.exceptions import InvalidResultsManifest, MissingRequiredOutput
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ from job.execution.configuration.volume import Volume, MODE_RO, MODE_RW
 from job.execution.configuration.workspace import TaskWorkspace
 from job.deprecation import JobInterfaceSunset
 from job.execution.container import get_job_exe_input_vol_name, get_job_exe_output_vol_name, get_mount_volume_name, \
-    get_workspace_volume_name, SCALE_JOB_EXE_INPUT_PATH, SCALE_JOB_EXE_OUTPUT_PATH
+    get_workspace_volume_name, SCALE_INPUT_CACHE_PATH, SCALE_JOB_EXE_INPUT_PATH, SCALE_JOB_EXE_OUTPUT_PATH
 from job.execution.tasks.post_task import POST_TASK_COMMAND_ARGS
 from job.execution.tasks.pre_task import PRE_TASK_COMMAND_ARGS
 from job.tasks.pull_task import create_pull_command
@@ -23,6 +23,7 @@ from node.resources.node_resources import NodeResources
 from node.resources.resource import Disk
 from scheduler.vault.manager import secrets_mgr
 from storage.container import get_workspace_volume_path
+from storage.input_cache import INPUT_CACHE_PATH_ENV, INPUT_CACHE_SIZE_LIMIT_ENV
 from storage.models import Workspace
 from util.environment import normalize_env_var_name
 from util.command import environment_expansion
@@ -45,6 +46,8 @@ class QueuedExecutionConfigurator(object):
 
         self._input_files = input_files
         self._cached_workspace_names = {}  # {ID: Name}
+        self._cached_interfaces = {}  # {Job type revision ID: Interface}
+        self._cached_output_workspaces = {}  # {Job type ID: {Output name: Workspace name}}
 
     def configure_queued_job(self, job):
         """Creates and returns an execution configuration for the given queued job. The given job model should have its
@@ -82,17 +85,11 @@ class QueuedExecutionConfigurator(object):
                 config.set_output_workspaces(output_workspaces)
             else:
                 # Set output workspaces from job configuration
-                output_workspaces = {}
-                job_config = job.job_type.get_job_configuration()
-                interface = JobInterfaceSunset.create(job.job_type.manifest, do_validate=False)
-                for output_name in interface.get_file_output_names():
-                    output_workspace = job_config.get_output_workspace(output_name)
-                    if output_workspace:
-                        output_workspaces[output_name] = output_workspace
-                config.set_output_workspaces(output_workspaces)
+                output_workspaces = self._get_output_workspaces(job.job_type)
+                config.set_output_workspaces(dict(output_workspaces))
 
         # Create main task with fields populated from input data
-        args = job.get_job_interface().get_injected_command_args(input_values, env_vars)
+        args = self._get_job_interface(job).get_injected_command_args(input_values, env_vars)
         config.create_tasks(['main'])
         config.add_to_task('main', args=args, env_vars=env_vars, workspaces=task_workspaces)
         return config
@@ -114,6 +111,41 @@ class QueuedExecutionConfigurator(object):
             for workspace in Workspace.objects.filter(id__in=ids).iterator():
                 self._cached_workspace_names[workspace.id] = workspace.name
 
+    def _get_job_interface(self, job):
+        """Returns the interface for the given job, parsing the manifest of each job type revision only once
+
+        :param job: The queued job model
+        :type job: :class:`job.models.Job`
+        :returns: The job interface
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
+        """
+
+        if job.job_type_rev_id not in self._cached_interfaces:
+            self._cached_interfaces[job.job_type_rev_id] = job.get_job_interface()
+        return self._cached_interfaces[job.job_type_rev_id]
+
+    def _get_output_workspaces(self, job_type):
+        """Returns the output workspaces configured for the given job type, parsing the configuration and manifest of
+        each job type only once
+
+        :param job_type: The job type model
+        :type job_type: :class:`job.models.JobType`
+        :returns: A dict where output name maps to workspace name
+        :rtype: dict
+        """
+
+        if job_type.id not in self._cached_output_workspaces:
+            output_workspaces = {}
+            job_config = job_type.get_job_configuration()
+            interface = JobInterfaceSunset.create(job_type.manifest, do_validate=False)
+            for output_name in interface.get_file_output_names():
+                output_workspace = job_config.get_output_workspace(output_name)
+                if output_workspace:
+                    output_workspaces[output_name] = output_workspace
+            self._cached_output_workspaces[job_type.id] = output_workspaces
+        return self._cached_output_workspaces[job_type.id]
+
     def _create_input_file_dict(self, job_data):
         """Creates the dict storing lists of input files by input name
 
@@ -223,6 +255,8 @@ class ScheduledExecutionConfigurator(object):
                                  'SCALE_DB_HOST': db['HOST'], 'SCALE_DB_PORT': db['PORT']}
         if settings.QUEUE_NAME:
             self._system_settings['SCALE_QUEUE_NAME'] = settings.QUEUE_NAME
+        if settings.FILE_CHECKSUM_ALGORITHM:
+            self._system_settings['SCALE_FILE_CHECKSUM_ALGORITHM'] = settings.FILE_CHECKSUM_ALGORITHM
         self._system_settings_hidden = {key: '*****' for key in self._system_settings.keys()}
 
     def configure_scheduled_job(self, job_exe, job_type, interface, system_logging_level):
@@ -447,6 +481,15 @@ class ScheduledExecutionConfigurator(object):
         config.add_to_task('post', mount_volumes={output_mnt_name: output_vol_ro},
                            env_vars={'SYSTEM_LOGGING_LEVEL': system_logging_level})
 
+        # Configure the node's input file cache, shared by the pre-tasks that run on the node
+        if settings.INPUT_CACHE_HOST_PATH:
+            input_cache_vol = Volume('scale_input_cache', SCALE_INPUT_CACHE_PATH, MODE_RW, is_host=True,
+                                     host_path=settings.INPUT_CACHE_HOST_PATH)
+            input_cache_env_vars = {INPUT_CACHE_PATH_ENV: SCALE_INPUT_CACHE_PATH,
+                                    INPUT_CACHE_SIZE_LIMIT_ENV: unicode(settings.INPUT_CACHE_SIZE_LIMIT)}
+            config.add_to_task('pre', mount_volumes={'scale_input_cache': input_cache_vol},
+                               env_vars=input_cache_env_vars)
+
         # Configure output directory
         # TODO: original output dir and command arg replacement can be removed when Scale no longer supports old-style
         # job types
@@ -4,7 +4,6 @@ from __future__ import unicode_literals
 import logging
 from copy import deepcopy
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.execution.configuration.docker_param import DockerParameter
@@ -14,6 +13,7 @@ from job.execution.configuration.volume import Volume, MODE_RO, MODE_RW
 from job.execution.configuration.workspace import TaskWorkspace
 from node.resources.node_resources import NodeResources
 from node.resources.resource import ScalarResource
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -3,10 +3,10 @@ from __future__ import unicode_literals
 
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.execution.configuration.exceptions import InvalidExecutionConfiguration
+from util.schema import validate
 
 
 logger = logging.getLogger(__name__)
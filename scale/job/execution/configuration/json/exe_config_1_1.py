@@ -3,12 +3,12 @@ from __future__ import unicode_literals
 
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.execution.configuration.exceptions import InvalidExecutionConfiguration
 from job.execution.configuration.json import exe_config_1_0 as previous_version
 from job.execution.configuration.volume import MODE_RO, MODE_RW
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +8,7 @@ from storage.container import SCALE_ROOT_PATH
 
 SCALE_JOB_EXE_INPUT_PATH = os.path.join(SCALE_ROOT_PATH, 'input_data')
 SCALE_JOB_EXE_OUTPUT_PATH = os.path.join(SCALE_ROOT_PATH, 'output_data')
+SCALE_INPUT_CACHE_PATH = os.path.join(SCALE_ROOT_PATH, 'input_cache')
 
 
 def get_job_exe_input_vol_name(job_exe):
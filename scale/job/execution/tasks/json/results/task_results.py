@@ -2,11 +2,11 @@
 from __future__ import unicode_literals
 
 from django.utils import dateparse
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.execution.exceptions import InvalidTaskResults
 from util.parse import datetime_to_string
+from util.schema import validate
 
 
 SCHEMA_VERSION = '1.0'
@@ -79,6 +79,24 @@ class PendingJobs(CommandMessage):
 
         return self._count < MAX_NUM
 
+    def can_merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.can_merge`
+        """
+
+        if not isinstance(message, PendingJobs) or message.status_change != self.status_change:
+            return False
+        return len(set(self._pending_job_ids) | set(message._pending_job_ids)) <= MAX_NUM
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        job_ids = set(self._pending_job_ids)
+        for job_id in message._pending_job_ids:
+            if job_id not in job_ids:
+                job_ids.add(job_id)
+                self.add_job(job_id)
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
@@ -10,11 +10,16 @@ from job.models import Job
 from messaging.messages.message import CommandMessage
 
 
+# This is the maximum number of jobs that can fit in one message. This maximum ensures that every message of this type
+# is less than 25 KiB long and that each message can be processed quickly.
+MAX_NUM = 100
+
+
 logger = logging.getLogger(__name__)
 
 
 def create_process_job_input_messages(job_ids):
-    """Creates messages to process the input for the given jobs
+    """Creates messages to process the input for the given jobs, with up to MAX_NUM jobs per message
 
     :param job_ids: The job IDs
     :type job_ids: list
@@ -24,16 +29,18 @@ def create_process_job_input_messages(job_ids):
 
     messages = []
 
+    message = None
     for job_id in job_ids:
-        message = ProcessJobInput()
-        message.job_id = job_id
-        messages.append(message)
+        if not message or not message.can_fit_more():
+            message = ProcessJobInput()
+            messages.append(message)
+        message.add_job(job_id)
 
     return messages
 
 
 class ProcessJobInput(CommandMessage):
-    """Command message that processes the input for a job
+    """Command message that processes the input for one or more jobs
     """
 
     def __init__(self):
@@ -42,13 +49,72 @@ class ProcessJobInput(CommandMessage):
 
         super(ProcessJobInput, self).__init__('process_job_input')
 
-        self.job_id = None
+        self.job_ids = []
+
+    @property
+    def job_id(self):
+        """The ID of the first job to process
+
+        :returns: The job ID, possibly None
+        :rtype: int
+        """
+
+        return self.job_ids[0] if self.job_ids else None
+
+    @job_id.setter
+    def job_id(self, value):
+        """Sets this message to process only the job with the given ID
+
+        :param value: The job ID
+        :type value: int
+        """
+
+        self.job_ids = [value]
+
+    def add_job(self, job_id):
+        """Adds the given job ID to this message
+
+        :param job_id: The job ID
+        :type job_id: int
+        """
+
+        self.job_ids.append(job_id)
+
+    def can_fit_more(self):
+        """Indicates whether more jobs can fit in this message
+
+        :return: True if more jobs can fit, False otherwise
+        :rtype: bool
+        """
+
+        return len(self.job_ids) < MAX_NUM
+
+    def can_merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.can_merge`
+        """
+
+        if not isinstance(message, ProcessJobInput):
+            return False
+        return len(set(self.job_ids) | set(message.job_ids)) <= MAX_NUM
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        job_ids = set(self.job_ids)
+        for job_id in message.job_ids:
+            if job_id not in job_ids:
+                job_ids.add(job_id)
+                self.add_job(job_id)
 
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
 
-        return {'job_id': self.job_id}
+        # A single job uses the original format of this message
+        if len(self.job_ids) == 1:
+            return {'job_id': self.job_id}
+        return {'job_ids': self.job_ids}
 
     @staticmethod
     def from_json(json_dict):
@@ -56,7 +122,11 @@ class ProcessJobInput(CommandMessage):
         """
 
         message = ProcessJobInput()
-        message.job_id = json_dict['job_id']
+        if 'job_ids' in json_dict:
+            for job_id in json_dict['job_ids']:
+                message.add_job(job_id)
+        else:
+            message.job_id = json_dict['job_id']
         return message
 
     def execute(self):
@@ -65,28 +135,33 @@ class ProcessJobInput(CommandMessage):
 
         from queue.messages.queued_jobs import create_queued_jobs_messages, QueuedJob
 
-        job = Job.objects.get_job_with_interfaces(self.job_id)
+        job_ids = []
+        for job in Job.objects.get_jobs_with_interfaces(self.job_ids):
+            if not job.has_input():
+                if not job.recipe:
+                    logger.error('Job %d has no input and is not in a recipe. Message will not re-run.', job.id)
+                    continue
 
-        if not job.has_input():
-            if not job.recipe:
-                logger.error('Job %d has no input and is not in a recipe. Message will not re-run.', self.job_id)
-                return True
+                try:
+                    self._generate_input_data_from_recipe(job)
+                except InvalidData:
+                    logger.exception('Recipe created invalid input data for job %d. Message will not re-run.', job.id)
+                    continue
+            job_ids.append(job.id)
 
-            try:
-                self._generate_input_data_from_recipe(job)
-            except InvalidData:
-                logger.exception('Recipe created invalid input data for job %d. Message will not re-run.', self.job_id)
-                return True
+        if not job_ids:
+            return True
 
-        # Lock job model and process job's input data
+        # Lock job models and process jobs' input data
         with transaction.atomic():
-            job = Job.objects.get_locked_job(self.job_id)
-            Job.objects.process_job_input(job)
-
-        # Create message to queue the job
-        if job.num_exes == 0:
-            logger.info('Processed input for job %d, sending message to queue job', self.job_id)
-            self.new_messages.extend(create_queued_jobs_messages([QueuedJob(job.id, 0)], requeue=False))
+            jobs = Job.objects.get_locked_jobs(job_ids)
+            Job.objects.process_job_inputs(jobs)
+
+        # Create messages to queue the jobs
+        queued_jobs = [QueuedJob(job.id, 0) for job in jobs if job.num_exes == 0]
+        if queued_jobs:
+            logger.info('Processed input for %d job(s), sending messages to queue jobs', len(queued_jobs))
+            self.new_messages.extend(create_queued_jobs_messages(queued_jobs, requeue=False))
 
         return True
 
@@ -139,10 +139,10 @@ class PurgeJobs(CommandMessage):
             RecipeNode.objects.filter(job__in=self._purge_job_ids).delete()
             JobInputFile.objects.filter(job__in=self._purge_job_ids).delete()
             Queue.objects.filter(job__in=self._purge_job_ids).delete()
-            Job.objects.filter(id__in=self._purge_job_ids).delete()
+            _, num_deleted_by_model = Job.objects.filter(id__in=self._purge_job_ids).delete()
 
-            # Update results
-            results.num_jobs_deleted = F('num_jobs_deleted') + len(self._purge_job_ids)
-            results.save()
+            # Update results, counting only the jobs that were actually deleted by this message
+            PurgeResults.objects.filter(trigger_event=self.trigger_id).update(
+                num_jobs_deleted=F('num_jobs_deleted') + num_deleted_by_model.get(Job._meta.label, 0))
 
         return True
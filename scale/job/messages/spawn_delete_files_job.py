@@ -73,7 +73,7 @@ class SpawnDeleteFilesJob(CommandMessage):
         message.job_id = json_dict['job_id']
         message.trigger_id = json_dict['trigger_id']
         message.source_file_id = json_dict['source_file_id']
-        message.purge = bool(json_dict['purge'])
+        message.purge = json_dict['purge'] in (True, 'True')
         return message
 
     def execute(self):
@@ -47,6 +47,7 @@ from storage.models import ScaleFile
 from trigger.configuration.exceptions import InvalidTriggerType, InvalidTriggerMissingConfiguration
 from trigger.models import TriggerRule
 from util import rest as rest_utils
+from util.cache import LruCache
 from util.exceptions import RollbackTransaction
 from vault.secrets_handler import SecretsHandler
 
@@ -69,6 +70,10 @@ MIN_RESOURCE = {
 
 INPUT_FILE_BATCH_SIZE = 500  # Maximum batch size for creating JobInputFile models
 
+# Job type revisions are immutable, so their parsed input and output interfaces are cached by revision ID for the life
+# of the process
+REVISION_INTERFACE_CACHE = LruCache(2000)
+
 # IMPORTANT NOTE: Locking order
 # Always adhere to the following model order for obtaining row locks via select_for_update() in order to prevent
 # deadlocks and ensure query efficiency
@@ -133,7 +138,7 @@ class JobManager(models.Manager):
         return job
 
     def create_job_old(self, job_type, event_id, root_recipe_id=None, recipe_id=None, batch_id=None,
-                       superseded_job=None, delete_superseded=True):
+                       superseded_job=None, delete_superseded=True, job_type_rev=None):
         """Creates a new job for the given type and returns the job model. Optionally a job can be provided that the new
         job is superseding. The returned job model will have not yet been saved in the database.
 
@@ -151,6 +156,8 @@ class JobManager(models.Manager):
         :type superseded_job: :class:`job.models.Job`
         :param delete_superseded: Whether the created job should delete products from the superseded job
         :type delete_superseded: :class:`job.models.Job`
+        :param job_type_rev: The current revision of the job type, retrieved from the database if not provided
+        :type job_type_rev: :class:`job.models.JobTypeRevision`
         :returns: The new job
         :rtype: :class:`job.models.Job`
         """
@@ -158,9 +165,12 @@ class JobManager(models.Manager):
         if not job_type.is_active:
             raise Exception('Job type is no longer active')
 
+        if not job_type_rev:
+            job_type_rev = JobTypeRevision.objects.get_revision(job_type.name, job_type.version, job_type.revision_num)
+
         job = Job()
         job.job_type = job_type
-        job.job_type_rev = JobTypeRevision.objects.get_revision(job_type.name, job_type.version, job_type.revision_num)
+        job.job_type_rev = job_type_rev
         job.event_id = event_id
         job.root_recipe_id = root_recipe_id if root_recipe_id else recipe_id
         job.recipe_id = recipe_id
@@ -657,6 +667,17 @@ class JobManager(models.Manager):
 
         return self.select_related('job_type_rev', 'recipe__recipe_type_rev').get(id=job_id)
 
+    def get_jobs_with_interfaces(self, job_ids):
+        """Gets the job models for the given IDs with related job_type_rev and recipe__recipe_type_rev models
+
+        :param job_ids: The job IDs
+        :type job_ids: list
+        :returns: The job models with related job_type_rev and recipe__recipe_type_rev models
+        :rtype: list
+        """
+
+        return list(self.select_related('job_type_rev', 'recipe__recipe_type_rev').filter(id__in=job_ids))
+
     def get_jobs_with_related(self, job_ids):
         """Gets the job models for the given IDs with related job_type, job_type_rev, and batch models
 
@@ -734,6 +755,38 @@ class JobManager(models.Manager):
         # Process job inputs
         self.process_job_input(job)
 
+    def create_jobs_with_data(self, jobs_with_data):
+        """Validates and populates the job data of the given new job models and then saves the jobs in the database with
+        a single bulk insert. Jobs without input files have their input processed in memory, so only jobs with input
+        files require additional queries. This is the bulk equivalent of saving each job and calling
+        :meth:`job.models.JobManager.populate_job_data`. The jobs should have their related job_type and job_type_rev
+        models populated.
+
+        :param jobs_with_data: A list of tuples of the new (unsaved) job model and its job data
+        :type jobs_with_data: [(:class:`job.models.Job`, :class:`job.configuration.data.job_data.JobData`)]
+        :returns: The saved job models
+        :rtype: [:class:`job.models.Job`]
+        :raises job.configuration.data.exceptions.InvalidData: If the job data is invalid
+        """
+
+        jobs = []
+        for job, data in jobs_with_data:
+            interface = job.get_job_interface()
+            data = JobDataSunset.create(interface, data=data.get_dict())
+            interface.validate_data(data)
+            job.input = data.get_dict()
+            if not job.get_job_data().get_input_file_ids():
+                # Same result as process_job_input() for a job without input files
+                job.input_file_size = 0.0
+            jobs.append(job)
+
+        self.bulk_create(jobs)
+
+        for job in jobs:
+            self.process_job_input(job)  # Skips the jobs that have already had their input processed
+
+        return jobs
+
     def populate_input_files(self, jobs):
         """Populates each of the given jobs with its input file references in a field called "input_files".
 
@@ -774,40 +827,59 @@ class JobManager(models.Manager):
         :type job: :class:`job.models.Job`
         """
 
-        if job.input_file_size is not None:
-            return  # Job has already had its input processed
+        self.process_job_inputs([job])
+
+    def process_job_inputs(self, jobs):
+        """Processes the input data for the given jobs to populate their input file models and input meta-data fields.
+        The same database statements are used for all of the jobs, so the number of queries does not grow with the
+        number of jobs. The caller must have obtained model locks on the given job models.
+
+        :param jobs: The locked job models
+        :type jobs: list
+        """
+
+        # Skip jobs that have already had their input processed
+        jobs = [job for job in jobs if job.input_file_size is None]
+        if not jobs:
+            return
 
         # Create JobInputFile models in batches
-        all_file_ids = set()
+        input_file_ids = {}  # {Job ID: Set of input file IDs}
         input_file_models = []
-        for file_value in job.get_input_data().values.values():
-            if file_value.param_type != FileParameter.PARAM_TYPE:
-                continue
-            for file_id in file_value.file_ids:
-                all_file_ids.add(file_id)
-                job_input_file = JobInputFile()
-                job_input_file.job_id = job.id
-                job_input_file.input_file_id = file_id
-                job_input_file.job_input = file_value.name
-                input_file_models.append(job_input_file)
-                if len(input_file_models) >= INPUT_FILE_BATCH_SIZE:
-                    JobInputFile.objects.bulk_create(input_file_models)
-                    input_file_models = []
+        for job in jobs:
+            job_file_ids = set()
+            input_file_ids[job.id] = job_file_ids
+            for file_value in job.get_input_data().values.values():
+                if file_value.param_type != FileParameter.PARAM_TYPE:
+                    continue
+                for file_id in file_value.file_ids:
+                    job_file_ids.add(file_id)
+                    job_input_file = JobInputFile()
+                    job_input_file.job_id = job.id
+                    job_input_file.input_file_id = file_id
+                    job_input_file.job_input = file_value.name
+                    input_file_models.append(job_input_file)
+                    if len(input_file_models) >= INPUT_FILE_BATCH_SIZE:
+                        JobInputFile.objects.bulk_create(input_file_models)
+                        input_file_models = []
 
         # Finish creating any remaining JobInputFile models
         if input_file_models:
             JobInputFile.objects.bulk_create(input_file_models)
 
-        # Create file ancestry links for job
+        # Create file ancestry links for jobs
         from product.models import FileAncestryLink
-        FileAncestryLink.objects.create_file_ancestry_links(list(all_file_ids), None, job, None)
-
-        if len(all_file_ids) == 0:
-            # If there are no input files, just zero out the file size and skip input meta-data fields
-            self.filter(id=job.id).update(input_file_size=0.0)
+        FileAncestryLink.objects.create_input_file_ancestry_links(input_file_ids)
+
+        # If there are no input files, just zero out the file size and skip input meta-data fields
+        no_input_job_ids = [job_id for job_id, file_ids in input_file_ids.items() if not file_ids]
+        if no_input_job_ids:
+            self.filter(id__in=no_input_job_ids).update(input_file_size=0.0)
+        job_ids = [job_id for job_id, file_ids in input_file_ids.items() if file_ids]
+        if not job_ids:
             return
 
-        # Set input meta-data fields on the job
+        # Set input meta-data fields on the jobs
         # Total input file size is in MiB rounded up to the nearest whole MiB
         qry = 'UPDATE job j SET input_file_size = CEILING(s.total_file_size / (1024.0 * 1024.0)), '
         qry += 'source_started = s.source_started, source_ended = s.source_ended, last_modified = %s, '
@@ -820,10 +892,10 @@ class JobManager(models.Manager):
         qry += 'MAX(f.source_collection) AS source_collection, '
         qry += 'MAX(f.source_task) AS source_task '
         qry += 'FROM scale_file f JOIN job_input_file jif ON f.id = jif.input_file_id '
-        qry += 'WHERE jif.job_id = %s GROUP BY jif.job_id) s '
+        qry += 'WHERE jif.job_id IN %s GROUP BY jif.job_id) s '
         qry += 'WHERE j.id = s.job_id'
         with connection.cursor() as cursor:
-            cursor.execute(qry, [timezone.now(), job.id])
+            cursor.execute(qry, [timezone.now(), tuple(job_ids)])
 
     def process_job_output(self, job_ids, when):
         """Processes the job output for the given job IDs. The caller must have obtained model locks on the job models
@@ -1511,21 +1583,30 @@ class Job(models.Model):
 
         return rest_utils.strip_schema_version(convert_data_to_v6_json(self.get_output_data()).get_dict())
 
-    def get_resources(self):
-        """Returns the resources required for this job
+    def get_resources(self, job_type_resources=None, job_type_interface=None):
+        """Returns the resources required for this job. The resources and interface of the job type may be passed in
+        when they have already been computed for another job of the same type, in which case they are not modified.
 
+        :param job_type_resources: The resources returned by this job's job_type.get_resources(), possibly None
+        :type job_type_resources: :class:`node.resources.node_resources.NodeResources`
+        :param job_type_interface: The interface returned by this job's job_type.get_job_interface(), possibly None
+        :type job_type_interface: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
         :returns: The required resources
         :rtype: :class:`node.resources.node_resources.NodeResources`
         """
 
-        resources = self.job_type.get_resources()
+        if job_type_resources:
+            resources = job_type_resources.copy()
+        else:
+            resources = self.job_type.get_resources()
 
         # Input File Size in MiB
         input_file_size = self.input_file_size
         if not input_file_size:
             input_file_size = 0.0
 
-        interface = self.job_type.get_job_interface()
+        interface = job_type_interface if job_type_interface else self.job_type.get_job_interface()
 
         # TODO: remove legacy code branch in v6
         if not isinstance(interface, SeedManifest):
@@ -4059,7 +4140,50 @@ class JobTypeRevision(models.Model):
     objects = JobTypeRevisionManager()
 
     def get_input_interface(self):
-        """Returns the input interface for this revision
+        """Returns the input interface for this revision. The interface is shared with other callers, so it must not be
+        modified.
+
+        :returns: The input interface for this revision
+        :rtype: :class:`data.interface.interface.Interface`
+        """
+
+        if self.id is None:
+            return self._parse_input_interface()
+        return REVISION_INTERFACE_CACHE.get((self.id, 'input'), self._parse_input_interface)
+
+    def get_output_interface(self):
+        """Returns the output interface for this revision. The interface is shared with other callers, so it must not
+        be modified.
+
+        :returns: The output interface for this revision
+        :rtype: :class:`data.interface.interface.Interface`
+        """
+
+        if self.id is None:
+            return self._parse_output_interface()
+        return REVISION_INTERFACE_CACHE.get((self.id, 'output'), self._parse_output_interface)
+
+    def get_job_interface(self):
+        """Returns the job type interface for this revision
+
+        :returns: The job type interface for this revision
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or `job.seed.manifest.SeedManifest`
+        """
+
+        return JobInterfaceSunset.create(self.manifest)
+
+    def natural_key(self):
+        """Django method to define the natural key for a job type revision as the combination of job type and revision
+        number
+
+        :returns: A tuple representing the natural key
+        :rtype: tuple(string, int)
+        """
+
+        return self.job_type, self.revision_num
+
+    def _parse_input_interface(self):
+        """Parses the input interface for this revision from its manifest
 
         :returns: The input interface for this revision
         :rtype: :class:`data.interface.interface.Interface`
@@ -4082,9 +4206,9 @@ class JobTypeRevision(models.Model):
             elif input_dict['type'] == 'property':
                 interface.add_parameter(JsonParameter(input_dict['name'], 'string', required))
         return interface
-        
-    def get_output_interface(self):
-        """Returns the output interface for this revision
+
+    def _parse_output_interface(self):
+        """Parses the output interface for this revision from its manifest
 
         :returns: The output interface for this revision
         :rtype: :class:`data.interface.interface.Interface`
@@ -4108,25 +4232,6 @@ class JobTypeRevision(models.Model):
                 interface.add_parameter(JsonParameter(output_dict['name'], 'string', required))
         return interface
 
-    def get_job_interface(self):
-        """Returns the job type interface for this revision
-
-        :returns: The job type interface for this revision
-        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or `job.seed.manifest.SeedManifest`
-        """
-
-        return JobInterfaceSunset.create(self.manifest)
-
-    def natural_key(self):
-        """Django method to define the natural key for a job type revision as the combination of job type and revision
-        number
-
-        :returns: A tuple representing the natural key
-        :rtype: tuple(string, int)
-        """
-
-        return self.job_type, self.revision_num
-
     class Meta(object):
         """meta information for the db"""
         db_table = 'job_type_revision'
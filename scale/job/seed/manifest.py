@@ -7,7 +7,6 @@ import json
 import logging
 import os
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from data.interface.json.interface_v6 import InterfaceV6
@@ -21,6 +20,7 @@ from job.seed.types import SeedInputFiles, SeedInputJson, SeedOutputJson, SeedOu
 from scheduler.vault.manager import secrets_mgr
 from storage.media_type import UNKNOWN_MEDIA_TYPE
 from util.environment import normalize_env_var_name
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +49,7 @@ class SeedManifest(object):
 
         try:
             if do_validate:
-                validate(definition, SEED_MANIFEST_SCHEMA)
+                validate(definition, SEED_MANIFEST_SCHEMA, memoize=True)
         except ValidationError as validation_error:
             raise InvalidSeedManifestDefinition('JSON_VALIDATION_ERROR', 'Error validating against schema: %s' % validation_error)
 
@@ -7,10 +7,10 @@ from copy import deepcopy
 
 import os
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.seed.exceptions import InvalidSeedMetadataDefinition
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,7 @@ from job.execution.configuration.configurators import QueuedExecutionConfigurato
 from job.configuration.data.job_data import JobData
 from job.execution.configuration.json.exe_config import ExecutionConfiguration
 from job.execution.container import get_job_exe_input_vol_name, get_job_exe_output_vol_name, get_mount_volume_name, \
-    get_workspace_volume_name, SCALE_JOB_EXE_INPUT_PATH, SCALE_JOB_EXE_OUTPUT_PATH
+    get_workspace_volume_name, SCALE_INPUT_CACHE_PATH, SCALE_JOB_EXE_INPUT_PATH, SCALE_JOB_EXE_OUTPUT_PATH
 from job.execution.tasks.post_task import POST_TASK_COMMAND_ARGS
 from job.execution.tasks.pre_task import PRE_TASK_COMMAND_ARGS
 from job.models import JobTypeRevision
@@ -268,6 +268,8 @@ class TestScheduledExecutionConfigurator(TestCase):
                                                    'PORT': 'TEST_PORT'}}
             mock_settings.BROKER_URL = 'mock://broker-url'
             mock_settings.QUEUE_NAME = ''
+            mock_settings.FILE_CHECKSUM_ALGORITHM = None
+            mock_settings.INPUT_CACHE_HOST_PATH = None
             configurator = ScheduledExecutionConfigurator(workspaces)
             exe_config_with_secrets = configurator.configure_scheduled_job(job_exe_model, ingest_job_type,
                                                                            queue.get_job_interface(), 'INFO')
@@ -378,6 +380,8 @@ class TestScheduledExecutionConfigurator(TestCase):
                                                        'PORT': 'TEST_PORT'}}
                 mock_settings.BROKER_URL = 'mock://broker-url'
                 mock_settings.QUEUE_NAME = ''
+                mock_settings.FILE_CHECKSUM_ALGORITHM = None
+                mock_settings.INPUT_CACHE_HOST_PATH = None
                 mock_secrets_mgr.retrieve_job_type_secrets = MagicMock()
                 mock_secrets_mgr.retrieve_job_type_secrets.return_value = {}
                 configurator = ScheduledExecutionConfigurator({})
@@ -418,6 +422,57 @@ class TestScheduledExecutionConfigurator(TestCase):
             self.assertTrue(found_syslog_address)
             self.assertTrue(found_tag)
 
+    def test_configure_scheduled_job_input_cache(self):
+        """Tests successfully calling configure_scheduled_job() with the node input file cache enabled"""
+
+        framework_id = '1234'
+        node = node_test_utils.create_node()
+        interface_dict = {'version': '1.4', 'command': 'foo', 'command_arguments': '', 'env_vars': [], 'settings': [],
+                          'input_data': [], 'output_data': []}
+        data_dict = {'input_data': [], 'output_data': []}
+        job_type = job_test_utils.create_job_type(interface=interface_dict)
+        from queue.job_exe import QueuedJobExecution
+        from queue.models import Queue
+        job = Queue.objects.queue_new_job(job_type, JobData(data_dict), trigger_test_utils.create_trigger_event())
+        resources = job.get_resources()
+        # Get job info off of the queue
+        queue = Queue.objects.get(job_id=job.id)
+        queued_job_exe = QueuedJobExecution(queue)
+        queued_job_exe.scheduled('agent_1', node.id, resources)
+        job_exe_model = queued_job_exe.create_job_exe_model(framework_id, now())
+
+        # Test method
+        with patch('job.execution.configuration.configurators.settings') as mock_settings:
+            with patch('job.execution.configuration.configurators.secrets_mgr') as mock_secrets_mgr:
+                mock_settings.LOGGING_ADDRESS = None  # Ignore logging settings
+                mock_settings.DATABASES = {'default': {'NAME': 'TEST_NAME', 'USER': 'TEST_USER',
+                                                       'PASSWORD': 'TEST_PASSWORD', 'HOST': 'TEST_HOST',
+                                                       'PORT': 'TEST_PORT'}}
+                mock_settings.BROKER_URL = 'mock://broker-url'
+                mock_settings.QUEUE_NAME = ''
+                mock_settings.FILE_CHECKSUM_ALGORITHM = None
+                mock_settings.INPUT_CACHE_HOST_PATH = '/var/cache/scale'
+                mock_settings.INPUT_CACHE_SIZE_LIMIT = 1024
+                mock_secrets_mgr.retrieve_job_type_secrets = MagicMock()
+                mock_secrets_mgr.retrieve_job_type_secrets.return_value = {}
+                configurator = ScheduledExecutionConfigurator({})
+                exe_config_with_secrets = configurator.configure_scheduled_job(job_exe_model, job_type,
+                                                                               queue.get_job_interface(), 'INFO')
+
+        # Ensure configuration is valid
+        ExecutionConfiguration(exe_config_with_secrets.get_dict())
+
+        # Check that only the pre-task uses the input file cache
+        volume = exe_config_with_secrets.get_volumes('pre')['scale_input_cache']
+        self.assertTrue(volume.is_host)
+        self.assertEqual(volume.host_path, '/var/cache/scale')
+        self.assertEqual(volume.container_path, SCALE_INPUT_CACHE_PATH)
+        self.assertEqual(volume.mode, 'rw')
+        env_vars = exe_config_with_secrets.get_env_vars('pre')
+        self.assertEqual(env_vars['SCALE_INPUT_CACHE_PATH'], SCALE_INPUT_CACHE_PATH)
+        self.assertEqual(env_vars['SCALE_INPUT_CACHE_SIZE_LIMIT'], '1024')
+        self.assertNotIn('scale_input_cache', exe_config_with_secrets.get_volumes('main'))
+
     def test_configure_scheduled_job_regular(self):
         """Tests successfully calling configure_scheduled_job() on a regular (non-system) job"""
 
@@ -479,6 +534,8 @@ class TestScheduledExecutionConfigurator(TestCase):
                                                        'PORT': 'TEST_PORT'}}
                 mock_settings.BROKER_URL = 'mock://broker-url'
                 mock_settings.QUEUE_NAME = ''
+                mock_settings.FILE_CHECKSUM_ALGORITHM = None
+                mock_settings.INPUT_CACHE_HOST_PATH = None
                 mock_secrets_mgr.retrieve_job_type_secrets = MagicMock()
                 mock_secrets_mgr.retrieve_job_type_secrets.return_value = {'s_2': 's_2_secret'}
                 configurator = ScheduledExecutionConfigurator(workspaces)
@@ -755,6 +812,8 @@ class TestScheduledExecutionConfigurator(TestCase):
                                                        'PORT': 'TEST_PORT'}}
                 mock_settings.BROKER_URL = 'mock://broker-url'
                 mock_settings.QUEUE_NAME = ''
+                mock_settings.FILE_CHECKSUM_ALGORITHM = None
+                mock_settings.INPUT_CACHE_HOST_PATH = None
                 mock_secrets_mgr.retrieve_job_type_secrets = MagicMock()
                 mock_secrets_mgr.retrieve_job_type_secrets.return_value = {'s_1': 's_1_secret', 's_2': 's_2_secret'}
                 configurator = ScheduledExecutionConfigurator({})
@@ -884,6 +943,8 @@ class TestScheduledExecutionConfigurator(TestCase):
                                                        'SCALE_DB_PORT': 'TEST_PORT'}}
                 mock_settings.BROKER_URL = 'mock://broker-url'
                 mock_settings.QUEUE_NAME = ''
+                mock_settings.FILE_CHECKSUM_ALGORITHM = None
+                mock_settings.INPUT_CACHE_HOST_PATH = None
                 mock_secrets_mgr.retrieve_job_type_secrets = MagicMock()
                 mock_secrets_mgr.retrieve_job_type_secrets.return_value = {}
             configurator = ScheduledExecutionConfigurator({})
@@ -16,6 +16,28 @@ class TestPendingJobs(TransactionTestCase):
     def setUp(self):
         django.setup()
 
+    def test_merge(self):
+        """Tests merging PendingJobs messages"""
+
+        status_change = now()
+        message_1 = PendingJobs()
+        message_1.status_change = status_change
+        message_1.add_job(1)
+        message_2 = PendingJobs()
+        message_2.status_change = status_change
+        message_2.add_job(1)
+        message_2.add_job(2)
+        message_3 = PendingJobs()
+        message_3.status_change = status_change + datetime.timedelta(seconds=1)
+        message_3.add_job(3)
+
+        # Messages with different status change times are not compatible
+        self.assertTrue(message_1.can_merge(message_2))
+        self.assertFalse(message_1.can_merge(message_3))
+        message_1.merge(message_2)
+        self.assertListEqual(message_1.to_json()['job_ids'], [1, 2])
+        self.assertTrue(message_1.can_fit_more())
+
     def test_json(self):
         """Tests coverting a PendingJobs message to and from JSON"""
 
@@ -6,7 +6,7 @@ from django.test import TransactionTestCase
 
 from data.data.json.data_v6 import DataV6
 from data.interface.interface import Interface
-from job.messages.process_job_input import ProcessJobInput
+from job.messages.process_job_input import create_process_job_input_messages, MAX_NUM, ProcessJobInput
 from job.models import Job, JobInputFile
 from job.test import utils as job_test_utils
 from storage.test import utils as storage_test_utils
@@ -39,6 +39,47 @@ class TestProcessJobInput(TransactionTestCase):
         # Job should have input_file_size set to 0 (no input files)
         self.assertEqual(job.input_file_size, 0.0)
 
+    def test_json_batch(self):
+        """Tests converting a ProcessJobInput message for many jobs to and from JSON"""
+
+        job_1 = job_test_utils.create_job(num_exes=0, status='PENDING', input_file_size=None, input=DataV6().get_dict())
+        job_2 = job_test_utils.create_job(num_exes=0, status='PENDING', input_file_size=None, input=DataV6().get_dict())
+
+        # Create message
+        messages = create_process_job_input_messages([job_1.id, job_2.id])
+        self.assertEqual(len(messages), 1)
+
+        # Convert message to JSON and back, and then execute
+        message_json_dict = messages[0].to_json()
+        new_message = ProcessJobInput.from_json(message_json_dict)
+        self.assertListEqual(new_message.job_ids, [job_1.id, job_2.id])
+        result = new_message.execute()
+
+        self.assertTrue(result)
+        self.assertEqual(len(new_message.new_messages), 1)
+        self.assertEqual(new_message.new_messages[0].type, 'queued_jobs')
+        self.assertEqual(len(new_message.new_messages[0]._queued_jobs), 2)
+        for job in Job.objects.filter(id__in=[job_1.id, job_2.id]):
+            self.assertEqual(job.input_file_size, 0.0)
+
+    def test_merge(self):
+        """Tests merging ProcessJobInput messages"""
+
+        message_1 = ProcessJobInput()
+        message_1.job_id = 1
+        message_2 = ProcessJobInput()
+        message_2.add_job(1)
+        message_2.add_job(2)
+
+        self.assertTrue(message_1.can_merge(message_2))
+        message_1.merge(message_2)
+        self.assertListEqual(message_1.job_ids, [1, 2])
+
+        message_3 = ProcessJobInput()
+        for job_id in range(3, MAX_NUM + 2):
+            message_3.add_job(job_id)
+        self.assertFalse(message_1.can_merge(message_3))
+
     def test_execute_with_data(self):
         """Tests calling ProcessJobInput.execute() successfully when the job already has data populated"""
 
@@ -301,6 +301,46 @@ class TestJobManager(TransactionTestCase):
         self.assertDictEqual(input_files_dict, {'Input 1': {file_6.id}, 'Input 2': {file_7.id, file_8.id, file_9.id,
                                                                                     file_10.id}})
 
+    def test_process_job_inputs(self):
+        """Tests calling JobManager.process_job_inputs() with jobs that have and do not have input files"""
+
+        workspace = storage_test_utils.create_workspace()
+        file_1 = storage_test_utils.create_file(workspace=workspace, file_size=10485760.0)
+        file_2 = storage_test_utils.create_file(workspace=workspace, file_size=104857600.0)
+        interface = {
+            'version': '1.0',
+            'command': 'my_command',
+            'command_arguments': 'args',
+            'input_data': [{
+                'name': 'Input 1',
+                'type': 'file',
+                'media_types': ['text/plain'],
+                'required': False,
+            }]}
+        job_type = job_test_utils.create_job_type(interface=interface)
+
+        data_1 = {'version': '1.0', 'input_data': [{'name': 'Input 1', 'file_id': file_1.id}]}
+        data_2 = {'version': '1.0', 'input_data': [{'name': 'Input 1', 'file_id': file_2.id}]}
+        data_3 = {'version': '1.0', 'input_data': []}
+        job_1 = job_test_utils.create_job(job_type=job_type, num_exes=0, status='PENDING', input_file_size=None,
+                                          input=data_1)
+        job_2 = job_test_utils.create_job(job_type=job_type, num_exes=0, status='PENDING', input_file_size=None,
+                                          input=data_2)
+        job_3 = job_test_utils.create_job(job_type=job_type, num_exes=0, status='PENDING', input_file_size=None,
+                                          input=data_3)
+
+        # Execute method
+        Job.objects.process_job_inputs([job_1, job_2, job_3])
+
+        # Check jobs for expected fields
+        jobs = Job.objects.filter(id__in=[job_1.id, job_2.id, job_3.id]).order_by('id')
+        self.assertEqual(jobs[0].input_file_size, 10.0)
+        self.assertEqual(jobs[1].input_file_size, 100.0)
+        self.assertEqual(jobs[2].input_file_size, 0.0)
+        self.assertEqual(JobInputFile.objects.get(job_id=job_1.id).input_file_id, file_1.id)
+        self.assertEqual(JobInputFile.objects.get(job_id=job_2.id).input_file_id, file_2.id)
+        self.assertFalse(JobInputFile.objects.filter(job_id=job_3.id).exists())
+
     def test_process_job_output(self):
         """Tests calling JobManager.process_job_output()"""
 
@@ -834,6 +874,17 @@ class TestJobTypeRevision(TransactionTestCase):
         self.assertEqual(self.seed_job_type_rev.get_output_interface().parameters['OUTPUT_IMAGE'].PARAM_TYPE, 'file')
         self.assertEqual(self.legacy_job_type_rev.get_output_interface().parameters, {})
 
+    def test_revision_interfaces_cached(self):
+        """Tests that the interfaces of a revision are only parsed once for all models of the revision"""
+
+        input_interface = self.seed_job_type_rev.get_input_interface()
+        output_interface = self.seed_job_type_rev.get_output_interface()
+
+        job_type_rev = JobTypeRevision.objects.get(id=self.seed_job_type_rev.id)
+        self.assertIs(job_type_rev.get_input_interface(), input_interface)
+        self.assertIs(job_type_rev.get_output_interface(), output_interface)
+        self.assertIsNot(input_interface, output_interface)
+
 class TestJobTypeManagerCreateJobType(TransactionTestCase):
 
     def setUp(self):
@@ -11,10 +11,12 @@ from messaging.messages.fail import FailCommandMessage
 """Registers the messaging factory methods."""
 from messaging.messages.factory import add_message_type
 from .backends.factory import add_message_backend
+from .codecs.factory import add_message_codec
 
 from messaging.messages.echo import EchoCommandMessage
 from .backends.amqp import AMQPMessagingBackend
 from .backends.sqs import SQSMessagingBackend
+from .codecs.zlib_json import ZlibJsonCodec
 
 
 class MessagingConfig(AppConfig):
@@ -32,3 +34,6 @@ class MessagingConfig(AppConfig):
         # Register message backends
         add_message_backend(AMQPMessagingBackend)
         add_message_backend(SQSMessagingBackend)
+
+        # Register message codecs
+        add_message_codec(ZlibJsonCodec)
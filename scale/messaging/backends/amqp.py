@@ -6,11 +6,12 @@ from __future__ import unicode_literals
 
 import Queue
 import logging
-from contextlib import closing
+import os
+from contextlib import closing, contextmanager
 
 from kombu import Connection
 
-from messaging.backends.backend import MessagingBackend
+from messaging.backends.backend import MessagingBackend, ReceivedMessage
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +25,20 @@ class AMQPMessagingBackend(MessagingBackend):
         # Message retrieval timeout
         self._timeout = 1
 
+        # Maximum number of broker connections held open by this process, shared by the send and receive paths
+        self._pool_limit = 10
+
+        # Number of attempts to re-establish a dropped connection before giving up
+        self._max_retries = 3
+
+        # Connections are opened lazily on first use and kept open between calls. The pool belongs to the process that
+        # created it, so a forked worker process creates its own pool (see _get_pool()).
+        self._pool = Connection(self._broker_url).Pool(limit=self._pool_limit)
+        self._pool_pid = os.getpid()
+
     def send_messages(self, messages):
         """See :meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
-        with Connection(self._broker_url) as connection:
+        with self._acquire_connection() as connection:
             with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
                 for message in messages:
                     logger.debug('Sending message of type: %s', message['type'])
@@ -34,7 +46,7 @@ class AMQPMessagingBackend(MessagingBackend):
 
     def receive_messages(self, batch_size):
         """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
-        with Connection(self._broker_url) as connection:
+        with self._acquire_connection() as connection:
             with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
                 for _ in range(batch_size):
                     try:
@@ -47,3 +59,56 @@ class AMQPMessagingBackend(MessagingBackend):
                     except Queue.Empty:
                         # We've reached the end of the queue... exit loop
                         break
+
+    @contextmanager
+    def receive_message_batch(self, batch_size):
+        """See :meth:`messaging.backends.backend.MessagingBackend.receive_message_batch`"""
+        with self._acquire_connection() as connection:
+            with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
+                messages = []
+                for _ in range(batch_size):
+                    try:
+                        message = simple_queue.get(timeout=self._timeout)
+                        messages.append(ReceivedMessage(message.payload, message.ack))
+                    except Queue.Empty:
+                        # We've reached the end of the queue... exit loop
+                        break
+
+                yield messages
+
+    @contextmanager
+    def _acquire_connection(self):
+        """Acquires a connection from the pool, checking that it is connected (and reconnecting if needed) before it is
+        used. The connection is always returned to the pool afterwards. If it failed, it is closed first so that the next
+        caller that acquires it gets a fresh connection.
+
+        :returns: The pooled broker connection
+        :rtype: :class:`kombu.Connection`
+        """
+
+        connection = self._get_pool().acquire(block=True)
+        try:
+            connection.ensure_connection(max_retries=self._max_retries)
+            yield connection
+        except connection.recoverable_connection_errors + connection.recoverable_channel_errors:
+            logger.warning('Broker connection failed, it will be re-established on next use')
+            connection.close()
+            raise
+        finally:
+            # Releasing (rather than replacing) a failed connection is required to return its slot to the pool
+            connection.release()
+
+    def _get_pool(self):
+        """Returns the connection pool of the current process, creating a new pool if this process was forked after the
+        pool was created. A forked process inherits the open connections of its parent's pool, which must not be shared
+        with (or closed on) the parent.
+
+        :returns: The connection pool
+        :rtype: :class:`kombu.connection.ConnectionPool`
+        """
+
+        if self._pool_pid != os.getpid():
+            logger.info('Creating broker connection pool for forked process %i', os.getpid())
+            self._pool = Connection(self._broker_url).Pool(limit=self._pool_limit)
+            self._pool_pid = os.getpid()
+        return self._pool
@@ -1,10 +1,15 @@
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 
 from django.conf import settings
 
 from util.broker import BrokerDetails
 
 
+# A message received in a batch, acknowledge is a no-argument callable that acknowledges/deletes the message
+ReceivedMessage = namedtuple('ReceivedMessage', ['payload', 'acknowledge'])
+
+
 class MessagingBackend(object):
     __metaclass__ = ABCMeta
 
@@ -26,8 +31,8 @@ class MessagingBackend(object):
     def send_messages(self, messages):
         """Send a collection of messages to the backend
         
-        Connections are not persisted across send_messages calls. It is recommended that if a large
-        number of messages are to be sent it be done directly in a single function call.
+        Implementations should hold long-lived connections to the broker that are shared with receive_messages and
+        re-established after a failure, rather than connecting on every call.
 
         :param messages: JSON payload of messages
         :type messages: [dict]
@@ -37,8 +42,8 @@ class MessagingBackend(object):
     def receive_messages(self, batch_size):
         """Receive a batch of messages from the backend
 
-        Connections are not persisted across receive_messages calls. It is recommended that if a large
-        number of messages are to be retrieved it be done directly in a single function call.
+        Implementations should hold long-lived connections to the broker that are shared with send_messages and
+        re-established after a failure, rather than connecting on every call.
 
         Implementing function must yield messages from backend. Messages must be
         in dict form. It is also the responsibility of the function to handle a boolean response
@@ -49,3 +54,16 @@ class MessagingBackend(object):
         :return: Yielded list of messages
         :rtype: Generator[dict]
         """
+
+    @abstractmethod
+    def receive_message_batch(self, batch_size):
+        """Receive a batch of messages from the backend all at once, so that they can be processed concurrently and
+        acknowledged afterwards. This is a context manager: the messages must be acknowledged before the context exits,
+        messages that are not acknowledged remain on the queue. Fewer messages than the batch size (including none) are
+        returned if the queue does not have enough messages.
+
+        :param batch_size: Maximum number of messages to receive
+        :type batch_size: int
+        :return: Context manager returning the list of received messages
+        :rtype: :class:`contextlib.GeneratorContextManager`
+        """
@@ -6,14 +6,43 @@ from __future__ import unicode_literals
 
 import json
 import logging
+import os
+import threading
 import uuid
+from contextlib import contextmanager
 
-from messaging.backends.backend import MessagingBackend
+from botocore.exceptions import BotoCoreError, ClientError
+
+from messaging.backends.backend import MessagingBackend, ReceivedMessage
 from util.aws import AWSCredentials, SQSClient
 
+# The longest time in seconds that each SQS request for up to 10 messages waits for messages to arrive
+RECEIVE_WAIT_SECONDS = 20
+# The time in seconds allowed for executing each message of a batch before its SQS visibility timeout expires
+EXECUTE_SECONDS_PER_MESSAGE = 10
+# The maximum visibility timeout in seconds supported by SQS
+MAX_VISIBILITY_TIMEOUT = 43200
+
 logger = logging.getLogger(__name__)
 
 
+def get_batch_visibility_timeout(batch_size):
+    """Returns the SQS visibility timeout for a batch of messages of the given size. Messages of a batch are only
+    deleted once the whole batch has executed, so the timeout must cover the long polls needed to receive the batch and
+    the execution of every message in it. Otherwise, messages from the first polls become visible again and are
+    executed a second time by other message handlers.
+
+    :param batch_size: The maximum number of messages in the batch
+    :type batch_size: int
+    :returns: The visibility timeout in seconds
+    :rtype: int
+    """
+
+    num_polls = (batch_size + 9) // 10
+    timeout = num_polls * RECEIVE_WAIT_SECONDS + batch_size * EXECUTE_SECONDS_PER_MESSAGE
+    return min(timeout, MAX_VISIBILITY_TIMEOUT)
+
+
 class SQSMessagingBackend(MessagingBackend):
     """Backend supporting message passing via Amazon SQS"""
 
@@ -25,22 +54,77 @@ class SQSMessagingBackend(MessagingBackend):
         self._credentials = AWSCredentials(self._broker.get_user_name(),
                                            self._broker.get_password())
 
+        # Each thread lazily creates its own client on first use and reuses it for both the send and receive paths,
+        # since boto3 sessions and resources (and the client's queue cache) must not be shared between threads. A
+        # client is discarded and re-created after a failure or in a forked process.
+        self._local = threading.local()
+
     def send_messages(self, messages):
         """See:meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
-        with SQSClient(self._credentials, self._region_name) as client:
-            encoded_messages = []
-            for message in messages:
-                encoded_messages.append({'Id': str(uuid.uuid4()), 'MessageBody': json.dumps(message)})
+        client = self._get_client()
+        encoded_messages = []
+        for message in messages:
+            encoded_messages.append({'Id': str(uuid.uuid4()), 'MessageBody': json.dumps(message)})
 
+        try:
             client.send_messages(self._queue_name, encoded_messages)
+        except (BotoCoreError, ClientError):
+            self._reset_client(client)
+            raise
 
     def receive_messages(self, batch_size):
         """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
 
-        with SQSClient(self._credentials, self._region_name) as client:
+        client = self._get_client()
+        try:
             for message in client.receive_messages(self._queue_name, batch_size=batch_size):
                 # Accept success back via generator send
                 success = yield json.loads(message.body)
                 if success:
                     message.delete()
+        except (BotoCoreError, ClientError):
+            self._reset_client(client)
+            raise
+
+    @contextmanager
+    def receive_message_batch(self, batch_size):
+        """See :meth:`messaging.backends.backend.MessagingBackend.receive_message_batch`"""
+
+        client = self._get_client()
+        visibility_timeout = get_batch_visibility_timeout(batch_size)
+        try:
+            messages = []
+            for message in client.receive_messages(self._queue_name, batch_size=batch_size,
+                                                   wait_time_seconds=RECEIVE_WAIT_SECONDS,
+                                                   visibility_timeout_seconds=visibility_timeout):
+                messages.append(ReceivedMessage(json.loads(message.body), message.delete))
+
+            yield messages
+        except (BotoCoreError, ClientError):
+            self._reset_client(client)
+            raise
+
+    def _get_client(self):
+        """Returns the SQS client of the current thread, connecting it if needed
+
+        :returns: The SQS client
+        :rtype: :class:`util.aws.SQSClient`
+        """
+
+        client = getattr(self._local, 'client', None)
+        if not client or self._local.pid != os.getpid():
+            client = SQSClient(self._credentials, self._region_name).connect()
+            self._local.client = client
+            self._local.pid = os.getpid()
+        return client
+
+    def _reset_client(self, client):
+        """Discards the given failed client so that a new one is connected on next use
+
+        :param client: The failed SQS client
+        :type client: :class:`util.aws.SQSClient`
+        """
 
+        logger.warning('SQS client failed, it will be re-created on next use')
+        if getattr(self._local, 'client', None) is client:
+            self._local.client = None
@@ -0,0 +1,47 @@
+"""Defines the abstract base class for message codecs"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from abc import ABCMeta, abstractmethod
+
+
+class MessageCodec(object):
+    """Abstract base class for a codec that encodes the body of a command message for transmission across the wire. The
+    name of the codec (including its version) is sent along with each encoded message so that the receiver can decode it
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self, name):
+        """Constructor
+
+        :param name: The unique name of the codec, including the version of its format. Each codec must be registered
+            in apps.py
+        :type name: string
+        """
+
+        self.name = name
+
+    @abstractmethod
+    def encode(self, body):
+        """Encodes the given message body
+
+        :param body: The JSON message body
+        :type body: dict
+        :return: The encoded message body
+        :rtype: string
+        """
+
+    @abstractmethod
+    def decode(self, encoded_body):
+        """Decodes the given encoded message body
+
+        :param encoded_body: The encoded message body
+        :type encoded_body: string
+        :return: The JSON message body
+        :rtype: dict
+
+        :raises :class:`messaging.exceptions.InvalidCommandMessage`: If the encoded body is invalid
+        """
@@ -0,0 +1,106 @@
+"""Defines the factory for encoding and decoding messages with message codecs"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import logging
+
+from django.conf import settings
+
+from messaging.exceptions import InvalidCommandMessage
+
+logger = logging.getLogger(__name__)
+
+# Key within an encoded message that names the codec used to encode the message body. Messages without this key have
+# a plain JSON body.
+CODEC_KEY = 'codec'
+
+_MESSAGE_CODECS = {}
+
+
+def add_message_codec(codec_class):
+    """Registers a codec so it can be used to encode and decode Scale messages
+
+    :param codec_class: The class definition for a codec
+    :type codec_class: class:`messaging.codecs.codec.MessageCodec`
+    """
+
+    codec = codec_class()
+    if codec.name in _MESSAGE_CODECS:
+        logger.warning('Duplicate message codec registration: %s', codec.name)
+    _MESSAGE_CODECS[codec.name] = codec
+
+
+def get_message_codec(codec_name):
+    """Returns the codec with the given name
+
+    :param codec_name: The unique name of a registered message codec
+    :type codec_name: string
+    :returns: The codec
+    :rtype: :class:`messaging.codecs.codec.MessageCodec`
+    """
+
+    if codec_name in _MESSAGE_CODECS:
+        return _MESSAGE_CODECS[codec_name]
+    raise KeyError("'{}' is an invalid message codec".format(codec_name))
+
+
+def encode_message(message_type, body):
+    """Encodes the given message for transmission. The body is encoded with the configured codec (the MESSAGE_CODEC
+    setting) if it is at least MESSAGE_CODEC_MIN_SIZE bytes long as plain JSON and encoding makes it smaller, otherwise
+    it is left as plain JSON.
+
+    :param message_type: The message type
+    :type message_type: string
+    :param body: The JSON message body
+    :type body: dict
+    :returns: The encoded message
+    :rtype: dict
+    """
+
+    message = {'type': message_type, 'body': body}
+
+    codec_name = settings.MESSAGE_CODEC
+    if not codec_name:
+        return message
+
+    plain_size = len(json.dumps(body))
+    if plain_size < settings.MESSAGE_CODEC_MIN_SIZE:
+        return message
+
+    codec = get_message_codec(codec_name)
+    encoded_body = codec.encode(body)
+    if len(encoded_body) < plain_size:
+        message['body'] = encoded_body
+        message[CODEC_KEY] = codec.name
+    return message
+
+
+def decode_message(message):
+    """Decodes the given received message. Messages without a codec have a plain JSON body and are returned unchanged.
+
+    :param message: The received message
+    :type message: dict
+    :returns: The decoded message, with a plain JSON body
+    :rtype: dict
+
+    :raises :class:`messaging.exceptions.InvalidCommandMessage`: If the message codec is unknown or the body is invalid
+    """
+
+    if CODEC_KEY not in message:
+        return message
+
+    try:
+        codec = get_message_codec(message[CODEC_KEY])
+    except KeyError:
+        raise InvalidCommandMessage('Unknown message codec: %s' % message[CODEC_KEY])
+
+    if 'body' not in message:
+        raise InvalidCommandMessage('Missing body in message.')
+
+    decoded_message = dict(message)
+    del decoded_message[CODEC_KEY]
+    decoded_message['body'] = codec.decode(message['body'])
+    return decoded_message
@@ -0,0 +1,36 @@
+"""Defines the codec that compresses message bodies as JSON with zlib"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import base64
+import binascii
+import json
+import zlib
+
+from messaging.codecs.codec import MessageCodec
+from messaging.exceptions import InvalidCommandMessage
+
+
+class ZlibJsonCodec(MessageCodec):
+    """Codec that serializes message bodies as compact JSON, compressed with zlib and base64 encoded so that they can be
+    sent as text by every messaging backend
+    """
+
+    def __init__(self):
+        super(ZlibJsonCodec, self).__init__('zlib-json-v1')
+
+    def encode(self, body):
+        """See :meth:`messaging.codecs.codec.MessageCodec.encode`"""
+
+        serialized_body = json.dumps(body, separators=(',', ':'))
+        return base64.b64encode(zlib.compress(serialized_body.encode('utf-8'))).decode('ascii')
+
+    def decode(self, encoded_body):
+        """See :meth:`messaging.codecs.codec.MessageCodec.decode`"""
+
+        try:
+            return json.loads(zlib.decompress(base64.b64decode(encoded_body)).decode('utf-8'))
+        except (binascii.Error, TypeError, ValueError, zlib.error) as ex:
+            raise InvalidCommandMessage('Invalid %s message body: %s' % (self.name, ex))
@@ -6,14 +6,20 @@ from __future__ import unicode_literals
 
 import logging
 import signal
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
 from error.models import Error
 from messaging.manager import CommandMessageManager
 
 logger = logging.getLogger(__name__)
 
+WORKER_TYPES = ['thread', 'process']
+
 
 class Command(BaseCommand):
     """Command for retrieval and execution of CommandMessages from queue
@@ -21,12 +27,27 @@ class Command(BaseCommand):
 
     help = 'Command for retrieval and execution of CommandMessages from queue'
 
+    def add_arguments(self, parser):
+        parser.add_argument('-w', '--workers', action='store', type=int, default=settings.MESSAGE_HANDLER_WORKERS,
+                            help='The number of workers that process messages concurrently, 0 to process serially')
+        parser.add_argument('-t', '--worker-type', action='store', choices=WORKER_TYPES,
+                            default=settings.MESSAGE_HANDLER_WORKER_TYPE,
+                            help='Whether the concurrent workers are threads or processes')
+        parser.add_argument('-b', '--batch-size', action='store', type=int, default=settings.MESSAGE_HANDLER_BATCH_SIZE,
+                            help='The maximum number of messages received at once when processing concurrently')
+
     def handle(self, *args, **options):
         """See :meth:`django.core.management.base.BaseCommand.handle`.
 
         This method starts the command.
         """
 
+        num_workers = options.get('workers')
+        worker_type = options.get('worker_type')
+        batch_size = options.get('batch_size')
+        if worker_type not in WORKER_TYPES:
+            raise CommandError('Invalid worker type: %s' % worker_type)
+
         logger.info('Command starting: scale_message_handler')
 
         self.running = True
@@ -42,8 +63,19 @@ class Command(BaseCommand):
 
         manager = CommandMessageManager()
 
-        while self.running:
-            manager.receive_messages()
+        if num_workers > 0:
+            logger.info('Processing messages concurrently with %d %s workers in batches of up to %d', num_workers,
+                        worker_type, batch_size)
+            worker_pool = self._create_worker_pool(num_workers, worker_type)
+            try:
+                while self.running:
+                    manager.receive_messages_concurrently(worker_pool, batch_size)
+            finally:
+                worker_pool.close()
+                worker_pool.join()
+        else:
+            while self.running:
+                manager.receive_messages()
 
         logger.info('Command completed: scale_message_handler')
 
@@ -51,3 +83,28 @@ class Command(BaseCommand):
 
         logger.info('Halting queue processing as a result of signal: {}'.format(signum))
         self.running = False
+
+    def _create_worker_pool(self, num_workers, worker_type):
+        """Creates the pool of workers for processing messages concurrently
+
+        :param num_workers: The number of workers
+        :type num_workers: int
+        :param worker_type: The type of worker, either 'thread' or 'process'
+        :type worker_type: string
+        :returns: The worker pool
+        :rtype: :class:`multiprocessing.pool.Pool`
+        """
+
+        if worker_type == 'process':
+            # Forked workers must not share this process's database connections, each opens its own
+            connections.close_all()
+            return Pool(num_workers, initializer=_init_worker_process)
+        return ThreadPool(num_workers)
+
+
+def _init_worker_process():
+    """Initializes a worker process, leaving signal handling (and therefore shutdown) to the parent process
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
@@ -4,12 +4,16 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import logging
+import time
 
 from django.conf import settings
+from django.db import close_old_connections, connection
 from django.utils.timezone import now
 from six import raise_from
 
+from messaging.codecs.factory import decode_message, encode_message
 from messaging.messages.factory import get_message_type
+from messaging.metrics import message_metrics, QueryCounter
 from util.broker import BrokerDetails
 from .backends.factory import get_message_backend
 from .exceptions import CommandMessageExecuteFailure, InvalidCommandMessage
@@ -43,7 +47,7 @@ class CommandMessageManager(object):
         :type command: [`messaging.messages.message.CommandMessage`]
         """
 
-        messages = [{"type": x.type, "body": x.to_json()} for x in commands]
+        messages = [encode_message(x.type, x.to_json()) for x in commands]
         self._backend.send_messages(messages)
 
     def receive_messages(self):
@@ -66,20 +70,121 @@ class CommandMessageManager(object):
             # Seed message to start processing
             message = message_generator.next()
             while True:
-                success = False
-                try:
-                    self._process_message(message)
-                    success = True
-                except InvalidCommandMessage:
-                    logger.exception('Exception encountered processing message payload. Message remains on queue.')
-                except CommandMessageExecuteFailure:
-                    logger.exception('CommandMessage failure during execute call. Message remains on queue.')
+                success = self._try_process_message(message)
 
                 # Feed boolean to backend generator and grab next message
                 message = message_generator.send(success)
         except StopIteration:
             pass
 
+    def receive_messages_concurrently(self, worker_pool, batch_size):
+        """Alternative entry point to message processing that receives a larger batch of messages at once and executes
+        them concurrently using the given worker pool. Messages make no ordering assurances, so every message in the
+        batch is independent. Compatible messages of the same type within the batch are first merged (see
+        :meth:`messaging.messages.message.CommandMessage.can_merge`) so that a single execute() call handles them all.
+        Each message is acknowledged only if it was successfully processed, the same as :meth:`receive_messages`.
+
+        Each worker thread/process uses its own database connection. A process pool must be created after closing the
+        database connections of this process so that none are shared with the workers.
+
+        :param worker_pool: The pool of workers that will process the messages
+        :type worker_pool: :class:`multiprocessing.pool.Pool`
+        :param batch_size: The maximum number of messages to receive and process at once
+        :type batch_size: int
+        :returns: The number of messages that were processed
+        :rtype: int
+        """
+
+        with self._backend.receive_message_batch(batch_size) as received_messages:
+            if not received_messages:
+                return 0
+
+            start_time = time.time()
+            payloads = [received_message.payload for received_message in received_messages]
+            merged_payloads, merged_indexes = self._merge_messages(payloads)
+            merged_results = worker_pool.map(_process_message_in_worker, merged_payloads, chunksize=1)
+            duration = time.time() - start_time
+
+            # A merged message succeeds or fails as a whole, messages that could not be extracted are not acknowledged
+            results = [False] * len(received_messages)
+            for indexes, success in zip(merged_indexes, merged_results):
+                for index in indexes:
+                    results[index] = success
+            for received_message, success in zip(received_messages, results):
+                if success:
+                    received_message.acknowledge()
+
+        if len(merged_payloads) < len(payloads):
+            logger.info('Merged %d message(s) into %d', len(payloads), len(merged_payloads))
+        self._log_throughput(payloads, results, duration)
+        return len(received_messages)
+
+    def _merge_messages(self, payloads):
+        """Merges the compatible messages within the given message payloads
+
+        :param payloads: The message payloads
+        :type payloads: [dict]
+        :returns: A tuple of the list of merged message payloads to process and a list with the indexes (within the given
+            payloads) of the messages that each merged message includes
+        :rtype: tuple
+        """
+
+        merged = []  # [(Command, [Message indexes])]
+        merge_candidates = {}  # {Message type: [(Command, [Message indexes])]}
+        for index, payload in enumerate(payloads):
+            try:
+                command = self._extract_command(payload)
+            except Exception:
+                logger.exception('Exception encountered processing message payload. Message remains on queue.')
+                continue
+
+            for candidate in merge_candidates.get(command.type, []):
+                if candidate[0].can_merge(command):
+                    candidate[0].merge(command)
+                    candidate[1].append(index)
+                    break
+            else:
+                candidate = (command, [index])
+                merged.append(candidate)
+                merge_candidates.setdefault(command.type, []).append(candidate)
+
+        merged_payloads = []
+        merged_indexes = []
+        for command, indexes in merged:
+            if len(indexes) == 1:
+                merged_payloads.append(payloads[indexes[0]])
+            else:
+                merged_payloads.append({'type': command.type, 'body': command.to_json()})
+            merged_indexes.append(indexes)
+        return merged_payloads, merged_indexes
+
+    @staticmethod
+    def _log_throughput(payloads, results, duration):
+        """Logs the per-type throughput of a batch of concurrently processed messages
+
+        :param payloads: The message payloads
+        :type payloads: [dict]
+        :param results: The processing success of each message
+        :type results: [bool]
+        :param duration: The number of seconds it took to process the batch
+        :type duration: float
+        """
+
+        counts = {}  # {Message type: [Number processed, number successful]}
+        for payload, success in zip(payloads, results):
+            message_type = payload.get('type') if isinstance(payload, dict) else None
+            if message_type not in counts:
+                counts[message_type] = [0, 0]
+            counts[message_type][0] += 1
+            if success:
+                counts[message_type][1] += 1
+
+        logger.info('Processed %d message(s) in %.3f seconds', len(payloads), duration)
+        for message_type in sorted(counts):
+            num_processed, num_successful = counts[message_type]
+            logger.info('Message type %s: %d processed, %d successful, %.1f messages/second', message_type,
+                        num_processed, num_successful, num_processed / duration if duration else 0.0)
+
     @staticmethod
     def _extract_command(message):
         """Reconstitute a CommandMessage from incoming raw message payload
@@ -92,6 +197,8 @@ class CommandMessageManager(object):
         if 'type' not in message:
             raise InvalidCommandMessage('Invalid message missing type: %s', message)
 
+        message = decode_message(message)
+
         if 'body' not in message:
             raise InvalidCommandMessage('Missing body in message.')
 
@@ -119,14 +226,20 @@ class CommandMessageManager(object):
         command = self._extract_command(message)
         start_time = now()
         logger.info('Processing message of type %s', command.type)
-        try:
-            success = command.execute()
-        except Exception:
-            logger.exception('Message threw exception')
-            success = False
+        with QueryCounter(connection) as query_counter:
+            try:
+                success = command.execute()
+            except Exception:
+                logger.exception('Message threw exception')
+                success = False
         duration = now() - start_time
         logger.info('Message execution took %.3f seconds', duration.total_seconds())
 
+        num_downstream = len(command.new_messages) if success else 0
+        message_metrics.add_message(command.type, success, duration.total_seconds(), query_counter.count,
+                                    num_downstream)
+        message_metrics.flush_if_due()
+
         if not success:
             raise CommandMessageExecuteFailure
 
@@ -135,6 +248,24 @@ class CommandMessageManager(object):
 
         logger.info('Successfully completed message of type %s', command.type)
 
+    def _try_process_message(self, message):
+        """Processes the given message, logging any failure
+
+        :param message: message payload
+        :type message: dict
+        :returns: True if the message was processed successfully and should be acknowledged, False otherwise
+        :rtype: bool
+        """
+
+        try:
+            self._process_message(message)
+            return True
+        except InvalidCommandMessage:
+            logger.exception('Exception encountered processing message payload. Message remains on queue.')
+        except CommandMessageExecuteFailure:
+            logger.exception('CommandMessage failure during execute call. Message remains on queue.')
+        return False
+
     def _send_downstream(self, messages):
         """Send any required downstream messages following a CommandMessage.execute
         :param messages: List of CommandMessage instances to send downstream
@@ -143,3 +274,24 @@ class CommandMessageManager(object):
         if len(messages):
             logger.info('Sending %i downstream CommandMessage(s).', len(messages))
             self.send_messages(messages)
+
+
+def _process_message_in_worker(message):
+    """Processes the given message within a worker thread/process of a concurrent message handler, see
+    :meth:`messaging.manager.CommandMessageManager.receive_messages_concurrently`
+
+    :param message: message payload
+    :type message: dict
+    :returns: True if the message was processed successfully and should be acknowledged, False otherwise
+    :rtype: bool
+    """
+
+    # Each worker uses its own database connection, so discard it if it has become unusable
+    close_old_connections()
+    try:
+        return CommandMessageManager()._try_process_message(message)
+    except Exception:
+        logger.exception('Unexpected error processing message. Message remains on queue.')
+        return False
+    finally:
+        close_old_connections()
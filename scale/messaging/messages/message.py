@@ -17,6 +17,30 @@ class CommandMessage(object):
         # Unique type of CommandMessage, each type must be registered in apps.py
         self.type = message_type
 
+    def can_merge(self, message):
+        """Indicates whether the given message can be merged into this one, so that a single execute() call performs the
+        work of both. Message types that carry lists of IDs and are idempotent should override this (along with
+        :meth:`merge`) to return True when the given message is of the same type and compatible, and the merged message
+        would not exceed the maximum size for the message type. The default implementation returns False.
+
+        :param message: The message to merge into this one
+        :type message: :class:`messaging.messages.message.CommandMessage`
+        :return: True if the given message can be merged into this one, False otherwise
+        :rtype: bool
+        """
+
+        return False
+
+    def merge(self, message):
+        """Merges the given message into this one. This is only called if :meth:`can_merge` returned True for the given
+        message.
+
+        :param message: The message to merge into this one
+        :type message: :class:`messaging.messages.message.CommandMessage`
+        """
+
+        raise NotImplementedError('%s messages do not support merging' % self.type)
+
     @abstractmethod
     def to_json(self):
         """JSON Serializer for CommandMessage subclasses. Must be implemented in all subclasses.
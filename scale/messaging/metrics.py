@@ -0,0 +1,320 @@
+"""Defines the classes that collect and summarize message handler throughput and latency metrics"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import datetime
+import logging
+import os
+import socket
+import threading
+
+from django.db.backends.utils import CursorWrapper
+from django.utils.timezone import now
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the execution latency histogram buckets, the last bucket holds everything slower
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0]
+
+# How often each message handler process writes its metrics to the database
+FLUSH_PERIOD = datetime.timedelta(seconds=30)
+
+# Message handlers that have not written their metrics within this period are no longer running
+STALE_PERIOD = datetime.timedelta(minutes=5)
+
+PERCENTILES = [50, 95, 99]
+
+
+class MessageTypeMetrics(object):
+    """This class holds the cumulative metrics for processing a single type of message. Latencies are kept as histogram
+    bucket counts so that the metrics of many message handlers can be combined.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self.count = 0
+        self.failures = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_duration = 0.0
+        self.total_queries = 0
+        self.total_downstream = 0
+
+    def add_message(self, success, duration, num_queries, num_downstream):
+        """Adds a processed message to the metrics
+
+        :param success: Whether the message was processed successfully
+        :type success: bool
+        :param duration: The number of seconds it took to execute the message
+        :type duration: float
+        :param num_queries: The number of database queries that the message performed
+        :type num_queries: int
+        :param num_downstream: The number of downstream messages that the message sent
+        :type num_downstream: int
+        """
+
+        self.count += 1
+        if not success:
+            self.failures += 1
+        self.latency_counts[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.total_duration += duration
+        self.total_queries += num_queries
+        self.total_downstream += num_downstream
+
+    def add_metrics(self, metrics):
+        """Combines the given metrics into these metrics
+
+        :param metrics: The metrics to combine
+        :type metrics: :class:`messaging.metrics.MessageTypeMetrics`
+        """
+
+        self.count += metrics.count
+        self.failures += metrics.failures
+        for i, latency_count in enumerate(metrics.latency_counts):
+            self.latency_counts[i] += latency_count
+        self.total_duration += metrics.total_duration
+        self.total_queries += metrics.total_queries
+        self.total_downstream += metrics.total_downstream
+
+    def get_percentile(self, percentile):
+        """Returns the given execution latency percentile, as the upper bound of the histogram bucket that contains it
+
+        :param percentile: The percentile, between 0 and 100
+        :type percentile: float
+        :returns: The latency in seconds, possibly None if there are no messages or it is above the last bucket
+        :rtype: float
+        """
+
+        if not self.count:
+            return None
+
+        rank = self.count * percentile / 100.0
+        running_count = 0
+        for i, latency_count in enumerate(self.latency_counts):
+            running_count += latency_count
+            if running_count >= rank:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else None
+        return None  # pragma: no cover
+
+    def generate_summary_json(self):
+        """Generates the summary JSON for these metrics
+
+        :returns: The summary JSON
+        :rtype: dict
+        """
+
+        summary_dict = {'count': self.count, 'failures': self.failures}
+        for percentile in PERCENTILES:
+            summary_dict['p%d_seconds' % percentile] = self.get_percentile(percentile)
+        if self.count:
+            summary_dict['avg_seconds'] = round(self.total_duration / self.count, 6)
+            summary_dict['avg_queries'] = round(self.total_queries / self.count, 3)
+            summary_dict['avg_downstream_messages'] = round(self.total_downstream / self.count, 3)
+        return summary_dict
+
+    def to_json(self):
+        """Returns the raw JSON for these metrics
+
+        :returns: The raw JSON
+        :rtype: dict
+        """
+
+        return {'count': self.count, 'failures': self.failures, 'latency_counts': self.latency_counts,
+                'total_duration': self.total_duration, 'total_queries': self.total_queries,
+                'total_downstream': self.total_downstream}
+
+    @staticmethod
+    def from_json(json_dict):
+        """Creates metrics from the given raw JSON
+
+        :param json_dict: The raw JSON
+        :type json_dict: dict
+        :returns: The metrics
+        :rtype: :class:`messaging.metrics.MessageTypeMetrics`
+        """
+
+        metrics = MessageTypeMetrics()
+        metrics.count = json_dict['count']
+        metrics.failures = json_dict['failures']
+        latency_counts = json_dict['latency_counts']
+        if len(latency_counts) == len(metrics.latency_counts):
+            metrics.latency_counts = list(latency_counts)
+        else:
+            # Bucket boundaries have changed, so only the total count can be kept
+            metrics.latency_counts[-1] = metrics.count
+        metrics.total_duration = json_dict['total_duration']
+        metrics.total_queries = json_dict['total_queries']
+        metrics.total_downstream = json_dict['total_downstream']
+        return metrics
+
+
+class MessageMetricsCollector(object):
+    """This class collects the message metrics of a single message handler process and periodically writes them to the
+    database. This class is thread-safe.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._lock = threading.Lock()
+        self._metrics = {}  # {Message type: MessageTypeMetrics}
+        self._last_flush = None
+        self._pid = None
+
+    def add_message(self, message_type, success, duration, num_queries, num_downstream):
+        """Adds a processed message to the metrics, see :meth:`messaging.metrics.MessageTypeMetrics.add_message`
+
+        :param message_type: The message type
+        :type message_type: string
+        """
+
+        with self._lock:
+            self._reset_if_forked()
+            if message_type not in self._metrics:
+                self._metrics[message_type] = MessageTypeMetrics()
+            self._metrics[message_type].add_message(success, duration, num_queries, num_downstream)
+
+    def flush_if_due(self, when=None):
+        """Writes these metrics to the database if they have not been written within the flush period
+
+        :param when: The current time, defaults to now
+        :type when: :class:`datetime.datetime`
+        """
+
+        when = when if when else now()
+        with self._lock:
+            self._reset_if_forked()
+            if self._last_flush and when < self._last_flush + FLUSH_PERIOD:
+                return
+            self._last_flush = when
+            metrics_json = {message_type: metrics.to_json() for message_type, metrics in self._metrics.items()}
+
+        from messaging.models import MessageHandlerStatus
+        try:
+            MessageHandlerStatus.objects.update_metrics(self._get_handler_id(), metrics_json, when)
+        except Exception:
+            logger.exception('Failed to write message handler metrics')
+
+    def _get_handler_id(self):
+        """Returns the unique ID of this message handler process
+
+        :returns: The handler ID
+        :rtype: string
+        """
+
+        return '%s:%d' % (socket.gethostname(), os.getpid())
+
+    def _reset_if_forked(self):
+        """Resets the metrics if this is a new (forked) worker process, so that each process reports only its own
+        messages. Caller must hold the lock.
+        """
+
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._metrics = {}
+            self._last_flush = None
+
+
+class QueryCounter(object):
+    """This class is a context manager that counts the queries executed on a database connection. Unlike Django's
+    CaptureQueriesContext, it does not turn on query logging; it only increments a counter for each query.
+    """
+
+    def __init__(self, connection):
+        """Constructor
+
+        :param connection: The database connection
+        :type connection: :class:`django.db.backends.base.base.BaseDatabaseWrapper`
+        """
+
+        self.count = 0
+        self._connection = connection
+
+    def __enter__(self):
+        """Wraps every cursor that the connection creates so that its queries are counted
+        """
+
+        self.count = 0
+        for factory_name in ('make_cursor', 'make_debug_cursor'):
+            factory = getattr(self._connection, factory_name)
+            setattr(self._connection, factory_name, self._create_counting_factory(factory))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Restores the cursor factories of the connection
+        """
+
+        del self._connection.make_cursor
+        del self._connection.make_debug_cursor
+
+    def _create_counting_factory(self, factory):
+        """Returns a cursor factory that wraps the cursors created by the given factory so that they count queries
+
+        :param factory: The original cursor factory of the connection
+        :type factory: function
+        :returns: The counting cursor factory
+        :rtype: function
+        """
+
+        def make_counting_cursor(cursor):
+            return QueryCountingCursorWrapper(factory(cursor), self)
+        return make_counting_cursor
+
+
+class QueryCountingCursorWrapper(CursorWrapper):
+    """This class wraps a database cursor and increments the count of a :class:`QueryCounter` for each query that the
+    cursor executes
+    """
+
+    def __init__(self, cursor, counter):
+        """Constructor
+
+        :param cursor: The cursor to wrap
+        :type cursor: :class:`django.db.backends.utils.CursorWrapper`
+        :param counter: The query counter
+        :type counter: :class:`QueryCounter`
+        """
+
+        super(QueryCountingCursorWrapper, self).__init__(cursor, cursor.db)
+        self._counter = counter
+
+    def execute(self, sql, params=None):
+        """See :meth:`django.db.backends.utils.CursorWrapper.execute`
+        """
+
+        self._counter.count += 1
+        return self.cursor.execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        """See :meth:`django.db.backends.utils.CursorWrapper.executemany`
+        """
+
+        self._counter.count += 1
+        return self.cursor.executemany(sql, param_list)
+
+
+def generate_metrics_json(metrics_dicts):
+    """Combines the raw metrics JSON of message handlers into summary JSON per message type
+
+    :param metrics_dicts: The raw metrics JSON of each message handler
+    :type metrics_dicts: [dict]
+    :returns: The summary JSON, keyed by message type
+    :rtype: dict
+    """
+
+    combined_metrics = {}
+    for metrics_dict in metrics_dicts:
+        for message_type, metrics_json in metrics_dict.items():
+            if message_type not in combined_metrics:
+                combined_metrics[message_type] = MessageTypeMetrics()
+            combined_metrics[message_type].add_metrics(MessageTypeMetrics.from_json(metrics_json))
+
+    return {message_type: metrics.generate_summary_json() for message_type, metrics in combined_metrics.items()}
+
+
+message_metrics = MessageMetricsCollector()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageHandlerStatus',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('handler_id', models.CharField(max_length=250, unique=True)),
+                ('metrics', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ('last_updated', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'message_handler_status',
+            },
+        ),
+    ]
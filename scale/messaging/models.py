@@ -0,0 +1,60 @@
+"""Defines the database models for the messaging system"""
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields
+from django.db import models
+
+from messaging.metrics import STALE_PERIOD, generate_metrics_json
+
+
+class MessageHandlerStatusManager(models.Manager):
+    """Provides additional methods for handling message handler status
+    """
+
+    def get_metrics_json(self, when):
+        """Returns the summary metrics JSON, per message type, of all message handlers that are currently running
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        :returns: The dict with the number of running message handlers and the summary metrics per message type
+        :rtype: dict
+        """
+
+        metrics_dicts = list(self.filter(last_updated__gte=when - STALE_PERIOD).values_list('metrics', flat=True))
+        return {'num_handlers': len(metrics_dicts), 'message_types': generate_metrics_json(metrics_dicts)}
+
+    def update_metrics(self, handler_id, metrics, when):
+        """Updates the metrics of the given message handler and removes message handlers that have stopped running
+
+        :param handler_id: The unique ID of the message handler process
+        :type handler_id: string
+        :param metrics: The raw metrics JSON of the message handler
+        :type metrics: dict
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        self.update_or_create(handler_id=handler_id, defaults={'metrics': metrics, 'last_updated': when})
+        self.filter(last_updated__lt=when - STALE_PERIOD).delete()
+
+
+class MessageHandlerStatus(models.Model):
+    """Represents the cumulative metrics of a running message handler process
+
+    :keyword handler_id: The unique ID of the message handler process
+    :type handler_id: :class:`django.db.models.CharField`
+    :keyword metrics: The raw metrics JSON of the message handler, keyed by message type
+    :type metrics: :class:`django.contrib.postgres.fields.JSONField`
+    :keyword last_updated: When the message handler last wrote its metrics
+    :type last_updated: :class:`django.db.models.DateTimeField`
+    """
+
+    handler_id = models.CharField(max_length=250, unique=True)
+    metrics = django.contrib.postgres.fields.JSONField(default=dict)
+    last_updated = models.DateTimeField(db_index=True)
+
+    objects = MessageHandlerStatusManager()
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'message_handler_status'
@@ -14,13 +14,15 @@ class TestMessagingConfig(TestCase):
     def setUp(self):
         django.setup()
 
+    @patch('messaging.apps.add_message_codec')
     @patch('messaging.apps.add_message_backend')
     @patch('messaging.apps.add_message_type')
-    def test_ready(self, add_message_type, add_message_backends):
+    def test_ready(self, add_message_type, add_message_backends, add_message_codec):
         """Validate backends and message type registration has been done.
 
         :param add_message_type: mock for adding message types
         :param add_message_backends: mock for adding messaging backends
+        :param add_message_codec: mock for adding message codecs
         """
 
         # Mock out init so we don't have to worry about AppConfig init complexity
@@ -30,3 +32,4 @@ class TestMessagingConfig(TestCase):
 
         self.assertTrue(add_message_type.called)
         self.assertTrue(add_message_backends.called)
+        self.assertTrue(add_message_codec.called)
@@ -5,17 +5,20 @@ from __future__ import unicode_literals
 
 import Queue
 import json
+import threading
 
 import django
+from botocore.exceptions import BotoCoreError
 from django.conf import settings
 from django.test import TestCase
+from kombu import Connection
 from mock import MagicMock
 from mock import call, patch
 
 import messaging.backends.factory as backend_factory
 from messaging.backends.amqp import AMQPMessagingBackend
 from messaging.backends.backend import MessagingBackend
-from messaging.backends.sqs import SQSMessagingBackend
+from messaging.backends.sqs import MAX_VISIBILITY_TIMEOUT, SQSMessagingBackend
 
 
 # Dummy class for ABC __init__ testing
@@ -29,6 +32,9 @@ class DummyBackend(MessagingBackend):
     def receive_messages(self, batch_size):  # pragma: no cover
         pass
 
+    def receive_message_batch(self, batch_size):  # pragma: no cover
+        pass
+
 
 class TestAMQPBackend(TestCase):
     def setUp(self):
@@ -49,8 +55,8 @@ class TestAMQPBackend(TestCase):
         backend = AMQPMessagingBackend()
         backend.send_messages(messages)
 
-        # Deep diving through context managers to assert put call
-        put = connection.return_value.__enter__.return_value.SimpleQueue.return_value.put
+        # Deep diving through the connection pool to assert put call
+        put = connection.return_value.Pool.return_value.acquire.return_value.SimpleQueue.return_value.put
         put.assert_called_with(messages[0])
         self.assertEquals(put.call_count, 1)
 
@@ -66,8 +72,8 @@ class TestAMQPBackend(TestCase):
         backend = AMQPMessagingBackend()
         backend.send_messages(messages)
 
-        # Deep diving through context managers to assert put call
-        put = connection.return_value.__enter__.return_value.SimpleQueue.return_value.put
+        # Deep diving through the connection pool to assert put call
+        put = connection.return_value.Pool.return_value.acquire.return_value.SimpleQueue.return_value.put
         put.assert_has_calls([call(x) for x in messages])
         self.assertEquals(put.call_count, 2)
 
@@ -79,8 +85,8 @@ class TestAMQPBackend(TestCase):
         message2 = MagicMock(payload={'type': 'echo', 'body': '2'})
         get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
 
-        # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        # Deep diving through the connection pool to patch get call
+        connection.return_value.Pool.return_value.acquire.return_value.SimpleQueue.return_value.get = get_func
 
         backend = AMQPMessagingBackend()
         generator = backend.receive_messages(5)
@@ -105,8 +111,8 @@ class TestAMQPBackend(TestCase):
         message3 = MagicMock(payload={'type': 'echo', 'body': '3'})
         get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
 
-        # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        # Deep diving through the connection pool to patch get call
+        connection.return_value.Pool.return_value.acquire.return_value.SimpleQueue.return_value.get = get_func
 
         backend = AMQPMessagingBackend()
         generator = backend.receive_messages(2)
@@ -132,8 +138,8 @@ class TestAMQPBackend(TestCase):
         message.payload = 'test'
         get_func = MagicMock(return_value=message)
 
-        # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        # Deep diving through the connection pool to patch get call
+        connection.return_value.Pool.return_value.acquire.return_value.SimpleQueue.return_value.get = get_func
 
         backend = AMQPMessagingBackend()
 
@@ -146,6 +152,106 @@ class TestAMQPBackend(TestCase):
 
         message.ack.assert_not_called()
 
+    @patch('messaging.backends.amqp.Connection')
+    def test_receive_message_batch(self, connection):
+        """Validate batch message retrieval and deferred acknowledgement via AMQP backend"""
+
+        message1 = MagicMock(payload={'type': 'echo', 'body': '1'})
+        message2 = MagicMock(payload={'type': 'echo', 'body': '2'})
+        get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
+        connection.return_value.Pool.return_value.acquire.return_value.SimpleQueue.return_value.get = get_func
+
+        backend = AMQPMessagingBackend()
+        with backend.receive_message_batch(5) as messages:
+            self.assertListEqual([message.payload for message in messages], [message1.payload, message2.payload])
+            message1.ack.assert_not_called()
+            messages[1].acknowledge()
+
+        message1.ack.assert_not_called()
+        message2.ack.assert_called_once()
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_connection_reused(self, connection):
+        """Validate that the send and receive paths share pooled connections in AMQP backend"""
+
+        pool = connection.return_value.Pool.return_value
+        pooled_connection = pool.acquire.return_value
+        pooled_connection.SimpleQueue.return_value.get = MagicMock(side_effect=Queue.Empty)
+
+        backend = AMQPMessagingBackend()
+        backend.send_messages([{'type': 'echo', 'body': 'yes'}])
+        list(backend.receive_messages(5))
+        backend.send_messages([{'type': 'echo', 'body': 'yes'}])
+
+        connection.assert_called_once_with(settings.BROKER_URL)
+        self.assertEqual(pool.acquire.call_count, 3)
+        self.assertEqual(pooled_connection.ensure_connection.call_count, 3)
+        self.assertEqual(pooled_connection.release.call_count, 3)
+        pool.replace.assert_not_called()
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_failed_connection_closed(self, connection):
+        """Validate that a connection that fails is closed and returned to the pool in AMQP backend"""
+
+        pool = connection.return_value.Pool.return_value
+        pooled_connection = pool.acquire.return_value
+        pooled_connection.recoverable_connection_errors = (IOError,)
+        pooled_connection.recoverable_channel_errors = ()
+        pooled_connection.SimpleQueue.return_value.put = MagicMock(side_effect=IOError)
+
+        backend = AMQPMessagingBackend()
+        with self.assertRaises(IOError):
+            backend.send_messages([{'type': 'echo', 'body': 'yes'}])
+
+        pooled_connection.close.assert_called_once()
+        pooled_connection.release.assert_called_once()
+        pool.replace.assert_not_called()
+
+    @patch('messaging.backends.amqp.os.getpid')
+    @patch('messaging.backends.amqp.Connection')
+    def test_pool_per_process(self, connection, getpid):
+        """Validate that a forked process does not share the pooled connections of its parent in AMQP backend"""
+
+        parent_pool = MagicMock()
+        child_pool = MagicMock()
+        connection.return_value.Pool.side_effect = [parent_pool, child_pool]
+        for pool in [parent_pool, child_pool]:
+            pool.acquire.return_value.SimpleQueue.return_value.get = MagicMock(side_effect=Queue.Empty)
+
+        getpid.return_value = 100
+        backend = AMQPMessagingBackend()
+        backend.send_messages([{'type': 'echo', 'body': 'yes'}])
+        getpid.return_value = 200
+        backend.send_messages([{'type': 'echo', 'body': 'yes'}])
+        list(backend.receive_messages(5))
+
+        self.assertEqual(parent_pool.acquire.call_count, 1)
+        self.assertEqual(child_pool.acquire.call_count, 2)
+        # The parent's connections are left open for the parent
+        parent_pool.acquire.return_value.close.assert_not_called()
+
+    def test_failed_connections_do_not_exhaust_pool(self):
+        """Validate that more failures than the pool limit do not leave the pool without connections in AMQP backend"""
+
+        backend = AMQPMessagingBackend()
+        backend._pool = Connection('memory://').Pool(limit=backend._pool_limit)
+
+        # Time out when blocking on an empty pool, so that lost connection slots fail the test instead of hanging it
+        acquire = backend._pool.acquire
+        backend._pool.acquire = lambda block=True: acquire(block=block, timeout=1)
+
+        with patch.object(Connection, 'SimpleQueue', side_effect=IOError):
+            with patch.object(Connection, 'recoverable_connection_errors', (IOError,)):
+                for _ in range(backend._pool_limit + 2):
+                    with self.assertRaises(IOError):
+                        backend.send_messages([{'type': 'echo', 'body': 'yes'}])
+
+        # Every connection slot should be back in the pool, ready to be acquired
+        self.assertEqual(len(backend._pool._resource.queue), backend._pool_limit)
+        connections = [acquire(block=True, timeout=1) for _ in range(backend._pool_limit)]
+        for pooled_connection in connections:
+            pooled_connection.release()
+
 
 class TestBackendsFactory(TestCase):
     def setUp(self):
@@ -230,7 +336,7 @@ class TestSQSBackend(TestCase):
         backend = SQSMessagingBackend()
         backend.send_messages(messages)
 
-        put = client.return_value.__enter__.return_value.send_messages
+        put = client.return_value.connect.return_value.send_messages
         self.assertIn(json.dumps(messages[0]), str(put.mock_calls[0]))
         self.assertEquals(put.call_count, 1)
 
@@ -246,7 +352,7 @@ class TestSQSBackend(TestCase):
         backend = SQSMessagingBackend()
         backend.send_messages(messages)
 
-        put = client.return_value.__enter__.return_value.send_messages
+        put = client.return_value.connect.return_value.send_messages
         for message in messages:
             self.assertIn(json.dumps(message), str(put.mock_calls[0]))
         self.assertEquals(put.call_count, 1)
@@ -259,7 +365,7 @@ class TestSQSBackend(TestCase):
         message2 = MagicMock(body=json.dumps({'type': 'echo', 'body': '2'}))
         get_func = MagicMock(return_value=[message1, message2])
 
-        client.return_value.__enter__.return_value.receive_messages = get_func
+        client.return_value.connect.return_value.receive_messages = get_func
 
         backend = SQSMessagingBackend()
         generator = backend.receive_messages(5)
@@ -285,7 +391,7 @@ class TestSQSBackend(TestCase):
         message.body = json.dumps(value)
         get_func = MagicMock(return_value=[message])
 
-        client.return_value.__enter__.return_value.receive_messages = get_func
+        client.return_value.connect.return_value.receive_messages = get_func
 
         backend = SQSMessagingBackend()
 
@@ -300,3 +406,84 @@ class TestSQSBackend(TestCase):
 
         self.assertEquals(results, [value])
         message.delete.assert_not_called()
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_receive_message_batch(self, client):
+        """Validate batch message retrieval and deferred deletion via SQS backend"""
+
+        message1 = MagicMock(body=json.dumps({'type': 'echo', 'body': '1'}))
+        message2 = MagicMock(body=json.dumps({'type': 'echo', 'body': '2'}))
+        client.return_value.connect.return_value.receive_messages = MagicMock(return_value=[message1, message2])
+
+        backend = SQSMessagingBackend()
+        with backend.receive_message_batch(5) as messages:
+            self.assertListEqual([message.payload for message in messages],
+                                 [{'type': 'echo', 'body': '1'}, {'type': 'echo', 'body': '2'}])
+            messages[0].acknowledge()
+
+        message1.delete.assert_called_once()
+        message2.delete.assert_not_called()
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_receive_message_batch_visibility_timeout(self, client):
+        """Validate that the messages of a batch stay hidden while the whole batch is received and executed via SQS
+        backend"""
+
+        receive_func = MagicMock(return_value=[])
+        client.return_value.connect.return_value.receive_messages = receive_func
+
+        backend = SQSMessagingBackend()
+        with backend.receive_message_batch(100):
+            pass
+        with backend.receive_message_batch(10000):
+            pass
+
+        # 10 polls of 20 seconds to receive the batch and 10 seconds to execute each message
+        self.assertEqual(receive_func.call_args_list[0][1]['visibility_timeout_seconds'], 1200)
+        self.assertEqual(receive_func.call_args_list[1][1]['visibility_timeout_seconds'], MAX_VISIBILITY_TIMEOUT)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_client_reused(self, client):
+        """Validate that the send and receive paths of a thread share a single client in SQS backend"""
+
+        client.return_value.connect.return_value.receive_messages = MagicMock(return_value=[])
+
+        backend = SQSMessagingBackend()
+        backend.send_messages([{'type': 'echo', 'body': '1'}])
+        list(backend.receive_messages(5))
+        backend.send_messages([{'type': 'echo', 'body': '2'}])
+
+        self.assertEqual(client.call_count, 1)
+        self.assertEqual(client.return_value.connect.call_count, 1)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_failed_client_recreated(self, client):
+        """Validate that a client that fails is re-created on next use in SQS backend"""
+
+        send_func = MagicMock(side_effect=[BotoCoreError(), None])
+        client.return_value.connect.return_value.send_messages = send_func
+
+        backend = SQSMessagingBackend()
+        with self.assertRaises(BotoCoreError):
+            backend.send_messages([{'type': 'echo', 'body': '1'}])
+        backend.send_messages([{'type': 'echo', 'body': '2'}])
+
+        self.assertEqual(client.return_value.connect.call_count, 2)
+        self.assertEqual(send_func.call_count, 2)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_client_per_thread(self, client):
+        """Validate that each thread uses its own client in SQS backend"""
+
+        client.return_value.connect.side_effect = lambda: MagicMock()
+
+        backend = SQSMessagingBackend()
+        main_client = backend._get_client()
+        thread_clients = []
+        thread = threading.Thread(target=lambda: thread_clients.extend([backend._get_client(), backend._get_client()]))
+        thread.start()
+        thread.join()
+
+        self.assertIs(backend._get_client(), main_client)
+        self.assertIs(thread_clients[0], thread_clients[1])
+        self.assertIsNot(thread_clients[0], main_client)
@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+
+import django
+from django.test import TestCase
+from django.test.utils import override_settings
+
+import messaging.codecs.factory as codec_factory
+from messaging.codecs.factory import CODEC_KEY, decode_message, encode_message
+from messaging.codecs.zlib_json import ZlibJsonCodec
+from messaging.exceptions import InvalidCommandMessage
+
+
+class TestZlibJsonCodec(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def test_round_trip(self):
+        """Validate that an encoded body decodes back to the original body"""
+
+        codec = ZlibJsonCodec()
+        body = {'job_ids': range(1000), 'status_change': '2018-01-01T00:00:00Z'}
+
+        encoded_body = codec.encode(body)
+        self.assertLess(len(encoded_body), len(json.dumps(body)))
+        self.assertDictEqual(codec.decode(encoded_body), body)
+
+    def test_invalid_body(self):
+        """Validate that an invalid encoded body raises InvalidCommandMessage"""
+
+        codec = ZlibJsonCodec()
+
+        with self.assertRaises(InvalidCommandMessage):
+            codec.decode('not-compressed')
+
+
+@override_settings(MESSAGE_CODEC='zlib-json-v1', MESSAGE_CODEC_MIN_SIZE=1024)
+class TestCodecFactory(TestCase):
+    def setUp(self):
+        django.setup()
+
+        codec_factory.add_message_codec(ZlibJsonCodec)
+
+    def test_encode_large_message(self):
+        """Validate that a large message body is encoded with the configured codec"""
+
+        body = {'job_ids': range(1000)}
+
+        message = encode_message('pending_jobs', body)
+        self.assertEqual(message['type'], 'pending_jobs')
+        self.assertEqual(message[CODEC_KEY], 'zlib-json-v1')
+        self.assertDictEqual(decode_message(message), {'type': 'pending_jobs', 'body': body})
+
+    def test_encode_small_message(self):
+        """Validate that a small message body is left as plain JSON"""
+
+        body = {'job_ids': [1, 2, 3]}
+
+        self.assertDictEqual(encode_message('pending_jobs', body), {'type': 'pending_jobs', 'body': body})
+
+    @override_settings(MESSAGE_CODEC=None)
+    def test_encode_no_codec(self):
+        """Validate that no codec is used when the codec setting is disabled"""
+
+        body = {'job_ids': range(1000)}
+
+        self.assertDictEqual(encode_message('pending_jobs', body), {'type': 'pending_jobs', 'body': body})
+
+    def test_decode_plain_message(self):
+        """Validate that plain JSON messages without a codec are decoded unchanged"""
+
+        message = {'type': 'echo', 'body': {'test': 'thing'}}
+
+        self.assertDictEqual(decode_message(message), message)
+
+    def test_decode_unknown_codec(self):
+        """Validate that a message with an unknown codec raises InvalidCommandMessage"""
+
+        message = {'type': 'echo', 'body': 'abc', CODEC_KEY: 'unknown-v1'}
+
+        with self.assertRaises(InvalidCommandMessage):
+            decode_message(message)
@@ -3,16 +3,47 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+
 import django
 from django.test import TestCase
 from mock import MagicMock
 from mock import call, patch
 
+from messaging.backends.backend import ReceivedMessage
 from messaging.exceptions import CommandMessageExecuteFailure, InvalidCommandMessage
 from messaging.manager import CommandMessageManager
+from messaging.messages.echo import EchoCommandMessage
 from messaging.messages.message import CommandMessage
 
 
+# Message type that merges ID lists of up to 3 IDs for testing
+class MergeableMessage(CommandMessage):
+    def __init__(self):
+        super(MergeableMessage, self).__init__('ids')
+
+        self.ids = []
+
+    def can_merge(self, message):
+        return len(set(self.ids) | set(message.ids)) <= 3
+
+    def merge(self, message):
+        self.ids.extend([x for x in message.ids if x not in self.ids])
+
+    def to_json(self):
+        return {'ids': self.ids}
+
+    @staticmethod
+    def from_json(json_dict):
+        message = MergeableMessage()
+        message.ids = list(json_dict['ids'])
+        return message
+
+    def execute(self):  # pragma: no cover
+        return True
+
+
 class TestCommandMessageManager(TestCase):
     def setUp(self):
         django.setup()
@@ -95,6 +126,71 @@ class TestCommandMessageManager(TestCase):
         process_message.assert_has_calls(calls)
         self.assertEquals(process_message.call_count, 10)
 
+    @patch('messaging.manager.get_message_type')
+    @patch('messaging.manager.CommandMessageManager._process_message')
+    def test_receive_messages_concurrently(self, process_message, get_message_type):
+        """Validate that receive_messages_concurrently processes every message and only acknowledges successes"""
+
+        payloads = [{'type': 'test', 'body': str(i)} for i in range(10)]
+        received_messages = [ReceivedMessage(payload, MagicMock()) for payload in payloads]
+
+        @contextmanager
+        def receive_message_batch(batch_size):
+            self.assertEqual(batch_size, 20)
+            yield received_messages
+
+        def execute(message):
+            if int(message['body']) % 2:
+                raise CommandMessageExecuteFailure
+
+        # Workers process messages with the singleton manager, so the patch is on the class
+        process_message.side_effect = execute
+        get_message_type.return_value = EchoCommandMessage
+        manager = CommandMessageManager()
+        manager._backend = MagicMock(receive_message_batch=receive_message_batch)
+        worker_pool = ThreadPool(4)
+        try:
+            num_processed = manager.receive_messages_concurrently(worker_pool, 20)
+        finally:
+            worker_pool.close()
+            worker_pool.join()
+
+        self.assertEqual(num_processed, 10)
+        self.assertEqual(process_message.call_count, 10)
+        for i, received_message in enumerate(received_messages):
+            self.assertEqual(received_message.acknowledge.call_count, 0 if i % 2 else 1)
+
+    @patch('messaging.manager.get_message_type')
+    @patch('messaging.manager.CommandMessageManager._process_message')
+    def test_receive_messages_concurrently_merged(self, process_message, get_message_type):
+        """Validate that receive_messages_concurrently merges compatible messages and acknowledges all of them"""
+
+        payloads = [{'type': 'ids', 'body': {'ids': [1, 2]}}, {'type': 'ids', 'body': {'ids': [2, 3]}},
+                    {'type': 'ids', 'body': {'ids': [4, 5]}}, {'type': 'invalid'}]
+        received_messages = [ReceivedMessage(payload, MagicMock()) for payload in payloads]
+
+        @contextmanager
+        def receive_message_batch(batch_size):
+            yield received_messages
+
+        get_message_type.return_value = MergeableMessage
+        manager = CommandMessageManager()
+        manager._backend = MagicMock(receive_message_batch=receive_message_batch)
+        worker_pool = ThreadPool(2)
+        try:
+            manager.receive_messages_concurrently(worker_pool, 10)
+        finally:
+            worker_pool.close()
+            worker_pool.join()
+
+        # The first two messages fill up one merged message, so the third is processed on its own
+        process_message.assert_has_calls([call({'type': 'ids', 'body': {'ids': [1, 2, 3]}}),
+                                          call({'type': 'ids', 'body': {'ids': [4, 5]}})], any_order=True)
+        self.assertEqual(process_message.call_count, 2)
+        for received_message in received_messages[:3]:
+            received_message.acknowledge.assert_called_once()
+        received_messages[3].acknowledge.assert_not_called()
+
     @patch('messaging.manager.CommandMessageManager._extract_command')
     @patch('messaging.manager.CommandMessageManager._send_downstream')
     def test_successful_process_message(self, send_downstream, extract_command):
@@ -0,0 +1,103 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase
+from django.utils.timezone import now
+
+from messaging.metrics import FLUSH_PERIOD, MessageMetricsCollector, MessageTypeMetrics, QueryCounter, STALE_PERIOD
+from messaging.models import MessageHandlerStatus
+
+
+class TestMessageTypeMetrics(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def test_summary(self):
+        """Validate the summary JSON of message type metrics"""
+
+        metrics = MessageTypeMetrics()
+        for _ in range(90):
+            metrics.add_message(True, 0.02, 4, 1)
+        for _ in range(9):
+            metrics.add_message(True, 0.4, 10, 0)
+        metrics.add_message(False, 400.0, 6, 0)
+
+        summary_dict = metrics.generate_summary_json()
+        self.assertEqual(summary_dict['count'], 100)
+        self.assertEqual(summary_dict['failures'], 1)
+        self.assertEqual(summary_dict['p50_seconds'], 0.025)
+        self.assertEqual(summary_dict['p95_seconds'], 0.5)
+        self.assertEqual(summary_dict['p99_seconds'], 0.5)
+        self.assertIsNone(metrics.get_percentile(100))  # Slowest message is above the last bucket
+        self.assertEqual(summary_dict['avg_queries'], 4.56)
+        self.assertEqual(summary_dict['avg_downstream_messages'], 0.9)
+
+    def test_json(self):
+        """Validate converting message type metrics to and from JSON and combining them"""
+
+        metrics = MessageTypeMetrics()
+        metrics.add_message(True, 0.02, 4, 1)
+        metrics.add_message(False, 3.0, 2, 0)
+
+        combined_metrics = MessageTypeMetrics.from_json(metrics.to_json())
+        combined_metrics.add_metrics(metrics)
+        self.assertDictEqual(combined_metrics.generate_summary_json(),
+                             {'count': 4, 'failures': 2, 'p50_seconds': 0.025, 'p95_seconds': 5.0, 'p99_seconds': 5.0,
+                              'avg_seconds': 1.51, 'avg_queries': 3.0, 'avg_downstream_messages': 0.5})
+
+
+class TestQueryCounter(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def test_count(self):
+        """Validate counting queries without logging them"""
+
+        num_logged_queries = len(connection.queries_log)
+        with QueryCounter(connection) as query_counter:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.execute('SELECT 2')
+            self.assertFalse(connection.queries_logged)
+        connection.cursor().execute('SELECT 1')
+
+        self.assertEqual(query_counter.count, 2)
+        self.assertEqual(len(connection.queries_log), num_logged_queries)
+        # The cursor factories of the connection are restored
+        self.assertNotIn('make_cursor', vars(connections[DEFAULT_DB_ALIAS]))
+        self.assertNotIn('make_debug_cursor', vars(connections[DEFAULT_DB_ALIAS]))
+
+
+class TestMessageHandlerStatus(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def test_flush_and_get_metrics(self):
+        """Validate writing message handler metrics to the database and summarizing the running handlers"""
+
+        when = now()
+        collector = MessageMetricsCollector()
+        collector.add_message('echo', True, 0.02, 1, 0)
+        collector.flush_if_due(when)
+
+        # Not written again until the flush period has passed
+        collector.add_message('echo', True, 0.02, 1, 0)
+        collector.flush_if_due(when + datetime.timedelta(seconds=1))
+        metrics_json = MessageHandlerStatus.objects.get_metrics_json(when)
+        self.assertEqual(metrics_json['num_handlers'], 1)
+        self.assertEqual(metrics_json['message_types']['echo']['count'], 1)
+
+        collector.flush_if_due(when + FLUSH_PERIOD)
+        metrics_json = MessageHandlerStatus.objects.get_metrics_json(when + FLUSH_PERIOD)
+        self.assertEqual(metrics_json['message_types']['echo']['count'], 2)
+
+        # Handlers that stop reporting are no longer included
+        metrics_json = MessageHandlerStatus.objects.get_metrics_json(when + FLUSH_PERIOD + STALE_PERIOD +
+                                                                      datetime.timedelta(seconds=1))
+        self.assertDictEqual(metrics_json, {'num_handlers': 0, 'message_types': {}})
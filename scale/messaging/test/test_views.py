@@ -0,0 +1,42 @@
+from __future__ import unicode_literals
+
+import json
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from rest_framework import status
+
+from messaging.metrics import MessageTypeMetrics
+from messaging.models import MessageHandlerStatus
+
+
+class TestMessageMetricsView(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        metrics = MessageTypeMetrics()
+        metrics.add_message(True, 0.02, 4, 1)
+        MessageHandlerStatus.objects.update_metrics('host_1:1', {'echo': metrics.to_json()}, now())
+        MessageHandlerStatus.objects.update_metrics('host_2:1', {'echo': metrics.to_json()}, now())
+
+    def test_invalid_version(self):
+        """Tests calling the message metrics view with an unsupported REST API version"""
+
+        url = '/v5/messaging/metrics/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.content)
+
+    def test_get_metrics(self):
+        """Tests getting the combined message handler metrics"""
+
+        url = '/v6/messaging/metrics/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertEqual(result['num_handlers'], 2)
+        self.assertEqual(result['message_types']['echo']['count'], 2)
+        self.assertEqual(result['message_types']['echo']['failures'], 0)
+        self.assertEqual(result['message_types']['echo']['avg_queries'], 4.0)
@@ -0,0 +1,10 @@
+"""Defines the URLs for the RESTful messaging services"""
+from __future__ import unicode_literals
+
+from django.conf.urls import url
+
+import messaging.views
+
+urlpatterns = [
+    url(r'^messaging/metrics/$', messaging.views.MessageMetricsView.as_view(), name='message_metrics_view'),
+]
@@ -0,0 +1,31 @@
+"""Defines the views for the RESTful messaging services"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.http.response import Http404
+from django.utils.timezone import now
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from messaging.models import MessageHandlerStatus
+
+logger = logging.getLogger(__name__)
+
+
+class MessageMetricsView(GenericAPIView):
+    """This view is the endpoint for retrieving the throughput and latency metrics of the running message handlers"""
+
+    def get(self, request):
+        """Gets the message handler metrics, per message type
+
+        :param request: the HTTP GET request
+        :type request: :class:`rest_framework.request.Request`
+        :rtype: :class:`rest_framework.response.Response`
+        :returns: the HTTP response to send back to the user
+        """
+
+        if request.version != 'v6':
+            raise Http404
+
+        return Response(MessageHandlerStatus.objects.get_metrics_json(now()))
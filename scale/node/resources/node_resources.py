@@ -3,13 +3,21 @@ from __future__ import unicode_literals
 
 from util.exceptions import ScaleLogicBug
 
-from node.resources.resource import Cpus, Disk, Mem, Gpus
+from node.resources.resource import Cpus, Disk, Mem, Gpus, ScalarResource
+
+
+# Maps the standard resource names to the slots that store them
+STANDARD_RESOURCE_SLOTS = {'cpus': '_cpus', 'mem': '_mem', 'disk': '_disk', 'gpus': '_gpus'}
 
 
 class NodeResources(object):
-    """This class encapsulates a set of node resources
+    """This class encapsulates a set of node resources. The standard resources (CPUs, memory, disk, and GPUs) are stored in
+    fixed slots and any other resources are stored in an overflow dict that is only created when needed, so that the
+    arithmetic performed many times in each scheduling loop does not allocate any resource objects.
     """
 
+    __slots__ = ('_cpus', '_mem', '_disk', '_gpus', '_custom')
+
     def __init__(self, resources=None):
         """Constructor
 
@@ -17,22 +25,18 @@ class NodeResources(object):
         :type resources: list
         """
 
-        self._resources = {}  # {Name: Resource}
+        # Make sure standard resources are defined
+        self._cpus = 0.0
+        self._mem = 0.0
+        self._disk = 0.0
+        self._gpus = 0.0
+        self._custom = None  # {Name: float}
+
         if resources:
             for resource in resources:
                 if resource.resource_type != 'SCALAR':
                     raise ScaleLogicBug('Resource type "%s" is not currently supported', resource.resource_type)
-                self._resources[resource.name] = resource
-
-        # Make sure standard resources are defined
-        if 'cpus' not in self._resources:
-            self._resources['cpus'] = Cpus(0.0)
-        if 'mem' not in self._resources:
-            self._resources['mem'] = Mem(0.0)
-        if 'disk' not in self._resources:
-            self._resources['disk'] = Disk(0.0)
-        if 'gpus' not in self._resources:
-            self._resources['gpus'] = Gpus(0.0)
+                self._set_value(resource.name, resource.value)
 
     def __str__(self):
         """Converts the resource to a readable logging string
@@ -41,7 +45,7 @@ class NodeResources(object):
         :rtype: string
         """
 
-        logging_str = ', '.join(['%.2f %s' % (resource.value, resource.name) for resource in self._resources.values()])
+        logging_str = ', '.join(['%.2f %s' % (value, name) for name, value in self._items()])
         return '[%s]' % logging_str
 
     @property
@@ -52,7 +56,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['cpus'].value
+        return self._cpus
 
     @property
     def disk(self):
@@ -62,7 +66,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['disk'].value
+        return self._disk
 
     @property
     def mem(self):
@@ -72,7 +76,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['mem'].value
+        return self._mem
 
     @property
     def gpus(self):
@@ -82,17 +86,21 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['gpus'].value
+        return self._gpus
 
     @property
     def resources(self):
-        """The list of resources
+        """The list of resources. The returned resource objects are copies, editing them will not affect these resources.
 
         :returns: The list of resources
         :rtype: list
         """
 
-        return self._resources.values()
+        resources = [Cpus(self._cpus), Mem(self._mem), Disk(self._disk), Gpus(self._gpus)]
+        if self._custom:
+            for name, value in self._custom.items():
+                resources.append(ScalarResource(name, value))
+        return resources
 
     def add(self, node_resources):
         """Adds the given resources
@@ -101,11 +109,18 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                self._resources[resource.name].value += resource.value  # Assumes SCALAR type
-            else:
-                self._resources[resource.name] = resource.copy()
+        self._cpus += node_resources._cpus
+        self._mem += node_resources._mem
+        self._disk += node_resources._disk
+        self._gpus += node_resources._gpus
+        if node_resources._custom:
+            if self._custom is None:
+                self._custom = {}
+            for name, value in node_resources._custom.items():
+                if name in self._custom:
+                    self._custom[name] += value
+                else:
+                    self._custom[name] = value
 
     def copy(self):
         """Returns a deep copy of these resources. Editing one of the resources objects will not affect the other.
@@ -127,15 +142,14 @@ class NodeResources(object):
         :type key_name: string
         """
 
-        for resource in self._resources.values():
-            if resource.name in resources_dict:
-                resource_dict = resources_dict[resource.name]
+        for name, value in self._items():
+            if name in resources_dict:
+                resource_dict = resources_dict[name]
             else:
                 resource_dict = {}
-                resources_dict[resource.name] = resource_dict
+                resources_dict[name] = resource_dict
 
-            # Assumes SCALAR type
-            resource_dict[key_name] = resource.value
+            resource_dict[key_name] = value
 
     def get_json(self):
         """Returns these resources as a JSON schema
@@ -145,10 +159,7 @@ class NodeResources(object):
         """
 
         from node.resources.json.resources import Resources
-        resources_dict = {}
-        for resource in self._resources.values():
-            resources_dict[resource.name] = resource.value  # Assumes SCALAR type
-        return Resources({'resources': resources_dict}, do_validate=False)
+        return Resources({'resources': dict(self._items())}, do_validate=False)
 
     def increase_up_to(self, node_resources):
         """Increases each resource up to the value in the given node resources
@@ -157,12 +168,20 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                if self._resources[resource.name].value < resource.value:  # Assumes SCALAR type
-                    self._resources[resource.name].value = resource.value
-            else:
-                self._resources[resource.name] = resource.copy()
+        if self._cpus < node_resources._cpus:
+            self._cpus = node_resources._cpus
+        if self._mem < node_resources._mem:
+            self._mem = node_resources._mem
+        if self._disk < node_resources._disk:
+            self._disk = node_resources._disk
+        if self._gpus < node_resources._gpus:
+            self._gpus = node_resources._gpus
+        if node_resources._custom:
+            if self._custom is None:
+                self._custom = {}
+            for name, value in node_resources._custom.items():
+                if name not in self._custom or self._custom[name] < value:
+                    self._custom[name] = value
 
     def is_equal(self, node_resources):
         """Indicates if these resources are equal. This should be used for testing only.
@@ -174,14 +193,13 @@ class NodeResources(object):
         """
 
         # Make sure they have the exact same set of resource names
-        names = set()
-        for resource in node_resources.resources:
-            names.add(resource.name)
-        if set(self._resources.keys()) != names:
+        values = dict(self._items())
+        other_values = dict(node_resources._items())
+        if set(values.keys()) != set(other_values.keys()):
             return False
 
-        for resource in node_resources.resources:
-            if round(self._resources[resource.name].value, 5) != round(resource.value, 5):  # Assumes SCALAR type
+        for name, value in other_values.items():
+            if round(values[name], 5) != round(value, 5):
                 return False
 
         return True
@@ -195,13 +213,18 @@ class NodeResources(object):
         :rtype: bool
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                if self._resources[resource.name].value < resource.value:  # Assumes SCALAR type
-                    return False
-            else:
-                # Do not have this resource, not a problem if requesting 0.0
-                if resource.value > 0.0:
+        if self._cpus < node_resources._cpus or self._mem < node_resources._mem:
+            return False
+        if self._disk < node_resources._disk or self._gpus < node_resources._gpus:
+            return False
+
+        if node_resources._custom:
+            for name, value in node_resources._custom.items():
+                if self._custom and name in self._custom:
+                    if self._custom[name] < value:
+                        return False
+                elif value > 0.0:
+                    # Do not have this resource, not a problem if requesting 0.0
                     return False
 
         return True
@@ -213,32 +236,45 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in self._resources.values():
-            if resource.name in node_resources._resources:
-                if resource.value > node_resources._resources[resource.name].value:  # Assumes SCALAR type
-                    resource.value = node_resources._resources[resource.name].value
-            else:
-                self.remove_resource(resource.name)
+        if self._cpus > node_resources._cpus:
+            self._cpus = node_resources._cpus
+        if self._mem > node_resources._mem:
+            self._mem = node_resources._mem
+        if self._disk > node_resources._disk:
+            self._disk = node_resources._disk
+        if self._gpus > node_resources._gpus:
+            self._gpus = node_resources._gpus
+        if self._custom:
+            for name in list(self._custom.keys()):
+                if node_resources._custom and name in node_resources._custom:
+                    if self._custom[name] > node_resources._custom[name]:
+                        self._custom[name] = node_resources._custom[name]
+                else:
+                    self.remove_resource(name)
 
     def remove_resource(self, name):
-        """Removes the resource with the given name
+        """Removes the resource with the given name. Standard resources are always defined, so they are set to zero.
 
         :param name: The name of the resource to remove
         :type name: string
         """
 
-        if name in self._resources:
-            if name in ['cpus', 'mem', 'disk']:
-                self._resources[name].value = 0.0
-            else:
-                del self._resources[name]
+        if name in STANDARD_RESOURCE_SLOTS:
+            setattr(self, STANDARD_RESOURCE_SLOTS[name], 0.0)
+        elif self._custom and name in self._custom:
+            del self._custom[name]
 
     def round_values(self):
         """Rounds all of the resource values
         """
 
-        for resource in self._resources.values():
-            resource.value = round(resource.value, 2)  # Assumes SCALAR type
+        self._cpus = round(self._cpus, 2)
+        self._mem = round(self._mem, 2)
+        self._disk = round(self._disk, 2)
+        self._gpus = round(self._gpus, 2)
+        if self._custom:
+            for name, value in self._custom.items():
+                self._custom[name] = round(value, 2)
 
     def subtract(self, node_resources):
         """Subtracts the given resources
@@ -247,6 +283,39 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                self._resources[resource.name].value -= resource.value  # Assumes SCALAR type
+        self._cpus -= node_resources._cpus
+        self._mem -= node_resources._mem
+        self._disk -= node_resources._disk
+        self._gpus -= node_resources._gpus
+        if node_resources._custom and self._custom:
+            for name, value in node_resources._custom.items():
+                if name in self._custom:
+                    self._custom[name] -= value
+
+    def _items(self):
+        """Returns the (name, value) pairs of all of these resources
+
+        :returns: The list of (name, value) tuples
+        :rtype: list
+        """
+
+        items = [('cpus', self._cpus), ('mem', self._mem), ('disk', self._disk), ('gpus', self._gpus)]
+        if self._custom:
+            items.extend(self._custom.items())
+        return items
+
+    def _set_value(self, name, value):
+        """Sets the value of the resource with the given name
+
+        :param name: The name of the resource
+        :type name: string
+        :param value: The value of the resource
+        :type value: float
+        """
+
+        if name in STANDARD_RESOURCE_SLOTS:
+            setattr(self, STANDARD_RESOURCE_SLOTS[name], value)
+        else:
+            if self._custom is None:
+                self._custom = {}
+            self._custom[name] = value
@@ -0,0 +1,151 @@
+from __future__ import unicode_literals
+
+import logging
+import os
+import timeit
+from unittest import skipUnless
+
+import django
+from django.test import TestCase
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Gpus, Mem, ScalarResource
+
+logger = logging.getLogger(__name__)
+
+
+class DictNodeResources(object):
+    """The previous dict-of-Resource implementation of the NodeResources operations used in the scheduling loop, kept as
+    the baseline for the micro-benchmark
+    """
+
+    def __init__(self, resources=None):
+        self._resources = {}
+        if resources:
+            for resource in resources:
+                self._resources[resource.name] = resource
+        for resource in [Cpus(0.0), Mem(0.0), Disk(0.0), Gpus(0.0)]:
+            if resource.name not in self._resources:
+                self._resources[resource.name] = resource
+
+    @property
+    def resources(self):
+        return self._resources.values()
+
+    def add(self, node_resources):
+        for resource in node_resources.resources:
+            if resource.name in self._resources:
+                self._resources[resource.name].value += resource.value
+            else:
+                self._resources[resource.name] = resource.copy()
+
+    def is_sufficient_to_meet(self, node_resources):
+        for resource in node_resources.resources:
+            if resource.name in self._resources:
+                if self._resources[resource.name].value < resource.value:
+                    return False
+            elif resource.value > 0.0:
+                return False
+        return True
+
+    def subtract(self, node_resources):
+        for resource in node_resources.resources:
+            if resource.name in self._resources:
+                self._resources[resource.name].value -= resource.value
+
+
+class TestNodeResources(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_standard_resources_defined(self):
+        """Tests that the standard resources are always defined"""
+
+        resources = NodeResources()
+        self.assertEqual(resources.cpus, 0.0)
+        self.assertEqual(resources.mem, 0.0)
+        self.assertEqual(resources.disk, 0.0)
+        self.assertEqual(resources.gpus, 0.0)
+        self.assertSetEqual({resource.name for resource in resources.resources}, {'cpus', 'mem', 'disk', 'gpus'})
+
+    def test_add_and_subtract(self):
+        """Tests adding and subtracting standard and custom resources"""
+
+        resources = NodeResources([Cpus(10.0), Mem(100.0)])
+        resources.add(NodeResources([Cpus(1.5), Disk(20.0), ScalarResource('foo', 3.0)]))
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(11.5), Mem(100.0), Disk(20.0),
+                                                          ScalarResource('foo', 3.0)])))
+
+        resources.subtract(NodeResources([Cpus(0.5), ScalarResource('foo', 1.0), ScalarResource('bar', 1.0)]))
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(11.0), Mem(100.0), Disk(20.0),
+                                                          ScalarResource('foo', 2.0)])))
+
+    def test_copy(self):
+        """Tests that a copy is not affected by changes to the original"""
+
+        resources = NodeResources([Cpus(10.0), ScalarResource('foo', 3.0)])
+        resources_copy = resources.copy()
+        resources.add(NodeResources([Cpus(1.0), ScalarResource('foo', 1.0)]))
+        self.assertTrue(resources_copy.is_equal(NodeResources([Cpus(10.0), ScalarResource('foo', 3.0)])))
+
+    def test_is_sufficient_to_meet(self):
+        """Tests calling is_sufficient_to_meet()"""
+
+        resources = NodeResources([Cpus(10.0), Mem(100.0), ScalarResource('foo', 1.0)])
+        self.assertTrue(resources.is_sufficient_to_meet(NodeResources([Cpus(10.0), ScalarResource('foo', 1.0)])))
+        self.assertTrue(resources.is_sufficient_to_meet(NodeResources([ScalarResource('bar', 0.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([Mem(100.1)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([ScalarResource('foo', 1.5)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([ScalarResource('bar', 0.1)])))
+
+    def test_increase_up_to_and_limit_to(self):
+        """Tests calling increase_up_to() and limit_to()"""
+
+        resources = NodeResources([Cpus(10.0), Mem(100.0), ScalarResource('foo', 1.0)])
+        resources.increase_up_to(NodeResources([Cpus(5.0), Mem(200.0), ScalarResource('bar', 2.0)]))
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(10.0), Mem(200.0), ScalarResource('foo', 1.0),
+                                                          ScalarResource('bar', 2.0)])))
+
+        resources.limit_to(NodeResources([Cpus(8.0), Mem(300.0), ScalarResource('bar', 1.0)]))
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(8.0), Mem(200.0), ScalarResource('bar', 1.0)])))
+
+    def test_remove_resource(self):
+        """Tests calling remove_resource()"""
+
+        resources = NodeResources([Cpus(10.0), Disk(10.0), ScalarResource('sharedmem', 1.0)])
+        resources.remove_resource('disk')
+        resources.remove_resource('sharedmem')
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(10.0)])))
+
+    def test_get_json(self):
+        """Tests converting the resources to JSON"""
+
+        resources = NodeResources([Cpus(10.0), Mem(100.0), ScalarResource('foo', 1.0)])
+        resources_dict = resources.get_json().get_dict()
+        self.assertDictEqual(resources_dict['resources'], {'cpus': 10.0, 'mem': 100.0, 'disk': 0.0, 'gpus': 0.0,
+                                                           'foo': 1.0})
+
+    @skipUnless(os.environ.get('SCALE_RUN_BENCHMARKS'), 'Set SCALE_RUN_BENCHMARKS to run micro-benchmarks')
+    def test_benchmark_scheduling_operations(self):
+        """Micro-benchmarks the per-operation cost of the add/subtract/is_sufficient_to_meet sequence that the scheduler
+        performs for every node, comparing the fixed-slot implementation against the previous dict-of-Resource one
+        """
+
+        def run_benchmark(resources_class):
+            watermark = resources_class([Cpus(100.0), Mem(1000.0), Disk(5000.0)])
+            task_resources = resources_class([Cpus(1.0), Mem(10.0), Disk(50.0)])
+
+            def operation():
+                available = resources_class()
+                available.add(watermark)
+                available.subtract(task_resources)
+                available.is_sufficient_to_meet(task_resources)
+
+            number = 10000
+            return min(timeit.repeat(operation, number=number, repeat=3)) / number
+
+        dict_cost = run_benchmark(DictNodeResources)
+        slotted_cost = run_benchmark(NodeResources)
+        logger.info('NodeResources per-operation cost: %.2f us with dict of resources, %.2f us with fixed slots',
+                    dict_cost * 1000000, slotted_cost * 1000000)
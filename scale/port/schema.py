@@ -1,9 +1,10 @@
 """Defines the class for managing a configuration export."""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
+from util.schema import validate
+
 
 class InvalidConfiguration(Exception):
     """Exception indicating that the provided configuration was invalid."""
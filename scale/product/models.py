@@ -9,7 +9,7 @@ import django.utils.timezone as timezone
 from django.db import transaction
 
 import storage.geospatial_utils as geo_utils
-from recipe.models import Recipe
+from recipe.models import Recipe, RecipeNode
 from storage.brokers.broker import FileUpload
 from storage.models import ScaleFile
 from util.parse import parse_datetime
@@ -83,6 +83,63 @@ class FileAncestryLinkManager(models.Manager):
 
         FileAncestryLink.objects.bulk_create(new_links)
 
+    @transaction.atomic
+    def create_input_file_ancestry_links(self, input_file_ids):
+        """Creates the file ancestry links between the given jobs and the source file ancestors of their input files,
+        replacing any previous links for the jobs. This is the same as calling create_file_ancestry_links() without any
+        child files for each job, but uses a fixed number of queries for all of the jobs. All database changes are made
+        in an atomic transaction.
+
+        :param input_file_ids: The set of input file IDs stored by job ID
+        :type input_file_ids: dict
+        """
+
+        job_ids = list(input_file_ids.keys())
+        if not job_ids:
+            return
+
+        new_links = []
+        created = timezone.now()
+
+        # Delete any previous file ancestry links for the given jobs
+        FileAncestryLink.objects.filter(job_id__in=job_ids).delete()
+
+        # Find the ancestors of all input files and which of the files and ancestors are source files
+        all_file_ids = set()
+        for file_ids in input_file_ids.values():
+            all_file_ids.update(file_ids)
+        ancestor_ids = {}  # {File ID: Set of ancestor file IDs}
+        src_file_ids = set()
+        if all_file_ids:
+            potential_src_file_ids = set(all_file_ids)
+            ancestor_qry = self.filter(descendant_id__in=list(all_file_ids)).values_list('descendant_id', 'ancestor_id')
+            for descendant_id, ancestor_id in ancestor_qry.iterator():
+                ancestor_ids.setdefault(descendant_id, set()).add(ancestor_id)
+                potential_src_file_ids.add(ancestor_id)
+            source_file_query = ScaleFile.objects.filter(id__in=list(potential_src_file_ids), file_type='SOURCE')
+            src_file_ids.update(source_file_query.values_list('id', flat=True))
+
+        # Not all jobs have a recipe or batch, so get the ones that do
+        from batch.models import BatchJob
+        recipe_qry = RecipeNode.objects.filter(job_id__in=job_ids, is_original=True).values_list('job_id', 'recipe_id')
+        recipe_ids = dict(recipe_qry)
+        batch_ids = dict(BatchJob.objects.filter(job_id__in=job_ids).values_list('job_id', 'batch_id'))
+
+        # Create direct links (from source to job) by leaving the descendant and ancestor job fields as null
+        for job_id, file_ids in input_file_ids.items():
+            parent_ids = set(file_ids)
+            for file_id in file_ids:
+                parent_ids.update(ancestor_ids.get(file_id, set()))
+            for parent_id in parent_ids & src_file_ids:
+                link = FileAncestryLink(created=created)
+                link.ancestor_id = parent_id
+                link.job_id = job_id
+                link.recipe_id = recipe_ids.get(job_id)
+                link.batch_id = batch_ids.get(job_id)
+                new_links.append(link)
+
+        FileAncestryLink.objects.bulk_create(new_links)
+
     def get_source_ancestor_ids(self, file_ids):
         """Returns a list of the source file ancestor IDs for the given file IDs. This will include any of the given
         files that are source files themselves.
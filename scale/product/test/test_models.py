@@ -151,6 +151,33 @@ class TestFileAncestryLinkManagerCreateFileAncestryLinks(TestCase):
         file_8_parent_ids = {link.ancestor_id for link in direct_qry}
         self.assertSetEqual(file_8_parent_ids, {self.file_1.id, self.file_2.id})
 
+    def test_input_links_for_jobs(self):
+        """Tests creating links for the input files of many jobs at once."""
+
+        job_1 = job_test_utils.create_job()
+        job_2 = job_test_utils.create_job()
+        recipe_job = recipe_test_utils.create_recipe_job(job=job_1)
+        batch = batch_test_utils.create_batch()
+        BatchJob.objects.create(batch_id=batch.id, job_id=job_2.id)
+
+        # This link should be replaced
+        FileAncestryLink.objects.create_file_ancestry_links([self.file_1.id], None, job_2, None)
+
+        input_file_ids = {job_1.id: {self.file_4.id, self.file_7.id}, job_2.id: {self.file_2.id}}
+        FileAncestryLink.objects.create_input_file_ancestry_links(input_file_ids)
+
+        links_1 = FileAncestryLink.objects.filter(job_id=job_1.id)
+        self.assertSetEqual({link.ancestor_id for link in links_1}, {self.file_1.id, self.file_2.id})
+        for link in links_1:
+            self.assertIsNone(link.descendant_id)
+            self.assertEqual(link.recipe_id, recipe_job.recipe_id)
+            self.assertIsNone(link.batch_id)
+        links_2 = FileAncestryLink.objects.filter(job_id=job_2.id)
+        self.assertEqual(len(links_2), 1)
+        self.assertEqual(links_2[0].ancestor_id, self.file_2.id)
+        self.assertIsNone(links_2[0].recipe_id)
+        self.assertEqual(links_2[0].batch_id, batch.id)
+
 
 class TestProductFileManager(TestCase):
     """Tests on the ProductFileManager"""
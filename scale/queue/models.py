@@ -221,7 +221,7 @@ class QueueManager(models.Manager):
         :type job_ids: list
         """
 
-        self.filter(job_id__in=job_ids).update(is_canceled=True)
+        self.filter(job_id__in=job_ids).update(is_canceled=True, last_modified=timezone.now())
 
     def get_queue(self, order_mode, ignore_job_type_ids=None):
         """Returns the list of queue models sorted according to their priority first, and then according to the provided
@@ -303,24 +303,33 @@ class QueueManager(models.Manager):
             for input_file in ScaleFile.objects.get_files_for_queued_jobs(input_file_ids):
                 input_files[input_file.id] = input_file
 
+        # Values that only depend on the job type, revision, or batch are computed once and shared by all of its jobs
+        job_type_values = {}  # {Job type ID: (Resources, Interface, Timeout, Priority)}
+        revision_interfaces = {}  # {Job type revision ID: Interface dict}
+        batch_priorities = {}  # {Batch ID: Priority}
+
         # Bulk create queue models
         queues = []
         configurator = QueuedExecutionConfigurator(input_files)
         for job in queued_jobs:
             config = configurator.configure_queued_job(job)
 
-            manifest = None
-            if JobInterfaceSunset.is_seed_dict(job.job_type.manifest):
-                manifest = SeedManifest(job.job_type.manifest)
+            if job.job_type_id not in job_type_values:
+                job_type_values[job.job_type_id] = self._get_job_type_queue_values(job.job_type)
+            job_type_resources, job_type_interface, timeout, job_type_priority = job_type_values[job.job_type_id]
+            if job.job_type_rev_id not in revision_interfaces:
+                revision_interfaces[job.job_type_rev_id] = job.get_job_interface().get_dict()
+            if job.batch and job.batch_id not in batch_priorities:
+                batch_priorities[job.batch_id] = job.batch.get_configuration().priority
 
             if priority:
                 queued_priority = priority
             elif job.priority:
                 queued_priority = job.priority
-            elif job.batch and self.batch.get_configuration().priority:
-                queued_priority = self.batch.get_configuration().priority
+            elif job.batch and batch_priorities[job.batch_id]:
+                queued_priority = batch_priorities[job.batch_id]
             else:
-                queued_priority = job.job_type.get_job_configuration().priority
+                queued_priority = job_type_priority
 
             queue = Queue()
             # select_related from get_jobs_with_related above will only make a single query
@@ -333,10 +342,10 @@ class QueueManager(models.Manager):
             queue.input_file_size = job.input_file_size if job.input_file_size else 0.0
             queue.is_canceled = False
             queue.priority = queued_priority
-            queue.timeout = manifest.get_timeout() if manifest else job.timeout
-            queue.interface = job.get_job_interface().get_dict()
+            queue.timeout = timeout if timeout is not None else job.timeout
+            queue.interface = revision_interfaces[job.job_type_rev_id]
             queue.configuration = config.get_dict()
-            queue.resources = job.get_resources().get_json().get_dict()
+            queue.resources = job.get_resources(job_type_resources, job_type_interface).get_json().get_dict()
             queue.queued = when_queued
             queues.append(queue)
 
@@ -345,6 +354,21 @@ class QueueManager(models.Manager):
 
         return queued_job_ids
 
+    def _get_job_type_queue_values(self, job_type):
+        """Returns the values needed to queue jobs of the given type that do not depend on the individual jobs
+
+        :param job_type: The job type model
+        :type job_type: :class:`job.models.JobType`
+        :returns: A tuple of the job type's resources, its interface, its Seed timeout (None for legacy job types), and
+            its default priority
+        :rtype: tuple
+        """
+
+        interface = job_type.get_job_interface()
+        timeout = interface.get_timeout() if isinstance(interface, SeedManifest) else None
+        priority = job_type.get_job_configuration().priority
+        return job_type.get_resources(), interface, timeout, priority
+
     # TODO: remove once REST API v5 is removed
     @transaction.atomic
     def handle_job_cancellation(self, job_id, when):
@@ -546,6 +570,8 @@ class Queue(models.Model):
     :type created: :class:`django.db.models.DateTimeField`
     :keyword queued: When the job was placed onto the queue
     :type queued: :class:`django.db.models.DateTimeField`
+    :keyword last_modified: When the queue model was last modified
+    :type last_modified: :class:`django.db.models.DateTimeField`
     :keyword docker_image: The docker image to be retrieved for job that is retrieved from job_type_rev.docker_image
     :type docker_image: str
     """
@@ -567,6 +593,7 @@ class Queue(models.Model):
 
     created = models.DateTimeField(auto_now_add=True)
     queued = models.DateTimeField()
+    last_modified = models.DateTimeField(auto_now=True, db_index=True)
 
     docker_image = models.TextField(default='')
 
@@ -6,6 +6,7 @@ import time
 import django
 from django.utils.timezone import now
 from django.test import TestCase, TransactionTestCase
+from mock import patch
 
 import job.test.utils as job_test_utils
 import product.test.utils as product_test_utils
@@ -144,6 +145,29 @@ class TestQueueManager(TransactionTestCase):
             else:
                 self.assertEqual(queue.id, queue_1.id)
 
+    def test_queue_jobs_same_job_type(self):
+        """Tests calling QueueManager.queue_jobs() with jobs of the same type that need different resources"""
+
+        job_type = job_test_utils.create_job_type()
+        job_1 = job_test_utils.create_job(job_type=job_type, input=JobData().get_dict(), num_exes=0,
+                                          input_file_size=10.0, status='PENDING')
+        job_2 = job_test_utils.create_job(job_type=job_type, input=JobData().get_dict(), num_exes=0,
+                                          input_file_size=500.0, status='PENDING')
+
+        with patch.object(Queue.objects, '_get_job_type_queue_values',
+                          wraps=Queue.objects._get_job_type_queue_values) as mock_values:
+            queued_job_ids = Queue.objects.queue_jobs([job_1, job_2])
+        self.assertEqual(mock_values.call_count, 1)
+        self.assertSetEqual(set(queued_job_ids), {job_1.id, job_2.id})
+
+        queue_1 = Queue.objects.get(job_id=job_1.id)
+        queue_2 = Queue.objects.get(job_id=job_2.id)
+        self.assertDictEqual(queue_1.interface, queue_2.interface)
+        self.assertEqual(queue_1.timeout, job_type.timeout)
+        resources_1 = queue_1.get_resources()
+        resources_2 = queue_2.get_resources()
+        self.assertEqual(resources_2.disk - resources_1.disk, 490.0)
+
 
 class TestQueueManagerHandleJobCancellation(TransactionTestCase):
 
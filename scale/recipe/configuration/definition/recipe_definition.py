@@ -12,11 +12,11 @@ from job.handlers.inputs.files import FilesInput
 from job.handlers.inputs.property import PropertyInput
 from job.models import JobType
 from job.seed.manifest import SeedManifest
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from recipe.configuration.data.exceptions import InvalidRecipeConnection
 from recipe.configuration.definition.exceptions import InvalidDefinition
 from recipe.handlers.graph import RecipeGraph
+from util.schema import validate
 
 
 DEFAULT_VERSION = '1.0'
@@ -1,13 +1,13 @@
 """Defines the class for managing a recipe definition"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from data.interface.parameter import FileParameter, JsonParameter
 from recipe.definition.connection import DependencyInputConnection, RecipeInputConnection
 from recipe.definition.exceptions import InvalidDefinition
 from recipe.definition.node import JobNodeDefinition
+from util.schema import validate
 
 
 DEFAULT_VERSION = '1.0'
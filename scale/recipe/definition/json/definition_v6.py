@@ -3,7 +3,6 @@ from __future__ import unicode_literals
 
 import copy
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from data.filter.filter import DataFilter
@@ -15,6 +14,7 @@ from recipe.definition.exceptions import InvalidDefinition
 from recipe.definition.json.definition_v1 import RecipeDefinitionV1
 from recipe.definition.node import ConditionNodeDefinition, JobNodeDefinition, RecipeNodeDefinition
 from util.rest import strip_schema_version
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
@@ -260,7 +260,7 @@ class RecipeDefinitionV6(object):
 
         try:
             if do_validate:
-                validate(self._definition, RECIPE_DEFINITION_SCHEMA)
+                validate(self._definition, RECIPE_DEFINITION_SCHEMA, memoize=True)
         except ValidationError as ex:
             raise InvalidDefinition('INVALID_DEFINITION', 'Invalid recipe definition: %s' % unicode(ex))
 
@@ -1,10 +1,10 @@
 """Manages the v6 recipe diff schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from recipe.diff.exceptions import InvalidDiff
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
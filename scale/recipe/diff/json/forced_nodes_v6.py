@@ -1,11 +1,11 @@
 """Manages the v6 forced nodes schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from recipe.diff.exceptions import InvalidDiff
 from recipe.diff.forced_nodes import ForcedNodes
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
@@ -1,11 +1,11 @@
 """Manages the v6 recipe instance schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from recipe.definition.node import ConditionNodeDefinition, JobNodeDefinition, RecipeNodeDefinition
 from recipe.instance.exceptions import InvalidRecipe
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
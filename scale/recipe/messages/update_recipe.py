@@ -20,6 +20,11 @@ from recipe.messages.process_recipe_input import create_process_recipe_input_mes
 from recipe.models import Recipe
 
 
+# This is the maximum number of root recipes that can fit in one message. This maximum ensures that every message of
+# this type is less than 25 KiB long and that each message can be processed quickly.
+MAX_NUM = 100
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +45,30 @@ def create_update_recipe_message(root_recipe_id, forced_nodes=None):
     return message
 
 
+def create_update_recipe_messages(root_recipe_ids, forced_nodes=None):
+    """Creates messages to update the given recipes from their root IDs, with up to MAX_NUM recipes per message
+
+    :param root_recipe_ids: The root recipe IDs
+    :type root_recipe_ids: list
+    :param forced_nodes: Describes the nodes that have been forced to reprocess
+    :type forced_nodes: :class:`recipe.diff.forced_nodes.ForcedNodes`
+    :return: The list of messages
+    :rtype: list
+    """
+
+    messages = []
+
+    message = None
+    for root_recipe_id in root_recipe_ids:
+        if not message or not message.can_fit_more():
+            message = UpdateRecipe()
+            message.forced_nodes = forced_nodes
+            messages.append(message)
+        message.add_recipe(root_recipe_id)
+
+    return messages
+
+
 def create_update_recipe_messages_from_node(root_recipe_ids):
     """Creates messages to update the given recipes from the root IDs. This is intended to be used by recipe nodes that
     have been updated and need to then update the recipes that contain the nodes.
@@ -56,14 +85,11 @@ def create_update_recipe_messages_from_node(root_recipe_ids):
     force_all_nodes = ForcedNodes()
     force_all_nodes.set_all_nodes()
 
-    messages = []
-    for root_recipe_id in root_recipe_ids:
-        messages.append(create_update_recipe_message(root_recipe_id, forced_nodes=force_all_nodes))
-    return messages
+    return create_update_recipe_messages(root_recipe_ids, forced_nodes=force_all_nodes)
 
 
 class UpdateRecipe(CommandMessage):
-    """Command message that evaluates and updates a recipe
+    """Command message that evaluates and updates one or more recipes
     """
 
     def __init__(self):
@@ -72,14 +98,74 @@ class UpdateRecipe(CommandMessage):
 
         super(UpdateRecipe, self).__init__('update_recipe')
 
-        self.root_recipe_id = None
+        self.root_recipe_ids = []
         self.forced_nodes = None
 
+    @property
+    def root_recipe_id(self):
+        """The root recipe ID of the first recipe to update
+
+        :returns: The root recipe ID, possibly None
+        :rtype: int
+        """
+
+        return self.root_recipe_ids[0] if self.root_recipe_ids else None
+
+    @root_recipe_id.setter
+    def root_recipe_id(self, value):
+        """Sets this message to update only the recipe with the given root ID
+
+        :param value: The root recipe ID
+        :type value: int
+        """
+
+        self.root_recipe_ids = [value]
+
+    def add_recipe(self, root_recipe_id):
+        """Adds the given root recipe ID to this message
+
+        :param root_recipe_id: The root recipe ID
+        :type root_recipe_id: int
+        """
+
+        self.root_recipe_ids.append(root_recipe_id)
+
+    def can_fit_more(self):
+        """Indicates whether more recipes can fit in this message
+
+        :return: True if more recipes can fit, False otherwise
+        :rtype: bool
+        """
+
+        return len(self.root_recipe_ids) < MAX_NUM
+
+    def can_merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.can_merge`
+        """
+
+        if not isinstance(message, UpdateRecipe) or not self._has_same_forced_nodes(message):
+            return False
+        return len(set(self.root_recipe_ids) | set(message.root_recipe_ids)) <= MAX_NUM
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        root_recipe_ids = set(self.root_recipe_ids)
+        for root_recipe_id in message.root_recipe_ids:
+            if root_recipe_id not in root_recipe_ids:
+                root_recipe_ids.add(root_recipe_id)
+                self.add_recipe(root_recipe_id)
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
 
-        json_dict = {'root_recipe_id': self.root_recipe_id}
+        # A single recipe uses the original format of this message
+        if len(self.root_recipe_ids) == 1:
+            json_dict = {'root_recipe_id': self.root_recipe_id}
+        else:
+            json_dict = {'root_recipe_ids': self.root_recipe_ids}
 
         if self.forced_nodes:
             json_dict['forced_nodes'] = convert_forced_nodes_to_v6(self.forced_nodes).get_dict()
@@ -92,7 +178,11 @@ class UpdateRecipe(CommandMessage):
         """
 
         message = UpdateRecipe()
-        message.root_recipe_id = json_dict['root_recipe_id']
+        if 'root_recipe_ids' in json_dict:
+            for root_recipe_id in json_dict['root_recipe_ids']:
+                message.add_recipe(root_recipe_id)
+        else:
+            message.root_recipe_id = json_dict['root_recipe_id']
         if 'forced_nodes' in json_dict:
             message.forced_nodes = ForcedNodesV6(json_dict['forced_nodes']).get_forced_nodes()
 
@@ -102,19 +192,48 @@ class UpdateRecipe(CommandMessage):
         """See :meth:`messaging.messages.message.CommandMessage.execute`
         """
 
-        recipe = Recipe.objects.get_recipe_instance_from_root(self.root_recipe_id)
-        recipe_model = recipe.recipe_model
+        recipes = Recipe.objects.get_recipe_instances_from_root(self.root_recipe_ids)
         when = now()
 
-        jobs_to_update = recipe.get_jobs_to_update()
-        blocked_job_ids = jobs_to_update['BLOCKED']
-        pending_job_ids = jobs_to_update['PENDING']
-
-        nodes_to_create = recipe.get_nodes_to_create()
-        nodes_to_process_input = recipe.get_nodes_to_process_input()
-
-        if not recipe_model.is_completed and recipe.has_completed():
-            Recipe.objects.complete_recipes([recipe_model.id], when)
+        blocked_job_ids = []
+        pending_job_ids = []
+        completed_recipe_ids = []
+        create_node_messages = []
+        process_condition_ids = []
+        process_job_ids = []
+        process_recipe_ids = []
+        for root_recipe_id in self.root_recipe_ids:
+            if root_recipe_id not in recipes:
+                logger.error('No recipe found for root recipe ID %d', root_recipe_id)
+                continue
+            recipe = recipes[root_recipe_id]
+            recipe_model = recipe.recipe_model
+
+            jobs_to_update = recipe.get_jobs_to_update()
+            blocked_job_ids.extend(jobs_to_update['BLOCKED'])
+            pending_job_ids.extend(jobs_to_update['PENDING'])
+
+            nodes_to_create = recipe.get_nodes_to_create()
+            nodes_to_process_input = recipe.get_nodes_to_process_input()
+
+            if not recipe_model.is_completed and recipe.has_completed():
+                completed_recipe_ids.append(recipe_model.id)
+
+            # Create new messages to create recipe nodes, which are specific to each recipe
+            create_node_messages.extend(self._create_node_messages(recipe_model, nodes_to_create,
+                                                                   nodes_to_process_input))
+
+            # Gather the recipe nodes that need to process their input
+            for node_name, node in nodes_to_process_input.items():
+                if node.node_type == ConditionNodeDefinition.NODE_TYPE:
+                    process_condition_ids.append(node.condition.id)
+                elif node.node_type == JobNodeDefinition.NODE_TYPE:
+                    process_job_ids.append(node.job.id)
+                elif node.node_type == RecipeNodeDefinition.NODE_TYPE:
+                    process_recipe_ids.append(node.recipe.id)
+
+        if completed_recipe_ids:
+            Recipe.objects.complete_recipes(completed_recipe_ids, when)
 
         # Create new messages for changing job statuses
         if len(blocked_job_ids):
@@ -124,7 +243,36 @@ class UpdateRecipe(CommandMessage):
             logger.info('Found %d job(s) that should transition to PENDING', len(pending_job_ids))
             self.new_messages.extend(create_pending_jobs_messages(pending_job_ids, when))
 
-        # Create new messages to create recipe nodes
+        self.new_messages.extend(create_node_messages)
+
+        # Create new messages for processing recipe node input
+        if len(process_condition_ids):
+            logger.info('Found %d condition(s) to process their input', len(process_condition_ids))
+            self.new_messages.extend(create_process_condition_messages(process_condition_ids))
+        if len(process_job_ids):
+            logger.info('Found %d job(s) to process their input and move to the queue', len(process_job_ids))
+            self.new_messages.extend(create_process_job_input_messages(process_job_ids))
+        if len(process_recipe_ids):
+            logger.info('Found %d sub-recipe(s) to process their input and begin processing', len(process_recipe_ids))
+            self.new_messages.extend(create_process_recipe_input_messages(process_recipe_ids))
+
+        return True
+
+    def _create_node_messages(self, recipe_model, nodes_to_create, nodes_to_process_input):
+        """Creates the messages to create the given nodes for the given recipe. Nodes that are created with their input
+        processed are removed from nodes_to_process_input.
+
+        :param recipe_model: The recipe model
+        :type recipe_model: :class:`recipe.models.Recipe`
+        :param nodes_to_create: The node definitions to create stored by node name
+        :type nodes_to_create: dict
+        :param nodes_to_process_input: The node instances that need to process their input stored by node name
+        :type nodes_to_process_input: dict
+        :return: The list of messages
+        :rtype: list
+        """
+
+        messages = []
         conditions = []
         recipe_jobs = []
         subrecipes = []
@@ -144,35 +292,27 @@ class UpdateRecipe(CommandMessage):
                 subrecipe = SubRecipe(node_def.recipe_type_name, node_def.revision_num, node_name, process_input)
                 subrecipes.append(subrecipe)
         if len(conditions):
-            logger.info('Found %d condition(s) to create for this recipe', len(conditions))
-            self.new_messages.extend(create_conditions_messages(recipe_model, conditions))
+            logger.info('Found %d condition(s) to create for recipe %d', len(conditions), recipe_model.id)
+            messages.extend(create_conditions_messages(recipe_model, conditions))
         if len(recipe_jobs):
-            logger.info('Found %d job(s) to create for this recipe', len(recipe_jobs))
-            self.new_messages.extend(create_jobs_messages_for_recipe(recipe_model, recipe_jobs))
+            logger.info('Found %d job(s) to create for recipe %d', len(recipe_jobs), recipe_model.id)
+            messages.extend(create_jobs_messages_for_recipe(recipe_model, recipe_jobs))
         if len(subrecipes):
-            logger.info('Found %d sub-recipe(s) to create for this recipe', len(subrecipes))
-            self.new_messages.extend(create_subrecipes_messages(recipe_model, subrecipes,
-                                                                forced_nodes=self.forced_nodes))
+            logger.info('Found %d sub-recipe(s) to create for recipe %d', len(subrecipes), recipe_model.id)
+            messages.extend(create_subrecipes_messages(recipe_model, subrecipes, forced_nodes=self.forced_nodes))
 
-        # Create new messages for processing recipe node input
-        process_condition_ids = []
-        process_job_ids = []
-        process_recipe_ids = []
-        for node_name, node in nodes_to_process_input.items():
-            if node.node_type == ConditionNodeDefinition.NODE_TYPE:
-                process_condition_ids.append(node.condition.id)
-            elif node.node_type == JobNodeDefinition.NODE_TYPE:
-                process_job_ids.append(node.job.id)
-            elif node.node_type == RecipeNodeDefinition.NODE_TYPE:
-                process_recipe_ids.append(node.recipe.id)
-        if len(process_condition_ids):
-            logger.info('Found %d condition(s) to process their input', len(process_condition_ids))
-            self.new_messages.extend(create_process_condition_messages(process_condition_ids))
-        if len(process_job_ids):
-            logger.info('Found %d job(s) to process their input and move to the queue', len(process_job_ids))
-            self.new_messages.extend(create_process_job_input_messages(process_job_ids))
-        if len(process_recipe_ids):
-            logger.info('Found %d sub-recipe(s) to process their input and begin processing', len(process_recipe_ids))
-            self.new_messages.extend(create_process_recipe_input_messages(process_recipe_ids))
+        return messages
 
-        return True
+    def _has_same_forced_nodes(self, message):
+        """Indicates whether the given message has the same forced nodes as this message
+
+        :param message: The other message
+        :type message: :class:`recipe.messages.update_recipe.UpdateRecipe`
+        :return: True if the forced nodes are the same, False otherwise
+        :rtype: bool
+        """
+
+        if not self.forced_nodes or not message.forced_nodes:
+            return not self.forced_nodes and not message.forced_nodes
+        return (convert_forced_nodes_to_v6(self.forced_nodes).get_dict() ==
+                convert_forced_nodes_to_v6(message.forced_nodes).get_dict())
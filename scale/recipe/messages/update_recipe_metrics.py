@@ -95,6 +95,24 @@ class UpdateRecipeMetrics(CommandMessage):
 
         return len(self._recipe_ids) < MAX_NUM
 
+    def can_merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.can_merge`
+        """
+
+        if not isinstance(message, UpdateRecipeMetrics):
+            return False
+        return len(set(self._recipe_ids) | set(message._recipe_ids)) <= MAX_NUM
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        recipe_ids = set(self._recipe_ids)
+        for recipe_id in message._recipe_ids:
+            if recipe_id not in recipe_ids:
+                recipe_ids.add(recipe_id)
+                self.add_recipe(recipe_id)
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
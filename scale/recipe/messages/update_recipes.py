@@ -4,7 +4,7 @@ from __future__ import unicode_literals
 import logging
 
 from messaging.messages.message import CommandMessage
-from recipe.messages.update_recipe import create_update_recipe_message
+from recipe.messages.update_recipe import create_update_recipe_messages
 from recipe.models import Recipe
 
 # This is the maximum number of recipe models that can fit in one message. This maximum ensures that every message of
@@ -51,6 +51,24 @@ class UpdateRecipes(CommandMessage):
 
         return self._count < MAX_NUM
 
+    def can_merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.can_merge`
+        """
+
+        if not isinstance(message, UpdateRecipes):
+            return False
+        return len(set(self._recipe_ids) | set(message._recipe_ids)) <= MAX_NUM
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        recipe_ids = set(self._recipe_ids)
+        for recipe_id in message._recipe_ids:
+            if recipe_id not in recipe_ids:
+                recipe_ids.add(recipe_id)
+                self.add_recipe(recipe_id)
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
@@ -72,9 +90,15 @@ class UpdateRecipes(CommandMessage):
         """See :meth:`messaging.messages.message.CommandMessage.execute`
         """
 
-        for recipe in Recipe.objects.filter(id__in=self._recipe_ids):
+        root_recipe_ids = []
+        qry = Recipe.objects.filter(id__in=self._recipe_ids).only('id', 'root_superseded_recipe_id')
+        for recipe in qry.order_by('id'):
             root_recipe_id = recipe.root_superseded_recipe_id if recipe.root_superseded_recipe_id else recipe.id
-            self.new_messages.append(create_update_recipe_message(root_recipe_id))
+            if root_recipe_id not in root_recipe_ids:
+                root_recipe_ids.append(root_recipe_id)
+
+        # Each message evaluates many recipes at once
+        self.new_messages.extend(create_update_recipe_messages(root_recipe_ids))
 
         logger.info('Found %d message(s) to update recipes', len(self.new_messages))
 
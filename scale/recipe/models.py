@@ -27,6 +27,7 @@ from storage.models import ScaleFile
 from trigger.configuration.exceptions import InvalidTriggerType
 from trigger.models import TriggerRule
 from util import rest as rest_utils
+from util.cache import LruCache
 
 
 RecipeNodeCopy = namedtuple('RecipeNodeCopy', ['superseded_recipe_id', 'recipe_id', 'node_names'])
@@ -36,6 +37,9 @@ RecipeNodeOutput = namedtuple('RecipeNodeOutput', ['node_name', 'node_type', 'id
 
 INPUT_FILE_BATCH_SIZE = 500  # Maximum batch size for creating RecipeInputFile models
 
+# Recipe type revisions are immutable, so their parsed definitions are cached by revision ID for the life of the process
+REVISION_DEFINITION_CACHE = LruCache(1000)
+
 # IMPORTANT NOTE: Locking order
 # Always adhere to the following model order for obtaining row locks via select_for_update() in order to prevent
 # deadlocks and ensure query efficiency
@@ -520,6 +524,39 @@ class RecipeManager(models.Manager):
         recipe_nodes = RecipeNode.objects.get_recipe_nodes(recipe.id)
         return RecipeInstance(recipe.recipe_type_rev.get_definition(), recipe, recipe_nodes)
 
+    def get_recipe_instances_from_root(self, root_recipe_ids):
+        """Returns the non-superseded recipe instances for the given root recipe IDs. The recipes and all of their
+        nodes are retrieved with two queries, regardless of the number of recipes.
+
+        :param root_recipe_ids: The root recipe IDs
+        :type root_recipe_ids: list
+        :returns: The recipe instances stored by root recipe ID, a root recipe ID without a non-superseded recipe is
+            omitted
+        :rtype: dict
+        """
+
+        qry = self.select_related('recipe_type_rev')
+        qry = qry.filter(models.Q(id__in=root_recipe_ids) | models.Q(root_superseded_recipe_id__in=root_recipe_ids))
+        root_recipe_ids = set(root_recipe_ids)
+        recipes = {}  # {Root recipe ID: recipe model}
+        for recipe in qry.filter(is_superseded=False).order_by('-created'):
+            if recipe.root_superseded_recipe_id in root_recipe_ids:
+                root_recipe_id = recipe.root_superseded_recipe_id
+            else:
+                root_recipe_id = recipe.id
+            if root_recipe_id not in recipes:
+                recipes[root_recipe_id] = recipe
+
+        recipe_nodes = {recipe.id: [] for recipe in recipes.values()}
+        for recipe_node in RecipeNode.objects.get_recipe_nodes_for_recipes(recipe_nodes.keys()):
+            recipe_nodes[recipe_node.recipe_id].append(recipe_node)
+
+        instances = {}
+        for root_recipe_id, recipe in recipes.items():
+            definition = recipe.recipe_type_rev.get_definition()
+            instances[root_recipe_id] = RecipeInstance(definition, recipe, recipe_nodes[recipe.id])
+        return instances
+
     def get_recipe_with_interfaces(self, recipe_id):
         """Gets the recipe model for the given ID with related recipe_type_rev and recipe__recipe_type_rev models
 
@@ -1377,6 +1414,17 @@ class RecipeNodeManager(models.Manager):
 
         return self.filter(recipe_id=recipe_id).select_related('sub_recipe', 'job', 'condition')
 
+    def get_recipe_nodes_for_recipes(self, recipe_ids):
+        """Returns the recipe_node models with related condition, job, and sub_recipe models for the given recipe IDs
+
+        :param recipe_ids: The recipe IDs
+        :type recipe_ids: list
+        :returns: The recipe_node models for the recipes
+        :rtype: list
+        """
+
+        return self.filter(recipe_id__in=recipe_ids).select_related('sub_recipe', 'job', 'condition')
+
     def get_recipe_node_outputs(self, recipe_id):
         """Returns the output data for each recipe node for the given recipe ID
 
@@ -2046,13 +2094,19 @@ class RecipeTypeRevision(models.Model):
     objects = RecipeTypeRevisionManager()
 
     def get_definition(self):
-        """Returns the definition for this recipe type revision
+        """Returns the definition for this recipe type revision. The definition is shared with other callers, so it
+        must not be modified.
 
         :returns: The definition for this revision
         :rtype: :class:`recipe.definition.definition.RecipeDefinition`
         """
 
-        return RecipeDefinitionV6(definition=self.definition, do_validate=False).get_definition()
+        def parse_definition():
+            return RecipeDefinitionV6(definition=self.definition, do_validate=False).get_definition()
+
+        if self.id is None:
+            return parse_definition()
+        return REVISION_DEFINITION_CACHE.get(self.id, parse_definition)
 
     def get_input_interface(self):
         """Returns the input interface for this revision
@@ -15,7 +15,8 @@ from recipe.diff.forced_nodes import ForcedNodes
 from recipe.diff.json.forced_nodes_v6 import convert_forced_nodes_to_v6
 from recipe.messages.create_conditions import Condition
 from recipe.messages.create_recipes import SUB_RECIPE_TYPE, SubRecipe
-from recipe.messages.update_recipe import create_update_recipe_message, UpdateRecipe
+from recipe.messages.update_recipe import (create_update_recipe_message, create_update_recipe_messages,
+                                           create_update_recipe_messages_from_node, UpdateRecipe)
 from recipe.models import RecipeNode
 from recipe.test import utils as recipe_test_utils
 
@@ -306,3 +307,69 @@ class TestUpdateRecipe(TestCase):
         self.assertEqual(process_job_input_msg.job_id, job_c.id)
         # Check message to process recipe input
         self.assertEqual(process_recipe_input_msg.recipe_id, recipe_b.id)
+
+    def _create_recipe_with_blocked_job(self):
+        """Creates a recipe with a failed job and a pending child job that should be BLOCKED"""
+
+        data_dict = convert_data_to_v6_json(Data()).get_dict()
+        job_failed = job_test_utils.create_job(status='FAILED', input=data_dict)
+        job_pending = job_test_utils.create_job(status='PENDING')
+        definition = RecipeDefinition(Interface())
+        definition.add_job_node('job_failed', job_failed.job_type.name, job_failed.job_type.version,
+                                job_failed.job_type_rev.revision_num)
+        definition.add_job_node('job_pending', job_pending.job_type.name, job_pending.job_type.version,
+                                job_pending.job_type_rev.revision_num)
+        definition.add_dependency('job_failed', 'job_pending')
+        definition_dict = convert_recipe_definition_to_v6_json(definition).get_dict()
+        recipe_type = recipe_test_utils.create_recipe_type(definition=definition_dict)
+        recipe = recipe_test_utils.create_recipe(recipe_type=recipe_type)
+        recipe_test_utils.create_recipe_job(recipe=recipe, job_name='job_failed', job=job_failed)
+        recipe_test_utils.create_recipe_job(recipe=recipe, job_name='job_pending', job=job_pending)
+        return recipe, job_pending
+
+    def test_json_batch(self):
+        """Tests converting an UpdateRecipe message for many recipes to and from JSON"""
+
+        message = create_update_recipe_messages_from_node([1, 2, 3])[0]
+
+        new_message = UpdateRecipe.from_json(message.to_json())
+
+        self.assertListEqual(new_message.root_recipe_ids, [1, 2, 3])
+        self.assertEqual(new_message.root_recipe_id, 1)
+        self.assertTrue(new_message.forced_nodes.all_nodes)
+
+    def test_create_messages_batch(self):
+        """Tests that create_update_recipe_messages() splits recipes into messages of up to the maximum size"""
+
+        messages = create_update_recipe_messages(range(1, 251))
+
+        self.assertListEqual([len(message.root_recipe_ids) for message in messages], [100, 100, 50])
+        self.assertIsNone(messages[0].forced_nodes)
+
+    def test_merge(self):
+        """Tests merging UpdateRecipe messages, which requires the same forced nodes"""
+
+        message_1 = create_update_recipe_messages_from_node([1, 2])[0]
+        message_2 = create_update_recipe_messages_from_node([2, 3])[0]
+        message_3 = create_update_recipe_message(4)
+
+        self.assertTrue(message_1.can_merge(message_2))
+        self.assertFalse(message_1.can_merge(message_3))
+        message_1.merge(message_2)
+        self.assertListEqual(message_1.root_recipe_ids, [1, 2, 3])
+
+    def test_execute_batch(self):
+        """Tests calling UpdateRecipe.execute() for many recipes at once"""
+
+        recipe_1, job_1 = self._create_recipe_with_blocked_job()
+        recipe_2, job_2 = self._create_recipe_with_blocked_job()
+
+        message = create_update_recipe_messages([recipe_1.id, recipe_2.id])[0]
+        result = message.execute()
+        self.assertTrue(result)
+
+        # The jobs of both recipes are set to BLOCKED with one message
+        self.assertEqual(len(message.new_messages), 1)
+        msg = message.new_messages[0]
+        self.assertEqual(msg.type, 'blocked_jobs')
+        self.assertListEqual(msg._blocked_job_ids, [job_1.id, job_2.id])
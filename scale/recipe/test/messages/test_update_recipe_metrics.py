@@ -8,7 +8,7 @@ from job.models import Job
 from job.test import utils as job_test_utils
 from recipe.diff.forced_nodes import ForcedNodes
 from recipe.diff.json.forced_nodes_v6 import convert_forced_nodes_to_v6
-from recipe.messages.update_recipe_metrics import UpdateRecipeMetrics
+from recipe.messages.update_recipe_metrics import MAX_NUM, UpdateRecipeMetrics
 from recipe.models import Recipe, RecipeNode
 from recipe.test import utils as recipe_test_utils
 
@@ -18,6 +18,29 @@ class TestUpdateRecipes(TestCase):
     def setUp(self):
         django.setup()
 
+    def test_merge(self):
+        """Tests merging UpdateRecipeMetrics messages"""
+
+        message_1 = UpdateRecipeMetrics()
+        message_1.add_recipe(1)
+        message_1.add_recipe(2)
+        message_2 = UpdateRecipeMetrics()
+        message_2.add_recipe(2)
+        message_2.add_recipe(3)
+
+        self.assertTrue(message_1.can_merge(message_2))
+        message_1.merge(message_2)
+        self.assertListEqual(message_1.to_json()['recipe_ids'], [1, 2, 3])
+
+        # Merging must not exceed the maximum number of recipes, though duplicate recipes do not count
+        full_message = UpdateRecipeMetrics()
+        for recipe_id in range(1, MAX_NUM + 1):
+            full_message.add_recipe(recipe_id)
+        self.assertTrue(full_message.can_merge(message_1))
+        extra_message = UpdateRecipeMetrics()
+        extra_message.add_recipe(MAX_NUM + 1)
+        self.assertFalse(full_message.can_merge(extra_message))
+
     def test_json(self):
         """Tests coverting a UpdateRecipeMetrics message to and from JSON"""
 
@@ -87,9 +87,9 @@ class TestUpdateRecipes(TestCase):
         result = new_message.execute()
 
         self.assertTrue(result)
-        self.assertEqual(len(new_message.new_messages), 2)
-        for msg in new_message.new_messages:
-            self.assertEqual(msg.type, 'update_recipe')
+        self.assertEqual(len(new_message.new_messages), 1)
+        self.assertEqual(new_message.new_messages[0].type, 'update_recipe')
+        self.assertListEqual(new_message.new_messages[0].root_recipe_ids, [self.recipe_1.id, self.recipe_2.id])
 
     def test_execute(self):
         """Tests calling UpdateRecipes.execute() successfully"""
@@ -269,9 +269,9 @@ class TestUpdateRecipes(TestCase):
         result = message.execute()
         self.assertTrue(result)
 
-        self.assertEqual(len(message.new_messages), 4)
-        for msg in message.new_messages:
-            self.assertEqual(msg.type, 'update_recipe')
+        self.assertEqual(len(message.new_messages), 1)
+        self.assertEqual(message.new_messages[0].type, 'update_recipe')
+        self.assertEqual(len(message.new_messages[0].root_recipe_ids), 4)
 
         # Test executing message again
         message_json_dict = message.to_json()
@@ -280,6 +280,6 @@ class TestUpdateRecipes(TestCase):
         self.assertTrue(result)
 
         # Make sure the same messages are returned
-        self.assertEqual(len(message.new_messages), 4)
-        for msg in message.new_messages:
-            self.assertEqual(msg.type, 'update_recipe')
+        self.assertEqual(len(message.new_messages), 1)
+        self.assertEqual(message.new_messages[0].type, 'update_recipe')
+        self.assertEqual(len(message.new_messages[0].root_recipe_ids), 4)
@@ -258,6 +258,19 @@ class TestRecipeManager(TransactionTestCase):
     def setUp(self):
         django.setup()
 
+    def test_get_recipe_instances_from_root(self):
+        """Tests calling RecipeManager.get_recipe_instances_from_root()"""
+
+        recipe_1 = recipe_test_utils.create_recipe(is_superseded=True)
+        recipe_2 = recipe_test_utils.create_recipe(superseded_recipe=recipe_1)
+        recipe_3 = recipe_test_utils.create_recipe()
+
+        instances = Recipe.objects.get_recipe_instances_from_root([recipe_1.id, recipe_3.id, 9999999])
+
+        self.assertSetEqual(set(instances.keys()), {recipe_1.id, recipe_3.id})
+        self.assertEqual(instances[recipe_1.id].recipe_model.id, recipe_2.id)
+        self.assertEqual(instances[recipe_3.id].recipe_model.id, recipe_3.id)
+
     def test_process_recipe_input(self):
         """Tests calling RecipeManager.process_recipe_input()"""
 
@@ -817,6 +830,27 @@ class TestRecipeTypeManagerEditRecipeType(TransactionTestCase):
         num_of_revs = RecipeTypeRevision.objects.filter(recipe_type_id=recipe_type.id).count()
         self.assertEqual(num_of_revs, 1)
 
+class TestRecipeTypeRevision(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.recipe_type = recipe_test_utils.create_recipe_type_v6()
+
+    def test_get_definition_cached(self):
+        """Tests that the definition of a revision is only parsed once for all models of the revision"""
+
+        revision = RecipeTypeRevision.objects.get_revision(self.recipe_type.name, self.recipe_type.revision_num)
+        definition = revision.get_definition()
+
+        other_revision = RecipeTypeRevision.objects.get(id=revision.id)
+        self.assertIs(other_revision.get_definition(), definition)
+        self.assertIs(other_revision.get_input_interface(), definition.input_interface)
+
+        # Unsaved revisions are not cached
+        new_revision = RecipeTypeRevision(definition=revision.definition)
+        self.assertIsNot(new_revision.get_definition(), definition)
+
 class TestRecipeTypeSubLinkManager(TransactionTestCase):
 
     def setUp(self):
@@ -828,7 +828,7 @@ class RecipeReprocessView(GenericAPIView):
         if priority is not None:
             Job.objects.filter(event_id=event.id).update(priority=priority)
             from queue.models import Queue
-            Queue.objects.filter(job__event_id=event.id).update(priority=priority)
+            Queue.objects.filter(job__event_id=event.id).update(priority=priority, last_modified=now())
 
         new_recipe = Recipe.objects.get(root_superseded_recipe_id=root_recipe_id, is_superseded=False)
         try:
@@ -52,6 +52,13 @@ if ELASTICSEARCH_URLS:
 # Broker URL for connection to messaging backend. Bootstrap must populate.
 BROKER_URL = os.environ.get('SCALE_BROKER_URL', BROKER_URL)
 QUEUE_NAME = os.environ.get('SCALE_QUEUE_NAME', QUEUE_NAME)
+MESSAGE_CODEC = os.environ.get('SCALE_MESSAGE_CODEC', MESSAGE_CODEC) or None
+MESSAGE_HANDLER_WORKERS = int(os.environ.get('SCALE_MESSAGE_HANDLER_WORKERS', MESSAGE_HANDLER_WORKERS))
+MESSAGE_HANDLER_WORKER_TYPE = os.environ.get('SCALE_MESSAGE_HANDLER_WORKER_TYPE', MESSAGE_HANDLER_WORKER_TYPE)
+MESSAGE_HANDLER_BATCH_SIZE = int(os.environ.get('SCALE_MESSAGE_HANDLER_BATCH_SIZE', MESSAGE_HANDLER_BATCH_SIZE))
+INPUT_CACHE_HOST_PATH = os.environ.get('SCALE_INPUT_CACHE_HOST_PATH', INPUT_CACHE_HOST_PATH) or None
+INPUT_CACHE_SIZE_LIMIT = int(os.environ.get('SCALE_INPUT_CACHE_SIZE_LIMIT', INPUT_CACHE_SIZE_LIMIT))
+FILE_CHECKSUM_ALGORITHM = os.environ.get('SCALE_FILE_CHECKSUM_ALGORITHM', FILE_CHECKSUM_ALGORITHM) or None
 
 DB_HOST = os.environ.get('SCALE_DB_HOST', '')
 if DB_HOST == '':
@@ -15,6 +15,7 @@ REST_API_APPS = [
     'error',
     'ingest',
     'job',
+    'messaging',
     'metrics',
     'node',
     'port',
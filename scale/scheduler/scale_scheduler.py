@@ -127,6 +127,10 @@ class ScaleScheduler(MesosScheduler):
         task_update_thread.daemon = True
         task_update_thread.start()
 
+        self._scheduler_status_thread.threads = [self._messaging_thread, self._recon_thread,
+                                                 self._scheduler_status_thread, self._scheduling_thread,
+                                                 self._sync_thread, self._task_handling_thread, self._task_update_thread]
+
     def registered(self, driver, frameworkId, masterInfo):
         """
         Invoked when the scheduler successfully registers with a Mesos master.
@@ -235,6 +239,7 @@ class ScaleScheduler(MesosScheduler):
 
         node_mgr.register_agents(agents.values())
         resource_mgr.add_new_offers(resource_offers)
+        self._scheduling_thread.wake()
 
         num_offers = len(resource_offers)
         logger.info('Received %d offer(s) with %s from %d node(s)', num_offers, total_resources, len(agents))
@@ -338,6 +343,13 @@ class ScaleScheduler(MesosScheduler):
 
         scheduler_mgr.add_task_update_counts(was_task_finished, was_job_finished)
 
+        # Wake up the background threads that act on this update instead of waiting for their next loop
+        self._task_update_thread.wake()
+        if was_task_finished:
+            # The next task of the job execution can be scheduled and any messages for the finished task can be sent
+            self._messaging_thread.wake()
+            self._scheduling_thread.wake()
+
         duration = now() - started
         msg = 'Scheduler statusUpdate() took %.3f seconds'
         if duration > ScaleScheduler.NORMAL_WARN_THRESHOLD:
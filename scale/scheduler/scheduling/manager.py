@@ -26,6 +26,8 @@ from scheduler.manager import scheduler_mgr
 from scheduler.node.manager import node_mgr
 from scheduler.resources.agent import ResourceSet
 from scheduler.resources.manager import resource_mgr
+from scheduler.scheduling.node_matrix import NodeScoringMatrix, NUMPY_AVAILABLE
+from scheduler.scheduling.queue_index import QueueIndex
 from scheduler.scheduling.scheduling_node import SchedulingNode
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.sync.workspace_manager import workspace_mgr
@@ -56,6 +58,7 @@ class SchedulingManager(object):
         """Constructor
         """
 
+        self._queue_index = QueueIndex()
         self._waiting_tasks = {}  # {Task ID: int}
 
     def perform_scheduling(self, driver, when):
@@ -313,7 +316,10 @@ class SchedulingManager(object):
         ignore_job_type_ids = self._calculate_job_types_to_ignore(job_types, job_type_limits)
         started = now()
 
-        for queue in Queue.objects.get_queue(scheduler_mgr.config.queue_mode, ignore_job_type_ids)[:QUEUE_LIMIT]:
+        node_matrix = NodeScoringMatrix(nodes.values(), job_type_resources) if NUMPY_AVAILABLE else None
+        self._queue_index.sync_with_database(started)
+        queues = self._queue_index.get_queue(scheduler_mgr.config.queue_mode, ignore_job_type_ids, QUEUE_LIMIT)
+        for queue in queues:
             job_exe = QueuedJobExecution(queue)
             
             # Canceled job executions get processed as scheduled executions
@@ -355,7 +361,7 @@ class SchedulingManager(object):
                 continue
 
             # Try to schedule job execution and adjust job type limit if needed
-            if self._schedule_new_job_exe(job_exe, nodes, job_type_resources):
+            if self._schedule_new_job_exe(job_exe, nodes, job_type_resources, node_matrix):
                 scheduled_job_executions.append(job_exe)
                 if job_type_id in job_type_limits:
                     job_type_limits[job_type_id] -= 1
@@ -391,6 +397,13 @@ class SchedulingManager(object):
         configurator = ScheduledExecutionConfigurator(workspaces)
 
         with transaction.atomic():
+            # The queue index may briefly hold queue models that were deleted elsewhere (such as by a job purge), so lock
+            # the queue models and only process the job executions that are still on the queue
+            queue_ids = [queued_job_exe.id for queued_job_exe in queued_job_executions]
+            query = Queue.objects.select_for_update().filter(id__in=queue_ids)
+            existing_queue_ids = set(query.values_list('id', flat=True))
+            queued_job_executions = [qje for qje in queued_job_executions if qje.id in existing_queue_ids]
+
             # Bulk create the job execution models
             job_exe_models = []
             scheduled_models = {}  # {queue ID: (job_exe model, config)}
@@ -409,10 +422,8 @@ class SchedulingManager(object):
             JobExecution.objects.bulk_create(job_exe_models)
 
             # Create running and canceled job executions
-            queue_ids = []
             canceled_job_exe_end_models = []
             for queued_job_exe in queued_job_executions:
-                queue_ids.append(queued_job_exe.id)
                 if queued_job_exe.is_canceled:
                     job_exe_model = canceled_models[queued_job_exe.id]
                     canceled_job_exe_end_models.append(job_exe_model.create_canceled_job_exe_end_model(started))
@@ -433,7 +444,8 @@ class SchedulingManager(object):
                 job_exe_mgr.add_canceled_job_exes(canceled_job_exe_end_models)
 
             # Delete queue models
-            Queue.objects.filter(id__in=queue_ids).delete()
+            Queue.objects.filter(id__in=existing_queue_ids).delete()
+        self._queue_index.remove_queues(queue_ids)
 
         duration = now() - started
         msg = 'Queries to process scheduled jobs took %.3f seconds'
@@ -444,7 +456,7 @@ class SchedulingManager(object):
 
         return running_job_exes
 
-    def _schedule_new_job_exe(self, job_exe, nodes, job_type_resources):
+    def _schedule_new_job_exe(self, job_exe, nodes, job_type_resources, node_matrix=None):
         """Schedules the given job execution on the queue on one of the available nodes, if possible
 
         :param job_exe: The job execution to schedule
@@ -453,10 +465,46 @@ class SchedulingManager(object):
         :type nodes: dict
         :param job_type_resources: The list of all of the job type resource requirements
         :type job_type_resources: list
+        :param node_matrix: The packed resources of the available nodes for scoring them all at once, possibly None
+        :type node_matrix: :class:`scheduler.scheduling.node_matrix.NodeScoringMatrix`
         :returns: True if scheduled, False otherwise
         :rtype: bool
         """
 
+        if node_matrix and not node_matrix.has_unknown_resources(job_exe.required_resources):
+            best_scheduling_node, best_reservation_node = node_matrix.find_best_nodes(job_exe)
+        else:
+            best_scheduling_node, best_reservation_node = self._score_nodes(job_exe, nodes, job_type_resources)
+
+        # Schedule the job execution on the best node
+        if best_scheduling_node:
+            if best_scheduling_node.accept_new_job_exe(job_exe):
+                if node_matrix:
+                    node_matrix.update_node(best_scheduling_node.node_id)
+                return True
+
+        # Could not schedule job execution, reserve a node to run this execution if possible
+        if best_reservation_node:
+            del nodes[best_reservation_node.node_id]
+            if node_matrix:
+                node_matrix.remove_node(best_reservation_node.node_id)
+
+        return False
+
+    def _score_nodes(self, job_exe, nodes, job_type_resources):
+        """Scores each of the available nodes in turn for the given job execution and returns the best node for
+        scheduling it or, if it cannot be scheduled on any node, the best node for it to reserve
+
+        :param job_exe: The job execution to score
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :param nodes: The dict of available scheduling nodes stored by node ID
+        :type nodes: dict
+        :param job_type_resources: The list of all of the job type resource requirements
+        :type job_type_resources: list
+        :returns: A tuple of the best scheduling node and the best reservation node, either of which may be None
+        :rtype: tuple
+        """
+
         best_scheduling_node = None
         best_scheduling_score = None
         best_reservation_node = None
@@ -483,16 +531,7 @@ class SchedulingManager(object):
                         best_reservation_node = node
                         best_reservation_score = score
 
-        # Schedule the job execution on the best node
-        if best_scheduling_node:
-            if best_scheduling_node.accept_new_job_exe(job_exe):
-                return True
-
-        # Could not schedule job execution, reserve a node to run this execution if possible
-        if best_reservation_node:
-            del nodes[best_reservation_node.node_id]
-
-        return False
+        return best_scheduling_node, best_reservation_node
 
     def _schedule_new_job_exes(self, framework_id, nodes, job_types, job_type_limits, job_type_resources, workspaces):
         """Schedules new job executions from the queue and adds them to the appropriate node
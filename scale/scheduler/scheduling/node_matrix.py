@@ -0,0 +1,270 @@
+"""Defines the class that scores job executions against all scheduling nodes at once using packed resource arrays"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    logger.warning('NumPy not available, scheduling nodes will be scored one at a time')
+    NUMPY_AVAILABLE = False
+
+# The standard resources that every node resources object defines
+STANDARD_RESOURCES = ['cpus', 'mem', 'disk', 'gpus']
+
+
+class NodeScoringMatrix(object):
+    """This class packs the resources of a set of scheduling nodes and the job type resource requirements into arrays (one
+    column per resource name) so that fit checks and fragmentation scores for a job execution are computed for all nodes
+    at once. The results are identical to calling :meth:`scheduler.scheduling.scheduling_node.SchedulingNode.
+    score_job_exe_for_scheduling` and :meth:`scheduler.scheduling.scheduling_node.SchedulingNode.
+    score_job_exe_for_reservation` on each node. This class requires NumPy and is NOT thread-safe.
+    """
+
+    def __init__(self, nodes, job_type_resources):
+        """Constructor
+
+        :param nodes: The list of scheduling nodes, in the order that ties should be broken
+        :type nodes: [:class:`scheduler.scheduling.scheduling_node.SchedulingNode`]
+        :param job_type_resources: The list of all of the job type resource requirements
+        :type job_type_resources: [:class:`node.resources.node_resources.NodeResources`]
+        """
+
+        self._nodes = list(nodes)
+        self._node_indexes = {}  # {Node ID: Row index}
+        for i, node in enumerate(self._nodes):
+            self._node_indexes[node.node_id] = i
+
+        names = list(STANDARD_RESOURCES)
+        for resources in job_type_resources:
+            for resource in resources.resources:
+                if resource.name not in names:
+                    names.append(resource.name)
+        self._names = names
+        self._name_indexes = {name: i for i, name in enumerate(names)}
+
+        # Duplicate job type requirements produce the same fit result, so only score each unique row once. Resources
+        # that a job type does not define are never checked, so they require -inf.
+        job_type_counts = {}
+        for resources in job_type_resources:
+            row = self._pack(resources, float('-inf'))
+            job_type_counts[row] = job_type_counts.get(row, 0) + 1
+        rows = list(job_type_counts.keys())
+        self._job_types = numpy.array(rows, dtype=numpy.float64).reshape(len(rows), len(names))
+        self._job_type_counts = numpy.array([job_type_counts[row] for row in rows], dtype=numpy.int64)
+
+        num_nodes = len(self._nodes)
+        self._is_active = numpy.ones(num_nodes, dtype=bool)
+        self._remaining = numpy.zeros((num_nodes, len(names)))
+        self._present = numpy.zeros((num_nodes, len(names)), dtype=bool)  # Resources defined in the watermark
+        self._scheduling_base = numpy.zeros((num_nodes, len(names)))  # Watermark minus task minus allocated
+        self._watermark_minus_tasks = numpy.zeros((num_nodes, len(names)))
+        self._reservation_base = numpy.zeros((num_nodes, len(names)))  # Watermark minus system tasks
+        self._reservation_job_exes = [None] * num_nodes  # [List of (priority, resource row)]
+        self._reservation_deductions = None  # (Priority array, resources array), rebuilt when nodes change
+        for i in range(num_nodes):
+            self._load_node(i, initial=True)
+
+    def has_unknown_resources(self, resources):
+        """Indicates whether the given resources require a resource that is not packed into this matrix, in which case
+        the nodes must be scored individually
+
+        :param resources: The resources
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: True if the resources include an unknown, non-zero resource
+        :rtype: bool
+        """
+
+        for resource in resources.resources:
+            if resource.name not in self._name_indexes and resource.value > 0.0:
+                return True
+        return False
+
+    def find_best_nodes(self, job_exe):
+        """Finds the best node for scheduling the given job execution or, if it cannot be scheduled on any node, the
+        best node for it to reserve. Ties are broken by node order, the same as scoring each node in turn.
+
+        :param job_exe: The job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: A tuple of the best scheduling node and the best reservation node, either of which may be None
+        :rtype: tuple
+        """
+
+        scores = self.score_for_scheduling(job_exe.required_resources)
+        best_index = self._find_best_index(scores)
+        if best_index is not None:
+            return self._nodes[best_index], None
+
+        scores = self.score_for_reservation(job_exe)
+        best_index = self._find_best_index(scores)
+        if best_index is not None:
+            return None, self._nodes[best_index]
+        return None, None
+
+    def remove_node(self, node_id):
+        """Removes the given node from consideration, such as when it has been reserved
+
+        :param node_id: The node ID
+        :type node_id: int
+        """
+
+        if node_id in self._node_indexes:
+            self._is_active[self._node_indexes[node_id]] = False
+
+    def score_for_reservation(self, job_exe):
+        """Returns the reservation score (see :meth:`scheduler.scheduling.scheduling_node.SchedulingNode.
+        score_job_exe_for_reservation`) of the given job execution for every node
+
+        :param job_exe: The job execution to score
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: An array of scores, one per node, where -1 indicates that the job execution cannot reserve the node
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if self._reservation_deductions is None:
+            self._build_reservation_deductions()
+        priorities, deductions = self._reservation_deductions
+
+        # Deduct resources of equal/higher priority job executions one at a time in the same order as the node does so
+        # that floating point results are identical
+        available = self._reservation_base.copy()
+        deduct_mask = priorities <= job_exe.priority
+        for i in range(deductions.shape[1]):
+            available -= numpy.where(deduct_mask[:, i:i + 1], deductions[:, i, :], 0.0)
+        available = numpy.where(self._present, available, 0.0)
+
+        required = self._pack(job_exe.required_resources, float('-inf'))
+        can_reserve = (available >= required).all(axis=1) & self._is_active
+        available = numpy.where(self._present, available - self._pack_subtrahend(job_exe.required_resources), 0.0)
+        return self._score(available, can_reserve)
+
+    def score_for_scheduling(self, resources):
+        """Returns the scheduling score (see :meth:`scheduler.scheduling.scheduling_node.SchedulingNode.
+        score_job_exe_for_scheduling`) of the given resources for every node
+
+        :param resources: The resources to score
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: An array of scores, one per node, where -1 indicates that the resources cannot be scheduled on the node
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        required = self._pack(resources, float('-inf'))
+        can_schedule = (self._remaining >= required).all(axis=1) & self._is_active
+        available = numpy.where(self._present, self._scheduling_base - self._pack_subtrahend(resources), 0.0)
+        return self._score(available, can_schedule)
+
+    def update_node(self, node_id):
+        """Reloads the resources of the given node after it has accepted a new job execution
+
+        :param node_id: The node ID
+        :type node_id: int
+        """
+
+        if node_id in self._node_indexes:
+            self._load_node(self._node_indexes[node_id])
+
+    def _build_reservation_deductions(self):
+        """Packs the per-node job execution deductions for reservation scoring into padded arrays
+        """
+
+        num_nodes = len(self._nodes)
+        max_count = max([len(job_exes) for job_exes in self._reservation_job_exes] + [0])
+        priorities = numpy.full((num_nodes, max_count), numpy.inf)
+        deductions = numpy.zeros((num_nodes, max_count, len(self._names)))
+        for i, job_exes in enumerate(self._reservation_job_exes):
+            for j, (priority, row) in enumerate(job_exes):
+                priorities[i, j] = priority
+                deductions[i, j, :] = row
+        self._reservation_deductions = (priorities, deductions)
+
+    def _find_best_index(self, scores):
+        """Returns the index of the first node with the lowest (best) score, possibly None
+
+        :param scores: An array of scores, one per node, where -1 indicates a node that was not scored
+        :type scores: :class:`numpy.ndarray`
+        :returns: The index of the best node, possibly None
+        :rtype: int
+        """
+
+        is_scored = scores >= 0
+        if not is_scored.any():
+            return None
+        return int(numpy.argmin(numpy.where(is_scored, scores, scores.max() + 1)))
+
+    def _load_node(self, i, initial=False):
+        """Packs the resources of the node at the given row index
+
+        :param i: The row index of the node
+        :type i: int
+        :param initial: Whether this is the initial load of the node
+        :type initial: bool
+        """
+
+        node = self._nodes[i]
+        remaining, watermark, task_resources = node.get_scheduling_resources()
+        if initial:
+            watermark_names = {resource.name for resource in watermark.resources}
+            self._present[i] = [name in watermark_names for name in self._names]
+            watermark_row = numpy.array(self._pack(watermark, 0.0))
+            self._watermark_minus_tasks[i] = watermark_row - numpy.array(self._pack_subtrahend(task_resources))
+        self._remaining[i] = self._pack(remaining, 0.0)
+        self._scheduling_base[i] = self._watermark_minus_tasks[i] - numpy.array(
+            self._pack_subtrahend(node.allocated_resources))
+
+        base_resources, job_exe_resources = node.get_reservation_resources()
+        self._reservation_base[i] = self._pack(base_resources, 0.0)
+        self._reservation_job_exes[i] = [(priority, self._pack_subtrahend(resources))
+                                         for priority, resources in job_exe_resources]
+        self._reservation_deductions = None
+
+    def _pack(self, resources, missing_value):
+        """Packs the given resources into a row tuple ordered by this matrix's resource names
+
+        :param resources: The resources to pack
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :param missing_value: The value to use for resource names that are not defined by the given resources
+        :type missing_value: float
+        :returns: The packed row
+        :rtype: tuple
+        """
+
+        row = [missing_value] * len(self._names)
+        for resource in resources.resources:
+            if resource.name in self._name_indexes:
+                row[self._name_indexes[resource.name]] = resource.value
+        return tuple(row)
+
+    def _pack_subtrahend(self, resources):
+        """Packs the given resources into a row tuple for subtraction, undefined resources subtract nothing
+
+        :param resources: The resources to pack
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: The packed row
+        :rtype: tuple
+        """
+
+        return self._pack(resources, 0.0)
+
+    def _score(self, available, mask):
+        """Counts the job types that fit within each node's available resources
+
+        :param available: The available resources of each node
+        :type available: :class:`numpy.ndarray`
+        :param mask: Which nodes should be scored
+        :type mask: :class:`numpy.ndarray`
+        :returns: An array of scores, one per node, where -1 indicates a node that was not scored
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        scores = numpy.full(len(self._nodes), -1, dtype=numpy.int64)
+        if not mask.any():
+            return scores
+
+        fits = (available[mask][:, numpy.newaxis, :] >= self._job_types[numpy.newaxis, :, :]).all(axis=2)
+        scores[mask] = fits.dot(self._job_type_counts)
+        return scores
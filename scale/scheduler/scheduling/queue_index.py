@@ -0,0 +1,260 @@
+"""Defines the class that maintains an in-memory index of the queue for scheduling"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import bisect
+import datetime
+import heapq
+import logging
+
+from django.utils.timezone import now, utc
+
+from queue.models import Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+
+
+# Queue models modified within this window before the latest seen modification are re-checked on every delta sync so
+# that models committed late by long-running transactions (or written by hosts with slightly skewed clocks) are caught
+DELTA_SYNC_OVERLAP = datetime.timedelta(seconds=30)
+# A full reconciliation of the index against the queue table (catching deleted queue models) is performed this often
+FULL_SYNC_PERIOD = datetime.timedelta(minutes=1)
+# Maximum number of queue models to retrieve with a single query
+HYDRATE_BATCH_SIZE = 500
+# Warning threshold for queue index sync duration
+SYNC_WARN_THRESHOLD = datetime.timedelta(milliseconds=300)
+
+EPOCH = datetime.datetime.utcfromtimestamp(0).replace(tzinfo=utc)
+
+logger = logging.getLogger(__name__)
+
+
+class QueueIndexEntry(object):
+    """This class represents the fields of a queue model that are needed to sort it for scheduling"""
+
+    def __init__(self, queue_id, job_type_id, priority, queued, last_modified):
+        """Constructor
+
+        :param queue_id: The queue model ID
+        :type queue_id: int
+        :param job_type_id: The job type ID
+        :type job_type_id: int
+        :param priority: The priority of the queued job execution
+        :type priority: int
+        :param queued: When the job was placed onto the queue
+        :type queued: :class:`datetime.datetime`
+        :param last_modified: When the queue model was last modified
+        :type last_modified: :class:`datetime.datetime`
+        """
+
+        self.id = queue_id
+        self.job_type_id = job_type_id
+        self.priority = priority
+        self.queued = queued
+        self.last_modified = last_modified
+
+    def get_sort_key(self, order_mode):
+        """Returns the key for sorting this entry according to the given queue order mode
+
+        :param order_mode: The mode determining how to order the queue (FIFO or LIFO)
+        :type order_mode: string
+        :returns: The sort key, ending with the queue model ID
+        :rtype: tuple
+        """
+
+        if order_mode == QUEUE_ORDER_FIFO:
+            return self.priority, (self.queued - EPOCH).total_seconds(), self.id
+        elif order_mode == QUEUE_ORDER_LIFO:
+            return self.priority, -(self.queued - EPOCH).total_seconds(), self.id
+        return self.priority, 0, self.id
+
+
+class QueueIndex(object):
+    """This class maintains an incrementally updated, in-memory index of the queue sorted in scheduling order. Each sync
+    only retrieves the small sort fields of queue models that were added or modified since the previous sync, and full
+    queue models are only retrieved (and then cached) once they reach the top of the queue. This class is NOT
+    thread-safe and should only be used within the scheduling thread.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._entries = {}  # {Queue ID: QueueIndexEntry}
+        self._job_type_keys = {}  # {Job type ID: Sorted list of sort keys}
+        self._last_full_sync = None
+        self._latest_modified = None
+        self._order_mode = QUEUE_ORDER_FIFO
+        self._queues = {}  # {Queue ID: Queue}, cached full models
+
+    def count(self):
+        """Returns the number of queue models in the index
+
+        :returns: The number of queue models in the index
+        :rtype: int
+        """
+
+        return len(self._entries)
+
+    def get_queue(self, order_mode, ignore_job_type_ids=None, limit=None):
+        """Returns the list of queue models sorted according to their priority first, and then according to the provided
+        mode. This matches the ordering of :meth:`queue.models.QueueManager.get_queue`.
+
+        :param order_mode: The mode determining how to order the queue (FIFO or LIFO)
+        :type order_mode: string
+        :param ignore_job_type_ids: The set of job type IDs to ignore
+        :type ignore_job_type_ids: set
+        :param limit: The maximum number of queue models to return, None for no limit
+        :type limit: int
+        :returns: The list of queue models
+        :rtype: list[:class:`queue.models.Queue`]
+        """
+
+        if order_mode != self._order_mode:
+            self._order_mode = order_mode
+            self._rebuild_sort_keys()
+
+        sorted_lists = []
+        for job_type_id, sort_keys in self._job_type_keys.items():
+            if not ignore_job_type_ids or job_type_id not in ignore_job_type_ids:
+                sorted_lists.append(sort_keys)
+
+        queue_ids = []
+        for sort_key in heapq.merge(*sorted_lists):
+            if limit is not None and len(queue_ids) >= limit:
+                break
+            queue_ids.append(sort_key[-1])
+
+        self._hydrate([queue_id for queue_id in queue_ids if queue_id not in self._queues])
+        return [self._queues[queue_id] for queue_id in queue_ids if queue_id in self._queues]
+
+    def remove_queues(self, queue_ids):
+        """Removes the queue models with the given IDs from the index, such as after they have been scheduled
+
+        :param queue_ids: The queue model IDs
+        :type queue_ids: list
+        """
+
+        for queue_id in queue_ids:
+            self._remove_entry(queue_id)
+
+    def sync_with_database(self, when):
+        """Syncs the index with the queue models in the database. A full reconciliation is performed periodically,
+        otherwise only queue models modified since the previous sync are retrieved.
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        started = now()
+
+        # Perform a full sync when the index is new or empty, or when the full sync period has elapsed
+        full_sync = self._last_full_sync is None or self._latest_modified is None
+        if full_sync or when - self._last_full_sync >= FULL_SYNC_PERIOD:
+            self._full_sync()
+            self._last_full_sync = when
+        else:
+            query = Queue.objects.filter(last_modified__gte=self._latest_modified - DELTA_SYNC_OVERLAP)
+            for row in query.values_list('id', 'job_type_id', 'priority', 'queued', 'last_modified'):
+                self._update_entry(row)
+
+        duration = now() - started
+        msg = 'Queue index sync took %.3f seconds, %d queued job execution(s) indexed'
+        if duration > SYNC_WARN_THRESHOLD:
+            logger.warning(msg, duration.total_seconds(), len(self._entries))
+        else:
+            logger.debug(msg, duration.total_seconds(), len(self._entries))
+
+    def _add_entry(self, entry):
+        """Adds the given entry to the index
+
+        :param entry: The entry to add
+        :type entry: :class:`scheduler.scheduling.queue_index.QueueIndexEntry`
+        """
+
+        self._entries[entry.id] = entry
+        if entry.job_type_id not in self._job_type_keys:
+            self._job_type_keys[entry.job_type_id] = []
+        bisect.insort(self._job_type_keys[entry.job_type_id], entry.get_sort_key(self._order_mode))
+
+    def _full_sync(self):
+        """Reconciles the entire index with the queue table, adding new and modified queue models and removing deleted
+        ones
+        """
+
+        existing_ids = set()
+        rows = Queue.objects.values_list('id', 'job_type_id', 'priority', 'queued', 'last_modified')
+        for row in rows.iterator():
+            existing_ids.add(row[0])
+            self._update_entry(row)
+
+        for queue_id in [queue_id for queue_id in self._entries if queue_id not in existing_ids]:
+            self._remove_entry(queue_id)
+
+    def _hydrate(self, queue_ids):
+        """Retrieves and caches the full queue models for the given IDs. Any IDs that no longer exist in the database are
+        removed from the index.
+
+        :param queue_ids: The queue model IDs
+        :type queue_ids: list
+        """
+
+        for i in range(0, len(queue_ids), HYDRATE_BATCH_SIZE):
+            batch_ids = queue_ids[i:i + HYDRATE_BATCH_SIZE]
+            for queue in Queue.objects.filter(id__in=batch_ids).iterator():
+                # Keep the index consistent with the model that was actually retrieved
+                self._update_entry((queue.id, queue.job_type_id, queue.priority, queue.queued, queue.last_modified))
+                self._queues[queue.id] = queue
+            for queue_id in batch_ids:
+                if queue_id not in self._queues:
+                    self._remove_entry(queue_id)
+
+    def _rebuild_sort_keys(self):
+        """Rebuilds all of the sorted lists of sort keys, such as after the queue order mode changes
+        """
+
+        self._job_type_keys = {}
+        for entry in self._entries.values():
+            if entry.job_type_id not in self._job_type_keys:
+                self._job_type_keys[entry.job_type_id] = []
+            self._job_type_keys[entry.job_type_id].append(entry.get_sort_key(self._order_mode))
+        for sort_keys in self._job_type_keys.values():
+            sort_keys.sort()
+
+    def _remove_entry(self, queue_id):
+        """Removes the entry (and any cached model) for the given queue model ID from the index
+
+        :param queue_id: The queue model ID
+        :type queue_id: int
+        """
+
+        self._queues.pop(queue_id, None)
+        entry = self._entries.pop(queue_id, None)
+        if not entry:
+            return
+
+        sort_keys = self._job_type_keys[entry.job_type_id]
+        sort_key = entry.get_sort_key(self._order_mode)
+        index = bisect.bisect_left(sort_keys, sort_key)
+        if index < len(sort_keys) and sort_keys[index] == sort_key:
+            del sort_keys[index]
+        if not sort_keys:
+            del self._job_type_keys[entry.job_type_id]
+
+    def _update_entry(self, row):
+        """Updates the index with the given queue model row if it is new or has been modified since it was indexed
+
+        :param row: The queue model row (ID, job type ID, priority, queued, last modified)
+        :type row: tuple
+        """
+
+        queue_id, job_type_id, priority, queued, last_modified = row
+
+        if self._latest_modified is None or last_modified > self._latest_modified:
+            self._latest_modified = last_modified
+
+        entry = self._entries.get(queue_id)
+        if entry and entry.last_modified == last_modified:
+            return  # Unchanged
+
+        # New or modified queue model, (re-)index it and drop any stale cached model
+        self._remove_entry(queue_id)
+        self._add_entry(QueueIndexEntry(queue_id, job_type_id, priority, queued, last_modified))
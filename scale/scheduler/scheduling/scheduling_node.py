@@ -206,6 +206,42 @@ class SchedulingNode(object):
         self._allocated_queued_job_exes = []
         self._allocated_running_job_exes.extend(job_exes)
 
+    def get_reservation_resources(self):
+        """Returns the resources that :meth:`score_job_exe_for_reservation` starts from and deducts, in the same order
+        that it deducts them. The first item is the watermark resources minus the resources of any running system tasks.
+        The second item is a list of (priority, resources) tuples for the running and newly allocated job executions.
+
+        :returns: A tuple of the base resources and the list of (priority, resources) tuples
+        :rtype: tuple
+        """
+
+        base_resources = NodeResources()
+        base_resources.add(self._watermark_resources)
+        for running_task in self._running_tasks:
+            if not isinstance(running_task, JobExecutionTask):
+                base_resources.subtract(running_task.get_resources())
+
+        job_exe_resources = []
+        for running_job_exe in self._running_job_exes:
+            task = running_job_exe.current_task
+            if not task:
+                task = running_job_exe.next_task()
+            if task:
+                job_exe_resources.append((running_job_exe.priority, task.get_resources()))
+        for queued_job_exe in self._allocated_queued_job_exes:
+            job_exe_resources.append((queued_job_exe.priority, queued_job_exe.required_resources))
+
+        return base_resources, job_exe_resources
+
+    def get_scheduling_resources(self):
+        """Returns the resources used for scoring resources for scheduling on this node
+
+        :returns: A tuple of the remaining resources, the watermark resources, and the resources of the running tasks
+        :rtype: tuple
+        """
+
+        return self._remaining_resources, self._watermark_resources, self._task_resources
+
     def reset_new_job_exes(self):
         """Resets the allocated new job executions and deallocates any resources associated with them
         """
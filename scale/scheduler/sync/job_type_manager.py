@@ -17,6 +17,9 @@ class JobTypeManager(object):
 
         self._job_type_resources = []
         self._job_types = {}  # {Job Type ID: Job Type}
+        self._last_modified = {}  # {Job Type ID: Last modified}
+        self._resources = {}  # {Job Type ID: Resources}
+        self._seed_resources = {}  # {(Job Type ID, Revision number): Resources}
         self._lock = threading.Lock()
 
     def generate_status_json(self, status_dict):
@@ -70,18 +73,68 @@ class JobTypeManager(object):
             return dict(self._job_types)
 
     def sync_with_database(self):
-        """Syncs with the database to retrieve updated job type models
+        """Syncs with the database to retrieve updated job type models. Only the job types that have been created or
+        modified since the last sync are retrieved in full, and the resources of Seed job types are only calculated
+        once per job type revision.
         """
 
-        update_job_type_resources = []
-        updated_job_types = {}
-        for job_type in JobType.objects.all().iterator():
-            updated_job_types[job_type.id] = job_type
-            update_job_type_resources.append(job_type.get_resources())
+        last_modified = dict(JobType.objects.values_list('id', 'last_modified').iterator())
+        with self._lock:
+            changed_ids = [job_type_id for job_type_id, modified in last_modified.items()
+                           if self._last_modified.get(job_type_id) != modified]
+
+        changed_job_types = {}
+        changed_resources = {}
+        if changed_ids:
+            for job_type in JobType.objects.filter(id__in=changed_ids).iterator():
+                changed_job_types[job_type.id] = job_type
+                changed_resources[job_type.id] = self._get_resources(job_type)
 
         with self._lock:
-            self._job_type_resources = update_job_type_resources
+            updated_job_types = {}
+            updated_resources = {}
+            updated_last_modified = {}
+            for job_type_id in last_modified:
+                if job_type_id in changed_job_types:
+                    job_type = changed_job_types[job_type_id]
+                    resources = changed_resources[job_type_id]
+                elif job_type_id in self._job_types:
+                    job_type = self._job_types[job_type_id]
+                    resources = self._resources[job_type_id]
+                else:
+                    continue  # Job type was created after retrieving the changed job types, get it on the next sync
+                updated_job_types[job_type_id] = job_type
+                updated_resources[job_type_id] = resources
+                updated_last_modified[job_type_id] = job_type.last_modified
+
             self._job_types = updated_job_types
+            self._resources = updated_resources
+            self._last_modified = updated_last_modified
+            self._job_type_resources = list(updated_resources.values())
+            for job_type_id, revision_num in list(self._seed_resources.keys()):
+                if job_type_id not in updated_job_types:
+                    del self._seed_resources[(job_type_id, revision_num)]
+
+    def _get_resources(self, job_type):
+        """Returns the resources required for jobs of the given type. The resources of a Seed job type come from its
+        manifest, which cannot change without a new revision, so they are cached per job type revision.
+
+        :param job_type: The job type
+        :type job_type: :class:`job.models.JobType`
+        :returns: The required resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        if not job_type.is_seed_job_type():
+            return job_type.get_resources()
 
+        key = (job_type.id, job_type.revision_num)
+        with self._lock:
+            resources = self._seed_resources.get(key)
+        if resources is None:
+            resources = job_type.get_resources()
+            with self._lock:
+                self._seed_resources[key] = resources
+        return resources
 
 job_type_mgr = JobTypeManager()
@@ -13,6 +13,7 @@ class WorkspaceManager(object):
         """Constructor
         """
 
+        self._last_modified = {}  # {Workspace ID: Last modified}
         self._workspaces = {}  # {Workspace Name: Workspace}
         self._lock = threading.Lock()
 
@@ -27,15 +28,30 @@ class WorkspaceManager(object):
             return dict(self._workspaces)
 
     def sync_with_database(self):
-        """Syncs with the database to retrieve updated workspace models
+        """Syncs with the database to retrieve updated workspace models. Only the workspaces that have been created or
+        modified since the last sync are retrieved in full.
         """
 
+        last_modified = dict(Workspace.objects.values_list('id', 'last_modified').iterator())
+        with self._lock:
+            changed_ids = [workspace_id for workspace_id, modified in last_modified.items()
+                           if self._last_modified.get(workspace_id) != modified]
+            workspaces_by_id = {workspace.id: workspace for workspace in self._workspaces.values()}
+
+        if changed_ids:
+            for workspace in Workspace.objects.filter(id__in=changed_ids).iterator():
+                workspaces_by_id[workspace.id] = workspace
+
+        updated_last_modified = {}
         updated_workspaces = {}
-        for workspace in Workspace.objects.all().iterator():
-            updated_workspaces[workspace.name] = workspace
+        for workspace_id in last_modified:
+            if workspace_id in workspaces_by_id:
+                workspace = workspaces_by_id[workspace_id]
+                updated_last_modified[workspace_id] = workspace.last_modified
+                updated_workspaces[workspace.name] = workspace
 
         with self._lock:
+            self._last_modified = updated_last_modified
             self._workspaces = updated_workspaces
 
-
 workspace_mgr = WorkspaceManager()
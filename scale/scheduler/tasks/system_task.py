@@ -64,5 +64,6 @@ class SystemTask(Task):
             messaging_params.append(DockerParameter('env', 'SCALE_BROKER_URL=%s' % broker_url))
         if queue_name:
             messaging_params.append(DockerParameter('env', 'SCALE_QUEUE_NAME=%s' % queue_name))
+        messaging_params.append(DockerParameter('env', 'SCALE_MESSAGE_CODEC=%s' % (settings.MESSAGE_CODEC or '')))
 
         self._docker_params.extend(messaging_params)
@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import MagicMock
+
+import job.test.utils as job_test_utils
+import queue.test.utils as queue_test_utils
+from job.tasks.health_task import HealthTask
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Mem
+from queue.job_exe import QueuedJobExecution
+from scheduler.resources.agent import ResourceSet
+from scheduler.scheduling.node_matrix import NodeScoringMatrix
+from scheduler.scheduling.scheduling_node import SchedulingNode
+
+
+class TestNodeScoringMatrix(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_type_resources = [NodeResources([Cpus(2.0), Mem(10.0)]), NodeResources([Cpus(5.5), Mem(12.0)]),
+                                   NodeResources([Cpus(6.0), Mem(10.0)]), NodeResources([Cpus(2.0), Mem(14.0)]),
+                                   NodeResources([Cpus(2.0), Mem(10.0)])]
+
+    def _create_node(self, node_id, offered_resources, watermark_resources, tasks=None, running_job_exes=None):
+        """Creates a scheduling node for testing"""
+
+        node = MagicMock()
+        node.hostname = 'host_%d' % node_id
+        node.id = node_id
+        node.is_ready_for_new_job = MagicMock()
+        node.is_ready_for_new_job.return_value = True
+        node.is_ready_for_next_job_task = MagicMock()
+        node.is_ready_for_next_job_task.return_value = True
+        resource_set = ResourceSet(offered_resources, NodeResources(), watermark_resources)
+        return SchedulingNode('agent_%d' % node_id, node, tasks if tasks else [],
+                              running_job_exes if running_job_exes else [], resource_set)
+
+    def _create_job_exe(self, priority, cpus, mem):
+        """Creates a queued job execution for testing"""
+
+        queue = queue_test_utils.create_queue(priority=priority, cpus_required=cpus, mem_required=mem,
+                                              disk_in_required=0.0, disk_out_required=0.0, disk_total_required=0.0)
+        return QueuedJobExecution(queue)
+
+    def test_score_for_scheduling(self):
+        """Tests that scheduling scores match scoring each node individually"""
+
+        node_1 = self._create_node(1, NodeResources([Cpus(20.0), Mem(100.0)]),
+                                   NodeResources([Cpus(100.0), Mem(500.0)]))
+        node_2 = self._create_node(2, NodeResources([Cpus(1.0), Mem(100.0)]), NodeResources([Cpus(8.0), Mem(30.0)]))
+        node_3 = self._create_node(3, NodeResources([Cpus(10.0), Mem(50.0)]), NodeResources([Cpus(12.0), Mem(50.0)]))
+        nodes = [node_1, node_2, node_3]
+        job_exe = self._create_job_exe(100, 4.0, 40.0)
+
+        matrix = NodeScoringMatrix(nodes, self.job_type_resources)
+        scores = matrix.score_for_scheduling(job_exe.required_resources)
+
+        for i, node in enumerate(nodes):
+            expected_score = node.score_job_exe_for_scheduling(job_exe, self.job_type_resources)
+            self.assertEqual(scores[i], -1 if expected_score is None else expected_score)
+        self.assertEqual(scores[1], -1)  # Not enough CPUs remaining on node 2
+        self.assertEqual(scores[2], 3)  # 8 CPUs and 10 MiB left, so (2, 10) (counted twice) and (6, 10) fit
+
+    def test_score_for_reservation(self):
+        """Tests that reservation scores match scoring each node individually"""
+
+        task = HealthTask('1234', 'agent_1')  # Resources are 0.1 CPUs and 32 MiB memory
+        running_job_exe_1 = job_test_utils.create_running_job_exe(agent_id='agent_1',
+                                                                  resources=NodeResources([Cpus(10.0), Mem(50.0)]),
+                                                                  priority=1000)
+        running_job_exe_2 = job_test_utils.create_running_job_exe(agent_id='agent_1',
+                                                                  resources=NodeResources([Cpus(56.0), Mem(15.0)]),
+                                                                  priority=100)
+        node_1 = self._create_node(1, NodeResources([Cpus(20.0), Mem(100.0)]),
+                                   NodeResources([Cpus(200.0), Mem(700.0)]), [task],
+                                   [running_job_exe_1, running_job_exe_2])
+        node_2 = self._create_node(2, NodeResources([Cpus(20.0), Mem(100.0)]), NodeResources([Cpus(8.0), Mem(30.0)]))
+        nodes = [node_1, node_2]
+        matrix = NodeScoringMatrix(nodes, self.job_type_resources)
+
+        new_job_exe = self._create_job_exe(100, 8.0, 40.0)
+        node_1.accept_new_job_exe(new_job_exe)
+        matrix.update_node(node_1.node_id)
+
+        job_exe = self._create_job_exe(120, 130.0, 600.0)
+        scores = matrix.score_for_reservation(job_exe)
+
+        for i, node in enumerate(nodes):
+            expected_score = node.score_job_exe_for_reservation(job_exe, self.job_type_resources)
+            self.assertEqual(scores[i], -1 if expected_score is None else expected_score)
+        self.assertEqual(scores[0], 3)  # 5.9 CPUs and 13 MiB left, so (2, 10) (counted twice) and (5.5, 12) fit
+        self.assertEqual(scores[1], -1)
+
+    def test_find_best_nodes(self):
+        """Tests finding the best scheduling and reservation nodes"""
+
+        node_1 = self._create_node(1, NodeResources([Cpus(20.0), Mem(100.0)]),
+                                   NodeResources([Cpus(100.0), Mem(500.0)]))
+        node_2 = self._create_node(2, NodeResources([Cpus(10.0), Mem(50.0)]), NodeResources([Cpus(12.0), Mem(50.0)]))
+        matrix = NodeScoringMatrix([node_1, node_2], self.job_type_resources)
+
+        # Node 2 is the tighter fit, reducing fragmentation
+        scheduling_node, reservation_node = matrix.find_best_nodes(self._create_job_exe(100, 4.0, 40.0))
+        self.assertEqual(scheduling_node.node_id, node_2.node_id)
+        self.assertIsNone(reservation_node)
+
+        # Too big to schedule now, so reserve node 1
+        scheduling_node, reservation_node = matrix.find_best_nodes(self._create_job_exe(100, 50.0, 400.0))
+        self.assertIsNone(scheduling_node)
+        self.assertEqual(reservation_node.node_id, node_1.node_id)
+
+        # Removed nodes are not considered
+        matrix.remove_node(node_1.node_id)
+        scheduling_node, reservation_node = matrix.find_best_nodes(self._create_job_exe(100, 50.0, 400.0))
+        self.assertIsNone(scheduling_node)
+        self.assertIsNone(reservation_node)
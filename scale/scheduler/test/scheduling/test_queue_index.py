@@ -0,0 +1,93 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+
+from job.test import utils as job_test_utils
+from queue.models import Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+from queue.test import utils as queue_test_utils
+from scheduler.scheduling.queue_index import FULL_SYNC_PERIOD, QueueIndex
+
+
+class TestQueueIndex(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_type_1 = job_test_utils.create_job_type()
+        self.job_type_2 = job_test_utils.create_job_type()
+        when = now()
+        self.queue_1 = queue_test_utils.create_queue(job_type=self.job_type_1, priority=100,
+                                                     queued=when - datetime.timedelta(minutes=3))
+        self.queue_2 = queue_test_utils.create_queue(job_type=self.job_type_2, priority=100,
+                                                     queued=when - datetime.timedelta(minutes=2))
+        self.queue_3 = queue_test_utils.create_queue(job_type=self.job_type_1, priority=1,
+                                                     queued=when - datetime.timedelta(minutes=1))
+
+    def test_get_queue_matches_database_order(self):
+        """Tests that the index returns queue models in the same order as the database query"""
+
+        index = QueueIndex()
+        index.sync_with_database(now())
+
+        for order_mode in [QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO]:
+            expected_ids = [queue.id for queue in Queue.objects.get_queue(order_mode)]
+            queue_ids = [queue.id for queue in index.get_queue(order_mode)]
+            self.assertListEqual(queue_ids, expected_ids)
+
+        queue_ids = [queue.id for queue in index.get_queue(QUEUE_ORDER_FIFO, limit=2)]
+        self.assertListEqual(queue_ids, [self.queue_3.id, self.queue_1.id])
+
+    def test_get_queue_ignore_job_types(self):
+        """Tests that the index skips queue models of ignored job types"""
+
+        index = QueueIndex()
+        index.sync_with_database(now())
+
+        queue_ids = [queue.id for queue in index.get_queue(QUEUE_ORDER_FIFO, {self.job_type_1.id})]
+        self.assertListEqual(queue_ids, [self.queue_2.id])
+
+    def test_delta_sync(self):
+        """Tests that a delta sync picks up new and modified queue models"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(when)
+        self.assertEqual(index.count(), 3)
+
+        queue_4 = queue_test_utils.create_queue(job_type=self.job_type_2, priority=50)
+        Queue.objects.cancel_queued_jobs([self.queue_2.job_id])
+        index.sync_with_database(when + datetime.timedelta(seconds=1))
+
+        queues = index.get_queue(QUEUE_ORDER_FIFO)
+        self.assertListEqual([queue.id for queue in queues],
+                             [self.queue_3.id, queue_4.id, self.queue_1.id, self.queue_2.id])
+        self.assertTrue(queues[3].is_canceled)
+
+    def test_full_sync_removes_deleted(self):
+        """Tests that a full sync removes queue models that were deleted from the database"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(when)
+
+        Queue.objects.filter(id=self.queue_1.id).delete()
+        index.sync_with_database(when + FULL_SYNC_PERIOD)
+
+        self.assertEqual(index.count(), 2)
+        queue_ids = [queue.id for queue in index.get_queue(QUEUE_ORDER_FIFO)]
+        self.assertListEqual(queue_ids, [self.queue_3.id, self.queue_2.id])
+
+    def test_remove_queues(self):
+        """Tests removing scheduled queue models from the index"""
+
+        index = QueueIndex()
+        index.sync_with_database(now())
+        index.remove_queues([self.queue_3.id])
+
+        queue_ids = [queue.id for queue in index.get_queue(QUEUE_ORDER_FIFO)]
+        self.assertListEqual(queue_ids, [self.queue_1.id, self.queue_2.id])
@@ -2,7 +2,11 @@ from __future__ import unicode_literals
 
 import django
 from django.test import TestCase
+from mock import patch
 
+import job.test.utils as job_test_utils
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus
 from scheduler.sync.job_type_manager import JobTypeManager
 
 
@@ -22,3 +26,52 @@ class TestJobTypeManager(TestCase):
         manager.generate_status_json(status_dict)
 
         self.assertEqual(len(status_dict['job_types']), 1)
+
+    def test_incremental_sync(self):
+        """Tests that a sync only retrieves the job types that were created, modified, or deleted since the last sync"""
+
+        job_type_1 = job_test_utils.create_seed_job_type()
+        job_type_2 = job_test_utils.create_seed_job_type()
+        job_type_3 = job_test_utils.create_job_type()
+
+        manager = JobTypeManager()
+        manager.sync_with_database()
+        self.assertEqual(len(manager.get_job_types()), 4)
+        self.assertEqual(len(manager.get_job_type_resources()), 4)
+        unchanged_model = manager.get_job_type(job_type_2.id)
+
+        job_type_1.is_paused = True
+        job_type_1.save()
+        job_type_3.delete()
+        job_type_4 = job_test_utils.create_seed_job_type()
+        manager.sync_with_database()
+
+        job_types = manager.get_job_types()
+        self.assertEqual(len(job_types), 4)
+        self.assertEqual(len(manager.get_job_type_resources()), 4)
+        self.assertTrue(job_types[job_type_1.id].is_paused)
+        self.assertIs(job_types[job_type_2.id], unchanged_model)
+        self.assertNotIn(job_type_3.id, job_types)
+        self.assertIn(job_type_4.id, job_types)
+
+    @patch('job.models.JobType.get_resources')
+    def test_seed_resources_cached_per_revision(self, mock_get_resources):
+        """Tests that the resources of a Seed job type are only calculated once per revision"""
+
+        mock_get_resources.return_value = NodeResources([Cpus(1.0)])
+        job_type = job_test_utils.create_seed_job_type()
+        manager = JobTypeManager()
+        manager.sync_with_database()
+        call_count = mock_get_resources.call_count
+
+        # Modifying the job type without a new revision re-uses the cached resources
+        job_type.is_paused = True
+        job_type.save()
+        manager.sync_with_database()
+        self.assertEqual(mock_get_resources.call_count, call_count)
+
+        # A new revision re-calculates the resources
+        job_type.revision_num += 1
+        job_type.save()
+        manager.sync_with_database()
+        self.assertEqual(mock_get_resources.call_count, call_count + 1)
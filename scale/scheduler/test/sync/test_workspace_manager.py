@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import django
 from django.test import TestCase
 
+import storage.test.utils as storage_test_utils
 from scheduler.sync.workspace_manager import WorkspaceManager
 
 
@@ -16,3 +17,26 @@ class TestWorkspaceManager(TestCase):
 
         manager = WorkspaceManager()
         manager.sync_with_database()
+
+    def test_incremental_sync(self):
+        """Tests that a sync only retrieves the workspaces that were created, modified, or deleted since the last sync"""
+
+        workspace_1 = storage_test_utils.create_workspace()
+        workspace_2 = storage_test_utils.create_workspace()
+        workspace_3 = storage_test_utils.create_workspace()
+
+        manager = WorkspaceManager()
+        manager.sync_with_database()
+        self.assertEqual(len(manager.get_workspaces()), 3)
+        unchanged_model = manager.get_workspaces()[workspace_2.name]
+
+        workspace_1.title = 'New Title'
+        workspace_1.save()
+        workspace_3.delete()
+        manager.sync_with_database()
+
+        workspaces = manager.get_workspaces()
+        self.assertEqual(len(workspaces), 2)
+        self.assertEqual(workspaces[workspace_1.name].title, 'New Title')
+        self.assertIs(workspaces[workspace_2.name], unchanged_model)
+        self.assertNotIn(workspace_3.name, workspaces)
@@ -0,0 +1,88 @@
+from __future__ import unicode_literals
+
+import datetime
+import threading
+import time
+
+import django
+from django.test import TestCase
+
+from scheduler.threads.base_thread import BaseSchedulerThread
+
+
+class CountingThread(BaseSchedulerThread):
+    """Test thread that counts its loop executions"""
+
+    def __init__(self, throttle, min_interval=datetime.timedelta()):
+        super(CountingThread, self).__init__('Counting', throttle, datetime.timedelta(seconds=1), min_interval)
+        self.count = 0
+        self.executed = threading.Event()
+
+    def _execute(self):
+        self.count += 1
+        self.executed.set()
+
+
+class TestBaseSchedulerThread(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def _start(self, thread):
+        """Starts the given test thread and waits for its first loop"""
+
+        background_thread = threading.Thread(target=thread.run)
+        background_thread.daemon = True
+        background_thread.start()
+        self.assertTrue(thread.executed.wait(5.0))
+        thread.executed.clear()
+        return background_thread
+
+    def test_wake(self):
+        """Tests that waking up a thread runs its next loop without waiting for the full throttle duration"""
+
+        thread = CountingThread(datetime.timedelta(seconds=60))
+        background_thread = self._start(thread)
+
+        thread.wake()
+        self.assertTrue(thread.executed.wait(5.0))
+        self.assertEqual(thread.count, 2)
+
+        thread.shutdown()
+        background_thread.join(5.0)
+        self.assertFalse(background_thread.is_alive())
+
+        status = thread.generate_status_json()
+        self.assertEqual(status['name'], 'Counting')
+        self.assertGreaterEqual(status['loop_count'], 2)
+        self.assertGreaterEqual(status['wake_count'], 1)
+
+    def test_throttle_is_upper_bound(self):
+        """Tests that a thread loops once its throttle duration has passed without being woken up"""
+
+        thread = CountingThread(datetime.timedelta(milliseconds=200))
+        background_thread = self._start(thread)
+
+        self.assertTrue(thread.executed.wait(5.0))
+        status = thread.generate_status_json()
+        self.assertEqual(status['loop_count'], 1)
+        self.assertEqual(status['wake_count'], 0)
+        self.assertGreaterEqual(status['avg_wait_seconds'], 0.1)
+
+        thread.shutdown()
+        background_thread.join(5.0)
+
+    def test_min_interval(self):
+        """Tests that a burst of wake ups is handled by a single loop after the minimum interval"""
+
+        thread = CountingThread(datetime.timedelta(seconds=60), datetime.timedelta(milliseconds=300))
+        background_thread = self._start(thread)
+
+        for _ in range(10):
+            thread.wake()
+        self.assertTrue(thread.executed.wait(5.0))
+        time.sleep(0.1)
+        self.assertEqual(thread.count, 2)
+
+        thread.shutdown()
+        background_thread.join(5.0)
@@ -1,8 +1,9 @@
 """Defines the base class for scheduler background threads"""
 from __future__ import unicode_literals
 
+import datetime
 import logging
-import math
+import threading
 import time
 from abc import ABCMeta
 
@@ -18,21 +19,65 @@ class BaseSchedulerThread(object):
 
     __metaclass__ = ABCMeta
 
-    def __init__(self, name, throttle, warning_threshold):
+    def __init__(self, name, throttle, warning_threshold, min_interval=datetime.timedelta()):
         """Constructor
 
         :param name: The name of this thread
         :type name: string
-        :param throttle: A loop of this thread should occur no more than once per this duration
+        :param throttle: A loop of this thread should occur at least once per this duration, a loop may occur sooner if
+            the thread is woken up
         :type throttle: :class:`datetime.timedelta`
         :param warning_threshold: A warning is logged if loop execution exceeds this duration
         :type warning_threshold: :class:`datetime.timedelta`
+        :param min_interval: A loop of this thread should occur no more than once per this duration, even when woken up
+        :type min_interval: :class:`datetime.timedelta`
         """
 
         self._name = name
         self._running = True
         self._throttle = throttle
         self._warning_threshold = warning_threshold
+        self._min_interval = min_interval
+        self._wake_event = threading.Event()
+
+        self._stats_lock = threading.Lock()
+        self._loop_count = 0
+        self._wake_count = 0
+        self._total_duration = 0.0
+        self._max_duration = 0.0
+        self._last_duration = 0.0
+        self._total_wait = 0.0
+
+    @property
+    def name(self):
+        """Returns the name of this thread
+
+        :returns: The name of this thread
+        :rtype: string
+        """
+
+        return self._name
+
+    def generate_status_json(self):
+        """Generates the status JSON for this thread, containing the timing statistics of its loops
+
+        :returns: The status JSON
+        :rtype: dict
+        """
+
+        with self._stats_lock:
+            loop_count = self._loop_count
+            wake_count = self._wake_count
+            total_duration = self._total_duration
+            max_duration = self._max_duration
+            last_duration = self._last_duration
+            total_wait = self._total_wait
+
+        avg_duration = round(total_duration / loop_count, 3) if loop_count else 0.0
+        avg_wait = round(total_wait / loop_count, 3) if loop_count else 0.0
+        return {'name': self._name, 'loop_count': loop_count, 'wake_count': wake_count,
+                'avg_loop_seconds': avg_duration, 'max_loop_seconds': round(max_duration, 3),
+                'last_loop_seconds': round(last_duration, 3), 'avg_wait_seconds': avg_wait}
 
     def run(self):
         """The main run loop of the thread
@@ -65,11 +110,8 @@ class BaseSchedulerThread(object):
             else:
                 logger.debug(msg, self._name, duration.total_seconds())
 
-            # If time takes less than threshold, throttle
-            if duration < self._throttle:
-                # Delay until full throttle time reached
-                delay = math.ceil(self._throttle.total_seconds() - duration.total_seconds())
-                time.sleep(delay)
+            was_woken = self._wait(duration)
+            self._add_loop_stats(duration, now() - started - duration, was_woken)
 
         logger.info('%s thread stopped', self._name)
 
@@ -79,9 +121,58 @@ class BaseSchedulerThread(object):
 
         logger.info('%s thread is shutting down', self._name)
         self._running = False
+        self._wake_event.set()
+
+    def wake(self):
+        """Wakes up the thread so that its next loop occurs without waiting for the rest of the throttle duration. This
+        method is thread-safe.
+        """
+
+        self._wake_event.set()
+
+    def _add_loop_stats(self, duration, wait, was_woken):
+        """Adds a completed loop to the timing statistics of this thread
+
+        :param duration: How long the loop execution took
+        :type duration: :class:`datetime.timedelta`
+        :param wait: How long the thread waited after the loop execution
+        :type wait: :class:`datetime.timedelta`
+        :param was_woken: Whether the wait was ended by a wake up
+        :type was_woken: bool
+        """
+
+        duration_secs = duration.total_seconds()
+        with self._stats_lock:
+            self._loop_count += 1
+            if was_woken:
+                self._wake_count += 1
+            self._total_duration += duration_secs
+            self._max_duration = max(self._max_duration, duration_secs)
+            self._last_duration = duration_secs
+            self._total_wait += wait.total_seconds()
 
     def _execute(self):
         """Executes a single loop of this thread
         """
 
         raise NotImplementedError
+
+    def _wait(self, duration):
+        """Waits after a loop execution until either the full throttle duration has been reached or the thread is woken
+        up, though never less than the minimum interval so that a burst of wake ups is handled by a single loop
+
+        :param duration: How long the loop execution took
+        :type duration: :class:`datetime.timedelta`
+        :returns: True if the wait was ended by a wake up, False otherwise
+        :rtype: bool
+        """
+
+        if duration < self._min_interval:
+            time.sleep((self._min_interval - duration).total_seconds())
+            duration = self._min_interval
+
+        # Clear the wake up only after waiting so that a wake up during the loop execution is not lost
+        remaining = max((self._throttle - duration).total_seconds(), 0.0)
+        was_woken = self._wake_event.wait(remaining)
+        self._wake_event.clear()
+        return bool(was_woken)
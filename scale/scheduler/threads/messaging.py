@@ -14,6 +14,7 @@ logger = logging.getLogger(__name__)
 
 
 THROTTLE = datetime.timedelta(seconds=1)
+MIN_INTERVAL = datetime.timedelta(milliseconds=100)
 WARN_THRESHOLD = datetime.timedelta(milliseconds=500)
 
 
@@ -24,7 +25,7 @@ class MessagingThread(BaseSchedulerThread):
         """Constructor
         """
 
-        super(MessagingThread, self).__init__('Messaging', THROTTLE, WARN_THRESHOLD)
+        super(MessagingThread, self).__init__('Messaging', THROTTLE, WARN_THRESHOLD, MIN_INTERVAL)
 
         self._manager = CommandMessageManager()
         self._messages = []
@@ -10,6 +10,7 @@ from scheduler.threads.base_thread import BaseSchedulerThread
 
 
 THROTTLE = datetime.timedelta(seconds=1)
+MIN_INTERVAL = datetime.timedelta(milliseconds=100)
 WARN_THRESHOLD = datetime.timedelta(seconds=1)
 
 
@@ -23,7 +24,7 @@ class SchedulingThread(BaseSchedulerThread):
         :type driver: :class:`mesos_api.mesos.SchedulerDriver`
         """
 
-        super(SchedulingThread, self).__init__('Scheduling', THROTTLE, WARN_THRESHOLD)
+        super(SchedulingThread, self).__init__('Scheduling', THROTTLE, WARN_THRESHOLD, MIN_INTERVAL)
         self._driver = driver
         self._manager = SchedulingManager()
 
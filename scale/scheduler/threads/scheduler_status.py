@@ -7,6 +7,7 @@ from django.utils.timezone import now
 
 from job.execution.manager import job_exe_mgr
 from job.tasks.manager import task_mgr
+from messaging.models import MessageHandlerStatus
 from scheduler.manager import scheduler_mgr
 from scheduler.models import Scheduler
 from scheduler.node.manager import node_mgr
@@ -29,6 +30,27 @@ class SchedulerStatusThread(BaseSchedulerThread):
         """
 
         super(SchedulerStatusThread, self).__init__('Scheduler status', THROTTLE, WARN_THRESHOLD)
+        self._threads = []
+
+    @property
+    def threads(self):
+        """Returns the scheduler background threads whose loop timing statistics are included in the status
+
+        :returns: The scheduler background threads
+        :rtype: [:class:`scheduler.threads.base_thread.BaseSchedulerThread`]
+        """
+
+        return self._threads
+
+    @threads.setter
+    def threads(self, value):
+        """Sets the scheduler background threads whose loop timing statistics are included in the status
+
+        :param value: The scheduler background threads
+        :type value: [:class:`scheduler.threads.base_thread.BaseSchedulerThread`]
+        """
+
+        self._threads = value
 
     def _execute(self):
         """See :meth:`scheduler.threads.base_thread.BaseSchedulerThread._execute`
@@ -45,10 +67,12 @@ class SchedulerStatusThread(BaseSchedulerThread):
 
         status_dict = {'timestamp': datetime_to_string(when)}
         scheduler_mgr.generate_status_json(status_dict)
+        status_dict['scheduler']['threads'] = [thread.generate_status_json() for thread in self._threads]
         system_task_mgr.generate_status_json(status_dict)
         node_mgr.generate_status_json(status_dict)
         resource_mgr.generate_status_json(status_dict)
         job_exe_mgr.generate_status_json(status_dict['nodes'], when)
         task_mgr.generate_status_json(status_dict['nodes'])
         job_type_mgr.generate_status_json(status_dict)
+        status_dict['message_handlers'] = MessageHandlerStatus.objects.get_metrics_json(when)
         Scheduler.objects.all().update(status=status_dict)
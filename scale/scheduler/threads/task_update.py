@@ -8,6 +8,7 @@ from scheduler.threads.base_thread import BaseSchedulerThread
 
 
 THROTTLE = datetime.timedelta(seconds=1)
+MIN_INTERVAL = datetime.timedelta(milliseconds=100)
 WARN_THRESHOLD = datetime.timedelta(milliseconds=500)
 
 
@@ -18,7 +19,7 @@ class TaskUpdateThread(BaseSchedulerThread):
         """Constructor
         """
 
-        super(TaskUpdateThread, self).__init__('Task update', THROTTLE, WARN_THRESHOLD)
+        super(TaskUpdateThread, self).__init__('Task update', THROTTLE, WARN_THRESHOLD, MIN_INTERVAL)
 
     def _execute(self):
         """See :meth:`scheduler.threads.base_thread.BaseSchedulerThread._execute`
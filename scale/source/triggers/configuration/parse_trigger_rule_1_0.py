@@ -3,7 +3,6 @@ from __future__ import unicode_literals
 
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from job.configuration.data.job_connection import JobConnection
@@ -12,6 +11,7 @@ from recipe.triggers.configuration.trigger_rule import RecipeTriggerRuleConfigur
 from source.triggers.parse_trigger_condition import ParseTriggerCondition
 from storage.models import Workspace
 from trigger.configuration.exceptions import InvalidTriggerRule
+from util.schema import validate
 
 
 logger = logging.getLogger(__name__)
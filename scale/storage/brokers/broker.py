@@ -121,7 +121,7 @@ class Broker(object):
 
         return None
 
-    def list_files(self, volume_path, recursive):
+    def list_files(self, volume_path, recursive, partition=None, start_after=None):
         """List the files under the given file system paths.
 
         If this broker uses a container volume, volume_path will contain the absolute local container location where
@@ -134,17 +134,44 @@ class Broker(object):
         result set to be returned, the results are returned via a generator. 
         This generator will contain objects of type `storage.brokers.broker.FileDetails`.
 
+        If a partition (see :meth:`storage.brokers.broker.Broker.list_partitions`) is given, only the files within that
+        partition are listed, in ascending path order so that a listing can be resumed by passing the path of the last
+        listed file as start_after.
+
         :param volume_path: Absolute path to the local container location onto which the volume file system was mounted,
             None if this broker does not use a container volume
         :type volume_path: string
         :param recursive: Flag to indicate whether file searching should be done recursively
         :type recursive: boolean
+        :param partition: The partition to list, None to list the whole file system
+        :type partition: string
+        :param start_after: Only files with a path after this path are listed, requires a partition
+        :type start_after: string
         :return: Generator of files matching given expression
         :rtype: Generator[:class:`storage.brokers.broker.FileDetails`]
         """
 
         raise NotImplementedError
 
+    def list_partitions(self, volume_path):
+        """Lists the partitions of the file system, so that the files of each partition can be listed concurrently. The
+        empty partition '' contains the files at the root of the file system and is always listed non-recursively.
+        Every other partition is a top-level directory (prefix) with a trailing slash, such as 'dir/', and contains all
+        of the files beneath it.
+
+        If this broker uses a container volume, volume_path will contain the absolute local container location where
+        that volume file system is mounted. If this broker does not use a container volume, None will be given for
+        volume_path.
+
+        :param volume_path: Absolute path to the local container location onto which the volume file system was mounted,
+            None if this broker does not use a container volume
+        :type volume_path: string
+        :return: The top-level directory partitions, not including the empty root partition
+        :rtype: [string]
+        """
+
+        raise NotImplementedError
+
     def load_configuration(self, config):
         """Loads the given configuration
 
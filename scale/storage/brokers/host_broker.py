@@ -5,11 +5,13 @@ import logging
 import os
 import shutil
 
+import storage.settings as settings
 from storage.brokers.broker import Broker, BrokerVolume, FileDetails
 from storage.brokers.exceptions import InvalidBrokerConfiguration
+from storage.checksum import compute_checksum, copy_file
 from storage.exceptions import MissingFile
 from util.command import execute_command_line
-from util.os_helper import makedirs
+from util.os_helper import link_file, makedirs, remove_files
 
 logger = logging.getLogger(__name__)
 
@@ -28,16 +30,13 @@ class HostBroker(Broker):
         """See :meth:`storage.brokers.broker.Broker.delete_files`
         """
 
-        for scale_file in files:
-            path_to_delete = os.path.join(volume_path, scale_file.file_path)
-            if os.path.exists(path_to_delete):
-                logger.info('Deleting %s', path_to_delete)
-                os.remove(path_to_delete)
+        paths_to_delete = [os.path.join(volume_path, scale_file.file_path) for scale_file in files]
+        deleted_paths = set(remove_files(paths_to_delete, settings.FILE_DELETE_CONCURRENCY))
 
-                if update_model:
-                    # Update model attributes
-                    scale_file.set_deleted()
-                    scale_file.save()
+        if update_model:
+            from storage.models import ScaleFile
+            deleted_files = [scale_file for scale_file, path in zip(files, paths_to_delete) if path in deleted_paths]
+            ScaleFile.objects.set_files_deleted(deleted_files)
 
     def download_files(self, volume_path, file_downloads):
         """See :meth:`storage.brokers.broker.Broker.download_files`
@@ -63,16 +62,34 @@ class HostBroker(Broker):
             paths.append(os.path.join(volume_path, scale_file.file_path))
         return paths
 
-    def list_files(self, volume_path, recursive):
+    def list_files(self, volume_path, recursive, partition=None, start_after=None):
         """See :meth:`storage.brokers.broker.Broker.list_files`
         """
 
+        if partition is not None:
+            # The root partition holds only the root files, directory partitions contain all of their files
+            recursive = bool(partition)
+            for relative_file_name in self._sorted_dir_walker(volume_path, partition, recursive, start_after):
+                yield FileDetails(relative_file_name, os.path.getsize(os.path.join(volume_path, relative_file_name)))
+            return
+
         for file_name in self._dir_walker(volume_path, recursive):
             if os.path.isfile(file_name):
                 # Strip down to a workspace relative path to the file, not an absolute path
                 relative_file_name = os.path.relpath(file_name, volume_path)
                 yield FileDetails(relative_file_name, os.path.getsize(file_name))
 
+    def list_partitions(self, volume_path):
+        """See :meth:`storage.brokers.broker.Broker.list_partitions`
+        """
+
+        partitions = []
+        for name in sorted(os.listdir(volume_path)):
+            path = os.path.join(volume_path, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                partitions.append(name + '/')
+        return partitions
+
     @staticmethod
     def _dir_walker(path, recursive):
         """Generator to handle both flat and recursive directory traversal
@@ -92,6 +109,45 @@ class HostBroker(Broker):
             for result in os.listdir(path):
                 yield os.path.join(path, result)
 
+    @staticmethod
+    def _sorted_dir_walker(volume_path, partition, recursive, start_after=None):
+        """Generator that walks the files of a partition in ascending path order (comparing path components), skipping
+        the directories that only contain paths up to and including start_after
+
+        :param volume_path: The path to the root of the file system
+        :type volume_path: string
+        :param partition: The partition to walk, either a top-level directory with a trailing slash or '' for the root
+        :type partition: string
+        :param recursive: Whether the walk includes sub-directories
+        :type recursive: bool
+        :param start_after: Only files with a relative path after this path are returned, possibly None
+        :type start_after: string
+        :returns: Generator of the relative paths of the files
+        :rtype: Generator[string]
+        """
+
+        start_parts = start_after.split(os.sep) if start_after else None
+        partition_parts = [partition.strip(os.sep)] if partition else []
+
+        def walk(parts):
+            dir_path = os.path.join(volume_path, *parts)
+            for name in sorted(os.listdir(dir_path)):
+                entry_parts = parts + [name]
+                entry_path = os.path.join(dir_path, name)
+                if os.path.isdir(entry_path):
+                    if not recursive or os.path.islink(entry_path):
+                        continue  # Symbolic links to directories are not followed, the same as os.walk()
+                    if start_parts and entry_parts < start_parts[:len(entry_parts)]:
+                        continue  # Everything within this directory comes before start_after
+                    for relative_path in walk(entry_parts):
+                        yield relative_path
+                elif os.path.isfile(entry_path):
+                    if start_parts and entry_parts <= start_parts:
+                        continue
+                    yield os.path.join(*entry_parts)
+
+        return walk(partition_parts)
+
     def load_configuration(self, config):
         """See :meth:`storage.brokers.broker.Broker.load_configuration`
         """
@@ -138,10 +194,21 @@ class HostBroker(Broker):
                 logger.info('Creating %s', path_to_upload_dir)
                 makedirs(path_to_upload_dir, mode=0755)
 
-            logger.info('Copying %s to %s', file_upload.local_path, path_to_upload)
-            shutil.copy(file_upload.local_path, path_to_upload)
-            logger.info('Setting file permissions for %s', path_to_upload)
-            os.chmod(path_to_upload, 0644)
+            algorithm = settings.FILE_CHECKSUM_ALGORITHM
+            # Avoid copying any bytes when the local file is on the same file system as the workspace and is already
+            # readable by every user. A linked file shares its permissions with the local file, so they are left
+            # unchanged. Other files are copied so that their permissions can be set.
+            if link_file(file_upload.local_path, path_to_upload, min_mode=0444):
+                if algorithm:
+                    file_upload.file.set_checksum(*compute_checksum(path_to_upload, algorithm))
+            else:
+                logger.info('Copying %s to %s', file_upload.local_path, path_to_upload)
+                if algorithm:
+                    file_upload.file.set_checksum(*copy_file(file_upload.local_path, path_to_upload, algorithm))
+                else:
+                    shutil.copy(file_upload.local_path, path_to_upload)
+                logger.info('Setting file permissions for %s', path_to_upload)
+                os.chmod(path_to_upload, 0644)
 
             # Create new model
             file_upload.file.save()
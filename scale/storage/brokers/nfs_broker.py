@@ -5,11 +5,13 @@ import logging
 import os
 import shutil
 
+import storage.settings as settings
 from storage.brokers.broker import Broker, BrokerVolume
 from storage.brokers.exceptions import InvalidBrokerConfiguration
+from storage.checksum import compute_checksum, copy_file
 from storage.exceptions import MissingFile
 from util.command import execute_command_line
-from util.os_helper import makedirs
+from util.os_helper import link_file, makedirs, remove_files
 
 logger = logging.getLogger(__name__)
 
@@ -29,16 +31,13 @@ class NfsBroker(Broker):
         """See :meth:`storage.brokers.broker.Broker.delete_files`
         """
 
-        for scale_file in files:
-            path_to_delete = os.path.join(volume_path, scale_file.file_path)
-            if os.path.exists(path_to_delete):
-                logger.info('Deleting %s', path_to_delete)
-                os.remove(path_to_delete)
+        paths_to_delete = [os.path.join(volume_path, scale_file.file_path) for scale_file in files]
+        deleted_paths = set(remove_files(paths_to_delete, settings.FILE_DELETE_CONCURRENCY))
 
-                if update_model:
-                    # Update model attributes
-                    scale_file.set_deleted()
-                    scale_file.save()
+        if update_model:
+            from storage.models import ScaleFile
+            deleted_files = [scale_file for scale_file, path in zip(files, paths_to_delete) if path in deleted_paths]
+            ScaleFile.objects.set_files_deleted(deleted_files)
 
     def download_files(self, volume_path, file_downloads):
         """See :meth:`storage.brokers.broker.Broker.download_files`
@@ -108,10 +107,20 @@ class NfsBroker(Broker):
                 logger.info('Creating %s', path_to_upload_dir)
                 makedirs(path_to_upload_dir, mode=0755)
 
-            logger.info('Copying %s to %s', file_upload.local_path, path_to_upload)
-            self._copy_file(file_upload.local_path, path_to_upload)
-            logger.info('Setting file permissions for %s', path_to_upload)
-            os.chmod(path_to_upload, 0644)
+            algorithm = settings.FILE_CHECKSUM_ALGORITHM
+            # Avoid copying any bytes when the local file is on the same file system as the workspace and is already
+            # readable by every user. A linked file shares its permissions with the local file, so they are left
+            # unchanged. Other files are copied so that their permissions can be set.
+            if link_file(file_upload.local_path, path_to_upload, min_mode=0444):
+                if algorithm:
+                    file_upload.file.set_checksum(*compute_checksum(path_to_upload, algorithm))
+            else:
+                logger.info('Copying %s to %s', file_upload.local_path, path_to_upload)
+                checksum_and_size = self._copy_file(file_upload.local_path, path_to_upload, algorithm)
+                if checksum_and_size:
+                    file_upload.file.set_checksum(*checksum_and_size)
+                logger.info('Setting file permissions for %s', path_to_upload)
+                os.chmod(path_to_upload, 0644)
 
             # Create new model
             file_upload.file.save()
@@ -124,13 +133,19 @@ class NfsBroker(Broker):
             raise InvalidBrokerConfiguration('INVALID_BROKER', 'NFS broker requires "nfs_path" to be populated')
         return []
 
-    def _copy_file(self, src_path, dest_path):
-        """Performs a copy from the src_path to the dest_path
+    def _copy_file(self, src_path, dest_path, algorithm=None):
+        """Performs a copy from the src_path to the dest_path using bbcp, falling back to cp if bbcp fails. If a checksum
+        algorithm is given, the file is copied locally instead of with bbcp so that the checksum is computed in the same
+        pass.
 
         :param src_path: The absolute path to the source file
         :type src_path: str
         :param dest_path: The absolute path to the destination
         :type dest_path: str
+        :param algorithm: The checksum algorithm, None to not compute a checksum
+        :type algorithm: str
+        :returns: The checksum and size of the file if a checksum algorithm was given, otherwise None
+        :rtype: tuple
         """
 
         if os.path.islink(src_path):
@@ -138,7 +153,10 @@ class NfsBroker(Broker):
             logger.info('%s is a link to %s', src_path, real_path)
             src_path = real_path
             logger.info('Copying %s to %s', src_path, dest_path)
-        # Attempt bbcp copy first. If it fails, we'll fallback to cp
+        if algorithm:
+            # bbcp does not report the checksum that it computes
+            return copy_file(src_path, dest_path, algorithm)
+        # Otherwise attempt a bbcp copy. If it fails, we'll fallback to cp
         try:
             # TODO: detect bbcp location instead of assuming /usr/local and don't even try to execute if it isn't
             # installed
@@ -149,7 +167,7 @@ class NfsBroker(Broker):
                         apply(os.path.join, srv_src_path) if srv_src_path[0] is not None else srv_src_path[1],
                         apply(os.path.join, srv_dest_path) if srv_dest_path[0] is not None else srv_dest_path[1]]
             execute_command_line(cmd_list)
-            return
+            return None
         except OSError as e:
             # errno 2 is No such file or directory..bbcp not installed. We'll be quiet about it but fallback
             if e.errno != 2:
@@ -158,6 +176,7 @@ class NfsBroker(Broker):
             logger.exception("NFS Broker bbcp copy_file")  # Ignore the error and attempt a regular cp
         logger.info('Fall back to cp for %s', src_path)
         shutil.copy(src_path, dest_path)
+        return None
 
     def _get_mount_info(self, *args):
         """Determine what filesystem contains a path and if it's an nfs filesystem return the mount spec and server.
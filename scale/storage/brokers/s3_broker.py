@@ -4,17 +4,22 @@ from __future__ import unicode_literals
 import logging
 import os
 import ssl
+import sys
 import time
+from multiprocessing.pool import ThreadPool
 
+import django.utils.six as six
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 
 import storage.settings as settings
 from storage.brokers.broker import Broker, BrokerVolume
 from storage.brokers.exceptions import InvalidBrokerConfiguration
+from storage.checksum import ChecksumStream, get_checksum_algorithm
 from storage.exceptions import MissingFile
+from storage.input_cache import get_input_file_cache
 from util.aws import S3Client, AWSClient
 from util.command import execute_command_line
-from util.exceptions import FileDoesNotExist
 from util.validation import ValidationWarning
 
 logger = logging.getLogger(__name__)
@@ -35,20 +40,30 @@ class S3Broker(Broker):
     def delete_files(self, volume_path, files, update_model=True):
         """See :meth:`storage.brokers.broker.Broker.delete_files`"""
 
+        if not files:
+            return
+
+        key_names = [scale_file.file_path for scale_file in files]
         with S3Client(self._credentials, self._region_name) as client:
-            for scale_file in files:
-                s3_object = client.get_object(self._bucket_name, scale_file.file_path)
+            errors = self._delete_objects(client, key_names)
+
+        for key_name, message in errors.items():
+            logger.error('Failed to delete %s: %s', key_name, message)
 
-                self._delete_file(s3_object, scale_file)
+        if update_model:
+            from storage.models import ScaleFile
+            deleted_files = [scale_file for scale_file in files if scale_file.file_path not in errors]
+            ScaleFile.objects.set_files_deleted(deleted_files)
 
-                if update_model:
-                    # Update model attributes
-                    scale_file.set_deleted()
-                    scale_file.save()
+        if errors:
+            raise IOError('Failed to delete %i file(s) from S3 bucket %s' % (len(errors), self._bucket_name))
 
     def download_files(self, volume_path, file_downloads):
         """See :meth:`storage.brokers.broker.Broker.download_files`"""
 
+        input_cache = get_input_file_cache()
+        transfers = []
+        cached_downloads = []  # [(File download, temporary download path)]
         with S3Client(self._credentials, self._region_name) as client:
             for file_download in file_downloads:
                 # If file supports partial mount and volume is configured attempt sym-link
@@ -63,21 +78,46 @@ class S3Broker(Broker):
                     # Create symlink to the file in the host mount
                     logger.info('Creating link %s -> %s', file_download.local_path, path_to_download)
                     execute_command_line(['ln', '-s', path_to_download, file_download.local_path])
+                # Use a copy of the file that was already downloaded onto this node
+                elif input_cache and input_cache.retrieve_file(file_download.file, file_download.local_path):
+                    continue
                 # Fall-back to default S3 file download
                 else:
-                    try:
-                        s3_object = client.get_object(self._bucket_name, file_download.file.file_path)
-                    except FileDoesNotExist:
-                        raise MissingFile(file_download.file.file_name)
+                    download_path = file_download.local_path
+                    if input_cache:
+                        download_path = input_cache.get_download_path(file_download.file)
+                        cached_downloads.append((file_download, download_path))
+                    # A missing file is detected by the download itself, so it is not validated beforehand
+                    s3_object = client.get_object(self._bucket_name, file_download.file.file_path, False)
+                    transfers.append((s3_object, file_download.file, download_path))
+
+            errors = self._run_transfers(self._download_file, transfers)
+        self._raise_first_error(errors)
+
+        if input_cache:
+            for file_download, download_path in cached_downloads:
+                input_cache.add_file(file_download.file, download_path, file_download.local_path)
+            input_cache.finish()
+
+    def list_files(self, volume_path, recursive, partition=None, start_after=None):
+        """See :meth:`storage.brokers.broker.Broker.list_files`
+        """
 
-                    self._download_file(s3_object, file_download.file, file_download.local_path)
+        prefix = volume_path
+        if partition is not None:
+            prefix = partition
+            # The root partition holds only the root files, directory partitions contain all of their files
+            recursive = bool(partition)
 
-    def list_files(self, volume_path, recursive):
-        """See :meth:`storage.brokers.broker.Broker.list_files`
+        with S3Client(self._credentials, self._region_name) as client:
+            return client.list_objects(self._bucket_name, recursive, prefix, start_after)
+
+    def list_partitions(self, volume_path):
+        """See :meth:`storage.brokers.broker.Broker.list_partitions`
         """
 
         with S3Client(self._credentials, self._region_name) as client:
-            return client.list_objects(self._bucket_name, recursive, volume_path)
+            return client.list_prefixes(self._bucket_name)
 
     def load_configuration(self, config):
         """See :meth:`storage.brokers.broker.Broker.load_configuration`"""
@@ -97,31 +137,39 @@ class S3Broker(Broker):
     def move_files(self, volume_path, file_moves):
         """See :meth:`storage.brokers.broker.Broker.move_files`"""
 
+        transfers = []
         with S3Client(self._credentials, self._region_name) as client:
             for file_move in file_moves:
-                try:
-                    s3_object_src = client.get_object(self._bucket_name, file_move.file.file_path)
-                except FileDoesNotExist:
-                    raise MissingFile(file_move.file.file_name)
+                # A missing source file is detected by the copy itself, so it is not validated beforehand
+                s3_object_src = client.get_object(self._bucket_name, file_move.file.file_path, False)
                 s3_object_dest = client.get_object(self._bucket_name, file_move.new_path, False)
+                transfers.append((s3_object_src, s3_object_dest, file_move.file, file_move.new_path))
 
-                self._move_file(s3_object_src, s3_object_dest, file_move.file, file_move.new_path)
+            errors = self._run_transfers(self._move_file, transfers)
 
+        for file_move, error in zip(file_moves, errors):
+            if not error:
                 # Update model attributes
                 file_move.file.file_path = file_move.new_path
                 file_move.file.save()
+        self._raise_first_error(errors)
 
     def upload_files(self, volume_path, file_uploads):
         """See :meth:`storage.brokers.broker.Broker.upload_files`"""
 
+        transfers = []
         with S3Client(self._credentials, self._region_name) as client:
             for file_upload in file_uploads:
                 s3_object = client.get_object(self._bucket_name, file_upload.file.file_path, False)
+                transfers.append((s3_object, file_upload.file, file_upload.local_path))
 
-                self._upload_file(s3_object, file_upload.file, file_upload.local_path)
+            errors = self._run_transfers(self._upload_file, transfers)
 
+        for file_upload, error in zip(file_uploads, errors):
+            if not error:
                 # Create new model
                 file_upload.file.save()
+        self._raise_first_error(errors)
 
     def validate_configuration(self, config):
         """See :meth:`storage.brokers.broker.Broker.validate_configuration`"""
@@ -143,6 +191,29 @@ class S3Broker(Broker):
 
         return warnings
 
+    def _delete_objects(self, client, key_names, retries=settings.S3_RETRY_COUNT):
+        """Deletes objects from the S3 file system in batches.
+
+        This method will attempt to retry the delete if :class:`ssl.SSLError` is raised up to a number of retries given.
+
+        :param client: The S3 client
+        :type client: :class:`util.aws.S3Client`
+        :param key_names: The keys of the objects to delete
+        :type key_names: [string]
+        :returns: The error message for each key that failed to be deleted
+        :rtype: dict
+        """
+
+        logger.info('Deleting %i file(s) from %s', len(key_names), self._bucket_name)
+        for attempt in range(retries):
+            try:
+                return client.delete_objects(self._bucket_name, key_names)
+            except ssl.SSLError:
+                if attempt + 1 >= retries:
+                    raise
+                time.sleep(settings.S3_RETRY_DELAY * attempt)
+                logger.exception('Retrying S3 delete attempt: %i', attempt + 1)
+
     def _delete_file(self, s3_object, scale_file, retries=settings.S3_RETRY_COUNT):
         """Deletes a file from the S3 file system.
 
@@ -181,14 +252,41 @@ class S3Broker(Broker):
         logger.info('Downloading %s -> %s', scale_file.file_path, path)
         for attempt in range(retries):
             try:
-                s3_object.download_file(path)
+                if settings.FILE_CHECKSUM_ALGORITHM and scale_file.checksum:
+                    self._download_file_with_checksum(s3_object, scale_file, path)
+                else:
+                    s3_object.download_file(path, Config=self._get_transfer_config())
                 return
+            except ClientError as err:
+                if self._is_not_found(err):
+                    raise MissingFile(scale_file.file_name)
+                raise
             except ssl.SSLError:
                 if attempt >= retries:
                     raise
                 time.sleep(settings.S3_RETRY_DELAY * attempt)
                 logger.exception('Retrying S3 download attempt: %i', attempt + 1)
 
+    def _download_file_with_checksum(self, s3_object, scale_file, path):
+        """Downloads a file in S3 storage to the local file system, verifying the file's checksum in the same pass
+
+        :param s3_object: The S3 object representing the file to download.
+        :type s3_object: :class:`boto3.s3.Object`
+        :param scale_file: The model associated with the file to download, with its checksum populated.
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :param path: The destination path for the file download.
+        :type path: string
+
+        :raises IOError: If the checksum of the downloaded file does not match
+        """
+
+        with open(path, 'wb') as file_obj:
+            stream = ChecksumStream(file_obj, get_checksum_algorithm(scale_file.checksum))
+            s3_object.download_fileobj(stream, Config=self._get_transfer_config())
+        if stream.checksum != scale_file.checksum:
+            raise IOError('Downloaded %s has checksum %s, expected %s' % (scale_file.file_path, stream.checksum,
+                                                                          scale_file.checksum))
+
     def _move_file(self, s3_object_src, s3_object_dest, scale_file, path, retries=settings.S3_RETRY_COUNT):
         """Moves a file within the S3 file system.
 
@@ -224,6 +322,10 @@ class S3Broker(Broker):
             try:
                 s3_object_dest.copy_from(**options)
                 break
+            except ClientError as err:
+                if self._is_not_found(err):
+                    raise MissingFile(scale_file.file_name)
+                raise
             except ssl.SSLError:
                 if attempt >= retries:
                     raise
@@ -253,12 +355,87 @@ class S3Broker(Broker):
             options['ContentType'] = scale_file.media_type
 
         logger.info('Uploading %s -> %s', path, scale_file.file_path)
+        algorithm = settings.FILE_CHECKSUM_ALGORITHM
         for attempt in range(retries):
             try:
-                s3_object.upload_file(path, options)
+                if algorithm:
+                    # Each attempt starts a new checksum since the file is read from the beginning again
+                    with open(path, 'rb') as file_obj:
+                        stream = ChecksumStream(file_obj, algorithm)
+                        s3_object.upload_fileobj(stream, options, Config=self._get_transfer_config())
+                    scale_file.set_checksum(stream.checksum, stream.size)
+                else:
+                    s3_object.upload_file(path, options, Config=self._get_transfer_config())
                 return
             except ssl.SSLError:
                 if attempt >= retries:
                     raise
                 time.sleep(settings.S3_RETRY_DELAY * attempt)
                 logger.exception('Retrying S3 upload attempt: %i', attempt + 1)
+
+    @staticmethod
+    def _get_transfer_config():
+        """Returns the configuration for multipart transfers of a single file
+
+        :returns: The transfer configuration
+        :rtype: :class:`boto3.s3.transfer.TransferConfig`
+        """
+
+        return TransferConfig(multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+                              multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+                              max_concurrency=settings.S3_MULTIPART_CONCURRENCY)
+
+    @staticmethod
+    def _is_not_found(err):
+        """Indicates whether the given client error was caused by a missing S3 object
+
+        :param err: The client error
+        :type err: :class:`botocore.exceptions.ClientError`
+        :returns: True if the S3 object was not found, False otherwise
+        :rtype: bool
+        """
+
+        return err.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 404
+
+    @staticmethod
+    def _raise_first_error(errors):
+        """Re-raises the first error returned by :meth:`_run_transfers`, if any
+
+        :param errors: The exception info of each transfer, None for each transfer that succeeded
+        :type errors: list
+        """
+
+        for error in errors:
+            if error:
+                six.reraise(*error)
+
+    @staticmethod
+    def _run_transfers(transfer_func, transfers):
+        """Runs the given transfers, up to the configured number of transfers at the same time. Every transfer is
+        attempted even if another transfer fails.
+
+        :param transfer_func: The function that performs a single transfer
+        :type transfer_func: func
+        :param transfers: The arguments of each transfer
+        :type transfers: [tuple]
+        :returns: The exception info of each transfer in the given order, None for each transfer that succeeded
+        :rtype: list
+        """
+
+        def run_transfer(transfer):
+            try:
+                transfer_func(*transfer)
+            except Exception:
+                return sys.exc_info()
+            return None
+
+        num_threads = min(settings.S3_TRANSFER_CONCURRENCY, len(transfers))
+        if num_threads <= 1:
+            return [run_transfer(transfer) for transfer in transfers]
+
+        pool = ThreadPool(num_threads)
+        try:
+            return pool.map(run_transfer, transfers)
+        finally:
+            pool.close()
+            pool.join()
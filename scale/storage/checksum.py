@@ -0,0 +1,126 @@
+"""Defines the classes and functions that compute file checksums in the same pass as a file transfer"""
+from __future__ import unicode_literals
+
+import hashlib
+import shutil
+
+# The algorithms that can be used to compute file checksums
+CHECKSUM_ALGORITHMS = ['md5', 'sha256']
+
+# The number of bytes that are read and hashed at a time
+BLOCK_SIZE = 1024 * 1024  # 1 MiB
+
+
+class ChecksumStream(object):
+    """This class wraps a file object and computes the checksum and byte count of all of the bytes that are read from or
+    written to it. The stream is deliberately not seekable so that transfer libraries only read and write it
+    sequentially.
+    """
+
+    def __init__(self, file_obj, algorithm):
+        """Constructor
+
+        :param file_obj: The file object to wrap
+        :type file_obj: file
+        :param algorithm: The checksum algorithm, one of CHECKSUM_ALGORITHMS
+        :type algorithm: string
+        """
+
+        self._file_obj = file_obj
+        self._algorithm = algorithm
+        self._hash = hashlib.new(algorithm)
+        self.size = 0
+
+    @property
+    def checksum(self):
+        """The checksum of the bytes transferred so far, prefixed by the algorithm (such as 'md5:<hex digest>')
+
+        :returns: The checksum
+        :rtype: string
+        """
+
+        return '%s:%s' % (self._algorithm, self._hash.hexdigest())
+
+    def read(self, size=-1):
+        """Reads and hashes bytes from the wrapped file object
+
+        :param size: The maximum number of bytes to read, -1 to read to the end of the file
+        :type size: int
+        :returns: The bytes that were read
+        :rtype: bytes
+        """
+
+        data = self._file_obj.read(size)
+        self._update(data)
+        return data
+
+    def write(self, data):
+        """Hashes and writes bytes to the wrapped file object
+
+        :param data: The bytes to write
+        :type data: bytes
+        """
+
+        self._file_obj.write(data)
+        self._update(data)
+
+    def _update(self, data):
+        """Adds the given bytes to the checksum and byte count
+
+        :param data: The bytes
+        :type data: bytes
+        """
+
+        self._hash.update(data)
+        self.size += len(data)
+
+
+def compute_checksum(path, algorithm):
+    """Computes the checksum and size of the given file by reading it once
+
+    :param path: The path of the file
+    :type path: string
+    :param algorithm: The checksum algorithm, one of CHECKSUM_ALGORITHMS
+    :type algorithm: string
+    :returns: The checksum (see :meth:`ChecksumStream.checksum`) and the size of the file in bytes
+    :rtype: tuple
+    """
+
+    with open(path, 'rb') as file_obj:
+        stream = ChecksumStream(file_obj, algorithm)
+        while stream.read(BLOCK_SIZE):
+            pass
+    return stream.checksum, stream.size
+
+
+def copy_file(src_path, dest_path, algorithm):
+    """Copies the given file, including its permission bits like :func:`shutil.copy`, and computes the checksum and size
+    of the file in the same pass
+
+    :param src_path: The path of the source file
+    :type src_path: string
+    :param dest_path: The path of the destination file
+    :type dest_path: string
+    :param algorithm: The checksum algorithm, one of CHECKSUM_ALGORITHMS
+    :type algorithm: string
+    :returns: The checksum (see :meth:`ChecksumStream.checksum`) and the size of the file in bytes
+    :rtype: tuple
+    """
+
+    with open(src_path, 'rb') as src_file, open(dest_path, 'wb') as dest_file:
+        stream = ChecksumStream(src_file, algorithm)
+        shutil.copyfileobj(stream, dest_file, BLOCK_SIZE)
+    shutil.copymode(src_path, dest_path)
+    return stream.checksum, stream.size
+
+
+def get_checksum_algorithm(checksum):
+    """Returns the algorithm of the given checksum
+
+    :param checksum: The checksum (see :meth:`ChecksumStream.checksum`)
+    :type checksum: string
+    :returns: The checksum algorithm
+    :rtype: string
+    """
+
+    return checksum.split(':', 1)[0]
@@ -3,11 +3,11 @@ from __future__ import unicode_literals
 
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from storage.configuration.workspace_configuration import WorkspaceConfiguration
 from storage.configuration.exceptions import InvalidWorkspaceConfiguration
+from util.schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -1,12 +1,12 @@
 """Manages the v6 job configuration schema"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 from storage.configuration.workspace_configuration import WorkspaceConfiguration
 from storage.configuration.exceptions import InvalidWorkspaceConfiguration
 from storage.configuration.json.workspace_config_1_0 import WorkspaceConfigurationV1
+from util.schema import validate
 
 
 SCHEMA_VERSION = '6'
@@ -1,11 +1,11 @@
 """Defines the configuration for a storage Workspace"""
 from __future__ import unicode_literals
 
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 import storage.brokers.factory as broker_factory
 from storage.configuration.exceptions import InvalidWorkspaceConfiguration
+from util.schema import validate
 
 class WorkspaceConfiguration(object):
     """Represents the configuration for a storage Workspace.
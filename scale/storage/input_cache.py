@@ -0,0 +1,249 @@
+"""Defines the class that manages the node-local cache of job input files"""
+from __future__ import unicode_literals
+
+import calendar
+import errno
+import fcntl
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Environment variables that enable the input file cache within a job execution's pre-task
+INPUT_CACHE_PATH_ENV = 'SCALE_INPUT_CACHE_PATH'
+INPUT_CACHE_SIZE_LIMIT_ENV = 'SCALE_INPUT_CACHE_SIZE_LIMIT'
+
+# Temporary downloads older than this many seconds were abandoned by failed pre-tasks
+ABANDONED_DOWNLOAD_AGE = 24 * 60 * 60
+
+LOCK_FILE_NAME = '.lock'
+STATS_FILE_NAME = 'stats.json'
+
+# Linux ioctl that clones a whole file as a copy-on-write reflink, on file systems that support it (Btrfs, XFS, etc)
+FICLONE = 0x40049409
+# Errors from FICLONE that mean the file must be copied instead of cloned
+CLONE_UNSUPPORTED_ERRNOS = (errno.EBADF, errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP, errno.EXDEV)
+
+
+class InputFileCache(object):
+    """This class manages a cache directory on a node that holds copies of downloaded job input files so that the job
+    executions on the node that use the same file only download it once. Cached files are keyed by the file's ID and
+    last modified time, are cloned (or copied if they cannot be cloned) into the job execution's input directory, and
+    are evicted in least recently used order when the cache grows beyond its size limit. Multiple processes on the node
+    can safely share the cache.
+    """
+
+    def __init__(self, cache_path, size_limit):
+        """Constructor
+
+        :param cache_path: The path of the cache directory
+        :type cache_path: string
+        :param size_limit: The maximum total size in bytes of the cached files
+        :type size_limit: int
+        """
+
+        self._cache_path = cache_path
+        self._files_path = os.path.join(cache_path, 'files')
+        self._tmp_path = os.path.join(cache_path, 'tmp')
+        self._size_limit = size_limit
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        for path in (self._files_path, self._tmp_path):
+            if not os.path.exists(path):
+                try:
+                    os.makedirs(path, 0755)
+                except OSError as ex:
+                    if ex.errno != errno.EEXIST:
+                        raise
+
+    def add_file(self, scale_file, download_path, local_path):
+        """Adds the given downloaded file to the cache and clones it into the given local path
+
+        :param scale_file: The file that was downloaded
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :param download_path: The temporary path that the file was downloaded to, from :meth:`get_download_path`
+        :type download_path: string
+        :param local_path: The local path where the job execution expects the file
+        :type local_path: string
+        """
+
+        # Cached files are never written again. Renaming is atomic, so another job execution on the node sees either no
+        # file or the whole file.
+        cached_path = self._get_cached_path(scale_file)
+        os.chmod(download_path, 0444)
+        os.rename(download_path, cached_path)
+        _clone_or_copy(cached_path, local_path)
+        self.misses += 1
+
+    def finish(self):
+        """Evicts the least recently used files until the cache is within its size limit and saves the cumulative
+        cache statistics for the node. This should be called after a job execution has retrieved its input files.
+        """
+
+        with self._lock():
+            self._evict()
+            stats = self._load_stats()
+            stats['hits'] = stats.get('hits', 0) + self.hits
+            stats['misses'] = stats.get('misses', 0) + self.misses
+            stats['evictions'] = stats.get('evictions', 0) + self.evictions
+            with open(os.path.join(self._cache_path, STATS_FILE_NAME), 'w') as stats_file:
+                json.dump(stats, stats_file)
+
+        logger.info('Input file cache: %i hit(s), %i miss(es), %i eviction(s)', self.hits, self.misses,
+                    self.evictions)
+
+    def get_download_path(self, scale_file):
+        """Returns a unique temporary path within the cache for downloading the given file
+
+        :param scale_file: The file to download
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :returns: The temporary download path
+        :rtype: string
+        """
+
+        return os.path.join(self._tmp_path, '%s_%s' % (uuid.uuid4().hex, self._get_cache_key(scale_file)))
+
+    def retrieve_file(self, scale_file, local_path):
+        """Clones the given file from the cache into the given local path if the file is cached
+
+        :param scale_file: The file to retrieve
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :param local_path: The local path where the job execution expects the file
+        :type local_path: string
+        :returns: True if the file was retrieved from the cache, False if it must be downloaded
+        :rtype: bool
+        """
+
+        cached_path = self._get_cached_path(scale_file)
+        try:
+            # Mark the file as recently used so that it is evicted last
+            os.utime(cached_path, None)
+            _clone_or_copy(cached_path, local_path)
+        except (IOError, OSError) as ex:
+            if ex.errno != errno.ENOENT:
+                raise
+            return False  # Not cached or just evicted
+
+        logger.info('Retrieved %s from input file cache', scale_file.file_name)
+        self.hits += 1
+        return True
+
+    def _evict(self):
+        """Deletes the least recently used files until the cache is within its size limit, along with any abandoned
+        temporary downloads. Caller must hold the lock.
+        """
+
+        cached_files = []  # [(Last used, size, path)]
+        total_size = 0
+        for file_name in os.listdir(self._files_path):
+            path = os.path.join(self._files_path, file_name)
+            stat = os.stat(path)
+            cached_files.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        cached_files.sort()
+        for _, size, path in cached_files:
+            if total_size <= self._size_limit:
+                break
+            logger.debug('Evicting %s from input file cache', path)
+            os.remove(path)
+            total_size -= size
+            self.evictions += 1
+
+        abandoned_time = time.time() - ABANDONED_DOWNLOAD_AGE
+        for file_name in os.listdir(self._tmp_path):
+            path = os.path.join(self._tmp_path, file_name)
+            if os.stat(path).st_mtime < abandoned_time:
+                os.remove(path)
+
+    def _get_cache_key(self, scale_file):
+        """Returns the cache key for the given file, which changes whenever the file model changes
+
+        :param scale_file: The file
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :returns: The cache key
+        :rtype: string
+        """
+
+        last_modified = scale_file.last_modified
+        timestamp = calendar.timegm(last_modified.utctimetuple()) * 1000000 + last_modified.microsecond
+        return '%d_%d' % (scale_file.id, timestamp)
+
+    def _get_cached_path(self, scale_file):
+        """Returns the path of the given file within the cache
+
+        :param scale_file: The file
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :returns: The cached file path
+        :rtype: string
+        """
+
+        return os.path.join(self._files_path, self._get_cache_key(scale_file))
+
+    def _load_stats(self):
+        """Loads the cumulative cache statistics for the node. Caller must hold the lock.
+
+        :returns: The cache statistics
+        :rtype: dict
+        """
+
+        try:
+            with open(os.path.join(self._cache_path, STATS_FILE_NAME)) as stats_file:
+                return json.load(stats_file)
+        except (IOError, ValueError):
+            return {}
+
+    @contextmanager
+    def _lock(self):
+        """Context manager that holds the lock shared by all processes using the cache
+        """
+
+        with open(os.path.join(self._cache_path, LOCK_FILE_NAME), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_input_file_cache():
+    """Returns the input file cache if it is enabled for this process (the pre-task of a job execution)
+
+    :returns: The input file cache, possibly None
+    :rtype: :class:`storage.input_cache.InputFileCache`
+    """
+
+    cache_path = os.environ.get(INPUT_CACHE_PATH_ENV)
+    if not cache_path:
+        return None
+    return InputFileCache(cache_path, int(os.environ.get(INPUT_CACHE_SIZE_LIMIT_ENV, 0)))
+
+
+def _clone_or_copy(src_path, dest_path):
+    """Clones the given source file to the given destination as a copy-on-write reflink, copying the file instead if the
+    file system cannot clone it. Unlike a hard link, the destination never shares data with the source, so a job
+    execution that writes to its input file cannot change the cached copy used by later job executions.
+
+    :param src_path: The source file path
+    :type src_path: string
+    :param dest_path: The destination file path
+    :type dest_path: string
+    """
+
+    with open(src_path, 'rb') as src_file:
+        with open(dest_path, 'wb') as dest_file:
+            try:
+                fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+                return
+            except (IOError, OSError) as ex:
+                if ex.errno not in CLONE_UNSUPPORTED_ERRNOS:
+                    raise
+            shutil.copyfileobj(src_file, dest_file)
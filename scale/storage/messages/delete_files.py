@@ -8,12 +8,13 @@ from django.db.models import F
 from django.utils import timezone
 
 from job.messages.purge_jobs import create_purge_jobs_messages
+from job.models import Job
 from messaging.messages.message import CommandMessage
 from storage.models import PurgeResults, ScaleFile
 
 # This is the maximum number of file models that can fit in one message. This maximum ensures that every message of this
 # type is less than 25 KiB long.
-MAX_NUM = 100
+MAX_NUM = 1000
 
 
 logger = logging.getLogger(__name__)
@@ -110,7 +111,7 @@ class DeleteFiles(CommandMessage):
         message.job_id = json_dict['job_id']
         message.trigger_id = json_dict['trigger_id']
         message.source_file_id = json_dict['source_file_id']
-        message.purge = bool(json_dict['purge'])
+        message.purge = json_dict['purge'] in (True, 'True')
         for file_id in json_dict['file_ids']:
             message.add_file(file_id)
         return message
@@ -119,26 +120,37 @@ class DeleteFiles(CommandMessage):
         """See :meth:`messaging.messages.message.CommandMessage.execute`
         """
 
-        # Check to see if a force stop was placed on this purge process
-        results = PurgeResults.objects.get(trigger_event=self.trigger_id)
-        if results.force_stop_purge:
-            return True
-
-        when = timezone.now()
-        files_to_delete = ScaleFile.objects.filter(id__in=self._file_ids)
-
-        if self.purge:
-            files_to_delete.delete()
-
-            # Update results
-            results.num_products_deleted = F('num_products_deleted') + len(self._file_ids)
-            results.save()
-
-            # Kick off purge_jobs for the given job_id
-            self.new_messages.extend(create_purge_jobs_messages(purge_job_ids=[self.job_id],
-                                                                trigger_id=self.trigger_id,
-                                                                source_file_id=self.source_file_id))
-        else:
-            files_to_delete.update(is_deleted=True, deleted=when, is_published=False, unpublished=when)
+        with transaction.atomic():
+            if self.purge:
+                # Lock the job so that the messages deleting its files are processed one at a time, ensuring that the
+                # message deleting the job's last files is the one that purges the job
+                Job.objects.get_locked_jobs([self.job_id])
+
+            # Check to see if a force stop was placed on this purge process
+            force_stop_purge = PurgeResults.objects.filter(trigger_event=self.trigger_id).values_list(
+                'force_stop_purge', flat=True).get()
+            if force_stop_purge:
+                return True
+
+            when = timezone.now()
+            files_to_delete = ScaleFile.objects.filter(id__in=self._file_ids)
+
+            if self.purge:
+                _, num_deleted_by_model = files_to_delete.delete()
+                num_deleted = num_deleted_by_model.get(ScaleFile._meta.label, 0)
+
+                # Update results
+                PurgeResults.objects.filter(trigger_event=self.trigger_id).update(
+                    num_products_deleted=F('num_products_deleted') + num_deleted)
+
+                # Kick off purge_jobs for the given job_id once none of its files remain, since the job cannot be
+                # deleted before its files
+                if not ScaleFile.objects.filter(job_id=self.job_id).exists():
+                    self.new_messages.extend(create_purge_jobs_messages(purge_job_ids=[self.job_id],
+                                                                        trigger_id=self.trigger_id,
+                                                                        source_file_id=self.source_file_id))
+            else:
+                files_to_delete.update(is_deleted=True, deleted=when, is_published=False, unpublished=when,
+                                       last_modified=when)
 
         return True
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storage', '0014_purgeresults_force_stop_purge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scalefile',
+            name='checksum',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
@@ -100,6 +100,50 @@ class CountryDataManager(models.Manager):
                 rval[val.name] = val
         return rval
 
+    def get_intersects_many(self, geoms):
+        """Get the countries whose borders intersect each of the given geometries and whose effective date is before
+        the geometry's target date. The candidate borders are retrieved in a single query and are then prepared and
+        intersected in-process, so the results match calling :meth:`get_intersects` for each geometry without a spatial
+        query per geometry.
+
+        :param geoms: List of (geometry, target date) tuples
+        :type geoms: [(:class:`django.contrib.gis.geos.geometry.GEOSGeometry`, :class:`datetime.datetime`)]
+        :returns: A list, in the same order as the given geometries, of dicts of intersected countries mapped to
+            entities
+        :rtype: [dict]
+        """
+
+        if not geoms:
+            return []
+
+        # The database transforms geometries into the border SRID, so in-process intersections must do the same
+        geoms = [(geom.transform(4326, clone=True) if geom.srid and geom.srid != 4326 else geom, target_date)
+                 for geom, target_date in geoms]
+
+        # Only retrieve the borders that overlap the combined extent of all of the geometries
+        extents = [geom.extent for geom, _ in geoms]
+        bbox = (min(e[0] for e in extents), min(e[1] for e in extents), max(e[2] for e in extents),
+                max(e[3] for e in extents))
+        latest_date = max(target_date for _, target_date in geoms)
+        query = self.filter(border__bboverlaps=geos.Polygon.from_bbox(bbox), effective__lte=latest_date)
+        countries = list(query.order_by('-effective'))
+        prepared_borders = {}  # {Country ID: Prepared border}
+
+        results = []
+        for geom, target_date in geoms:
+            rval = {}
+            for country in countries:
+                # Countries are ordered by descending effective date, so the first intersecting border for each name is
+                # the most recent one
+                if country.name in rval or country.effective > target_date:
+                    continue
+                if country.id not in prepared_borders:
+                    prepared_borders[country.id] = country.border.prepared
+                if prepared_borders[country.id].intersects(geom):
+                    rval[country.name] = country
+            results.append(rval)
+        return results
+
 
 class CountryData(models.Model):
     """Represents country borders and official abbreviations
@@ -503,6 +547,53 @@ class ScaleFileManager(models.Manager):
             wp_file_moves = wp_dict[wp_id][1]
             workspace.move_files(wp_file_moves)
 
+    def set_countries(self, files):
+        """Clears and recreates the countries list of each of the given saved files from the CountryData table in bulk,
+        see :meth:`storage.models.ScaleFile.set_countries`. The number of queries does not depend on the number of
+        files.
+
+        :param files: The saved file models
+        :type files: [:class:`storage.models.ScaleFile`]
+        """
+
+        if not files:
+            return
+
+        files_with_geom = [scale_file for scale_file in files if scale_file.geometry is not None]
+        geoms = [(scale_file.geometry, scale_file.get_country_target_date()) for scale_file in files_with_geom]
+        intersects = CountryData.objects.get_intersects_many(geoms)
+
+        through_model = ScaleFile.countries.through
+        new_countries = []
+        for scale_file, countries in zip(files_with_geom, intersects):
+            for country in countries.values():
+                new_countries.append(through_model(scalefile_id=scale_file.id, countrydata_id=country.id))
+
+        with transaction.atomic():
+            through_model.objects.filter(scalefile_id__in=[scale_file.id for scale_file in files]).delete()
+            through_model.objects.bulk_create(new_countries)
+
+    def set_files_deleted(self, files):
+        """Marks the given files as deleted and saves the changes in the database with a single update
+
+        :param files: List of files that were deleted
+        :type files: [:class:`storage.models.ScaleFile`]
+        """
+
+        if not files:
+            return
+
+        when = timezone.now()
+        for scale_file in files:
+            scale_file.is_deleted = True
+            scale_file.is_published = False
+            scale_file.deleted = when
+            scale_file.unpublished = when
+
+        file_ids = [scale_file.id for scale_file in files]
+        self.filter(id__in=file_ids).update(is_deleted=True, is_published=False, deleted=when, unpublished=when,
+                                            last_modified=when)
+
     def upload_files(self, workspace, file_uploads):
         """Uploads the given files from the given local file system paths into the given workspace. Each ScaleFile model
         should have its file_path field populated with the relative location where the file should be stored within the
@@ -535,11 +626,7 @@ class ScaleFileManager(models.Manager):
         workspace.upload_files(file_uploads)
 
         # Populate the country list for all files that were saved
-        for file_upload in file_uploads:
-            scale_file = file_upload.file
-            if scale_file.pk:
-                scale_file.set_countries()
-                scale_file.save()
+        self.set_countries([file_upload.file for file_upload in file_uploads if file_upload.file.pk])
 
         return file_list
 
@@ -555,6 +642,9 @@ class ScaleFile(models.Model):
     :type media_type: :class:`django.db.models.CharField`
     :keyword file_size: The size of the file in bytes
     :type file_size: :class:`django.db.models.BigIntegerField`
+    :keyword checksum: The checksum of the file computed while it was uploaded, prefixed by its algorithm (such as
+        'sha256:<hex digest>'), possibly None
+    :type checksum: :class:`django.db.models.CharField`
     :keyword data_type: A comma-separated string listing the data type "tags" for the file
     :type data_type: :class:`django.db.models.TextField`
     :keyword file_path: The relative path of the file in its workspace
@@ -653,6 +743,7 @@ class ScaleFile(models.Model):
     file_type = models.CharField(choices=FILE_TYPES, default='SOURCE', max_length=50, db_index=True)
     media_type = models.CharField(max_length=250)
     file_size = models.BigIntegerField()
+    checksum = models.CharField(blank=True, null=True, max_length=100)
     data_type = models.TextField(blank=True)
     file_path = models.CharField(max_length=1000)
     workspace = models.ForeignKey('storage.Workspace', on_delete=models.PROTECT)
@@ -757,6 +848,20 @@ class ScaleFile(models.Model):
                 tags.add(tag)
         return tags
 
+    def get_country_target_date(self):
+        """Returns the date used to select the effective country borders for this file, which is (in order of
+        preference) data_started, data_ended, or created
+
+        :returns: The target date for the country borders
+        :rtype: :class:`datetime.datetime`
+        """
+
+        if self.data_started is not None:
+            return self.data_started
+        elif self.data_ended is not None:
+            return self.data_ended
+        return self.created
+
     def set_basic_fields(self, file_name, file_size, media_type=None, data_type=None):
         """Sets the basic fields for the Scale file
 
@@ -780,6 +885,18 @@ class ScaleFile(models.Model):
             for tag in data_type:
                 self.add_data_type_tag(tag)
 
+    def set_checksum(self, checksum, file_size):
+        """Sets the checksum and size of the file that were computed while the file was transferred
+
+        :param checksum: The checksum prefixed by its algorithm, see :class:`storage.checksum.ChecksumStream`
+        :type checksum: string
+        :param file_size: The size of the file in bytes
+        :type file_size: long
+        """
+
+        self.checksum = checksum
+        self.file_size = file_size
+
     def set_countries(self):
         """Clears the countries list then recreates it from the CountryData table.
         If no geometry is available, this will remain empty.
@@ -788,11 +905,7 @@ class ScaleFile(models.Model):
         self.countries.clear()
         if self.geometry is None:
             return
-        target_date = self.created
-        if self.data_started is not None:
-            target_date = self.data_started
-        elif self.data_ended is not None:
-            target_date = self.data_ended
+        target_date = self.get_country_target_date()
         apply(self.countries.add, CountryData.objects.get_intersects(self.geometry, target_date).values())
 
     def set_deleted(self):
@@ -1219,19 +1332,36 @@ class Workspace(models.Model):
 
         return rest_utils.strip_schema_version(convert_config_to_v6_json(self.get_configuration()).get_dict())
 
-    def list_files(self, recursive):
-        """Lists files within a workspace, with optional full tree recursion.
+    def list_files(self, recursive, partition=None, start_after=None):
+        """Lists files within a workspace, with optional full tree recursion. See
+        :meth:`storage.brokers.broker.Broker.list_files` for listing a single partition of the workspace.
 
         :param recursive: Flag to indicate whether file searching should be done recursively
         :type recursive: boolean
+        :param partition: The partition to list, None to list the whole workspace
+        :type partition: string
+        :param start_after: Only files with a path after this path are listed, requires a partition
+        :type start_after: string
         :return: Generator of files matching given expression
         :rtype: Generator[:class:`storage.brokers.broker.FileDetails`]
         """
         volume_path = self._get_volume_path()
 
-        logger.info('Beginning%s file list for workspace: %s' % (' recursive' if recursive else '',
-                                                                   self.name))
-        return self.get_broker().list_files(volume_path, recursive)
+        if partition is None:
+            logger.info('Beginning%s file list for workspace: %s' % (' recursive' if recursive else '',
+                                                                       self.name))
+        else:
+            logger.info('Beginning file list of partition \'%s\' for workspace: %s', partition, self.name)
+        return self.get_broker().list_files(volume_path, recursive, partition, start_after)
+
+    def list_partitions(self):
+        """Lists the top-level partitions of the workspace, see :meth:`storage.brokers.broker.Broker.list_partitions`
+
+        :return: The top-level directory partitions, not including the empty root partition
+        :rtype: [string]
+        """
+
+        return self.get_broker().list_partitions(self._get_volume_path())
 
     def move_files(self, file_moves):
         """Moves the given files to the new file system paths and saves the ScaleFile model changes in the database. If
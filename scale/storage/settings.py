@@ -11,3 +11,21 @@ S3_RETRY_COUNT = getattr(settings, 'S3_RETRY_COUNT', 3)
 
 # The delay between retry attempts
 S3_RETRY_DELAY = getattr(settings, 'S3_RETRY_DELAY', 60)  # 1 minute
+
+# The number of files that are transferred to/from S3 at the same time
+S3_TRANSFER_CONCURRENCY = getattr(settings, 'S3_TRANSFER_CONCURRENCY', 8)
+
+# Files at least this size (in bytes) are transferred with multipart transfers
+S3_MULTIPART_THRESHOLD = getattr(settings, 'S3_MULTIPART_THRESHOLD', 8 * 1024 * 1024)  # 8 MiB
+
+# The size (in bytes) of each part of a multipart transfer
+S3_MULTIPART_CHUNKSIZE = getattr(settings, 'S3_MULTIPART_CHUNKSIZE', 8 * 1024 * 1024)  # 8 MiB
+
+# The number of parts of a single file that are transferred at the same time
+S3_MULTIPART_CONCURRENCY = getattr(settings, 'S3_MULTIPART_CONCURRENCY', 10)
+
+# The algorithm (md5 or sha256) of the checksums computed for files while they are uploaded, None to disable checksums
+FILE_CHECKSUM_ALGORITHM = getattr(settings, 'FILE_CHECKSUM_ALGORITHM', None)
+
+# The number of files that are deleted from host and NFS workspaces at the same time
+FILE_DELETE_CONCURRENCY = getattr(settings, 'FILE_DELETE_CONCURRENCY', 16)
@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+import hashlib
 import os
 import shutil
 import tempfile
@@ -46,7 +47,7 @@ class TestHostBrokerDeleteFiles(TestCase):
 
         # Check results
         two_calls = [call(full_path_file_1), call(full_path_file_2)]
-        mock_remove.assert_has_calls(two_calls)
+        mock_remove.assert_has_calls(two_calls, any_order=True)
 
         self.assertTrue(file_1.is_deleted)
         self.assertIsNotNone(file_1.deleted)
@@ -206,6 +207,46 @@ class TestHostBrokerListFiles(TestCase):
         self.assertEqual(len(file_list), 10)
 
 
+class TestHostBrokerListPartitions(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.root_path = tempfile.mkdtemp()
+        for dir_path in ['a/x', 'a/y', 'b']:
+            os.makedirs(os.path.join(self.root_path, dir_path))
+        for file_path in ['root.txt', 'a/1.txt', 'a/x/2.txt', 'a/y/3.txt', 'a/y/4.txt', 'b/5.txt']:
+            with open(os.path.join(self.root_path, file_path), 'w') as f:
+                f.write('data')
+        self.broker = HostBroker()
+
+    def tearDown(self):
+        shutil.rmtree(self.root_path)
+
+    def test_list_partitions(self):
+        """Tests calling HostBroker.list_partitions()"""
+
+        self.assertListEqual(self.broker.list_partitions(self.root_path), ['a/', 'b/'])
+
+    def test_list_files_partition(self):
+        """Tests calling HostBroker.list_files() for a single partition"""
+
+        root_files = [f.file for f in self.broker.list_files(self.root_path, True, '')]
+        self.assertListEqual(root_files, ['root.txt'])
+
+        a_files = [f.file for f in self.broker.list_files(self.root_path, True, 'a/')]
+        self.assertListEqual(a_files, ['a/1.txt', 'a/x/2.txt', 'a/y/3.txt', 'a/y/4.txt'])
+
+    def test_list_files_partition_start_after(self):
+        """Tests calling HostBroker.list_files() for a single partition resuming after a file"""
+
+        a_files = [f.file for f in self.broker.list_files(self.root_path, True, 'a/', 'a/x/2.txt')]
+        self.assertListEqual(a_files, ['a/y/3.txt', 'a/y/4.txt'])
+
+        a_files = [f.file for f in self.broker.list_files(self.root_path, True, 'a/', 'a/y/4.txt')]
+        self.assertListEqual(a_files, [])
+
+
 class TestHostBrokerLoadConfiguration(TestCase):
 
     def setUp(self):
@@ -326,6 +367,118 @@ class TestHostBrokerUploadFiles(TestCase):
         two_calls = [call(full_workspace_path_file_1, 0644), call(full_workspace_path_file_2, 0644)]
         mock_chmod.assert_has_calls(two_calls)
 
+    @patch('storage.brokers.host_broker.shutil.copy')
+    def test_same_file_system(self, mock_copy):
+        """Tests calling HostBroker.upload_files() with a local file on the same file system, which is linked"""
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp(dir=volume_path)
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            os.chmod(local_path, 0664)
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            self.assertFalse(mock_copy.called)
+            self.assertTrue(os.path.samefile(local_path, os.path.join(volume_path, workspace_path)))
+            # The permissions of the linked local file are not changed
+            self.assertEqual(os.stat(local_path).st_mode & 0777, 0664)
+        finally:
+            shutil.rmtree(volume_path)
+
+    def test_same_file_system_not_readable(self):
+        """Tests calling HostBroker.upload_files() with a local file on the same file system that other users cannot read,
+        which is copied so that the workspace file is readable
+        """
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp(dir=volume_path)
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            os.chmod(local_path, 0600)
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            full_workspace_path = os.path.join(volume_path, workspace_path)
+            self.assertFalse(os.path.samefile(local_path, full_workspace_path))
+            self.assertEqual(os.stat(full_workspace_path).st_mode & 0777, 0644)
+            with open(full_workspace_path) as workspace_file:
+                self.assertEqual(workspace_file.read(), 'hello')
+            # The permissions of the local file are not changed
+            self.assertEqual(os.stat(local_path).st_mode & 0777, 0600)
+        finally:
+            shutil.rmtree(volume_path)
+
+    @patch('storage.brokers.host_broker.settings.FILE_CHECKSUM_ALGORITHM', 'sha256')
+    @patch('storage.brokers.host_broker.link_file')
+    def test_checksum_copied(self, mock_link):
+        """Tests calling HostBroker.upload_files() with checksums enabled, which computes the checksum and size while
+        copying the file
+        """
+
+        mock_link.return_value = False
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp()
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path, file_size=1)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            full_workspace_path = os.path.join(volume_path, workspace_path)
+            with open(full_workspace_path) as workspace_file:
+                self.assertEqual(workspace_file.read(), 'hello')
+            self.assertEqual(os.stat(full_workspace_path).st_mode & 0777, 0644)
+            self.assertEqual(scale_file.checksum, 'sha256:%s' % hashlib.sha256('hello').hexdigest())
+            self.assertEqual(scale_file.file_size, 5)
+        finally:
+            shutil.rmtree(volume_path)
+            shutil.rmtree(local_dir)
+
+    @patch('storage.brokers.host_broker.settings.FILE_CHECKSUM_ALGORITHM', 'md5')
+    def test_checksum_same_file_system(self):
+        """Tests calling HostBroker.upload_files() with checksums enabled and a local file on the same file system,
+        which computes the checksum and size after linking the file
+        """
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp(dir=volume_path)
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            os.chmod(local_path, 0644)
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path, file_size=1)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            self.assertTrue(os.path.samefile(local_path, os.path.join(volume_path, workspace_path)))
+            self.assertEqual(scale_file.checksum, 'md5:%s' % hashlib.md5('hello').hexdigest())
+            self.assertEqual(scale_file.file_size, 5)
+        finally:
+            shutil.rmtree(volume_path)
+
 
 class TestHostBrokerValidateConfiguration(TestCase):
 
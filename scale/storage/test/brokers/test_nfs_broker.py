@@ -1,6 +1,10 @@
 from __future__ import unicode_literals
 
+import errno
+import hashlib
 import os
+import shutil
+import tempfile
 
 import django
 from django.test import TestCase
@@ -43,7 +47,7 @@ class TestNfsBrokerDeleteFiles(TestCase):
 
         # Check results
         two_calls = [call(full_path_file_1), call(full_path_file_2)]
-        mock_remove.assert_has_calls(two_calls)
+        mock_remove.assert_has_calls(two_calls, any_order=True)
 
         self.assertTrue(file_1.is_deleted)
         self.assertIsNotNone(file_1.deleted)
@@ -245,6 +249,129 @@ class TestNfsBrokerUploadFiles(TestCase):
         two_calls = [call(full_workspace_path_file_1, 0644), call(full_workspace_path_file_2, 0644)]
         mock_chmod.assert_has_calls(two_calls)
 
+    @patch('storage.brokers.nfs_broker.execute_command_line')
+    @patch('storage.brokers.nfs_broker.shutil.copy')
+    def test_same_file_system(self, mock_copy, mock_execute):
+        """Tests calling NfsBroker.upload_files() with a local file on the same file system, which is linked"""
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp(dir=volume_path)
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            os.chmod(local_path, 0664)
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            self.assertFalse(mock_copy.called)
+            self.assertFalse(mock_execute.called)
+            self.assertTrue(os.path.samefile(local_path, os.path.join(volume_path, workspace_path)))
+            # The permissions of the linked local file are not changed
+            self.assertEqual(os.stat(local_path).st_mode & 0777, 0664)
+        finally:
+            shutil.rmtree(volume_path)
+
+    @patch('storage.brokers.nfs_broker.execute_command_line')
+    def test_same_file_system_not_readable(self, mock_execute):
+        """Tests calling NfsBroker.upload_files() with a local file on the same file system that other users cannot read,
+        which is copied so that the workspace file is readable
+        """
+
+        mock_execute.side_effect = OSError(errno.ENOENT, 'bbcp is not installed')
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp(dir=volume_path)
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            os.chmod(local_path, 0600)
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            full_workspace_path = os.path.join(volume_path, workspace_path)
+            self.assertFalse(os.path.samefile(local_path, full_workspace_path))
+            self.assertEqual(os.stat(full_workspace_path).st_mode & 0777, 0644)
+            with open(full_workspace_path) as workspace_file:
+                self.assertEqual(workspace_file.read(), 'hello')
+            # The permissions of the local file are not changed
+            self.assertEqual(os.stat(local_path).st_mode & 0777, 0600)
+        finally:
+            shutil.rmtree(volume_path)
+
+    @patch('storage.brokers.nfs_broker.settings.FILE_CHECKSUM_ALGORITHM', 'sha256')
+    @patch('storage.brokers.nfs_broker.link_file')
+    @patch('storage.brokers.nfs_broker.execute_command_line')
+    @patch('storage.brokers.nfs_broker.shutil.copy')
+    def test_checksum_skips_bbcp(self, mock_copy, mock_execute, mock_link):
+        """Tests calling NfsBroker.upload_files() with checksums enabled, which copies the file locally instead of with
+        bbcp to compute the checksum and size in the same pass
+        """
+
+        mock_link.return_value = False
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp()
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path, file_size=1)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            self.assertFalse(mock_execute.called)
+            self.assertFalse(mock_copy.called)
+            full_workspace_path = os.path.join(volume_path, workspace_path)
+            with open(full_workspace_path) as workspace_file:
+                self.assertEqual(workspace_file.read(), 'hello')
+            self.assertEqual(os.stat(full_workspace_path).st_mode & 0777, 0644)
+            self.assertEqual(scale_file.checksum, 'sha256:%s' % hashlib.sha256('hello').hexdigest())
+            self.assertEqual(scale_file.file_size, 5)
+        finally:
+            shutil.rmtree(volume_path)
+            shutil.rmtree(local_dir)
+
+    @patch('storage.brokers.nfs_broker.settings.FILE_CHECKSUM_ALGORITHM', 'md5')
+    @patch('storage.brokers.nfs_broker.execute_command_line')
+    def test_checksum_same_file_system(self, mock_execute):
+        """Tests calling NfsBroker.upload_files() with checksums enabled and a local file on the same file system,
+        which computes the checksum and size after linking the file
+        """
+
+        volume_path = tempfile.mkdtemp()
+        local_dir = tempfile.mkdtemp(dir=volume_path)
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            os.chmod(local_path, 0644)
+            workspace_path = os.path.join('my_wrk_dir', 'my_file.txt')
+            scale_file = storage_test_utils.create_file(file_path=workspace_path, file_size=1)
+
+            # Call method to test
+            self.broker.upload_files(volume_path, [FileUpload(scale_file, local_path)])
+
+            # Check results
+            self.assertFalse(mock_execute.called)
+            self.assertTrue(os.path.samefile(local_path, os.path.join(volume_path, workspace_path)))
+            self.assertEqual(scale_file.checksum, 'md5:%s' % hashlib.md5('hello').hexdigest())
+            self.assertEqual(scale_file.file_size, 5)
+        finally:
+            shutil.rmtree(volume_path)
+
 
 class TestNfsBrokerValidateConfiguration(TestCase):
 
@@ -1,8 +1,12 @@
 from __future__ import unicode_literals
 
+import hashlib
 import os
+import shutil
+import tempfile
 
 import django
+from botocore.exceptions import ClientError
 from django.test import TestCase
 from mock import MagicMock, Mock, call, mock_open, patch
 
@@ -10,6 +14,8 @@ import storage.test.utils as storage_test_utils
 from storage.brokers.broker import FileDownload, FileMove, FileUpload
 from storage.brokers.exceptions import InvalidBrokerConfiguration
 from storage.brokers.s3_broker import S3Broker
+from storage.exceptions import MissingFile
+from storage.models import ScaleFile
 from util.aws import S3Client
 
 
@@ -33,10 +39,8 @@ class TestS3Broker(TestCase):
     def test_delete_files(self, mock_client_class):
         """Tests deleting files successfully"""
 
-        s3_object_1 = MagicMock()
-        s3_object_2 = MagicMock()
         mock_client = MagicMock(S3Client)
-        mock_client.get_object.side_effect = [s3_object_1, s3_object_2]
+        mock_client.delete_objects.return_value = {}
         mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
 
         file_path_1 = os.path.join('my_dir', 'my_file.txt')
@@ -49,12 +53,35 @@ class TestS3Broker(TestCase):
         self.broker.delete_files(None, [file_1, file_2])
 
         # Check results
-        self.assertTrue(s3_object_1.delete.called)
-        self.assertTrue(s3_object_2.delete.called)
+        mock_client.delete_objects.assert_called_once_with('my_bucket.domain.com', [file_path_1, file_path_2])
         self.assertTrue(file_1.is_deleted)
         self.assertIsNotNone(file_1.deleted)
         self.assertTrue(file_2.is_deleted)
         self.assertIsNotNone(file_2.deleted)
+        file_1 = ScaleFile.objects.get(pk=file_1.id)
+        self.assertTrue(file_1.is_deleted)
+        self.assertIsNotNone(file_1.deleted)
+
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_delete_files_failed(self, mock_client_class):
+        """Tests deleting files when S3 fails to delete one of them"""
+
+        file_path_1 = os.path.join('my_dir', 'my_file.txt')
+        file_path_2 = os.path.join('my_dir', 'my_file.json')
+        mock_client = MagicMock(S3Client)
+        mock_client.delete_objects.return_value = {file_path_2: 'Access Denied'}
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+
+        file_1 = storage_test_utils.create_file(file_path=file_path_1)
+        file_2 = storage_test_utils.create_file(file_path=file_path_2)
+
+        # Call method to test
+        with self.assertRaises(IOError):
+            self.broker.delete_files(None, [file_1, file_2])
+
+        # Check results
+        self.assertTrue(ScaleFile.objects.get(pk=file_1.id).is_deleted)
+        self.assertFalse(ScaleFile.objects.get(pk=file_2.id).is_deleted)
 
     @patch('os.path.exists')
     @patch('storage.brokers.s3_broker.S3Client')
@@ -89,6 +116,35 @@ class TestS3Broker(TestCase):
         self.assertTrue(s3_object_1.download_file.called)
         self.assertTrue(s3_object_2.download_file.called)
 
+    @patch('storage.brokers.s3_broker.get_input_file_cache')
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_download_files_input_cache(self, mock_client_class, mock_get_cache):
+        """Tests downloading files through the node input file cache"""
+
+        s3_object = MagicMock()
+        mock_client = MagicMock(S3Client)
+        mock_client.get_object.side_effect = [s3_object]
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+        mock_cache = MagicMock()
+        mock_cache.retrieve_file.side_effect = [True, False]
+        mock_cache.get_download_path.return_value = '/cache/tmp/my_file.json'
+        mock_get_cache.return_value = mock_cache
+
+        file_1 = storage_test_utils.create_file(file_path=os.path.join('my_wrk_dir_1', 'my_file.txt'))
+        file_2 = storage_test_utils.create_file(file_path=os.path.join('my_wrk_dir_2', 'my_file.json'))
+        local_path_file_2 = os.path.join('my_dir_2', 'my_file.json')
+        file_1_dl = FileDownload(file_1, os.path.join('my_dir_1', 'my_file.txt'), False)
+        file_2_dl = FileDownload(file_2, local_path_file_2, False)
+
+        # Call method to test
+        self.broker.download_files(None, [file_1_dl, file_2_dl])
+
+        # Check results, only the second file is downloaded and it is downloaded into the cache
+        mock_client.get_object.assert_called_once_with('my_bucket.domain.com', file_2.file_path, False)
+        self.assertEqual(s3_object.download_file.call_args[0][0], '/cache/tmp/my_file.json')
+        mock_cache.add_file.assert_called_once_with(file_2, '/cache/tmp/my_file.json', local_path_file_2)
+        self.assertTrue(mock_cache.finish.called)
+
     # Patching in storage.brokers.s3_broker as opposed to util.aws / util.command because patch must be applied where
     # import is made, not on source
     @patch('os.path.exists')
@@ -198,6 +254,36 @@ class TestS3Broker(TestCase):
         self.assertEqual(file_1.file_path, new_workspace_path_1)
         self.assertEqual(file_2.file_path, new_workspace_path_2)
 
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_move_files_missing(self, mock_client_class):
+        """Tests moving files when one of the source files is missing"""
+
+        s3_object_1a = MagicMock()
+        s3_object_1b = MagicMock()
+        s3_object_2a = MagicMock()
+        s3_object_2b = MagicMock()
+        error_response = {'Error': {'Code': 'NoSuchKey'}, 'ResponseMetadata': {'HTTPStatusCode': 404}}
+        s3_object_1b.copy_from.side_effect = ClientError(error_response, 'CopyObject')
+        mock_client = MagicMock(S3Client)
+        mock_client.get_object.side_effect = [s3_object_1a, s3_object_1b, s3_object_2a, s3_object_2b]
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+
+        file_1 = storage_test_utils.create_file(file_path=os.path.join('my_dir_1', 'my_file.txt'))
+        file_2 = storage_test_utils.create_file(file_path=os.path.join('my_dir_2', 'my_file.json'))
+        new_workspace_path_2 = os.path.join('my_new_dir_2', 'my_file.json')
+        file_1_mv = FileMove(file_1, os.path.join('my_new_dir_1', 'my_file.txt'))
+        file_2_mv = FileMove(file_2, new_workspace_path_2)
+
+        # Call method to test
+        with self.assertRaises(MissingFile):
+            self.broker.move_files(None, [file_1_mv, file_2_mv])
+
+        # Check results, the second file is still moved
+        self.assertFalse(s3_object_1a.delete.called)
+        self.assertTrue(s3_object_2b.copy_from.called)
+        self.assertEqual(file_1.file_path, os.path.join('my_dir_1', 'my_file.txt'))
+        self.assertEqual(file_2.file_path, new_workspace_path_2)
+
     @patch('storage.brokers.s3_broker.S3Client')
     def test_upload_files(self, mock_client_class):
         """Tests uploading files successfully"""
@@ -231,6 +317,83 @@ class TestS3Broker(TestCase):
         self.assertEqual(s3_object_1.upload_file.call_args[0][1]['ContentType'], 'text/plain')
         self.assertEqual(s3_object_2.upload_file.call_args[0][1]['ContentType'], 'application/json')
 
+    @patch('storage.brokers.s3_broker.settings.FILE_CHECKSUM_ALGORITHM', 'sha256')
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_upload_files_checksum(self, mock_client_class):
+        """Tests uploading files with checksums enabled, which computes the checksum and size in the same pass"""
+
+        def upload_fileobj(file_obj, options, Config):
+            file_obj.read()
+        s3_object = MagicMock()
+        s3_object.upload_fileobj.side_effect = upload_fileobj
+        mock_client = MagicMock(S3Client)
+        mock_client.get_object.return_value = s3_object
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+
+        local_dir = tempfile.mkdtemp()
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+            with open(local_path, 'w') as local_file:
+                local_file.write('hello')
+            scale_file = storage_test_utils.create_file(file_path=os.path.join('my_wrk_dir', 'my_file.txt'),
+                                                        file_size=1)
+
+            # Call method to test
+            self.broker.upload_files(None, [FileUpload(scale_file, local_path)])
+        finally:
+            shutil.rmtree(local_dir)
+
+        # Check results
+        self.assertFalse(s3_object.upload_file.called)
+        self.assertTrue(s3_object.upload_fileobj.called)
+        self.assertEqual(scale_file.checksum, 'sha256:%s' % hashlib.sha256('hello').hexdigest())
+        self.assertEqual(scale_file.file_size, 5)
+
+    @patch('storage.brokers.s3_broker.settings.FILE_CHECKSUM_ALGORITHM', 'sha256')
+    def test_download_file_checksum(self):
+        """Tests downloading a file with checksums enabled, which verifies the checksum in the same pass"""
+
+        def download_fileobj(file_obj, Config):
+            file_obj.write('hello')
+        s3_object = MagicMock()
+        s3_object.download_fileobj.side_effect = download_fileobj
+        scale_file = ScaleFile(file_path=os.path.join('my_wrk_dir', 'my_file.txt'))
+        scale_file.checksum = 'sha256:%s' % hashlib.sha256('hello').hexdigest()
+
+        local_dir = tempfile.mkdtemp()
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+
+            # Call method to test
+            self.broker._download_file(s3_object, scale_file, local_path)
+
+            # Check results
+            self.assertFalse(s3_object.download_file.called)
+            with open(local_path) as local_file:
+                self.assertEqual(local_file.read(), 'hello')
+        finally:
+            shutil.rmtree(local_dir)
+
+    @patch('storage.brokers.s3_broker.settings.FILE_CHECKSUM_ALGORITHM', 'sha256')
+    def test_download_file_checksum_mismatch(self):
+        """Tests downloading a file whose bytes do not match its checksum"""
+
+        def download_fileobj(file_obj, Config):
+            file_obj.write('corrupted')
+        s3_object = MagicMock()
+        s3_object.download_fileobj.side_effect = download_fileobj
+        scale_file = ScaleFile(file_path=os.path.join('my_wrk_dir', 'my_file.txt'))
+        scale_file.checksum = 'sha256:%s' % hashlib.sha256('hello').hexdigest()
+
+        local_dir = tempfile.mkdtemp()
+        try:
+            local_path = os.path.join(local_dir, 'my_file.txt')
+
+            # Call method to test
+            self.assertRaises(IOError, self.broker._download_file_with_checksum, s3_object, scale_file, local_path)
+        finally:
+            shutil.rmtree(local_dir)
+
     def test_validate_configuration_roles(self):
         """Tests validating a configuration based on IAM roles successfully"""
 
@@ -60,6 +60,45 @@ class TestDeleteFiles(TestCase):
         # One new job for create_purge_jobs_messages
         self.assertEqual(len(new_message.new_messages), 1)
 
+    def test_json_no_purge(self):
+        """Tests that a DeleteFiles message that does not purge keeps its purge flag through JSON"""
+
+        message = DeleteFiles()
+        message.purge = False
+        message.job_id = 1
+        message.trigger_id = 2
+        message.source_file_id = 3
+        message.add_file(4)
+
+        new_message = DeleteFiles.from_json(message.to_json())
+        self.assertFalse(new_message.purge)
+
+    def test_execute_purge_job_after_last_files(self):
+        """Tests that only the DeleteFiles message that deletes the last files of a job purges the job"""
+
+        job = job_test_utils.create_job()
+        job_exe = job_test_utils.create_job_exe(job=job)
+        trigger = trigger_test_utils.create_trigger_event()
+        PurgeResults.objects.create(source_file_id=self.source_file.id, trigger_event=trigger)
+        files = [storage_test_utils.create_file(file_path='my_dir/my_file_%d.txt' % i, job_exe=job_exe)
+                 for i in range(4)]
+
+        messages = create_delete_files_messages(files=files[:2], job_id=job.id, trigger_id=trigger.id,
+                                                source_file_id=self.source_file.id, purge=True)
+        messages.extend(create_delete_files_messages(files=files[2:], job_id=job.id, trigger_id=trigger.id,
+                                                     source_file_id=self.source_file.id, purge=True))
+        self.assertEqual(len(messages), 2)
+
+        self.assertTrue(messages[0].execute())
+        self.assertListEqual(messages[0].new_messages, [])
+        self.assertTrue(messages[1].execute())
+        self.assertEqual(len(messages[1].new_messages), 1)
+        self.assertEqual(messages[1].new_messages[0].type, 'purge_jobs')
+
+        self.assertEqual(ScaleFile.objects.filter(job_id=job.id).count(), 0)
+        self.assertEqual(PurgeResults.objects.values_list('num_products_deleted', flat=True).get(
+            trigger_event=trigger), 4)
+
     def test_execute(self):
         """Tests calling DeleteFile.execute() successfully"""
 
@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+import django
+from django.test import TestCase
+
+from storage.checksum import ChecksumStream, compute_checksum, copy_file, get_checksum_algorithm
+
+
+class TestChecksum(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.dir_path = tempfile.mkdtemp()
+        self.data = b'hello world' * 1000
+        self.src_path = os.path.join(self.dir_path, 'src.txt')
+        with open(self.src_path, 'wb') as src_file:
+            src_file.write(self.data)
+        os.chmod(self.src_path, 0640)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_stream_read(self):
+        """Tests computing a checksum while reading through a ChecksumStream"""
+
+        stream = ChecksumStream(BytesIO(self.data), 'sha256')
+        while stream.read(100):
+            pass
+
+        self.assertEqual(stream.checksum, 'sha256:%s' % hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(stream.size, len(self.data))
+        self.assertEqual(get_checksum_algorithm(stream.checksum), 'sha256')
+
+    def test_stream_write(self):
+        """Tests computing a checksum while writing through a ChecksumStream"""
+
+        file_obj = BytesIO()
+        stream = ChecksumStream(file_obj, 'md5')
+        stream.write(self.data[:10])
+        stream.write(self.data[10:])
+
+        self.assertEqual(file_obj.getvalue(), self.data)
+        self.assertEqual(stream.checksum, 'md5:%s' % hashlib.md5(self.data).hexdigest())
+        self.assertEqual(stream.size, len(self.data))
+
+    def test_compute_checksum(self):
+        """Tests calling compute_checksum()"""
+
+        checksum, size = compute_checksum(self.src_path, 'md5')
+
+        self.assertEqual(checksum, 'md5:%s' % hashlib.md5(self.data).hexdigest())
+        self.assertEqual(size, len(self.data))
+
+    def test_copy_file(self):
+        """Tests calling copy_file(), which copies the file and its permissions while computing the checksum"""
+
+        dest_path = os.path.join(self.dir_path, 'dest.txt')
+        checksum, size = copy_file(self.src_path, dest_path, 'md5')
+
+        with open(dest_path, 'rb') as dest_file:
+            self.assertEqual(dest_file.read(), self.data)
+        self.assertEqual(os.stat(dest_path).st_mode, os.stat(self.src_path).st_mode)
+        self.assertEqual(checksum, 'md5:%s' % hashlib.md5(self.data).hexdigest())
+        self.assertEqual(size, len(self.data))
@@ -0,0 +1,120 @@
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from mock import MagicMock
+
+from storage.input_cache import InputFileCache
+
+
+class TestInputFileCache(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.cache_path = tempfile.mkdtemp()
+        self.job_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path)
+        shutil.rmtree(self.job_path)
+
+    def _create_file(self, file_id):
+        """Creates a mock file model for testing"""
+
+        scale_file = MagicMock()
+        scale_file.id = file_id
+        scale_file.file_name = 'file_%d.txt' % file_id
+        scale_file.last_modified = now()
+        return scale_file
+
+    def _download(self, cache, scale_file, size):
+        """Simulates downloading the given file through the cache"""
+
+        local_path = os.path.join(self.job_path, '%s_%s' % (uuid.uuid4().hex, scale_file.file_name))
+        download_path = cache.get_download_path(scale_file)
+        with open(download_path, 'w') as download_file:
+            download_file.write('a' * size)
+        cache.add_file(scale_file, download_path, local_path)
+        return local_path
+
+    def test_retrieve_file(self):
+        """Tests retrieving a cached file"""
+
+        scale_file = self._create_file(1)
+        cache = InputFileCache(self.cache_path, 1000)
+        self.assertFalse(cache.retrieve_file(scale_file, os.path.join(self.job_path, 'first.txt')))
+        self._download(cache, scale_file, 10)
+
+        local_path = os.path.join(self.job_path, 'second.txt')
+        self.assertTrue(cache.retrieve_file(scale_file, local_path))
+        self.assertEqual(os.path.getsize(local_path), 10)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+        # A modified file is no longer retrieved from the cache
+        scale_file.last_modified = now()
+        self.assertFalse(cache.retrieve_file(scale_file, os.path.join(self.job_path, 'third.txt')))
+
+    def test_cached_file_not_changed_by_job(self):
+        """Tests that a job execution writing to its input file does not change the cached file"""
+
+        scale_file = self._create_file(1)
+        cache = InputFileCache(self.cache_path, 1000)
+        first_path = self._download(cache, scale_file, 10)
+        second_path = os.path.join(self.job_path, 'second.txt')
+        self.assertTrue(cache.retrieve_file(scale_file, second_path))
+
+        for local_path in (first_path, second_path):
+            with open(local_path, 'r+') as local_file:
+                local_file.write('b' * 5)
+                local_file.truncate(5)
+
+        cached_path = cache._get_cached_path(scale_file)
+        with open(cached_path) as cached_file:
+            self.assertEqual(cached_file.read(), 'a' * 10)
+        self.assertEqual(os.stat(cached_path).st_mode & 0777, 0444)
+
+        third_path = os.path.join(self.job_path, 'third.txt')
+        self.assertTrue(cache.retrieve_file(scale_file, third_path))
+        with open(third_path) as third_file:
+            self.assertEqual(third_file.read(), 'a' * 10)
+
+    def test_finish_evicts_least_recently_used(self):
+        """Tests that finishing evicts the least recently used files over the size limit and saves the statistics"""
+
+        cache = InputFileCache(self.cache_path, 25)
+        file_1 = self._create_file(1)
+        file_2 = self._create_file(2)
+        file_3 = self._create_file(3)
+        local_path_1 = self._download(cache, file_1, 10)
+        self._download(cache, file_2, 10)
+        self._download(cache, file_3, 10)
+
+        # Make file 2 the least recently used file
+        cached_path_1 = cache._get_cached_path(file_1)
+        cached_path_2 = cache._get_cached_path(file_2)
+        os.utime(cached_path_2, (0, 0))
+        self.assertTrue(cache.retrieve_file(file_1, os.path.join(self.job_path, 'again.txt')))
+        cache.finish()
+
+        self.assertTrue(os.path.exists(cached_path_1))
+        self.assertFalse(os.path.exists(cached_path_2))
+        self.assertTrue(os.path.exists(cache._get_cached_path(file_3)))
+        self.assertTrue(os.path.exists(local_path_1))  # Job files are not affected by eviction
+        with open(os.path.join(self.cache_path, 'stats.json')) as stats_file:
+            self.assertDictEqual(json.load(stats_file), {'hits': 1, 'misses': 3, 'evictions': 1})
+
+        # Statistics accumulate across job executions on the node
+        cache = InputFileCache(self.cache_path, 25)
+        self.assertTrue(cache.retrieve_file(file_3, os.path.join(self.job_path, 'other.txt')))
+        cache.finish()
+        with open(os.path.join(self.cache_path, 'stats.json')) as stats_file:
+            self.assertDictEqual(json.load(stats_file), {'hits': 2, 'misses': 3, 'evictions': 1})
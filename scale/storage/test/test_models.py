@@ -5,8 +5,9 @@ import os
 
 import django
 import django.contrib.gis.geos as geos
-from django.db import transaction
+from django.db import connection, transaction
 from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.text import get_valid_filename
 from django.utils.timezone import utc
 from mock import MagicMock, patch
@@ -348,6 +349,67 @@ class TestScaleFileManagerMoveFiles(TestCase):
         self.assertRaises(DeletedFile, ScaleFile.objects.move_files, files)
 
 
+class TestScaleFileManagerSetCountries(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        old_effective = datetime.datetime(2000, 1, 1, tzinfo=utc)
+        new_effective = datetime.datetime(2010, 1, 1, tzinfo=utc)
+        self.country_1 = CountryData.objects.create(name='Test Country', fips='TC', gmi='TCY', iso2='TC', iso3='TCY',
+                                                    iso_num=42, effective=old_effective,
+                                                    border=geos.Polygon(((0, 0), (0, 10), (10, 10), (10, 0), (0, 0))))
+        self.country_1_new = CountryData.objects.create(name='Test Country', fips='TC', gmi='TCY', iso2='TC',
+                                                        iso3='TCY', iso_num=42, effective=new_effective,
+                                                        border=geos.Polygon(((0, 0), (0, 20), (20, 20), (20, 0),
+                                                                             (0, 0))))
+        self.country_2 = CountryData.objects.create(name='Test Country 2', fips='TT', gmi='TCT', iso2='TT',
+                                                    iso3='TCT', iso_num=43, effective=old_effective,
+                                                    border=geos.Polygon(((11, 0), (11, 8), (19, 8), (19, 0), (11, 0))))
+
+    def test_matches_set_countries(self):
+        """Tests that ScaleFileManager.set_countries() sets the same countries as ScaleFile.set_countries()"""
+
+        old_date = datetime.datetime(2005, 1, 1, tzinfo=utc)
+        new_date = datetime.datetime(2015, 1, 1, tzinfo=utc)
+        geoms_and_dates = [(geos.Polygon(((5, 5), (5, 10), (12, 10), (12, 5), (5, 5))), old_date),
+                           (geos.Polygon(((5, 5), (5, 10), (12, 10), (12, 5), (5, 5))), new_date),
+                           (geos.Point(15, 15), old_date),
+                           (geos.Point(15, 15), new_date),
+                           (None, new_date)]
+        files = [storage_test_utils.create_file(data_started=data_started, geometry=geom)
+                 for geom, data_started in geoms_and_dates]
+        files[4].countries.add(self.country_2)  # Existing countries are replaced
+
+        ScaleFile.objects.set_countries(files)
+        bulk_countries = [{c.id for c in scale_file.countries.all()} for scale_file in files]
+        self.assertListEqual(bulk_countries, [{self.country_1.id, self.country_2.id},
+                                              {self.country_1_new.id, self.country_2.id}, set(),
+                                              {self.country_1_new.id}, set()])
+
+        for scale_file, countries in zip(files, bulk_countries):
+            scale_file.set_countries()
+            self.assertSetEqual({c.id for c in scale_file.countries.all()}, countries)
+
+    def test_query_count(self):
+        """Tests that ScaleFileManager.set_countries() performs the same number of queries for any number of files"""
+
+        files = [storage_test_utils.create_file(geometry=geos.Point(i, 5)) for i in range(20)]
+
+        with CaptureQueriesContext(connection) as one_file_queries:
+            ScaleFile.objects.set_countries(files[:1])
+        with CaptureQueriesContext(connection) as all_files_queries:
+            ScaleFile.objects.set_countries(files)
+        self.assertEqual(len(all_files_queries), len(one_file_queries))
+
+        # Points with x of 11 and over are also within the second country
+        for scale_file in files:
+            expected_countries = {self.country_1_new.id}
+            if scale_file.geometry.x >= 11:
+                expected_countries.add(self.country_2.id)
+            self.assertSetEqual({c.id for c in scale_file.countries.all()}, expected_countries)
+
+
 class TestScaleFileManagerUploadFiles(TestCase):
 
     def setUp(self):
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 
 AWSCredentials = namedtuple('AWSCredentials', ['access_key_id', 'secret_access_key'])
 
+# The maximum number of keys that S3 accepts in a single DeleteObjects request
+MAX_DELETE_KEYS = 1000
+
 
 class AWSClient(object):
     """Manages automatically creating and destroying clients to AWS services."""
@@ -41,6 +44,20 @@ class AWSClient(object):
     def __enter__(self):
         """Callback handles creating a new client for AWS access."""
 
+        return self.connect()
+
+    def __exit__(self, type, value, traceback):
+        """Callback handles destroying an existing client."""
+        pass
+
+    def connect(self):
+        """Creates a new session and client for AWS access. This is called automatically when the client is used as a
+        context manager, long-lived clients may call it directly.
+
+        :returns: This client
+        :rtype: :class:`util.aws.AWSClient`
+        """
+
         logger.debug('Setting up AWS client...')
 
         session_args = {}
@@ -55,10 +72,6 @@ class AWSClient(object):
         self._resource = self._session.resource(self._resource_name, config=self._config)
         return self
 
-    def __exit__(self, type, value, traceback):
-        """Callback handles destroying an existing client."""
-        pass
-
     @staticmethod
     def instantiate_credentials_from_config(config):
         """Extract credential keys from configuration and return instantiated credential object
@@ -102,9 +115,17 @@ class SQSClient(AWSClient):
         :type region_name: string
         """
         AWSClient.__init__(self, 'sqs', None, credentials, region_name)
+        self._queues = {}  # {Queue name: Queue resource}
+
+    def connect(self):
+        """See :meth:`util.aws.AWSClient.connect`"""
+
+        self._queues = {}
+        return AWSClient.connect(self)
 
     def get_queue_by_name(self, queue_name):
-        """Gets a SQS queue by the given name
+        """Gets a SQS queue by the given name. The queue URL lookup is only performed the first time a queue is requested
+        from this client.
 
         :param queue_name: The unique name of the SQS queue
         :type queue_name: string
@@ -112,7 +133,9 @@ class SQSClient(AWSClient):
         :rtype: :class:`boto3.sqs.Queue`
         """
 
-        return self._resource.get_queue_by_name(QueueName=queue_name)
+        if queue_name not in self._queues:
+            self._queues[queue_name] = self._resource.get_queue_by_name(QueueName=queue_name)
+        return self._queues[queue_name]
 
     def send_message(self, queue_name, message):
         """Send a message to SQS queue.
@@ -192,6 +215,28 @@ class S3Client(AWSClient):
         config = Config(s3={'addressing_style': getattr(settings, 'S3_ADDRESSING_STYLE', 'auto')})
         AWSClient.__init__(self, 's3', config, credentials, region_name)
 
+    def delete_objects(self, bucket_name, key_names):
+        """Deletes the S3 objects with the given identifiers, using DeleteObjects requests of up to 1000 keys each.
+        Keys that do not exist are considered to be deleted.
+
+        :param bucket_name: The unique name of the bucket containing the objects.
+        :type bucket_name: string
+        :param key_names: The unique names of the objects to delete.
+        :type key_names: [string]
+        :returns: The error message for each key that failed to be deleted
+        :rtype: dict
+
+        :raises :class:`botocore.exceptions.ClientError`: If a request is invalid.
+        """
+
+        errors = {}
+        for i in range(0, len(key_names), MAX_DELETE_KEYS):
+            objects = [{'Key': key_name} for key_name in key_names[i:i + MAX_DELETE_KEYS]]
+            response = self._client.delete_objects(Bucket=bucket_name, Delete={'Objects': objects, 'Quiet': True})
+            for error in response.get('Errors', []):
+                errors[error['Key']] = error.get('Message', error.get('Code'))
+        return errors
+
     def get_bucket(self, bucket_name, validate=True):
         """Gets a reference to an S3 bucket with the given identifier.
 
@@ -237,7 +282,7 @@ class S3Client(AWSClient):
             raise
         return s3_object
 
-    def list_objects(self, bucket_name, recursive=False, prefix=None):
+    def list_objects(self, bucket_name, recursive=False, prefix=None, start_after=None):
         """Generator function to retrieve list of objects within an S3 bucket
 
         Retrieval of objects is provided by the boto3 paginator over 
@@ -252,6 +297,8 @@ class S3Client(AWSClient):
         :type recursive: bool
         :param prefix: The parent key from which to search bucket. Trailing slash is optional
         :type prefix: string
+        :param start_after: Only objects with keys after this key are retrieved, S3 lists keys in ascending order
+        :type start_after: string
         :return: Generator of S3 objects that were found.
         :rtype: Generator[:class:`storage.brokers.broker.FileDetails`]
         """
@@ -261,6 +308,8 @@ class S3Client(AWSClient):
             params['Prefix'] = prefix
         if not recursive:
             params['Delimiter'] = '/'
+        if start_after:
+            params['Marker'] = start_after
 
         paginator = self._client.get_paginator('list_objects')
         iterator = paginator.paginate(**params)
@@ -274,3 +323,25 @@ class S3Client(AWSClient):
                 # Filter out 0 size keys, these are directory keys as S3 objects must be at least 1 Byte
                 if result['Size'] > 0:
                     yield FileDetails(result['Key'], result['Size'])
+
+    def list_prefixes(self, bucket_name, prefix=None):
+        """Retrieves the list of common prefixes (directories) directly beneath the given prefix within an S3 bucket
+
+        :param bucket_name: The unique name of the bucket to retrieve.
+        :type bucket_name: string
+        :param prefix: The parent key from which to search bucket, None for the top of the bucket
+        :type prefix: string
+        :return: The common prefixes that were found, each with a trailing slash
+        :rtype: [string]
+        """
+
+        params = {'Bucket': bucket_name, 'Delimiter': '/'}
+        if prefix:
+            params['Prefix'] = prefix
+
+        paginator = self._client.get_paginator('list_objects')
+        prefixes = []
+        for page in paginator.paginate(**params):
+            for common_prefix in page.get('CommonPrefixes', []):
+                prefixes.append(common_prefix['Prefix'])
+        return prefixes
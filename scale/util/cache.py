@@ -0,0 +1,69 @@
+"""Defines a bounded in-memory cache"""
+from __future__ import unicode_literals
+
+import threading
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """A thread-safe cache that holds up to a maximum number of values, evicting the least recently used value when it is
+    full. Cached values are shared by all callers, so they must not be modified.
+    """
+
+    def __init__(self, max_size):
+        """Constructor
+
+        :param max_size: The maximum number of values in the cache
+        :type max_size: int
+        """
+
+        self._max_size = max_size
+        self._values = OrderedDict()  # Ordered from least to most recently used
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Returns the number of values in the cache
+
+        :returns: The number of values
+        :rtype: int
+        """
+
+        return len(self._values)
+
+    def clear(self):
+        """Removes all values from the cache
+        """
+
+        with self._lock:
+            self._values.clear()
+
+    def get(self, key, create_func):
+        """Returns the value for the given key, calling the given function to create and cache the value if it is not
+        cached. The function is called without holding the cache's lock, so it may be called more than once for a key.
+
+        :param key: The key of the value
+        :type key: :func:`hash`-able
+        :param create_func: The function with no arguments that creates the value
+        :type create_func: function
+        :returns: The value
+        :rtype: object
+        """
+
+        with self._lock:
+            if key in self._values:
+                value = self._values.pop(key)
+                self._values[key] = value
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = create_func()
+
+        with self._lock:
+            self._values[key] = value
+            while len(self._values) > self._max_size:
+                self._values.popitem(last=False)
+        return value
@@ -0,0 +1,131 @@
+"""Defines a minimal wrapper around the Linux inotify API for watching directories for file events"""
+from __future__ import unicode_literals
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Event masks, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Flags for inotify_init1()
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+# Each event is a header of (watch descriptor, mask, cookie, name length) followed by the padded name
+EVENT_HEADER = struct.Struct(str('iIII'))
+READ_SIZE = 64 * 1024
+
+InotifyEvent = namedtuple('InotifyEvent', ['wd', 'mask', 'cookie', 'name'])
+
+
+class Inotify(object):
+    """This class reads file events for watched directories from an inotify instance. The instance should be closed
+    with close() when it is no longer needed.
+    """
+
+    def __init__(self):
+        """Constructor
+
+        :raises OSError: If inotify is not supported on this system
+        """
+
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            init = self._libc.inotify_init1
+        except (AttributeError, OSError):
+            raise OSError(errno.ENOSYS, 'inotify is not supported on this system')
+
+        self._fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            _raise_errno()
+
+    def add_watch(self, path, mask):
+        """Starts watching the given directory for the given events
+
+        :param path: The path of the directory to watch
+        :type path: string
+        :param mask: The bit mask of events to watch for
+        :type mask: int
+        :returns: The watch descriptor
+        :rtype: int
+        """
+
+        wd = self._libc.inotify_add_watch(self._fd, path.encode(sys.getfilesystemencoding()), ctypes.c_uint32(mask))
+        if wd < 0:
+            _raise_errno()
+        return wd
+
+    def close(self):
+        """Closes the inotify instance, removing all of its watches
+        """
+
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def read_events(self, timeout):
+        """Waits up to the given timeout for events and returns all of the events that are ready
+
+        :param timeout: The maximum number of seconds to wait for events
+        :type timeout: float
+        :returns: The events in the order that they occurred, possibly empty
+        :rtype: [:class:`util.inotify.InotifyEvent`]
+        """
+
+        try:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+        except select.error as ex:
+            if ex.args[0] != errno.EINTR:
+                raise
+            return []
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except OSError as ex:
+            if ex.errno in (errno.EAGAIN, errno.EINTR):
+                return []
+            raise
+        return parse_events(data)
+
+
+def parse_events(data):
+    """Parses the given bytes read from an inotify instance into events
+
+    :param data: The bytes read from the inotify file descriptor
+    :type data: bytes
+    :returns: The parsed events
+    :rtype: [:class:`util.inotify.InotifyEvent`]
+    """
+
+    events = []
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(data):
+        wd, mask, cookie, name_len = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        name = data[offset:offset + name_len].rstrip(b'\0').decode(sys.getfilesystemencoding())
+        offset += name_len
+        events.append(InotifyEvent(wd, mask, cookie, name))
+    return events
+
+
+def _raise_errno():
+    """Raises an OSError for the current errno of the last libc call
+    """
+
+    error = ctypes.get_errno()
+    raise OSError(error, os.strerror(error))
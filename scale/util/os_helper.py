@@ -1,10 +1,110 @@
 """Helper methods for os operations"""
 
+import logging
 import os, errno
+from multiprocessing.pool import ThreadPool
+
+from util.command import CommandError, execute_command_line
+
+logger = logging.getLogger(__name__)
+
 
 def makedirs(path, mode=0755):
     try:
         os.makedirs(path, mode)
     except OSError as e:
         if e.errno != errno.EEXIST:
-            raise
\ No newline at end of file
+            raise
+
+
+def is_same_device(path_1, path_2):
+    """Returns whether the two given existing paths are on the same file system device
+
+    :param path_1: The first path
+    :type path_1: string
+    :param path_2: The second path
+    :type path_2: string
+    :returns: True if both paths are on the same device, False otherwise (including if a path does not exist)
+    :rtype: bool
+    """
+
+    try:
+        return os.stat(path_1).st_dev == os.stat(path_2).st_dev
+    except OSError:
+        return False
+
+
+def link_file(src_path, dest_path, min_mode=0):
+    """Creates the given destination file from the given source file without copying any bytes, if the two paths are on
+    the same file system device. A hard link is attempted first, followed by a reflink (copy-on-write clone) for file
+    systems that do not support hard links. Symbolic links in the source path are resolved first.
+
+    :param src_path: The absolute path to the source file
+    :type src_path: string
+    :param dest_path: The absolute path to the destination, its directory must already exist
+    :type dest_path: string
+    :param min_mode: The permission bits that the source file must already grant to be linked, since a hard linked
+        destination shares the permissions and owner of the source
+    :type min_mode: int
+    :returns: True if the destination was created, False if the file must be copied instead
+    :rtype: bool
+    """
+
+    src_path = os.path.realpath(src_path)
+    if os.path.exists(dest_path) or not is_same_device(src_path, os.path.dirname(dest_path)):
+        return False
+    if os.stat(src_path).st_mode & min_mode != min_mode:
+        return False
+
+    try:
+        os.link(src_path, dest_path)
+        logger.info('Hard linked %s to %s', src_path, dest_path)
+        return True
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+
+    try:
+        execute_command_line(['cp', '--reflink=always', src_path, dest_path])
+        logger.info('Reflinked %s to %s', src_path, dest_path)
+        return True
+    except (CommandError, OSError):
+        # Reflinks not supported by the file system (or cp), clean up any partial file
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+    return False
+
+
+def remove_files(paths, num_threads=1):
+    """Removes the given files using the given number of concurrent threads, which hides the latency of each removal on
+    network file systems. Paths that do not exist are skipped.
+
+    :param paths: The absolute paths of the files to remove
+    :type paths: [string]
+    :param num_threads: The maximum number of files to remove at the same time
+    :type num_threads: int
+    :returns: The paths that were removed
+    :rtype: [string]
+    """
+
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return False
+        logger.info('Deleted %s', path)
+        return True
+
+    num_threads = min(num_threads, len(paths))
+    if num_threads <= 1:
+        removed = [remove(path) for path in paths]
+    else:
+        pool = ThreadPool(num_threads)
+        try:
+            removed = pool.map(remove, paths)
+        finally:
+            pool.close()
+            pool.join()
+    return [path for path, was_removed in zip(paths, removed) if was_removed]
@@ -0,0 +1,70 @@
+"""Defines functions for validating JSON against JSON schemas using validators that are only compiled once per schema"""
+from __future__ import unicode_literals
+
+import hashlib
+import json
+
+from jsonschema.validators import validator_for
+
+# The maximum number of content hashes that are remembered as valid before the memo is cleared
+MAX_VALIDATED_HASHES = 10000
+
+# The compiled validators stored by the id of their schema. Each validator keeps a reference to its schema, so the id of
+# a cached schema is never reused by another object.
+_VALIDATORS = {}
+
+# The (schema id, content hash) pairs of JSON that has already passed validation
+_VALIDATED = set()
+
+
+def get_validator(schema):
+    """Returns the validator for the given schema. The first time a schema is used, it is checked against its
+    meta-schema and compiled into a validator that is cached for all later calls.
+
+    :param schema: The JSON schema
+    :type schema: dict
+    :returns: The validator for the schema
+    :rtype: :class:`jsonschema.validators.Validator`
+
+    :raises :class:`jsonschema.exceptions.SchemaError`: If the schema is invalid
+    """
+
+    validator = _VALIDATORS.get(id(schema))
+    if validator is None or validator.schema is not schema:
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+        _VALIDATORS[id(schema)] = validator
+    return validator
+
+
+def validate(instance, schema, memoize=False):
+    """Validates the given JSON against the given schema, like :func:`jsonschema.validate` but without re-checking the
+    schema and building a new validator on every call. The schema should be a module-level constant since its validator
+    is cached for the life of the process.
+
+    :param instance: The JSON to validate
+    :type instance: dict
+    :param schema: The JSON schema
+    :type schema: dict
+    :param memoize: Whether to remember the content hash of JSON that passes validation so that identical JSON is not
+        validated again. This should be used for JSON that is validated many times without changing, such as job type
+        manifests and recipe type revision definitions.
+    :type memoize: bool
+
+    :raises :class:`jsonschema.exceptions.ValidationError`: If the JSON is invalid
+    :raises :class:`jsonschema.exceptions.SchemaError`: If the schema is invalid
+    """
+
+    validator = get_validator(schema)
+    if not memoize:
+        validator.validate(instance)
+        return
+
+    key = (id(schema), hashlib.sha1(json.dumps(instance, sort_keys=True)).hexdigest())
+    if key in _VALIDATED:
+        return
+    validator.validate(instance)
+    if len(_VALIDATED) >= MAX_VALIDATED_HASHES:
+        _VALIDATED.clear()
+    _VALIDATED.add(key)
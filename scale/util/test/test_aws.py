@@ -143,6 +143,19 @@ class TestS3Client(TestCase):
 
         self.assertEqual(len(list(results)), 2)
 
+    def test_delete_objects_batches(self):
+        keys = ['file_%i' % x for x in range(2500)]
+        delete_objects = MagicMock(side_effect=[{}, {'Errors': [{'Key': 'file_1500', 'Code': 'AccessDenied',
+                                                                 'Message': 'Access Denied'}]}, {}])
+
+        with S3Client(self.credentials) as client:
+            client._client = MagicMock(delete_objects=delete_objects)
+            errors = client.delete_objects('sample-bucket', keys)
+
+        self.assertDictEqual(errors, {'file_1500': 'Access Denied'})
+        self.assertEqual(delete_objects.call_count, 3)
+        batch_sizes = [len(c[1]['Delete']['Objects']) for c in delete_objects.call_args_list]
+        self.assertListEqual(batch_sizes, [1000, 1000, 500])
 
 
 class TestSQSClient(TestCase):
@@ -0,0 +1,42 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import MagicMock
+
+from util.cache import LruCache
+
+
+class TestLruCache(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get(self):
+        """Tests that calling get() only creates a value once"""
+
+        cache = LruCache(10)
+        create_func = MagicMock(return_value='value')
+
+        self.assertEqual(cache.get(1, create_func), 'value')
+        self.assertEqual(cache.get(1, create_func), 'value')
+
+        self.assertEqual(create_func.call_count, 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_evict_least_recently_used(self):
+        """Tests that the least recently used value is evicted when the cache is full"""
+
+        cache = LruCache(2)
+        cache.get(1, lambda: 'a')
+        cache.get(2, lambda: 'b')
+        cache.get(1, lambda: 'not used')
+        cache.get(3, lambda: 'c')
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(1, lambda: 'not used'), 'a')
+        self.assertEqual(cache.get(2, lambda: 'new b'), 'new b')
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,50 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+import django
+from django.test import TestCase
+
+from util.inotify import Inotify, IN_CLOSE_WRITE, IN_ISDIR, IN_MOVED_TO, EVENT_HEADER, parse_events
+
+
+class TestInotify(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.dir_path = tempfile.mkdtemp()
+        self.inotify = Inotify()
+
+    def tearDown(self):
+        self.inotify.close()
+        shutil.rmtree(self.dir_path)
+
+    def test_read_events(self):
+        """Tests reading the events for files that are written and moved into a watched directory"""
+
+        wd = self.inotify.add_watch(self.dir_path, IN_CLOSE_WRITE | IN_MOVED_TO)
+        self.assertListEqual(self.inotify.read_events(0), [])
+
+        with open(os.path.join(self.dir_path, 'file.txt_tmp'), 'w') as new_file:
+            new_file.write('hello')
+        os.rename(os.path.join(self.dir_path, 'file.txt_tmp'), os.path.join(self.dir_path, 'file.txt'))
+        os.mkdir(os.path.join(self.dir_path, 'sub_dir'))
+
+        events = self.inotify.read_events(1)
+        self.assertListEqual([(event.wd, event.mask, event.name) for event in events],
+                             [(wd, IN_CLOSE_WRITE, 'file.txt_tmp'), (wd, IN_MOVED_TO, 'file.txt')])
+        self.assertFalse(any(event.mask & IN_ISDIR for event in events))
+
+    def test_parse_events(self):
+        """Tests parsing events that include a padded file name and no file name"""
+
+        data = EVENT_HEADER.pack(1, IN_CLOSE_WRITE, 0, 16) + b'file.txt' + b'\0' * 8
+        data += EVENT_HEADER.pack(1, IN_MOVED_TO, 5, 0)
+
+        events = parse_events(data)
+
+        self.assertListEqual([tuple(event) for event in events], [(1, IN_CLOSE_WRITE, 0, 'file.txt'),
+                                                                  (1, IN_MOVED_TO, 5, '')])
@@ -0,0 +1,118 @@
+from __future__ import unicode_literals
+
+import errno
+import os
+import shutil
+import tempfile
+
+import django
+from django.test import TestCase
+from mock import patch
+
+from util.os_helper import is_same_device, link_file, remove_files
+
+
+class TestLinkFile(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.dir_path = tempfile.mkdtemp()
+        self.src_path = os.path.join(self.dir_path, 'src.txt')
+        with open(self.src_path, 'w') as src_file:
+            src_file.write('hello')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_is_same_device(self):
+        """Tests calling is_same_device()"""
+
+        self.assertTrue(is_same_device(self.src_path, self.dir_path))
+        self.assertFalse(is_same_device(self.src_path, os.path.join(self.dir_path, 'missing')))
+
+    def test_hard_link(self):
+        """Tests calling link_file() on the same file system, which hard links the file"""
+
+        dest_path = os.path.join(self.dir_path, 'dest.txt')
+        self.assertTrue(link_file(self.src_path, dest_path))
+        self.assertTrue(os.path.samefile(self.src_path, dest_path))
+
+    def test_hard_link_symlink(self):
+        """Tests calling link_file() with a symbolic link, which links the file that the symbolic link points to"""
+
+        link_path = os.path.join(self.dir_path, 'link.txt')
+        os.symlink(self.src_path, link_path)
+        dest_path = os.path.join(self.dir_path, 'dest.txt')
+        self.assertTrue(link_file(link_path, dest_path))
+        self.assertFalse(os.path.islink(dest_path))
+        self.assertTrue(os.path.samefile(self.src_path, dest_path))
+
+    def test_existing_destination(self):
+        """Tests calling link_file() when the destination already exists, which must be copied over instead"""
+
+        dest_path = os.path.join(self.dir_path, 'dest.txt')
+        open(dest_path, 'w').close()
+        self.assertFalse(link_file(self.src_path, dest_path))
+        self.assertFalse(os.path.samefile(self.src_path, dest_path))
+
+    def test_min_mode(self):
+        """Tests calling link_file() with a source file that does not grant the required permissions"""
+
+        os.chmod(self.src_path, 0600)
+        dest_path = os.path.join(self.dir_path, 'dest.txt')
+        self.assertFalse(link_file(self.src_path, dest_path, min_mode=0444))
+        self.assertFalse(os.path.exists(dest_path))
+
+        os.chmod(self.src_path, 0644)
+        self.assertTrue(link_file(self.src_path, dest_path, min_mode=0444))
+        self.assertTrue(os.path.samefile(self.src_path, dest_path))
+
+    @patch('util.os_helper.execute_command_line')
+    @patch('util.os_helper.os.link')
+    def test_reflink(self, mock_link, mock_execute):
+        """Tests calling link_file() on a file system without hard links, which falls back to a reflink"""
+
+        mock_link.side_effect = OSError(errno.EPERM, 'Operation not permitted')
+        dest_path = os.path.join(self.dir_path, 'dest.txt')
+        self.assertTrue(link_file(self.src_path, dest_path))
+        mock_execute.assert_called_once_with(['cp', '--reflink=always', os.path.realpath(self.src_path), dest_path])
+
+    @patch('util.os_helper.execute_command_line')
+    @patch('util.os_helper.os.link')
+    def test_no_link_supported(self, mock_link, mock_execute):
+        """Tests calling link_file() on a file system without hard links or reflinks"""
+
+        mock_link.side_effect = OSError(errno.EPERM, 'Operation not permitted')
+        mock_execute.side_effect = OSError(errno.ENOENT, 'No such file or directory')
+        self.assertFalse(link_file(self.src_path, os.path.join(self.dir_path, 'dest.txt')))
+
+
+class TestRemoveFiles(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_remove_files(self):
+        """Tests calling remove_files() concurrently with some files that do not exist"""
+
+        paths = [os.path.join(self.dir_path, 'file_%d.txt' % i) for i in range(10)]
+        for path in paths[:8]:
+            open(path, 'w').close()
+
+        removed_paths = remove_files(paths, 4)
+
+        self.assertListEqual(removed_paths, paths[:8])
+        self.assertListEqual(os.listdir(self.dir_path), [])
+
+    @patch('util.os_helper.os.remove')
+    def test_remove_files_error(self, mock_remove):
+        """Tests calling remove_files() when a file cannot be removed"""
+
+        mock_remove.side_effect = OSError(errno.EACCES, 'Permission denied')
+        self.assertRaises(OSError, remove_files, [os.path.join(self.dir_path, 'file.txt')], 4)
@@ -0,0 +1,67 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from jsonschema.exceptions import SchemaError, ValidationError
+from mock import patch
+
+import util.schema as schema
+from util.schema import get_validator, validate
+
+TEST_SCHEMA = {
+    'type': 'object',
+    'required': ['name'],
+    'properties': {
+        'name': {'type': 'string'},
+    },
+}
+
+
+class TestSchema(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get_validator(self):
+        """Tests that calling get_validator() compiles each schema once"""
+
+        validator = get_validator(TEST_SCHEMA)
+
+        self.assertIs(get_validator(TEST_SCHEMA), validator)
+        self.assertIsNot(get_validator(dict(TEST_SCHEMA)), validator)
+
+    def test_get_validator_invalid_schema(self):
+        """Tests calling get_validator() with an invalid schema"""
+
+        self.assertRaises(SchemaError, get_validator, {'type': 'invalid'})
+
+    def test_validate(self):
+        """Tests calling validate() with valid and invalid JSON"""
+
+        validate({'name': 'my-name'}, TEST_SCHEMA)
+        self.assertRaises(ValidationError, validate, {'name': 1}, TEST_SCHEMA)
+        self.assertRaises(ValidationError, validate, {}, TEST_SCHEMA)
+
+    def test_validate_memoize(self):
+        """Tests that calling validate() with memoize only validates identical valid JSON once"""
+
+        validator = get_validator(TEST_SCHEMA)
+        with patch.object(validator, 'validate', wraps=validator.validate) as mock_validate:
+            validate({'name': 'memoized', 'other': [1, 2]}, TEST_SCHEMA, memoize=True)
+            validate({'other': [1, 2], 'name': 'memoized'}, TEST_SCHEMA, memoize=True)
+            self.assertEqual(mock_validate.call_count, 1)
+
+            # Invalid JSON is never remembered
+            self.assertRaises(ValidationError, validate, {'name': 2}, TEST_SCHEMA, memoize=True)
+            self.assertRaises(ValidationError, validate, {'name': 2}, TEST_SCHEMA, memoize=True)
+            self.assertEqual(mock_validate.call_count, 3)
+
+    @patch('util.schema.MAX_VALIDATED_HASHES', 2)
+    def test_validate_memoize_limit(self):
+        """Tests that the memo of valid JSON is cleared when it is full"""
+
+        schema._VALIDATED.clear()
+        for name in ['a', 'b', 'c']:
+            validate({'name': name}, TEST_SCHEMA, memoize=True)
+
+        self.assertEqual(len(schema._VALIDATED), 1)